@@ -0,0 +1,360 @@
+"""
+SQLmap GUI Command Line Runner
+Runs saved GUI profiles against target lists without Qt, for CI and cron jobs.
+Progress and events are written to stdout as JSON lines; everything else the
+core prints goes to stderr.
+
+Run with: python -m src.cli PROFILE [-t targets.txt] [-u URL ...] [-j 4]
+
+Exit codes:
+    0  every scan finished and nothing injectable was found
+    1  at least one scan reported an injection point
+    2  bad arguments, unreadable profile or invalid options
+    3  one or more scans failed to start or exited with an error
+    130 interrupted
+"""
+
+import json
+import os
+import sys
+import time
+from typing import IO, Any, Dict, Iterable, List, Optional
+
+from .core import parameter_schema
+from .core.bulk_sharding import iter_bulk_targets
+from .core.output_events import classify_line, parse_log_line, reports_injection
+from .core.progress_tracker import ProgressAggregator, ScanProgress
+from .core.rate_governor import RateGovernor, options_host
+from .core.results_ingester import csv_delimiter
+from .core.sqlmap_wrapper import SqlmapProcess, SqlmapWrapper
+from .core.target_registry import COMPLETED_OUTCOMES, TargetRegistry
+
+
+EXIT_OK, EXIT_FOUND, EXIT_USAGE, EXIT_FAILED, EXIT_INTERRUPTED = 0, 1, 2, 3, 130
+
+
+def load_profile_options(profile: str) -> Dict[str, Any]:
+    """Flat options of a GUI profile (a path, or the name of a saved profile)"""
+    data = None
+    if not os.path.exists(profile):
+        from .core.profile_store import get_default_store
+        data = get_default_store().load(profile)
+    if data is None:
+        with open(profile, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("Profile is not a JSON object")
+
+    # Profiles saved by the GUI group options by tab; plain option files are flat
+    options: Dict[str, Any] = {}
+    for key, value in data.items():
+        if key == '_metadata':
+            continue
+        if isinstance(value, dict) and key not in parameter_schema.BY_NAME:
+            options.update(value)
+        else:
+            options[key] = value
+    return options
+
+
+def target_options(options: Dict[str, Any], target: str) -> Dict[str, Any]:
+    """The profile's options pointed at one target URL"""
+    scoped = {key: value for key, value in options.items() if key not in parameter_schema.TARGET_PARAMS}
+    scoped['url'] = target
+    return scoped
+
+
+class EventWriter:
+    """Writes one JSON object per line"""
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+
+    def emit(self, event: str, **fields):
+        fields = dict(event=event, time=round(time.time(), 3), **fields)
+        self.stream.write(json.dumps(fields, default=str) + '\n')
+        self.stream.flush()
+
+
+class CliJob:
+    """One scan run by the command line runner"""
+
+    __slots__ = ('index', 'target', 'options', 'process', 'start_time', 'exit_code', 'found', 'lines', 'progress')
+
+    def __init__(self, index: int, target: Optional[str], options: Dict[str, Any]):
+        self.index = index
+        self.target = target
+        self.options = options
+        self.process = None
+        self.start_time: Optional[float] = None
+        self.exit_code: Optional[int] = None
+        self.found = False
+        self.lines = 0
+        self.progress: Optional[ScanProgress] = None
+
+
+class CliRunner:
+    """Runs jobs with up to `parallel` sqlmap processes, streaming JSONL events"""
+
+    def __init__(self, wrapper: SqlmapWrapper, events: EventWriter, parallel: int = 1,
+                 stream_output: bool = True, governor: Optional[RateGovernor] = None,
+                 registry: Optional[TargetRegistry] = None, backend: str = 'process', ingester=None):
+        self.wrapper = wrapper
+        self.events = events
+        self.parallel = max(1, parallel)
+        self.stream_output = stream_output
+        self.governor = governor
+        self.registry = registry
+        self.backend = backend
+        self.ingester = ingester  # Merges each finished scan's output into the findings database
+        self.api_server = None
+        self.progress = ProgressAggregator()
+
+    def _create_process(self, options: Dict[str, Any]):
+        if self.backend == 'api':
+            from .core.sqlmap_api import SqlmapApiProcess, SqlmapApiServer
+            if self.api_server is None:
+                self.api_server = SqlmapApiServer(self.wrapper)
+            return SqlmapApiProcess(self.api_server, options)
+        return SqlmapProcess(self.wrapper.build_command(options, force_batch=True))
+
+    def _job_id(self, job: CliJob) -> str:
+        return f"cli-{job.index}"
+
+    def _launch(self, job: CliJob) -> Optional[bool]:
+        """Start a job; None when the rate governor has no free slot for it yet"""
+        options = job.options
+        if self.governor:
+            options = self.governor.acquire(self._job_id(job), options_host(options), options)
+            if options is None:
+                return None
+        job.start_time = time.time()
+        job.progress = ScanProgress.from_options(options)
+        try:
+            job.process = self._create_process(options)
+            started = job.process.start()
+        except Exception as e:
+            self.events.emit('error', job=job.index, target=job.target, message=str(e))
+            started = False
+        if not started:
+            job.exit_code = -1
+            self._release(job)
+            self.events.emit('finished', job=job.index, target=job.target, exit_code=None, status='not_started')
+            return False
+        command = job.process.command if hasattr(job.process, 'command') else None
+        self.events.emit('started', job=job.index, target=job.target, command=command)
+        return True
+
+    def _release(self, job: CliJob):
+        if self.governor:
+            self.governor.release(self._job_id(job))
+
+    def _drain(self, job: CliJob):
+        for line in job.process.get_output():
+            self._line(job, line, 'stdout')
+        for line in job.process.get_errors():
+            self._line(job, line, 'stderr')
+        self._report_progress(job)
+
+    def _line(self, job: CliJob, line: str, stream: str):
+        job.lines += 1
+        if not job.found and reports_injection(line):
+            job.found = True
+            self.events.emit('injection_found', job=job.index, target=job.target, line=line)
+        event = classify_line(line)
+        if event is not None:
+            self.events.emit('health', job=job.index, target=job.target, kind=event.kind, message=event.message)
+        level, message = parse_log_line(line)
+        job.progress.feed(level, message)
+        if self.stream_output:
+            self.events.emit('output', job=job.index, stream=stream, level=level, message=message)
+
+    def _report_progress(self, job: CliJob):
+        """Emit a progress event when the job's estimate moved, with the estimate over all running jobs"""
+        if job.progress is None or not job.progress.take_changed():
+            return
+        percent, eta, phase = job.progress.snapshot()
+        self.progress.update(self._job_id(job), percent, eta, phase)
+        overall, overall_eta = self.progress.combined()
+        self.events.emit('progress', job=job.index, target=job.target, percent=percent, phase=phase, eta=eta,
+                         overall=overall, overall_eta=overall_eta)
+
+    def _finish(self, job: CliJob, exit_code: Optional[int]):
+        job.process.wait_output()
+        self._drain(job)
+        job.exit_code = exit_code
+        self._release(job)
+        self.progress.remove(self._job_id(job))
+        if self.registry is not None and exit_code == 0:
+            self.registry.record_options(job.options, 'vulnerable' if job.found else 'not_vulnerable')
+        self.events.emit('finished', job=job.index, target=job.target, exit_code=exit_code,
+                         status='vulnerable' if job.found else ('completed' if exit_code == 0 else 'failed'),
+                         duration=round(time.time() - job.start_time, 2), lines=job.lines)
+        if self.ingester is not None and job.options.get('output_dir'):
+            self.ingester.watch(job.options['output_dir'], csv_delimiter(job.options.get('csv_del')))
+            counts = self.ingester.ingest([job.options['output_dir']])
+            self.events.emit('ingested', job=job.index, target=job.target, **counts)
+
+    def run(self, jobs: Iterable[CliJob], poll_interval: float = 0.2) -> List[CliJob]:
+        pending = iter(jobs)
+        running: List[CliJob] = []
+        done: List[CliJob] = []
+        exhausted = False
+        waiting: Optional[CliJob] = None  # Next job, held back until its host has a free slot
+        try:
+            while True:
+                while not exhausted and len(running) < self.parallel:
+                    job = waiting or next(pending, None)
+                    waiting = None
+                    if job is None:
+                        exhausted = True
+                        break
+                    launched = self._launch(job)
+                    if launched is None:
+                        waiting = job
+                        break
+                    if launched:
+                        running.append(job)
+                    else:
+                        done.append(job)
+
+                if not running and exhausted:
+                    break
+
+                for job in list(running):
+                    self._drain(job)
+                    exit_code = job.process.poll()
+                    if exit_code is not None or not job.process.is_running:
+                        running.remove(job)
+                        self._finish(job, exit_code)
+                        done.append(job)
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            for job in running:
+                job.process.stop()
+                self._finish(job, job.process.poll())
+            raise
+        finally:
+            if self.api_server is not None:
+                self.api_server.stop()
+        return done
+
+
+def _targets(args) -> List[Optional[str]]:
+    targets: List[Optional[str]] = list(args.url or [])
+    for path in args.targets or []:
+        targets.extend(iter_bulk_targets(path))
+    return targets
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point; returns the process exit code"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m src.cli',
+                                     description="Run SQLmap GUI profiles headless, reporting JSONL events")
+    parser.add_argument('profile', help="GUI profile file, or the name of a saved profile")
+    parser.add_argument('-u', '--url', action='append', help="target URL (repeatable)")
+    parser.add_argument('-t', '--targets', action='append', help="file with one target URL per line (repeatable)")
+    parser.add_argument('-j', '--parallel', type=int, default=1, help="concurrent scans (default: 1)")
+    parser.add_argument('--sqlmap', default='sqlmap', help="sqlmap command or path to sqlmap.py")
+    parser.add_argument('--backend', choices=('process', 'api'), default='process',
+                        help="run scans as processes or as sqlmapapi tasks (default: process)")
+    parser.add_argument('--output-dir', help="per-scan output directories are created below this")
+    parser.add_argument('--host-rps', type=float, help="requests per second per host")
+    parser.add_argument('--findings', action='store_true',
+                        help="merge results into the findings database (needs --output-dir)")
+    parser.add_argument('--skip-tested', action='store_true',
+                        help="skip targets the tested-target registry says were covered with these options")
+    parser.add_argument('--no-output', action='store_true', help="report events only, not sqlmap output lines")
+    parser.add_argument('--dry-run', action='store_true', help="validate and print commands without scanning")
+    args = parser.parse_args(argv)
+
+    events = EventWriter(sys.stdout)
+    # Core modules report problems with print(); keep stdout for events only
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        return run(args, events)
+    finally:
+        sys.stdout = stdout
+
+
+def run(args, events: EventWriter) -> int:
+    """Validate, plan and run the scans described by parsed arguments"""
+    try:
+        options = load_profile_options(args.profile)
+    except (OSError, ValueError) as e:
+        events.emit('error', message=f"Cannot load profile: {e}")
+        return EXIT_USAGE
+
+    sqlmap = args.sqlmap
+    wrapper = SqlmapWrapper([sys.executable, sqlmap] if sqlmap.endswith('.py') else sqlmap)
+
+    targets = _targets(args)
+    if not targets:
+        targets = [None]  # The profile's own target
+
+    registry = TargetRegistry() if args.skip_tested else None
+    jobs: List[CliJob] = []
+    invalid = 0
+    for index, target in enumerate(targets):
+        job_options = target_options(options, target) if target else dict(options)
+        if args.output_dir:
+            job_options['output_dir'] = os.path.join(args.output_dir, f"job-{index:05d}")
+
+        validation = wrapper.validate_options(job_options)
+        if not validation.is_valid:
+            invalid += 1
+            events.emit('invalid', job=index, target=target,
+                        errors=[{'parameter': issue.parameter, 'message': issue.message} for issue in validation.errors])
+            continue
+        if registry is not None:
+            record = registry.check_options(job_options)
+            if record is not None and record.outcome in COMPLETED_OUTCOMES:
+                events.emit('skipped', job=index, target=target, reason='already tested', outcome=record.outcome)
+                continue
+        if args.dry_run:
+            events.emit('command', job=index, target=target,
+                        command=wrapper.build_command(job_options, force_batch=True))
+            continue
+        jobs.append(CliJob(index, target, job_options))
+
+    events.emit('plan', profile=args.profile, targets=len(targets), scans=len(jobs), invalid=invalid,
+                parallel=args.parallel, backend=args.backend)
+    if invalid and not jobs:
+        return EXIT_USAGE
+
+    ingester = None
+    if args.findings and args.output_dir:
+        from .core.findings_db import FindingsDB
+        from .core.results_ingester import ResultsIngester, ResultsStore
+        ingester = ResultsIngester(ResultsStore(), findings=FindingsDB())
+    elif args.findings:
+        events.emit('warning', message="--findings needs --output-dir; results will not be merged")
+
+    governor = RateGovernor(host_rps=args.host_rps) if args.host_rps else None
+    runner = CliRunner(wrapper, events, args.parallel, not args.no_output, governor, registry, args.backend,
+                       ingester)
+    started = time.time()
+    try:
+        done = runner.run(jobs)
+    except KeyboardInterrupt:
+        events.emit('interrupted')
+        return EXIT_INTERRUPTED
+    finally:
+        if registry is not None:
+            registry.close()
+
+    found = sum(1 for job in done if job.found)
+    failed = sum(1 for job in done if job.exit_code != 0 and not job.found)
+    events.emit('summary', scans=len(done), vulnerable=found, failed=failed, invalid=invalid,
+                duration=round(time.time() - started, 2))
+    if found:
+        return EXIT_FOUND
+    if failed or invalid:
+        return EXIT_FAILED if failed else EXIT_USAGE
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Atomic IO - Replace files so readers never see a half-written one
+Data goes to a temporary file in the same directory, is flushed to disk and
+then renamed over the target, so a crash leaves either the old or the new file
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+
+def atomic_write_text(path: Union[str, Path], text: str, encoding: str = 'utf-8'):
+    """Write `text` to `path` atomically; raises OSError on failure"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(handle, 'w', encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            # mkstemp creates 0600 files; keep the permissions the file already had
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    try:
+        # Make the rename itself durable
+        directory = os.open(str(path.parent), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+    except OSError:
+        pass  # Not supported on every platform (e.g. Windows)
+
+
+def atomic_write_json(path: Union[str, Path], data: Any, **dump_options):
+    """Serialize `data` as JSON and write it atomically"""
+    atomic_write_text(path, json.dumps(data, **dump_options))
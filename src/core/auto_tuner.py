@@ -0,0 +1,284 @@
+"""
+Auto Tuner - AIMD control of --threads/--delay/--timeout from live scan output
+Backs off multiplicatively on timeouts, resets, HTTP 429/503, retries and
+responses nearing the timeout, and ramps up additively after quiet periods;
+changes are applied by relaunching sqlmap on the same session so finished
+work is resumed rather than redone. Response times come from the scan's
+traffic file (-t) when it has one.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .output_events import CONGESTION_EVENTS, TIMEOUT, OutputEvent, classify_line
+from .traffic_analyzer import TrafficTailer
+
+
+# Exit code reported when sqlmap could not be (re)launched
+START_FAILED = -1
+
+
+class TuningDecision:
+    """A change of scan settings and why it was made"""
+
+    __slots__ = ('reason', 'previous', 'current')
+
+    def __init__(self, reason: str, previous: Dict[str, Any], current: Dict[str, Any]):
+        self.reason = reason
+        self.previous = previous
+        self.current = current
+
+    def __repr__(self) -> str:
+        return f"TuningDecision({self.reason!r}, {self.previous} -> {self.current})"
+
+    def describe(self) -> str:
+        changes = ', '.join(f"{key} {self.previous[key]} -> {value}"
+                            for key, value in self.current.items() if self.previous[key] != value)
+        return f"{changes} ({self.reason})"
+
+
+def _number(value: Any, cast, default):
+    try:
+        return cast(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        return default
+
+
+class AutoTuner:
+    """Additive-increase / multiplicative-decrease controller for one scan
+
+    Output is judged in windows of `window` seconds. A window with congestion
+    events halves the threads (or, at the minimum, doubles the delay); after
+    `increase_after` clean windows the delay is reduced by `delay_step` or, at
+    zero delay, one thread is added. Settings change at most every `cooldown`
+    seconds because each change costs a relaunch. Settings never go beyond
+    max_threads / min_delay, so an externally granted budget is respected.
+    """
+
+    def __init__(self, threads: int = 1, delay: float = 0.0, timeout: int = 30,
+                 min_threads: int = 1, max_threads: int = 10, min_delay: float = 0.0, max_delay: float = 10.0,
+                 delay_step: float = 0.1, max_timeout: int = 120, window: float = 20.0,
+                 increase_after: int = 3, cooldown: float = 30.0, burst: int = 5):
+        self.threads = max(min_threads, min(max_threads, threads))
+        self.delay = max(min_delay, delay)
+        self.timeout = max(1, timeout)
+        self.min_threads = min_threads
+        self.max_threads = max_threads
+        self.min_delay = min_delay  # E.g. the rate governor's allocation
+        self.max_delay = max_delay
+        self.delay_step = delay_step
+        self.max_timeout = max_timeout
+        self.window = window
+        self.increase_after = increase_after
+        self.cooldown = cooldown
+        self.burst = burst  # Congestion events that end a window early
+
+        self.window_start: Optional[float] = None
+        self.window_events: Dict[str, int] = {}
+        self.window_lines = 0
+        self.clean_windows = 0
+        self.last_change: Optional[float] = None
+        self.latency: Optional[float] = None  # Smoothed response time, when known
+        self.history: List[TuningDecision] = []
+        self.initial = self.settings()
+        self.configured: Set[str] = set()  # Settings the scan's own options give
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any], **kwargs) -> 'AutoTuner':
+        """Start from the scan's configured threads, delay and timeout"""
+        tuner = cls(threads=_number(options.get('threads'), int, 1),
+                    delay=_number(options.get('delay'), float, 0.0),
+                    timeout=_number(options.get('timeout'), int, 30), **kwargs)
+        tuner.configured = {key for key in tuner.initial if options.get(key) not in (None, '')}
+        return tuner
+
+    def settings(self) -> Dict[str, Any]:
+        return {'threads': self.threads, 'delay': self.delay, 'timeout': self.timeout}
+
+    def observe_line(self, line: str, now: Optional[float] = None) -> Optional[OutputEvent]:
+        """Feed one line of scan output"""
+        now = time.time() if now is None else now
+        if self.window_start is None:
+            self.window_start = now
+        self.window_lines += 1
+        event = classify_line(line, now)
+        if event is not None:
+            self.window_events[event.kind] = self.window_events.get(event.kind, 0) + 1
+        return event
+
+    def observe_latency(self, seconds: float):
+        """Feed a response time; responses near the timeout count as congestion"""
+        self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+        if self.latency > 0.5 * self.timeout:
+            self.window_events['slow'] = self.window_events.get('slow', 0) + 1
+
+    def _congestion(self) -> int:
+        return sum(count for kind, count in self.window_events.items()
+                   if kind in CONGESTION_EVENTS or kind == 'slow')
+
+    def evaluate(self, now: Optional[float] = None) -> Optional[TuningDecision]:
+        """Close the current window if it is due; returns a decision when settings change"""
+        now = time.time() if now is None else now
+        if self.window_start is None:
+            self.window_start = now
+            return None
+
+        congestion = self._congestion()
+        if now - self.window_start < self.window and congestion < self.burst:
+            return None
+
+        events = self.window_events
+        lines = self.window_lines
+        self.window_start = now
+        self.window_events = {}
+        self.window_lines = 0
+
+        cooled_down = self.last_change is None or now - self.last_change >= self.cooldown
+        if congestion:
+            self.clean_windows = 0
+            if cooled_down:
+                return self._decrease(now, events)
+            return None
+
+        if lines:
+            self.clean_windows += 1
+            if self.clean_windows >= self.increase_after and cooled_down:
+                self.clean_windows = 0
+                return self._increase(now)
+        return None
+
+    def _decrease(self, now: float, events: Dict[str, int]) -> Optional[TuningDecision]:
+        previous = self.settings()
+        if self.threads > self.min_threads:
+            self.threads = max(self.min_threads, self.threads // 2)
+        else:
+            self.delay = min(self.max_delay, round(max(self.delay_step, self.delay * 2), 2))
+        if events.get(TIMEOUT) or events.get('slow'):
+            self.timeout = min(self.max_timeout, int(self.timeout * 1.5))
+
+        reason = ', '.join(f"{count} {kind}" for kind, count in sorted(events.items())
+                           if kind in CONGESTION_EVENTS or kind == 'slow')
+        return self._changed(now, previous, f"backing off: {reason}")
+
+    def _increase(self, now: float) -> Optional[TuningDecision]:
+        previous = self.settings()
+        if self.delay > self.min_delay:
+            self.delay = max(self.min_delay, round(self.delay - self.delay_step, 2))
+        elif self.threads < self.max_threads:
+            self.threads += 1
+        return self._changed(now, previous, f"{self.increase_after} quiet windows")
+
+    def _changed(self, now: float, previous: Dict[str, Any], reason: str) -> Optional[TuningDecision]:
+        current = self.settings()
+        if current == previous:
+            return None
+        self.last_change = now
+        decision = TuningDecision(reason, previous, current)
+        self.history.append(decision)
+        return decision
+
+    def apply(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Options for relaunching with the current settings on the same session
+
+        Only settings the tuner has moved away from where the scan started are
+        written; the rest keep the scan's own value or sqlmap's default.
+        """
+        tuned = dict(options)
+        for key, value in self.settings().items():
+            if value != self.initial[key] or key in self.configured:
+                tuned[key] = value
+            else:
+                tuned.pop(key, None)
+        # Flushing would throw away everything the previous run stored
+        tuned.pop('flush_session', None)
+        tuned.pop('fresh_queries', None)
+        return tuned
+
+
+class TunedScan:
+    """Runs a scan under an AutoTuner, relaunching sqlmap when settings change"""
+
+    def __init__(self, wrapper, options: Dict[str, Any], tuner: Optional[AutoTuner] = None,
+                 use_sudo: bool = False, sudo_password: Optional[str] = None):
+        self.wrapper = wrapper
+        self.options = dict(options)
+        self.tuner = tuner or AutoTuner.from_options(options)
+        self.use_sudo = use_sudo
+        self.sudo_password = sudo_password
+        self.process = None
+        self.relaunches = 0
+        self.exit_code: Optional[int] = None  # Set when a (re)launch fails
+        # Last lines of a process stopped for a relaunch, handed out by the next read()
+        self._carried: Tuple[List[str], List[str]] = ([], [])
+        # Response times, when the scan logs its traffic; the tailer follows the
+        # file across relaunches, which recreate it
+        self.traffic: Optional[TrafficTailer] = None
+        if options.get('traffic_file'):
+            self.traffic = TrafficTailer(options['traffic_file'], self.tuner.threads)
+            self.traffic.on_exchange = self._observe_exchange
+
+    def _observe_exchange(self, exchange):
+        if exchange.latency is not None:
+            self.tuner.observe_latency(exchange.latency)
+
+    def start(self) -> bool:
+        """Launch sqlmap; on failure the scan counts as finished with START_FAILED"""
+        self.process = self.wrapper.create_process(self.options, self.use_sudo, self.sudo_password)
+        if self.process and self.process.start():
+            return True
+        self.process = None
+        self.exit_code = START_FAILED
+        return False
+
+    def read(self) -> Tuple[List[str], List[str]]:
+        """Drain output and error lines, feeding both to the tuner"""
+        carried_output, carried_errors = self._carried
+        self._carried = ([], [])
+        if not self.process:
+            return carried_output, carried_errors
+        output = self.process.get_output()
+        errors = self.process.get_errors()
+        for line in output:
+            self.tuner.observe_line(line)
+        for line in errors:
+            self.tuner.observe_line(line)
+        if self.traffic is not None:
+            self.traffic.threads = self.tuner.threads
+            try:
+                self.traffic.poll()
+            except Exception as e:
+                print(f"Error reading traffic file: {e}")
+        # Lines of a stopped process belong to the old settings; the tuner doesn't see them
+        return carried_output + output, carried_errors + errors
+
+    def finish(self) -> Tuple[List[str], List[str]]:
+        """The last lines once sqlmap has exited"""
+        if self.process:
+            self.process.wait_output()
+        return self.read()
+
+    def retune(self) -> Optional[TuningDecision]:
+        """Apply a due tuning decision by restarting sqlmap on the same session"""
+        if self.process is None or self.process.poll() is not None:
+            return None
+        decision = self.tuner.evaluate()
+        if decision is None:
+            return None
+        output, errors = self.read()
+        self.process.stop()
+        self.process.wait_output()
+        self._carried = (output + self.process.get_output(), errors + self.process.get_errors())
+        self.options = self.tuner.apply(self.options)
+        self.relaunches += 1
+        if not self.start():
+            print("Error relaunching tuned scan")
+        return decision
+
+    def poll(self) -> Optional[int]:
+        if self.process is None:
+            return self.exit_code
+        return self.process.poll()
+
+    def stop(self):
+        if self.process:
+            self.process.stop()
@@ -0,0 +1,277 @@
+"""
+Micro-benchmarks for the SQLmap GUI core
+Times the hot paths that run on every option change in the GUI
+
+Run with: python -m src.core.benchmarks [--no-check]
+"""
+
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .sqlmap_validator import SqlmapValidator
+from .sqlmap_wrapper import SqlmapWrapper
+
+
+# Representative option sets: a minimal scan, a typical enumeration scan and
+# a heavily configured scan touching most option groups.
+SAMPLE_OPTIONS: List[Dict[str, Any]] = [
+    {
+        'url': 'http://example.com/page.php?id=1',
+        'batch': True,
+    },
+    {
+        'url': 'http://example.com/page.php?id=1',
+        'data': 'id=1&user=admin',
+        'cookie': 'PHPSESSID=abc123',
+        'level': 3,
+        'risk': 2,
+        'boolean_blind': True,
+        'union_based': True,
+        'dbs': True,
+        'tables': True,
+        'db': 'testdb',
+        'threads': 4,
+        'batch': True,
+    },
+    {
+        'url': 'http://example.com/page.php?id=1',
+        'method': 'POST',
+        'data': 'id=1&user=admin',
+        'cookie': 'PHPSESSID=abc123; security=low',
+        'random_agent': True,
+        'headers': 'X-Forwarded-For: 127.0.0.1',
+        'proxy': 'http://127.0.0.1:8080',
+        'delay': 1,
+        'timeout': 30,
+        'retries': 3,
+        'level': 5,
+        'risk': 3,
+        'boolean_blind': True,
+        'error_based': True,
+        'union_based': True,
+        'stacked_queries': True,
+        'time_based': True,
+        'inline_queries': True,
+        'dbms': 'MySQL',
+        'tamper': 'space2comment,between',
+        'current_user': True,
+        'current_db': True,
+        'is_dba': True,
+        'dump': True,
+        'db': 'testdb',
+        'tbl': 'users',
+        'threads': 8,
+        'verbose': 3,
+        'batch': True,
+        'flush_session': True,
+    },
+]
+
+
+# Command lines as pasted into the validator or imported from notes and scripts
+SAMPLE_COMMANDS: List[str] = [
+    "sqlmap -u 'http://example.com/page.php?id=1' --batch --random-agent --level 3 --risk 2 --threads 5 --dbs",
+    "python sqlmap -u http://testphp.vulnweb.com/artists.php?artist=1 --technique=BEU --dbms=MySQL "
+    "--dump -D acuart -T users --batch",
+    "sqlmap -r /tmp/request.txt -p id --tamper=space2comment --level 5 --os-shell",
+    'sqlmap -u "http://10.0.0.5/login.php" --data="user=admin&pass=x" --method POST --thr 4 --flush',
+]
+
+
+# Command lines per second the lexer was meant to sustain. It is not met:
+# lexing reaches roughly 80k lines/s and full validate_command roughly 30k
+# lines/s on a typical machine, so the floors below guard what was achieved.
+COMMAND_LINE_TARGET = 100000
+
+# Minimum calls per second; main() fails when a benchmark drops below its floor
+FLOORS: Dict[str, float] = {
+    'command_lexer': 60000,
+    'validate_command': 20000,
+}
+
+
+def _time_call(func: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """Run func repeatedly and return total and per-call timings"""
+    # Warm up caches and lazily compiled state before measuring
+    for _ in range(min(iterations, 100)):
+        func()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'iterations': iterations,
+        'total_s': elapsed,
+        'per_call_us': (elapsed / iterations) * 1e6 if iterations else 0.0,
+        'calls_per_s': iterations / elapsed if elapsed else 0.0,
+    }
+
+
+def bench_build_command(wrapper: SqlmapWrapper, iterations: int = 10000) -> Dict[str, float]:
+    """Benchmark uncached command building over the sample option sets"""
+    samples = SAMPLE_OPTIONS
+
+    def run():
+        for options in samples:
+            wrapper._build_command(options)
+
+    result = _time_call(run, iterations)
+    result['per_call_us'] /= len(samples)
+    result['calls_per_s'] *= len(samples)
+    return result
+
+
+def bench_validate_options(wrapper: SqlmapWrapper, iterations: int = 10000) -> Dict[str, float]:
+    """Benchmark uncached SqlmapWrapper.validate_options over the sample option sets"""
+    samples = SAMPLE_OPTIONS
+
+    def run():
+        for options in samples:
+            wrapper.invalidate_caches()
+            wrapper.validate_options(options)
+
+    result = _time_call(run, iterations)
+    result['per_call_us'] /= len(samples)
+    result['calls_per_s'] *= len(samples)
+    return result
+
+
+def bench_cached_validation(wrapper: SqlmapWrapper, iterations: int = 10000) -> Dict[str, float]:
+    """Benchmark repeated validation of unchanged options (memoized path)"""
+    samples = [dict(options) for options in SAMPLE_OPTIONS]
+
+    def run():
+        for options in samples:
+            wrapper.validate_options(options)
+
+    result = _time_call(run, iterations)
+    result['per_call_us'] /= len(samples)
+    result['calls_per_s'] *= len(samples)
+    return result
+
+
+def bench_incremental_validation(wrapper: SqlmapWrapper, iterations: int = 10000) -> Dict[str, float]:
+    """Benchmark a single-keystroke update of the live validation engine"""
+    engine = wrapper.create_validation_engine(SAMPLE_OPTIONS[-1])
+    values = ['http://example.com/page.php?id=1', 'http://example.com/page.php?id=12']
+    state = {'i': 0}
+
+    def run():
+        state['i'] ^= 1
+        engine.set_option('url', values[state['i']])
+
+    return _time_call(run, iterations)
+
+
+def bench_command_lexer(validator: SqlmapValidator, iterations: int = 10000) -> Dict[str, float]:
+    """Benchmark lexing sample command lines into resolved flags"""
+    samples = SAMPLE_COMMANDS
+    lex = validator.lexer.lex
+
+    def run():
+        for command in samples:
+            lex(command)
+
+    result = _time_call(run, iterations)
+    result['per_call_us'] /= len(samples)
+    result['calls_per_s'] *= len(samples)
+    return result
+
+
+def bench_validate_command(validator: SqlmapValidator, iterations: int = 10000) -> Dict[str, float]:
+    """Benchmark SqlmapValidator.validate_command over the sample command lines"""
+    samples = SAMPLE_COMMANDS
+
+    def run():
+        for command in samples:
+            validator.validate_command(command)
+
+    result = _time_call(run, iterations)
+    result['per_call_us'] /= len(samples)
+    result['calls_per_s'] *= len(samples)
+    return result
+
+
+def bench_bulk_validation(iterations: int = 10000, workers: Optional[int] = None) -> Dict[str, float]:
+    """Benchmark validate_bulk throughput over repeated sample option sets"""
+    from .bulk_validation import validate_bulk
+
+    option_sets = [SAMPLE_OPTIONS[i % len(SAMPLE_OPTIONS)] for i in range(iterations)]
+    start = time.perf_counter()
+    count = sum(1 for _ in validate_bulk(option_sets, workers=workers))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'iterations': count,
+        'total_s': elapsed,
+        'per_call_us': (elapsed / count) * 1e6 if count else 0.0,
+        'calls_per_s': count / elapsed if elapsed else 0.0,
+    }
+
+
+def run_all(iterations: int = 10000) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark and return results keyed by benchmark name"""
+    wrapper = SqlmapWrapper()
+    validator = SqlmapValidator()
+    return {
+        'build_command': bench_build_command(wrapper, iterations),
+        'validate_options': bench_validate_options(wrapper, iterations),
+        'cached_validation': bench_cached_validation(wrapper, iterations),
+        'incremental_validation': bench_incremental_validation(wrapper, iterations),
+        'command_lexer': bench_command_lexer(validator, iterations),
+        'validate_command': bench_validate_command(validator, iterations),
+        'bulk_validation': bench_bulk_validation(iterations),
+    }
+
+
+def format_results(results: Dict[str, Dict[str, float]]) -> str:
+    """Format benchmark results as a plain text table"""
+    lines = [f"{'Benchmark':<24}{'Iterations':>12}{'us/call':>12}{'calls/s':>14}"]
+    lines.append('-' * len(lines[0]))
+    for name, result in results.items():
+        lines.append(
+            f"{name:<24}{result['iterations']:>12}"
+            f"{result['per_call_us']:>12.2f}{result['calls_per_s']:>14.0f}"
+        )
+    return "\n".join(lines)
+
+
+def check_floors(results: Dict[str, Dict[str, float]]) -> List[str]:
+    """Lines comparing command line throughput with the target and floors; failures start with FAIL"""
+    lines = []
+    for name, floor in FLOORS.items():
+        if name not in results:
+            continue
+        rate = results[name]['calls_per_s']
+        status = 'ok' if rate >= floor else 'FAIL'
+        lines.append(f"{status} {name}: {rate:.0f} lines/s, {rate / COMMAND_LINE_TARGET:.0%} of the "
+                     f"{COMMAND_LINE_TARGET} target (floor {floor:.0f})")
+    return lines
+
+
+def main() -> int:
+    """Run the core micro-benchmarks, print a summary table and check the floors"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLmap GUI core micro-benchmarks")
+    parser.add_argument('-n', '--iterations', type=int, default=10000,
+                        help="iterations per benchmark (default: 10000)")
+    parser.add_argument('--no-check', action='store_true', help="don't fail when a benchmark is below its floor")
+    args = parser.parse_args()
+
+    results = run_all(args.iterations)
+    print(format_results(results))
+    checks = check_floors(results)
+    if checks:
+        print()
+        print("\n".join(checks))
+    if not args.no_check and any(line.startswith('FAIL') for line in checks):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
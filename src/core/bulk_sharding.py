@@ -0,0 +1,424 @@
+"""
+Bulk Sharding - Run a sqlmap bulk file (-m) across parallel sqlmap workers
+Targets are streamed from the bulk file, grouped by host into shard files and
+handed to a pool of sqlmap processes; per-shard results are merged afterwards
+
+Run with: python -m src.core.bulk_sharding targets.txt [-j 4] [--profile P] [-- SQLMAP OPTIONS]
+"""
+
+import csv
+import glob
+import os
+import tempfile
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .proxy_log import target_signature
+from .rate_governor import RateGovernor, target_host
+from .sqlmap_wrapper import SqlmapProcess, SqlmapWrapper
+from .target_registry import TargetRegistry, coverage_fingerprint
+
+
+def iter_bulk_targets(path: str) -> Iterator[str]:
+    """Stream targets from a bulk file, skipping blank lines and # comments"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+class Shard:
+    """A batch of targets on one host, scanned by one sqlmap worker"""
+
+    PENDING, RUNNING, DONE, FAILED, STOPPED = 'pending', 'running', 'done', 'failed', 'stopped'
+
+    __slots__ = ('index', 'host', 'targets', 'path', 'output_dir', 'results_file',
+                 'process', 'status', 'return_code', 'start_time', 'end_time')
+
+    def __init__(self, index: int, host: str, targets: List[str]):
+        self.index = index
+        self.host = host
+        self.targets = targets
+        self.path: Optional[str] = None          # Generated bulk file
+        self.output_dir: Optional[str] = None
+        self.results_file: Optional[str] = None
+        self.process: Optional[SqlmapProcess] = None
+        self.status = self.PENDING
+        self.return_code: Optional[int] = None
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"Shard({self.index}, {self.host!r}, targets={len(self.targets)}, {self.status})"
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.start_time is None:
+            return None
+        return (self.end_time or time.time()) - self.start_time
+
+
+class ShardedBulkScan:
+    """Scan a bulk file with several sqlmap workers, keeping each host within budget
+
+    Shards are small and handed out one at a time as workers free up, so a
+    fast worker simply takes more shards; the next shard always comes from
+    the host with the most targets left that still has concurrency budget.
+    """
+
+    def __init__(self, wrapper: SqlmapWrapper, options: Dict[str, Any], workers: int = 4,
+                 per_host_limit: int = 1, shard_size: int = 200, work_dir: Optional[str] = None,
+                 process_factory: Callable[[List[str]], SqlmapProcess] = SqlmapProcess,
+                 output_callback: Optional[Callable[[Shard, str], None]] = None,
+                 governor: Optional[RateGovernor] = None, registry: Optional[TargetRegistry] = None,
+                 registry_policy: str = 'skip'):
+        if not options.get('bulk_file'):
+            raise ValueError("Sharded bulk scans need the bulk_file option")
+
+        self.wrapper = wrapper
+        self.options = dict(options)
+        self.workers = max(1, workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.shard_size = max(1, shard_size)
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix='sqlmap-gui-bulk-')
+        self.process_factory = process_factory
+        self.output_callback = output_callback
+        self.governor = governor  # Splits each host's request budget across its running shards
+        self.registry = registry  # Targets covered by earlier campaigns are skipped or deferred
+        self.registry_policy = registry_policy
+        self.coverage = coverage_fingerprint(self.options)
+        self.already_tested = 0
+
+        self.shards: List[Shard] = []
+        self.pending: Dict[str, Deque[Shard]] = {}  # Host -> shards not started yet
+        self.deferred: Dict[str, Deque[Shard]] = {}  # Same, for already tested targets (run last)
+        self.running: List[Shard] = []
+        self.host_running: Dict[str, int] = {}
+        self.output: Deque[Tuple[int, str]] = deque(maxlen=5000)  # (shard index, line)
+        self.merged_rows: Optional[int] = None
+        self.stopped = False
+
+    def prepare(self) -> int:
+        """Stream the bulk file into per-host shards; returns the number of targets"""
+        open_shards: Dict[str, Shard] = {}
+        open_deferred: Dict[str, Shard] = {}
+        total = 0
+        for target in iter_bulk_targets(self.options['bulk_file']):
+            host = target_host(target)
+            shards, queues = open_shards, self.pending
+            if self.registry is not None and self.registry.is_covered(target_signature(target), self.coverage):
+                self.already_tested += 1
+                if self.registry_policy == 'skip':
+                    continue
+                shards, queues = open_deferred, self.deferred
+
+            shard = shards.get(host)
+            if shard is None:
+                shard = shards[host] = self._new_shard(host, queues)
+            shard.targets.append(target)
+            total += 1
+            if len(shard.targets) >= self.shard_size:
+                del shards[host]
+        return total
+
+    def _new_shard(self, host: str, queues: Dict[str, Deque[Shard]]) -> Shard:
+        shard = Shard(len(self.shards), host, [])
+        self.shards.append(shard)
+        queues.setdefault(host, deque()).append(shard)
+        return shard
+
+    def _next_shard(self) -> Optional[Shard]:
+        """Pending shard of the busiest host that is below its concurrency budget"""
+        for queues in (self.pending, self.deferred):
+            best_host = None
+            best_left = 0
+            for host, queue in queues.items():
+                if not queue or self.host_running.get(host, 0) >= self.per_host_limit:
+                    continue
+                left = sum(len(shard.targets) for shard in queue)
+                if left > best_left:
+                    best_host, best_left = host, left
+            if best_host is not None:
+                return queues[best_host].popleft()
+        return None
+
+    def _shard_options(self, shard: Shard) -> Dict[str, Any]:
+        """Scan options for one shard: same as the campaign, own targets and outputs"""
+        shard_dir = os.path.join(self.work_dir, f"shard-{shard.index:05d}")
+        os.makedirs(shard_dir, exist_ok=True)
+        shard.path = os.path.join(shard_dir, 'targets.txt')
+        with open(shard.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(shard.targets))
+            f.write('\n')
+
+        shard.output_dir = os.path.join(shard_dir, 'output')
+        shard.results_file = os.path.join(shard_dir, 'results.csv')
+
+        options = dict(self.options)
+        options['bulk_file'] = shard.path
+        options['output_dir'] = shard.output_dir
+        options['results_file'] = shard.results_file
+        return options
+
+    def _job_id(self, shard: Shard) -> str:
+        return f"bulk-{id(self):x}-{shard.index}"
+
+    def _launch(self, shard: Shard) -> Optional[bool]:
+        """Start a shard's worker; None when the rate governor has no free slot for it yet"""
+        try:
+            options = self._shard_options(shard)
+            if self.governor:
+                options = self.governor.acquire(self._job_id(shard), shard.host, options)
+                if options is None:
+                    # Back to the front of its host's queue until a slot frees up
+                    self.pending.setdefault(shard.host, deque()).appendleft(shard)
+                    return None
+            command = self.wrapper.build_command(options, force_batch=True)
+            shard.process = self.process_factory(command)
+            started = shard.process.start()
+        except Exception as e:
+            print(f"Error starting shard {shard.index}: {e}")
+            started = False
+
+        shard.start_time = time.time()
+        if not started:
+            shard.status = Shard.FAILED
+            shard.end_time = shard.start_time
+            if self.governor:
+                self.governor.release(self._job_id(shard))
+            return False
+
+        shard.status = Shard.RUNNING
+        self.running.append(shard)
+        self.host_running[shard.host] = self.host_running.get(shard.host, 0) + 1
+        return True
+
+    def _collect_output(self, shard: Shard):
+        for line in shard.process.get_output():
+            self.output.append((shard.index, line))
+            if self.output_callback:
+                self.output_callback(shard, line)
+
+    def _reap(self):
+        """Collect output and retire finished workers"""
+        still_running = []
+        for shard in self.running:
+            self._collect_output(shard)
+            return_code = shard.process.poll()
+            if return_code is None:
+                still_running.append(shard)
+                continue
+            shard.process.wait_output()
+            self._collect_output(shard)
+            shard.return_code = return_code
+            shard.end_time = time.time()
+            shard.status = Shard.DONE if return_code == 0 else Shard.FAILED
+            self.host_running[shard.host] -= 1
+            if self.governor:
+                self.governor.release(self._job_id(shard))
+            if self.registry is not None and return_code == 0:
+                self._record_outcomes(shard)
+        self.running = still_running
+
+    def _record_outcomes(self, shard: Shard):
+        """Register the shard's targets as tested, marking those with findings"""
+        vulnerable = set()
+        for result_path in self._result_files(shard):
+            try:
+                with open(result_path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+                    reader = csv.reader(f)
+                    next(reader, None)  # Header row
+                    # sqlmap may spell the URL differently (e.g. with the default port)
+                    vulnerable.update(target_signature(row[0]) for row in reader if row)
+            except OSError as e:
+                print(f"Error reading results of shard {shard.index}: {e}")
+        self.registry.record_many(
+            (signature, self.coverage, 'vulnerable' if signature in vulnerable else 'not_vulnerable')
+            for signature in map(target_signature, shard.targets)
+        )
+
+    def step(self) -> bool:
+        """Retire finished workers and start new ones; returns False once all shards are done"""
+        self._reap()
+        if not self.stopped:
+            while len(self.running) < self.workers:
+                shard = self._next_shard()
+                if shard is None or self._launch(shard) is None:
+                    break
+        waiting = any(self.pending.values()) or any(self.deferred.values())
+        return bool(self.running) or (not self.stopped and waiting)
+
+    def run(self, poll_interval: float = 0.5) -> Dict[str, Any]:
+        """Run the whole campaign, blocking until every shard has finished"""
+        if not self.shards:
+            self.prepare()
+        while self.step():
+            time.sleep(poll_interval)
+        self.merge_results()
+        return self.summary()
+
+    def stop(self):
+        """Stop all running workers and discard pending shards"""
+        self.stopped = True
+        for shard in self.running:
+            shard.process.stop()
+        self._reap()
+        for queue in list(self.pending.values()) + list(self.deferred.values()):
+            for shard in queue:
+                shard.status = Shard.STOPPED
+            queue.clear()
+
+    def merge_results(self, path: Optional[str] = None) -> Optional[str]:
+        """Merge the per-shard results CSV files into one; returns its path"""
+        path = path or os.path.join(self.work_dir, 'results.csv')
+        header = None
+        rows = 0
+        with open(path, 'w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out)
+            for shard in self.shards:
+                for result_path in self._result_files(shard):
+                    try:
+                        with open(result_path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+                            reader = csv.reader(f)
+                            shard_header = next(reader, None)
+                            if shard_header is None:
+                                continue
+                            if header is None:
+                                header = shard_header
+                                writer.writerow(header)
+                            for row in reader:
+                                if row:
+                                    writer.writerow(row)
+                                    rows += 1
+                    except OSError as e:
+                        print(f"Error reading results of shard {shard.index}: {e}")
+        self.merged_rows = rows
+        return path
+
+    @staticmethod
+    def _result_files(shard: Shard) -> List[str]:
+        """Results CSVs of a shard (older sqlmap writes results-*.csv into the output dir)"""
+        files = []
+        if shard.results_file and os.path.exists(shard.results_file):
+            files.append(shard.results_file)
+        if shard.output_dir:
+            files.extend(sorted(glob.glob(os.path.join(shard.output_dir, 'results-*.csv'))))
+        return files
+
+    def summary(self) -> Dict[str, Any]:
+        """Campaign view: totals, per-host and per-shard status"""
+        counts = {status: 0 for status in (Shard.PENDING, Shard.RUNNING, Shard.DONE, Shard.FAILED, Shard.STOPPED)}
+        hosts: Dict[str, Dict[str, int]] = {}
+        for shard in self.shards:
+            counts[shard.status] += 1
+            host = hosts.setdefault(shard.host, {'targets': 0, 'shards': 0, 'done': 0})
+            host['targets'] += len(shard.targets)
+            host['shards'] += 1
+            if shard.status == Shard.DONE:
+                host['done'] += 1
+        return {
+            'targets': sum(len(shard.targets) for shard in self.shards),
+            'already_tested': self.already_tested,
+            'shards': len(self.shards),
+            'workers': self.workers,
+            'status': counts,
+            'hosts': hosts,
+            'results_rows': self.merged_rows,
+            'shard_details': [
+                {'index': shard.index, 'host': shard.host, 'targets': len(shard.targets),
+                 'status': shard.status, 'return_code': shard.return_code, 'duration': shard.duration}
+                for shard in self.shards
+            ],
+        }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run a sharded bulk scan from the command line
+
+    Scan options come from a GUI profile and/or sqlmap options after "--".
+    """
+    import argparse
+    import shlex
+    import sys
+
+    from . import parameter_schema
+    from .command_lexer import CommandLexer
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    sqlmap_args: List[str] = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, sqlmap_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="Scan a sqlmap bulk file with parallel workers",
+                                     epilog="sqlmap options for every shard go after --, "
+                                            "e.g. -- --level 3 --risk 2 --technique BEU")
+    parser.add_argument('bulk_file', help="file with one target URL per line")
+    parser.add_argument('--profile', default=None, help="GUI profile (file or saved name) with the scan options")
+    parser.add_argument('-j', '--workers', type=int, default=4, help="parallel sqlmap processes (default: 4)")
+    parser.add_argument('--per-host', type=int, default=1, help="concurrent workers per host (default: 1)")
+    parser.add_argument('--shard-size', type=int, default=200, help="targets per shard (default: 200)")
+    parser.add_argument('--work-dir', default=None, help="directory for shard files and results")
+    parser.add_argument('--sqlmap', default='sqlmap', help="sqlmap command or path to sqlmap.py (default: sqlmap)")
+    parser.add_argument('--host-rps', type=float, default=None, help="requests per second per host")
+    parser.add_argument('--global-rps', type=float, default=None, help="requests per second across all hosts")
+    parser.add_argument('--tested', choices=('scan', 'skip', 'defer'), default='scan',
+                        help="what to do with targets the registry says were already tested (default: scan)")
+    args = parser.parse_args(argv)
+
+    options: Dict[str, Any] = {}
+    if args.profile:
+        from ..cli import load_profile_options
+        try:
+            options = load_profile_options(args.profile)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot load profile: {e}")
+    lexed = CommandLexer(parameter_schema.BOOLEAN_FLAGS, parameter_schema.VALUE_FLAGS).lex(shlex.join(sqlmap_args))
+    extra, unknown = parameter_schema.options_from_flags(lexed.flags)
+    problems = [message for level, message, _, _ in lexed.issues if level == 'error']
+    problems += [f"unknown sqlmap option {flag}" for flag in unknown]
+    if problems:
+        parser.error('; '.join(problems))
+    options.update(extra)
+    for name in parameter_schema.TARGET_PARAMS:
+        options.pop(name, None)  # The bulk file is the only target
+    options.update(bulk_file=args.bulk_file, batch=True)
+
+    sqlmap = args.sqlmap
+    wrapper = SqlmapWrapper([sys.executable, sqlmap] if sqlmap.endswith('.py') else sqlmap)
+    validation = wrapper.validate_options(options)
+    if not validation.is_valid:
+        parser.error('; '.join(f"{issue.parameter}: {issue.message}" for issue in validation.errors))
+
+    registry = TargetRegistry() if args.tested != 'scan' else None
+
+    governor = None
+    if args.host_rps or args.global_rps:
+        governor = RateGovernor(host_rps=args.host_rps, global_rps=args.global_rps)
+
+    scan = ShardedBulkScan(wrapper, options,
+                           workers=args.workers, per_host_limit=args.per_host,
+                           shard_size=args.shard_size, work_dir=args.work_dir,
+                           output_callback=lambda shard, line: print(f"[shard {shard.index}] {line}"),
+                           governor=governor, registry=registry, registry_policy=args.tested)
+    total = scan.prepare()
+    print(f"{total} targets in {len(scan.shards)} shards ({scan.already_tested} already tested)")
+
+    try:
+        summary = scan.run()
+    except KeyboardInterrupt:
+        scan.stop()
+        scan.merge_results()
+        summary = scan.summary()
+    finally:
+        if registry is not None:
+            registry.close()
+
+    print(f"Shards: {summary['status']}")
+    print(f"Merged results: {os.path.join(scan.work_dir, 'results.csv')} ({summary['results_rows']} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Bulk Validation - Validate large numbers of option sets across a process pool
+Headless entry point for checking generated option sets before they are queued
+
+Run with: python -m src.core.bulk_validation options.jsonl [-o results.jsonl]
+"""
+
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .sqlmap_wrapper import SqlmapWrapper
+
+
+class IssueRecord:
+    """Compact, picklable form of a ValidationIssue"""
+
+    __slots__ = ('level', 'parameter', 'message', 'flag')
+
+    def __init__(self, level: str, parameter: str, message: str, flag: Optional[str] = None):
+        self.level = level
+        self.parameter = parameter
+        self.message = message
+        self.flag = flag
+
+    def __repr__(self) -> str:
+        return f"IssueRecord({self.level!r}, {self.parameter!r}, {self.message!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        info = {'level': self.level, 'parameter': self.parameter, 'message': self.message}
+        if self.flag:
+            info['flag'] = self.flag
+        return info
+
+
+class ValidationRecord:
+    """Validation outcome of one option set in a bulk run"""
+
+    __slots__ = ('index', 'is_valid', 'issues', 'command')
+
+    def __init__(self, index: int, is_valid: bool, issues: Tuple[IssueRecord, ...],
+                 command: Optional[Tuple[str, ...]] = None):
+        self.index = index          # Position of the option set in the input
+        self.is_valid = is_valid
+        self.issues = issues        # Errors and warnings (infos are left out)
+        self.command = command      # Only filled in when requested
+
+    def __repr__(self) -> str:
+        return f"ValidationRecord({self.index}, valid={self.is_valid}, issues={len(self.issues)})"
+
+    @property
+    def errors(self) -> List[IssueRecord]:
+        return [issue for issue in self.issues if issue.level == 'error']
+
+    @property
+    def warnings(self) -> List[IssueRecord]:
+        return [issue for issue in self.issues if issue.level == 'warning']
+
+    def to_dict(self) -> Dict[str, Any]:
+        info = {
+            'index': self.index,
+            'valid': self.is_valid,
+            'issues': [issue.to_dict() for issue in self.issues],
+        }
+        if self.command is not None:
+            info['command'] = list(self.command)
+        return info
+
+
+# Per-process wrapper, created once by the pool initializer
+_worker_wrapper: Optional[SqlmapWrapper] = None
+
+
+def _init_worker(sqlmap_path: Union[str, List[str]]):
+    global _worker_wrapper
+    _worker_wrapper = SqlmapWrapper(sqlmap_path)
+
+
+def _validate_one(wrapper: SqlmapWrapper, index: int, options: Union[Dict[str, Any], str],
+                  include_command: bool) -> ValidationRecord:
+    """Validate one option set; a string instead of a dict is an input error"""
+    if not isinstance(options, dict):
+        return ValidationRecord(index, False, (IssueRecord('error', 'input', str(options)),))
+
+    engine = wrapper.create_validation_engine(options)
+    issues = tuple(
+        IssueRecord(issue.level.value, issue.parameter, issue.message, issue.flag)
+        for issue in engine.errors + engine.warnings
+    )
+    is_valid = engine.is_valid
+
+    command = None
+    if include_command and is_valid:
+        command = tuple(wrapper.build_command(options))
+    return ValidationRecord(index, is_valid, issues, command)
+
+
+def _validate_chunk(chunk: List[Tuple[int, Any]], include_command: bool) -> List[ValidationRecord]:
+    """Pool task: validate a chunk of (index, options) pairs"""
+    wrapper = _worker_wrapper
+    return [_validate_one(wrapper, index, options, include_command) for index, options in chunk]
+
+
+def _chunked(option_sets: Iterable[Any], chunk_size: int) -> Iterator[List[Tuple[int, Any]]]:
+    chunk = []
+    for index, options in enumerate(option_sets):
+        chunk.append((index, options))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_bulk(option_sets: Iterable[Any], workers: Optional[int] = None, chunk_size: int = 256,
+                  ordered: bool = True, include_command: bool = False,
+                  sqlmap_path: Union[str, List[str]] = 'sqlmap') -> Iterator[ValidationRecord]:
+    """Validate option sets across a process pool, streaming results back
+
+    The input is consumed lazily: at most a few chunks per worker are in
+    flight, so arbitrarily long streams can be validated in bounded memory.
+    With ordered=False results are yielded as soon as their chunk finishes.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = _chunked(option_sets, max(1, chunk_size))
+
+    # A pool only pays off with several cores
+    if workers <= 1:
+        _init_worker(sqlmap_path)
+        for chunk in chunks:
+            yield from _validate_chunk(chunk, include_command)
+        return
+
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(sqlmap_path,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_validate_chunk, chunk, include_command))
+            if len(pending) >= max_in_flight:
+                yield from _drain(pending, ordered)
+        while pending:
+            yield from _drain(pending, ordered)
+
+
+def _drain(pending: deque, ordered: bool) -> Iterator[ValidationRecord]:
+    """Yield the results of one finished chunk"""
+    if ordered:
+        yield from pending.popleft().result()
+        return
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    future = next(iter(done))
+    pending.remove(future)
+    yield from future.result()
+
+
+def read_jsonl(stream: IO[str]) -> Iterator[Union[Dict[str, Any], str]]:
+    """Yield option dicts from a JSONL stream; malformed lines yield an error message"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            options = json.loads(line)
+        except ValueError as e:
+            yield f"Invalid JSON on line {line_number}: {e}"
+            continue
+        if not isinstance(options, dict):
+            yield f"Line {line_number} is not a JSON object"
+            continue
+        yield options
+
+
+def validate_jsonl(in_stream: IO[str], out_stream: IO[str], **kwargs) -> Dict[str, int]:
+    """Validate a JSONL stream of option sets and write JSONL results
+
+    Returns counts of total, valid and invalid option sets.
+    """
+    counts = {'total': 0, 'valid': 0, 'invalid': 0}
+    for record in validate_bulk(read_jsonl(in_stream), **kwargs):
+        out_stream.write(json.dumps(record.to_dict(), separators=(',', ':')))
+        out_stream.write('\n')
+        counts['total'] += 1
+        counts['valid' if record.is_valid else 'invalid'] += 1
+    return counts
+
+
+def main():
+    """Validate option sets from a JSONL file (or stdin) and write JSONL results"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate SQLmap option sets in bulk")
+    parser.add_argument('input', nargs='?', default='-', help="JSONL file of option sets (default: stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL results file (default: stdout)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="option sets per task (default: 256)")
+    parser.add_argument('--unordered', action='store_true', help="emit results as soon as they are ready")
+    parser.add_argument('--with-command', action='store_true', help="include the built command for valid sets")
+    args = parser.parse_args()
+
+    in_stream = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    out_stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        counts = validate_jsonl(in_stream, out_stream, workers=args.workers, chunk_size=args.chunk_size,
+                                ordered=not args.unordered, include_command=args.with_command)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+
+    print(f"Validated {counts['total']} option sets: {counts['valid']} valid, "
+          f"{counts['invalid']} invalid", file=sys.stderr)
+    sys.exit(0 if counts['invalid'] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
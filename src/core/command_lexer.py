@@ -0,0 +1,228 @@
+"""
+Command Lexer - Single-pass tokenizer for sqlmap command lines
+Splits with POSIX shell quoting rules and resolves flags (including unambiguous
+long-flag prefixes, as optparse does) through a trie
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# A token is a run of unquoted text, quoted strings and escapes; anything else
+# that is not whitespace is an unterminated quote or a dangling backslash.
+_TOKEN = re.compile(r'''(?P<tok>(?:[^\s'"\\]+|'[^']*'|"(?:[^"\\]|\\.)*"|\\.)+)|(?P<bad>\S)''', re.S)
+_TOKEN_PART = re.compile(r'''([^'"\\]+)|'([^']*)'|"((?:[^"\\]|\\.)*)"|\\(.)''', re.S)
+_DQ_ESCAPE = re.compile(r'\\(["\\])')
+_QUOTING = re.compile(r'[\'"\\]')
+
+# "sqlmap", "sqlmap.py", "/opt/sqlmap/sqlmap.py", "python3", "/usr/bin/python" ...
+_PROGRAM = re.compile(r'(?:.*[/\\])?sqlmap[^/\\]*$')
+_PYTHON = re.compile(r'(?:.*[/\\])?python[^/\\]*$')
+
+
+def _unquote(token: str) -> str:
+    """Remove shell quoting from a token"""
+    parts = []
+    for plain, single, double, escaped in _TOKEN_PART.findall(token):
+        if plain:
+            parts.append(plain)
+        elif single:
+            parts.append(single)
+        elif double:
+            parts.append(_DQ_ESCAPE.sub(r'\1', double))
+        else:
+            parts.append(escaped)
+    return ''.join(parts)
+
+
+def split_command(command: str) -> List[str]:
+    """Split a command line like shlex.split, raising ValueError on bad quoting"""
+    if _QUOTING.search(command) is None:
+        # Nothing quoted or escaped: plain whitespace splitting is exact
+        return command.split()
+
+    tokens = []
+    for match in _TOKEN.finditer(command):
+        token = match.group('tok')
+        if token is None:
+            bad = match.group('bad')
+            raise ValueError("No escaped character" if bad == '\\' else "No closing quotation")
+        if "'" in token or '"' in token or '\\' in token:
+            token = _unquote(token)
+        tokens.append(token)
+    return tokens
+
+
+class FlagTrie:
+    """Prefix tree over long flags for exact and unambiguous-prefix lookups"""
+
+    # Upper bound on memoized lookups so pasted garbage cannot grow the cache forever
+    CACHE_LIMIT = 4096
+
+    # Node layout: [children, flag ending here, single flag below this node or None]
+    _CHILDREN, _TERMINAL, _UNIQUE = 0, 1, 2
+
+    def __init__(self, flags: Iterable[str]):
+        self.flags = frozenset(flags)
+        self.root: list = [{}, None, None]
+        self._cache: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {}
+
+        for flag in sorted(self.flags):
+            node = self.root
+            for char in flag:
+                node = node[self._CHILDREN].setdefault(char, [{}, None, None])
+            node[self._TERMINAL] = flag
+        self._mark_unique(self.root)
+
+    def _mark_unique(self, node: list) -> int:
+        """Record on every node the flag below it when there is exactly one
+
+        Returns the number of flags at or below the node.
+        """
+        total = 1 if node[self._TERMINAL] else 0
+        only = node[self._TERMINAL]
+        for child in node[self._CHILDREN].values():
+            below = self._mark_unique(child)
+            if below == 1:
+                only = child[self._UNIQUE]
+            total += below
+        node[self._UNIQUE] = only if total == 1 else None
+        return total
+
+    def resolve(self, flag: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """Resolve a flag or flag prefix
+
+        Returns (flag, ()) on an exact or unambiguous match, (None, candidates)
+        for an ambiguous prefix and (None, ()) for an unknown flag.
+        """
+        cached = self._cache.get(flag)
+        if cached is not None:
+            return cached
+
+        if flag in self.flags:
+            result = (flag, ())
+        else:
+            node = self.root
+            for char in flag:
+                node = node[self._CHILDREN].get(char)
+                if node is None:
+                    break
+            if node is None:
+                result = (None, ())
+            elif node[self._UNIQUE]:
+                result = (node[self._UNIQUE], ())
+            else:
+                result = (None, tuple(sorted(self._collect(node))))
+        if len(self._cache) < self.CACHE_LIMIT:
+            self._cache[flag] = result
+        return result
+
+    def _collect(self, node: list) -> List[str]:
+        found = [node[self._TERMINAL]] if node[self._TERMINAL] else []
+        for child in node[self._CHILDREN].values():
+            found.extend(self._collect(child))
+        return found
+
+
+class LexedCommand:
+    """Result of lexing one command line"""
+
+    __slots__ = ('parsed', 'program', 'recognized', 'flags', 'issues')
+
+    def __init__(self):
+        self.parsed = False              # False if the quoting could not be parsed
+        self.program: List[str] = []     # Leading interpreter/sqlmap tokens
+        self.recognized = False          # Whether the line starts with sqlmap
+        self.flags: Dict[str, Any] = {}  # Resolved flag -> value (True for switches)
+        self.issues: List[Tuple[str, str, Optional[str], Optional[str]]] = []  # (level, message, flag, suggestion)
+
+
+class CommandLexer:
+    """Turns a sqlmap command line into resolved flags and values in one pass"""
+
+    def __init__(self, boolean_flags: Iterable[str], value_flags: Iterable[str]):
+        self.boolean_flags = frozenset(boolean_flags)
+        self.value_flags = frozenset(value_flags)
+        known = self.boolean_flags | self.value_flags
+        self.known_flags = known
+        self.long_trie = FlagTrie(flag for flag in known if flag.startswith('--'))
+
+    def lex(self, command: str) -> LexedCommand:
+        """Lex a command line into a LexedCommand"""
+        lexed = LexedCommand()
+        issues = lexed.issues
+
+        try:
+            tokens = split_command(command)
+        except ValueError as e:
+            issues.append(('error', f"Failed to parse command: {e}", None,
+                           "Check for unmatched quotes or invalid shell syntax"))
+            return lexed
+        lexed.parsed = True
+
+        # Strip "sqlmap" or "python sqlmap[.py]" from the front
+        start = 0
+        if tokens and _PROGRAM.match(tokens[0]):
+            start = 1
+        elif len(tokens) > 1 and _PYTHON.match(tokens[0]) and _PROGRAM.match(tokens[1]):
+            start = 2
+        lexed.program = tokens[:start]
+        lexed.recognized = start > 0
+
+        flags = lexed.flags
+        boolean_flags = self.boolean_flags
+        value_flags = self.value_flags
+        known_flags = self.known_flags
+        resolve = self.long_trie.resolve
+        count = len(tokens)
+        i = start
+
+        while i < count:
+            token = tokens[i]
+            i += 1
+
+            if token[:1] != '-' or token == '-':
+                issues.append(('warning', f"Unexpected token '{token}' - not a flag or value", None,
+                               "Check command syntax"))
+                continue
+
+            if token[1:2] == '-':
+                flag, sep, value = token.partition('=')
+                if flag not in known_flags:
+                    resolved, candidates = resolve(flag)
+                    if resolved:
+                        flag = resolved
+                    elif candidates:
+                        issues.append(('error', f"Ambiguous flag '{flag}' could be: {', '.join(candidates)}",
+                                       flag, "Type more of the flag name"))
+                        continue
+                if sep:
+                    flags[flag] = value
+                    continue
+            elif token in known_flags:
+                flag = token
+            elif '=' in token:
+                flag, _, value = token.partition('=')
+                flags[flag] = value
+                continue
+            elif len(token) > 2:
+                # Combined short flag like -uhttp://example.com
+                flags[token[:2]] = token[2:]
+                continue
+            else:
+                flag = token
+
+            if flag in boolean_flags:
+                flags[flag] = True
+            elif flag in value_flags:
+                if i < count and tokens[i][:1] != '-':
+                    flags[flag] = tokens[i]
+                    i += 1
+                else:
+                    issues.append(('error', f"Flag '{flag}' requires a value but none provided", flag, None))
+                    flags[flag] = None
+            else:
+                # Unknown flag - reported by the validator's flag checks
+                flags[flag] = True
+
+        return lexed
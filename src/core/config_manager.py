@@ -5,9 +5,14 @@ Handles configuration, profiles, and validation
 
 import json
 import os
+from datetime import datetime
 from typing import Dict, Any, List
 from pathlib import Path
 
+from . import parameter_schema
+from .atomic_io import atomic_write_json
+from .profile_store import get_default_store
+
 
 class ConfigManager:
     """Configuration manager for SQLmap GUI"""
@@ -20,42 +25,36 @@ class ConfigManager:
         # Create config directory if it doesn't exist
         self.config_dir.mkdir(exist_ok=True)
         
-        # Load existing profiles
-        self.profiles = self.load_profiles()
+        # Profiles live in a SQLite store; profiles.json is imported into it once
+        self.profile_store = get_default_store()
+    
+    @property
+    def profiles(self) -> Dict[str, Any]:
+        """All profiles as {name: {'name', 'options', 'created_at'}} (reads the whole store)"""
+        return self.load_profiles()
     
     def save_profile(self, name: str, options: Dict[str, Any]) -> bool:
         """Save a profile with given options"""
         try:
-            if name not in self.profiles:
-                self.profiles[name] = {}
-            
-            self.profiles[name] = {
-                'name': name,
-                'options': options,
-                'created_at': self._get_timestamp()
-            }
-            
-            # Save to file
-            with open(self.profiles_file, 'w') as f:
-                json.dump(self.profiles, f, indent=2)
-            
-            return True
-            
+            return self.profile_store.save(name, options)
         except Exception as e:
             print(f"Error saving profile: {e}")
             return False
     
     def load_profile(self, name: str) -> Dict[str, Any]:
         """Load a profile by name"""
-        return self.profiles.get(name, {}).get('options', {})
+        try:
+            return self.profile_store.load(name) or {}
+        except Exception as e:
+            print(f"Error loading profile: {e}")
+            return {}
     
     def load_profiles(self) -> Dict[str, Any]:
-        """Load all profiles from file"""
+        """Load all profiles from the store"""
         try:
-            if self.profiles_file.exists():
-                with open(self.profiles_file, 'r') as f:
-                    return json.load(f)
-            return {}
+            return {entry['name']: {'name': entry['name'], 'options': entry['options'],
+                                    'created_at': datetime.fromtimestamp(entry['created_at']).isoformat()}
+                    for entry in self.profile_store.entries()}
         except Exception as e:
             print(f"Error loading profiles: {e}")
             return {}
@@ -67,12 +66,7 @@ class ConfigManager:
     def delete_profile(self, name: str) -> bool:
         """Delete a profile"""
         try:
-            if name in self.profiles:
-                del self.profiles[name]
-                with open(self.profiles_file, 'w') as f:
-                    json.dump(self.profiles, f, indent=2)
-                return True
-            return False
+            return self.profile_store.delete(name)
         except Exception as e:
             print(f"Error deleting profile: {e}")
             return False
@@ -86,8 +80,7 @@ class ConfigManager:
         }
         
         # Check for required options
-        target_options = ['url', 'direct', 'log_file', 'bulk_file', 'request_file', 'google_dork', 'config_file']
-        has_target = any(options.get(opt) for opt in target_options)
+        has_target = any(options.get(opt) for opt in parameter_schema.TARGET_PARAMS)
         
         if not has_target:
             validation_result['errors'].append("At least one target option must be specified (URL, direct connection, etc.)")
@@ -155,8 +148,7 @@ class ConfigManager:
         # Validate technique string
         if options.get('technique'):
             technique = str(options['technique']).upper()
-            valid_techniques = set('BEUSTQ')
-            invalid_chars = set(technique) - valid_techniques
+            invalid_chars = set(technique) - parameter_schema.VALID_TECHNIQUES
             if invalid_chars:
                 validation_result['errors'].append(f"Invalid technique characters: {', '.join(invalid_chars)}. Valid: B,E,U,S,T,Q")
                 validation_result['valid'] = False
@@ -185,8 +177,7 @@ class ConfigManager:
     def save_config(self, config: Dict[str, Any]) -> bool:
         """Save general configuration"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            atomic_write_json(self.config_file, config, indent=2)
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
@@ -0,0 +1,196 @@
+"""
+Dump Index - Row offset index over memory-mapped sqlmap CSV dumps
+Finds where every record ends without parsing it, so a viewer can parse just
+the rows it shows; sorting and filtering work from the same index
+"""
+
+import csv
+import io
+import mmap
+import os
+import re
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+# Bytes scanned per indexing step; progress is reported between steps
+INDEX_CHUNK = 4 * 1024 * 1024
+
+# Rows between cancellation checks in sort and filter passes
+CHECK_EVERY = 65536
+
+_NEWLINE = re.compile(b'\n')
+_NUMBER = re.compile(r'^-?\d+(\.\d+)?$')
+
+
+class DumpFile:
+    """A CSV dump mapped into memory with a lazily built index of record ends
+
+    `ends[i]` is the offset just past record i (the header is not a record).
+    Records may contain quoted newlines, so newline positions are only taken
+    as record ends outside double quotes.
+    """
+
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.size = os.path.getsize(path)
+        self._file = open(path, 'rb')
+        self.map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self.ends = array('Q')
+        self.indexed = 0  # Bytes scanned so far
+        self.complete = False
+        self.header: List[str] = []
+        self.data_start = 0
+        self._in_quotes = False
+        self._read_header()
+
+    def close(self):
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'DumpFile':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_header(self):
+        end = self._record_end(0)
+        self.header = self._parse(0, end) if end else []
+        self.data_start = self.indexed = end
+        self.complete = end >= self.size
+
+    def _record_end(self, start: int) -> int:
+        """Offset past the record starting at `start` (slow path, header only)"""
+        in_quotes = False
+        position = start
+        while position < self.size:
+            newline = self.map.find(b'\n', position)
+            if newline < 0:
+                return self.size
+            in_quotes ^= self.map[position:newline].count(b'"') % 2 == 1
+            position = newline + 1
+            if not in_quotes:
+                return position
+        return self.size
+
+    # Indexing
+
+    def index_step(self, chunk_size: int = INDEX_CHUNK) -> bool:
+        """Index the next chunk of the file; False once the whole file is indexed"""
+        if self.complete:
+            return False
+        start = self.indexed
+        stop = min(start + chunk_size, self.size)
+        chunk = self.map[start:stop]
+        ends = self.ends
+        if not self._in_quotes and b'"' not in chunk:
+            # Fast path: every newline ends a record
+            ends.extend(start + match.end() for match in _NEWLINE.finditer(chunk))
+        else:
+            in_quotes = self._in_quotes
+            position = 0
+            while True:
+                newline = chunk.find(b'\n', position)
+                if newline < 0:
+                    in_quotes ^= chunk.count(b'"', position) % 2 == 1
+                    break
+                in_quotes ^= chunk.count(b'"', position, newline) % 2 == 1
+                position = newline + 1
+                if not in_quotes:
+                    ends.append(start + position)
+            self._in_quotes = in_quotes
+        self.indexed = stop
+        if stop >= self.size:
+            if self.size > (ends[-1] if ends else self.data_start):
+                ends.append(self.size)  # Last record without a trailing newline
+            self.complete = True
+            return False
+        return True
+
+    def build_index(self, progress: Optional[Callable[[int, int], None]] = None,
+                    cancelled: Optional[Callable[[], bool]] = None) -> bool:
+        """Index the whole file; True unless cancelled"""
+        while self.index_step():
+            if progress:
+                progress(self.indexed, len(self.ends))
+            if cancelled and cancelled():
+                return False
+        if progress:
+            progress(self.indexed, len(self.ends))
+        return True
+
+    @property
+    def row_count(self) -> int:
+        """Records indexed so far"""
+        return len(self.ends)
+
+    # Access
+
+    def _parse(self, start: int, end: int) -> List[str]:
+        text = self.map[start:end].decode(self.encoding, errors='replace')
+        try:
+            return next(csv.reader(io.StringIO(text, newline='')), [])
+        except csv.Error:
+            return [text.rstrip('\r\n')]
+
+    def row(self, index: int) -> List[str]:
+        """Parse record `index` straight from the mapping"""
+        start = self.ends[index - 1] if index else self.data_start
+        return self._parse(start, self.ends[index])
+
+    def rows(self, indexes: Sequence[int]) -> List[List[str]]:
+        return [self.row(index) for index in indexes]
+
+    def value(self, index: int, column: int) -> str:
+        row = self.row(index)
+        return row[column] if column < len(row) else ''
+
+    # Sorting and filtering
+
+    def filter_rows(self, text: str, column: int = -1, rows: Optional[Sequence[int]] = None,
+                    cancelled: Optional[Callable[[], bool]] = None) -> Optional[array]:
+        """Indexes of records containing `text` (case-insensitive) in a column, or any column if -1"""
+        needle = text.lower()
+        # Bytes only lower-case reliably for ASCII; other needles skip the pre-check
+        encoded = needle.encode('ascii') if needle.isascii() else None
+        result = array('Q')
+        candidates = range(self.row_count) if rows is None else rows
+        for count, index in enumerate(candidates):
+            if count % CHECK_EVERY == 0 and cancelled and cancelled():
+                return None
+            start = self.ends[index - 1] if index else self.data_start
+            raw = self.map[start:self.ends[index]]
+            if encoded is not None and encoded not in raw.lower():
+                continue  # Cheap byte test rules out most rows without parsing
+            if column < 0 and encoded is not None:
+                result.append(index)
+            else:
+                values = self._parse(start, self.ends[index])
+                searched = values if column < 0 else values[column:column + 1]
+                if any(needle in value.lower() for value in searched):
+                    result.append(index)
+        return result
+
+    def sort_rows(self, column: int, descending: bool = False, rows: Optional[Sequence[int]] = None,
+                  cancelled: Optional[Callable[[], bool]] = None) -> Optional[array]:
+        """Record indexes ordered by one column; numbers sort numerically, before text"""
+        candidates = range(self.row_count) if rows is None else rows
+        keys = []
+        for count, index in enumerate(candidates):
+            if count % CHECK_EVERY == 0 and cancelled and cancelled():
+                return None
+            value = self.value(index, column)
+            if _NUMBER.match(value):
+                keys.append((0, float(value), '', index))
+            else:
+                keys.append((1, 0.0, value.lower(), index))
+        if cancelled and cancelled():
+            return None
+        keys.sort(reverse=descending)
+        return array('Q', (key[3] for key in keys))
+
+    def stats(self) -> Dict[str, int]:
+        return {'bytes': self.size, 'indexed': self.indexed, 'rows': self.row_count, 'columns': len(self.header)}
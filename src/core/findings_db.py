@@ -0,0 +1,236 @@
+"""
+Findings Database - Every injectable parameter across all scans
+Merges injection points reported by any scan into one table keyed on
+(host, path, parameter, place, technique), with indexes that answer
+"grouped by DBMS and technique" queries without touching the table
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def default_findings_path() -> Path:
+    return Path.home() / '.sqlmap-gui' / 'findings.db'
+
+
+# Columns findings can be grouped by, in index order
+GROUP_COLUMNS = ('dbms', 'technique', 'host', 'place')
+
+FINDING_COLUMNS = ('host', 'path', 'parameter', 'place', 'technique', 'dbms', 'title', 'payload', 'source',
+                   'first_seen', 'last_seen', 'reports')
+
+
+# sqlmap's DBMS names, longest first so e.g. "Microsoft SQL Server" wins over shorter matches
+KNOWN_DBMS = sorted((
+    'MySQL', 'Oracle', 'PostgreSQL', 'Microsoft SQL Server', 'Microsoft Access', 'SQLite', 'Firebird',
+    'SAP MaxDB', 'Sybase', 'IBM DB2', 'HSQLDB', 'H2', 'Informix', 'MonetDB', 'Apache Derby', 'Vertica',
+    'Mckoi', 'Presto', 'Altibase', 'MimerSQL', 'CrateDB', 'Cubrid', 'InterSystems Cache', 'eXtremeDB',
+    'FrontBase', 'Raima Database Manager', 'Virtuoso', 'ClickHouse', 'Snowflake',
+), key=len, reverse=True)
+
+# Where a fingerprint's version/fork details start ("MySQL >= 5.6", "Oracle 12c", "MySQL (MariaDB fork)")
+_DBMS_DETAIL = re.compile(r'\s*(?:[<>=!]|\(|\d).*$')
+
+
+def normalize_dbms(dbms: Optional[str]) -> str:
+    """Base DBMS name of a fingerprint or a bare DBMS value, so both sources group together"""
+    dbms = (dbms or '').strip()
+    lowered = dbms.lower()
+    for name in KNOWN_DBMS:
+        if lowered.startswith(name.lower()):
+            return name
+    return _DBMS_DETAIL.sub('', dbms)
+
+
+def normalize_path(path: Optional[str]) -> str:
+    """URL path in one form ("/z", never "/z/" or "z"), matching how sqlmap keys its session"""
+    path = (path or '').strip().strip('/')
+    return f"/{path}"
+
+
+class FindingsDB:
+    """Deduplicated injection points from every scan"""
+
+    # WITHOUT ROWID tables store rows in primary key order and every secondary
+    # index carries the full key, so (dbms, technique) and (technique, dbms)
+    # cover grouped counts and key listings on their own
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS findings (
+            host TEXT NOT NULL,
+            path TEXT NOT NULL,
+            parameter TEXT NOT NULL,
+            place TEXT NOT NULL,
+            technique TEXT NOT NULL,
+            dbms TEXT NOT NULL DEFAULT '',
+            title TEXT,
+            payload TEXT,
+            source TEXT,
+            first_seen REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            reports INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (host, path, parameter, place, technique)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS findings_by_dbms ON findings (dbms, technique);
+        CREATE INDEX IF NOT EXISTS findings_by_technique ON findings (technique, dbms);
+        CREATE INDEX IF NOT EXISTS findings_by_last_seen ON findings (last_seen);
+        CREATE TABLE IF NOT EXISTS host_dbms (
+            host TEXT PRIMARY KEY,
+            dbms TEXT NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    UPSERT = """
+        INSERT INTO findings (host, path, parameter, place, technique, dbms, title, payload, source,
+                              first_seen, last_seen)
+        VALUES (?, ?, ?, ?, ?, COALESCE(NULLIF(?, ''), (SELECT dbms FROM host_dbms WHERE host = ?), ''),
+                ?, ?, ?, ?, ?)
+        ON CONFLICT (host, path, parameter, place, technique) DO UPDATE SET
+            dbms = CASE WHEN excluded.dbms != '' THEN excluded.dbms ELSE findings.dbms END,
+            title = COALESCE(excluded.title, findings.title),
+            payload = COALESCE(excluded.payload, findings.payload),
+            source = COALESCE(excluded.source, findings.source),
+            last_seen = excluded.last_seen,
+            reports = findings.reports + 1
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else default_findings_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._normalize_existing()
+        self.version = 0  # Bumped on every change, so views know when to refresh
+
+    def _normalize_existing(self):
+        """Bring rows stored before DBMS and path normalization into the normalized form (once)"""
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+            return
+        self.conn.create_function('normalize_dbms', 1, normalize_dbms)
+        self.conn.create_function('normalize_path', 1, normalize_path)
+        with self.conn:
+            self.conn.execute("UPDATE findings SET dbms = normalize_dbms(dbms) WHERE dbms != normalize_dbms(dbms)")
+            self.conn.execute("UPDATE host_dbms SET dbms = normalize_dbms(dbms)")
+            # Rows whose normalized path already exists are duplicates of it
+            self.conn.execute("UPDATE OR IGNORE findings SET path = normalize_path(path) "
+                              "WHERE path != normalize_path(path)")
+            self.conn.execute("DELETE FROM findings WHERE path != normalize_path(path)")
+            self.conn.execute("PRAGMA user_version = 1")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> 'FindingsDB':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Updates
+
+    def record(self, host: str, path: str, parameter: str, place: str, technique: str, dbms: str = '',
+               title: Optional[str] = None, payload: Optional[str] = None, source: Optional[str] = None):
+        self.record_many([(host, path, parameter, place, technique, dbms, title, payload, source)])
+
+    def record_many(self, findings: Iterable[Sequence[Any]], seen_at: Optional[float] = None) -> int:
+        """Merge (host, path, parameter, place, technique, dbms, title, payload, source) tuples in one transaction"""
+        seen_at = seen_at or time.time()
+        rows = []
+        for host, path, parameter, place, technique, dbms, title, payload, source in findings:
+            rows.append((host, normalize_path(path), parameter, place, technique, normalize_dbms(dbms), host,
+                         title, payload, source, seen_at, seen_at))
+        if not rows:
+            return 0
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(self.UPSERT, rows)
+            self.version += 1
+        return len(rows)
+
+    def set_dbms(self, host: str, dbms: str):
+        """Fingerprint of a host; fills in its findings that were reported before it was known"""
+        dbms = normalize_dbms(dbms)
+        if not dbms:
+            return
+        with self._lock:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO host_dbms (host, dbms) VALUES (?, ?)", (host, dbms))
+                cursor = self.conn.execute("UPDATE findings SET dbms = ? WHERE host = ? AND dbms = ''", (dbms, host))
+            if cursor.rowcount:
+                self.version += 1
+
+    def remove_host(self, host: str) -> int:
+        with self._lock:
+            with self.conn:
+                cursor = self.conn.execute("DELETE FROM findings WHERE host = ?", (host,))
+                self.conn.execute("DELETE FROM host_dbms WHERE host = ?", (host,))
+            self.version += 1
+        return cursor.rowcount
+
+    # Queries
+
+    @staticmethod
+    def _where(filters: Dict[str, Optional[str]]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for column in ('dbms', 'technique', 'host', 'place', 'parameter'):
+            value = filters.get(column)
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def groups(self, by: Sequence[str] = ('dbms', 'technique'), **filters) -> List[Dict[str, Any]]:
+        """Finding and host counts per group, e.g. per (dbms, technique)"""
+        columns = [column for column in by if column in GROUP_COLUMNS]
+        if not columns:
+            raise ValueError(f"Group by one of {', '.join(GROUP_COLUMNS)}")
+        names = ', '.join(columns)
+        where, params = self._where(filters)
+        query = (f"SELECT {names}, COUNT(*), COUNT(DISTINCT host) FROM findings{where} "
+                 f"GROUP BY {names} ORDER BY COUNT(*) DESC")
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [dict(zip(columns + ['findings', 'hosts'], row)) for row in rows]
+
+    def findings(self, limit: int = 1000, offset: int = 0, **filters) -> List[Dict[str, Any]]:
+        """Findings matching exact column filters, in key order"""
+        where, params = self._where(filters)
+        query = (f"SELECT {', '.join(FINDING_COLUMNS)} FROM findings{where} "
+                 f"ORDER BY host, path, parameter, place, technique LIMIT ? OFFSET ?")
+        with self._lock:
+            rows = self.conn.execute(query, params + [limit, offset]).fetchall()
+        return [dict(zip(FINDING_COLUMNS, row)) for row in rows]
+
+    def vulnerable_parameters(self, **filters) -> List[Tuple[str, str, str, str]]:
+        """Distinct (host, path, parameter, place) across all techniques"""
+        where, params = self._where(filters)
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT DISTINCT host, path, parameter, place FROM findings{where} "
+                f"ORDER BY host, path, parameter, place", params).fetchall()
+
+    def count(self, **filters) -> int:
+        where, params = self._where(filters)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM findings{where}", params).fetchone()[0]
+
+    def recent(self, since: float, limit: int = 1000) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(FINDING_COLUMNS)} FROM findings WHERE last_seen >= ? "
+                f"ORDER BY last_seen DESC LIMIT ?", (since, limit)).fetchall()
+        return [dict(zip(FINDING_COLUMNS, row)) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            findings, hosts = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT host) FROM findings").fetchone()
+            parameters = self.conn.execute(
+                "SELECT COUNT(*) FROM (SELECT DISTINCT host, path, parameter, place FROM findings)").fetchone()[0]
+        return {'findings': findings, 'hosts': hosts, 'parameters': parameters}
@@ -0,0 +1,316 @@
+"""
+Help Schema - Flag schema generated from the installed sqlmap's `-hh` output
+Parsed once per sqlmap version and cached in a compact JSON file
+"""
+
+import json
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from . import parameter_schema
+from .atomic_io import atomic_write_json
+
+
+# Bump when the cache layout changes so stale files are regenerated
+CACHE_FORMAT = 2
+
+# Option lines look like "    -u URL, --url=URL   Target URL (e.g. ...)"; a
+# metavar cut short entirely is printed as "=.." ("--param-exclude=..")
+_OPTION_LINE = re.compile(r'^\s+(-[^\s,=]+(?:[ =](?:[A-Z][A-Z0-9_.]*|\.\.))?'
+                          r'(?:,\s*-[^\s,=]+(?:[ =](?:[A-Z][A-Z0-9_.]*|\.\.))?)*)(?:\s{2,}(.*))?$')
+_FLAG_TOKEN = re.compile(r'(-[^\s,=]+)(?:[ =]([A-Z][A-Z0-9_]*|\.\.))?')
+_SECTION_LINE = re.compile(r'^  ([A-Z][\w /-]*):\s*$')
+_DEFAULT_VALUE = re.compile(r'\(default:?\s*"?([^)"]+)"?\)')
+
+# sqlmap truncates long option spellings in its help output (e.g. "--user..")
+_TRUNCATED = '..'
+
+
+def _expand_truncated(prefix: str, spellings: List[str], takes_value: bool) -> Optional[str]:
+    """Full spelling of a flag `-hh` printed as `prefix..`, if the parameter schema has exactly one
+
+    Flags sharing a spec with the line's other spellings are preferred; when
+    the line shows a metavar ("-A AGENT, --user..") only options taking a
+    value qualify, so "--user.." is --user-agent rather than --users.
+    """
+    def longer(flags):
+        return {flag for flag in flags if flag.startswith(prefix) and flag != prefix
+                and (not takes_value or parameter_schema.BY_FLAG[flag].takes_value)}
+
+    for spelling in spellings:
+        spec = parameter_schema.BY_FLAG.get(spelling)
+        if spec is not None:
+            candidates = longer(spec.flags)
+            if len(candidates) == 1:
+                return candidates.pop()
+    candidates = longer(parameter_schema.BY_FLAG)
+    return candidates.pop() if len(candidates) == 1 else None
+
+
+class HelpFlag:
+    """One option as advertised by `sqlmap -hh`"""
+
+    __slots__ = ('flag', 'aliases', 'arity', 'type_hint', 'section', 'metavar', 'description')
+
+    def __init__(self, flag: str, aliases: Tuple[str, ...], arity: int, type_hint: str,
+                 section: str, metavar: Optional[str] = None, description: str = ''):
+        self.flag = flag
+        self.aliases = aliases
+        self.arity = arity              # 0 for switches, 1 for options taking a value
+        self.type_hint = type_hint      # 'bool', 'int', 'float', 'path' or 'str'
+        self.section = section
+        self.metavar = metavar
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"HelpFlag({self.flag!r}, aliases={self.aliases!r}, arity={self.arity})"
+
+
+class HelpSchema:
+    """Flag schema of one sqlmap version, indexed by every flag spelling"""
+
+    def __init__(self, version: str, flags: List[HelpFlag]):
+        self.version = version
+        self.flags = flags
+        self.by_flag: Dict[str, HelpFlag] = {}
+        for record in flags:
+            for spelling in (record.flag,) + record.aliases:
+                self.by_flag.setdefault(spelling, record)
+
+    def __contains__(self, flag: str) -> bool:
+        return flag in self.by_flag
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def get(self, flag: str) -> Optional[HelpFlag]:
+        """Get the record for any spelling of a flag"""
+        return self.by_flag.get(flag)
+
+    def sections(self) -> List[str]:
+        """Section names in help order"""
+        seen = []
+        for record in self.flags:
+            if record.section not in seen:
+                seen.append(record.section)
+        return seen
+
+    def boolean_flags(self) -> set:
+        """All spellings of flags that take no value"""
+        return {f for f, record in self.by_flag.items() if record.arity == 0}
+
+    def value_flags(self) -> set:
+        """All spellings of flags that take a value"""
+        return {f for f, record in self.by_flag.items() if record.arity > 0}
+
+    def to_compact(self) -> Dict[str, Any]:
+        """Compact JSON-serialisable form: sections stored once, flags as rows"""
+        sections = self.sections()
+        index = {name: i for i, name in enumerate(sections)}
+        rows = [
+            [r.flag, list(r.aliases), r.arity, r.type_hint, index[r.section], r.metavar or '', r.description]
+            for r in self.flags
+        ]
+        return {'format': CACHE_FORMAT, 'version': self.version, 'sections': sections, 'flags': rows}
+
+    @classmethod
+    def from_compact(cls, data: Dict[str, Any]) -> 'HelpSchema':
+        """Rebuild a schema from its compact form"""
+        sections = data['sections']
+        flags = [
+            HelpFlag(flag, tuple(aliases), arity, type_hint, sections[section], metavar or None, description)
+            for flag, aliases, arity, type_hint, section, metavar, description in data['flags']
+        ]
+        return cls(data['version'], flags)
+
+
+def _guess_type(metavar: Optional[str], description: str) -> str:
+    """Infer a value type from the metavar and the help text"""
+    if not metavar:
+        return 'bool'
+    metavar = metavar.rstrip('.')
+    if 'FILE' in metavar or metavar.endswith(('DIR', 'PATH')):
+        return 'path'
+
+    match = _DEFAULT_VALUE.search(description)
+    if match:
+        default = match.group(1).strip()
+        if re.fullmatch(r'-?\d+', default):
+            return 'int'
+        if re.fullmatch(r'-?\d+\.\d+', default):
+            return 'float'
+
+    if re.search(r'\b\d+-\d+\b', description) or 'number of' in description.lower():
+        return 'int'
+    if 'seconds' in description.lower():
+        return 'float'
+    return 'str'
+
+
+def parse_help_output(text: str, version: str = '') -> HelpSchema:
+    """Parse the output of `sqlmap -hh` into a HelpSchema"""
+    flags: List[HelpFlag] = []
+    section = 'Options'
+    last: Optional[HelpFlag] = None
+
+    for raw_line in text.splitlines():
+        line = raw_line.rstrip()
+        if not line.strip():
+            last = None
+            continue
+
+        section_match = _SECTION_LINE.match(line)
+        if section_match:
+            section = section_match.group(1)
+            last = None
+            continue
+
+        option_match = _OPTION_LINE.match(line)
+        if option_match:
+            spellings = []
+            truncated = []
+            metavar = None
+            for token in option_match.group(1).split(','):
+                token_match = _FLAG_TOKEN.match(token.strip())
+                if token_match:
+                    metavar = metavar or token_match.group(2)
+                    if token_match.group(1).endswith(_TRUNCATED):
+                        truncated.append(token_match.group(1)[:-len(_TRUNCATED)])
+                    else:
+                        spellings.append(token_match.group(1))
+            for prefix in truncated:
+                full = _expand_truncated(prefix, spellings, metavar is not None)
+                if full:
+                    spellings.append(full)
+                    # A value option cut short before its metavar still takes a value
+                    if metavar is None and parameter_schema.BY_FLAG[full].takes_value:
+                        metavar = _TRUNCATED
+            if not spellings:
+                continue
+
+            description = (option_match.group(2) or '').strip()
+            # Prefer the long form as the canonical spelling when both exist
+            long_forms = [s for s in spellings if s.startswith('--')]
+            canonical = long_forms[0] if long_forms else spellings[0]
+            aliases = tuple(s for s in spellings if s != canonical)
+
+            last = HelpFlag(canonical, aliases, 1 if metavar else 0, 'bool', section, metavar, description)
+            flags.append(last)
+            continue
+
+        # Wrapped description continuation lines
+        if last is not None and line.startswith(' ' * 10):
+            last.description = f"{last.description} {line.strip()}".strip()
+
+    for record in flags:
+        record.type_hint = _guess_type(record.metavar, record.description)
+
+    return HelpSchema(version, flags)
+
+
+def default_cache_path() -> Path:
+    """Location of the cached schema for the installed sqlmap"""
+    return Path.home() / '.sqlmap-gui' / 'cache' / 'help_schema.json'
+
+
+def load_cached_schema(path: Optional[Path] = None) -> Optional[HelpSchema]:
+    """Load the cached schema, or None if it is missing or unreadable"""
+    path = Path(path) if path else default_cache_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != CACHE_FORMAT:
+            return None
+        return HelpSchema.from_compact(data)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+        print(f"Ignoring unreadable sqlmap help schema cache {path}: {e}")
+        return None
+
+
+def save_schema(schema: HelpSchema, path: Optional[Path] = None) -> bool:
+    """Write the schema to the cache file atomically"""
+    path = Path(path) if path else default_cache_path()
+    try:
+        atomic_write_json(path, schema.to_compact(), separators=(',', ':'))
+        return True
+    except OSError as e:
+        print(f"Error saving sqlmap help schema cache: {e}")
+        return False
+
+
+def generate_schema(sqlmap_cmd: Union[str, List[str]], version: str = '',
+                    timeout: int = 30) -> Optional[HelpSchema]:
+    """Run `sqlmap -hh` and parse its output"""
+    cmd = list(sqlmap_cmd) if isinstance(sqlmap_cmd, list) else [sqlmap_cmd]
+    try:
+        result = subprocess.run(cmd + ['-hh'], input='', capture_output=True, text=True, timeout=timeout)
+    except (FileNotFoundError, subprocess.TimeoutExpired, OSError) as e:
+        print(f"Could not run sqlmap -hh: {e}")
+        return None
+
+    schema = parse_help_output(result.stdout, version)
+    if not len(schema):
+        print("sqlmap -hh produced no recognisable options")
+        return None
+    return schema
+
+
+class HelpSchemaCache:
+    """Loads the cached schema instantly and regenerates it when sqlmap changes"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_cache_path()
+        self.schema: Optional[HelpSchema] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[HelpSchema]:
+        """Load whatever schema was cached by a previous launch"""
+        self.schema = load_cached_schema(self.path)
+        return self.schema
+
+    def is_current(self, version: str) -> bool:
+        """Check whether the loaded schema matches the given sqlmap version"""
+        return self.schema is not None and self.schema.version == version
+
+    def refresh_async(self, sqlmap_cmd: Union[str, List[str]], version: str,
+                      callback: Optional[Callable[[HelpSchema], None]] = None) -> bool:
+        """Regenerate the schema in a background thread if the version changed
+
+        Returns True if a regeneration was started.
+        """
+        if not version or self.is_current(version):
+            return False
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(
+                target=self._regenerate, args=(sqlmap_cmd, version, callback), daemon=True
+            )
+            self._thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None):
+        """Wait for a running regeneration to finish"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _regenerate(self, sqlmap_cmd, version: str, callback):
+        schema = generate_schema(sqlmap_cmd, version)
+        if schema is None:
+            return
+        save_schema(schema, self.path)
+        self.schema = schema
+        print(f"Generated sqlmap help schema for {version}: {len(schema)} options")
+        if callback:
+            try:
+                callback(schema)
+            except Exception as e:
+                print(f"Error in help schema callback: {e}")
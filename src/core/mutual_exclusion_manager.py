@@ -2,10 +2,13 @@
 Mutual Exclusion Manager - Handles GUI-level mutual exclusion for SQLmap options
 """
 
+from contextlib import contextmanager
 from typing import Dict, List, Set, Any, Optional
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtCore import pyqtSignal, QObject
 
+from . import parameter_schema
+
 
 class MutualExclusionManager(QObject):
     """Manages mutual exclusion groups across the GUI"""
@@ -14,28 +17,21 @@ class MutualExclusionManager(QObject):
 
     def __init__(self):
         super().__init__()
-        # Define mutual exclusion groups
-        self.mutual_exclusions = {
-            'target_input': ['url', 'direct', 'log_file', 'bulk_file', 'request_file', 'google_dork'],
-            'user_agent_type': ['user_agent', 'random_agent', 'mobile'],
-            'proxy_type': ['proxy', 'tor'],
-            'shell_access': ['sql_shell', 'os_shell', 'os_cmd'],
-            'data_output': ['dump_all', 'sql_query', 'dump'],
-            'crawl_vs_threads': ['crawl', 'threads'],
-            'batch_vs_wizard': ['batch', 'wizard']
-        }
+        # Mutual exclusion groups come from the shared parameter schema
+        self.mutual_exclusions = parameter_schema.MUTUAL_EXCLUSIONS
 
         # Track current state of options
         self.option_states = {}  # option_name -> current_value
         self.option_widgets = {}  # option_name -> widget
 
-        # Build reverse mapping for quick lookup
-        self.option_to_groups = {}
-        for group_name, options in self.mutual_exclusions.items():
-            for option in options:
-                if option not in self.option_to_groups:
-                    self.option_to_groups[option] = []
-                self.option_to_groups[option].append(group_name)
+        # Prebuilt reverse mapping for quick lookup
+        self.option_to_groups = parameter_schema.OPTION_EXCLUSION_GROUPS
+
+        # Options currently disabled by an exclusion, with the reason shown
+        self.disabled_options: Dict[str, str] = {}
+
+        # While > 0, state changes are only recorded and evaluated together at the end
+        self._bulk_depth = 0
 
     def register_option(self, option_name: str, widget: QWidget):
         """Register an option widget for mutual exclusion management"""
@@ -48,9 +44,45 @@ class MutualExclusionManager(QObject):
         self.option_states[option_name] = value
 
         # Only process mutual exclusions if the value actually changed
-        if old_value != value:
+        if old_value != value and not self._bulk_depth:
             self._handle_mutual_exclusions(option_name, value)
 
+    @contextmanager
+    def bulk_update(self):
+        """Defer exclusion handling while many options are set, then evaluate the final state once"""
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                self.evaluate_all()
+
+    @property
+    def in_bulk_update(self) -> bool:
+        return self._bulk_depth > 0
+
+    def evaluate_all(self):
+        """Enable or disable every grouped option according to the current state"""
+        reasons = {}  # option -> why it is disabled
+        for group_name, group_options in self.mutual_exclusions.items():
+            active_options = [option for option in group_options
+                              if self._has_value(self.option_states.get(option))]
+            if not active_options:
+                continue
+            # As in _reevaluate_group, the first active option wins
+            winner = active_options[0]
+            for option in group_options:
+                if option != winner and option not in reasons:
+                    reasons[option] = f"Disabled: conflicts with '{winner}' in {group_name} group"
+
+        for option_name in self.option_to_groups:
+            if option_name in reasons:
+                if self.disabled_options.get(option_name) != reasons[option_name]:
+                    self._disable_option(option_name, reasons[option_name])
+            elif option_name in self.disabled_options:
+                self._enable_option(option_name)
+
     def _handle_mutual_exclusions(self, changed_option: str, new_value: Any):
         """Handle mutual exclusion logic when an option changes"""
         if changed_option not in self.option_to_groups:
@@ -105,6 +137,7 @@ class MutualExclusionManager(QObject):
             else:
                 widget.setEnabled(False)
                 widget.setToolTip(reason)
+            self.disabled_options[option_name] = reason
             # Emit signal for additional handling
             self.option_state_changed.emit(option_name, False)
 
@@ -120,6 +153,7 @@ class MutualExclusionManager(QObject):
             else:
                 widget.setEnabled(True)
                 widget.setToolTip("")
+            self.disabled_options.pop(option_name, None)
             # Emit signal for additional handling
             self.option_state_changed.emit(option_name, True)
 
@@ -159,6 +193,8 @@ class MutualExclusionManager(QObject):
 
     def reset_all(self):
         """Reset all mutual exclusion states"""
-        for option_name in self.option_widgets.keys():
+        # Only options disabled here need re-enabling; the rest keep their tooltips
+        for option_name in list(self.disabled_options):
             self._enable_option(option_name)
-        self.option_states.clear()
\ No newline at end of file
+        self.option_states.clear()
+        self.disabled_options.clear()
\ No newline at end of file
@@ -0,0 +1,327 @@
+"""
+Option Matrix - Race a grid of option variants against one target
+Expands technique/tamper/level/risk/prefix/suffix combinations, runs them in
+parallel within the host's request budget and cancels the rest as soon as one
+variant confirms an injection point; the winning configuration is recorded
+
+Run with: python -m src.core.option_matrix URL --tamper space2comment,between --level 1,3 [-j 4]
+"""
+
+import itertools
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from . import parameter_schema
+from .atomic_io import atomic_write_json
+from .output_events import reports_injection
+from .rate_governor import RateGovernor, options_host
+from .sqlmap_wrapper import SqlmapProcess, SqlmapWrapper
+from .target_registry import TargetRegistry
+from .validation_cache import options_fingerprint
+
+
+# Options a matrix can vary, in the order variants are described
+MATRIX_AXES = ('technique', 'tamper', 'level', 'risk', 'prefix', 'suffix')
+
+# Requests per second shared by all variants when no governor is given
+DEFAULT_HOST_RPS = 10.0
+
+# Technique checkboxes are replaced by the variant's --technique letters
+_TECHNIQUE_SWITCHES = tuple(spec.name for spec in parameter_schema.PARAMETERS if spec.kind == 'technique')
+
+
+def apply_variant(base: Dict[str, Any], variant: Dict[str, Any]) -> Dict[str, Any]:
+    """Base options with one variant's values; None removes an option"""
+    options = dict(base)
+    if 'technique' in variant:
+        for name in _TECHNIQUE_SWITCHES:
+            options.pop(name, None)
+    for key, value in variant.items():
+        if value is None or value == '':
+            options.pop(key, None)
+        else:
+            options[key] = value
+    return options
+
+
+def _variant_cost(variant: Dict[str, Any]) -> tuple:
+    """Cheap variants (low level/risk, few techniques) are tried first"""
+    def number(key):
+        try:
+            return int(variant.get(key) or 1)
+        except (TypeError, ValueError):
+            return 1
+    return number('level') * number('risk'), len(str(variant.get('technique') or 'BEUSTQ'))
+
+
+def expand_matrix(axes: Dict[str, Iterable[Any]], max_variants: Optional[int] = None) -> List[Dict[str, Any]]:
+    """All combinations of the axis values, cheapest first, without duplicates"""
+    names = [name for name in MATRIX_AXES if name in axes] + [name for name in axes if name not in MATRIX_AXES]
+    values = [list(axes[name]) or [None] for name in names]
+    variants = []
+    seen = set()
+    for combination in itertools.product(*values):
+        variant = dict(zip(names, combination))
+        key = options_fingerprint(variant)
+        if key not in seen:
+            seen.add(key)
+            variants.append(variant)
+    variants.sort(key=_variant_cost)
+    return variants[:max_variants] if max_variants else variants
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()] if value else []
+
+
+def parse_axes(values: Dict[str, Optional[str]]) -> Dict[str, List[Any]]:
+    """Axes from comma-separated text per option
+
+    Tamper chains use ';' between scripts and '-' for no tamper.
+    """
+    axes: Dict[str, List[Any]] = {}
+    for name in MATRIX_AXES:
+        items = _split(values.get(name))
+        if items:
+            if name == 'tamper':
+                items = [None if item == '-' else item.replace(';', ',') for item in items]
+            axes[name] = items
+    return axes
+
+
+def describe_variant(variant: Dict[str, Any]) -> str:
+    return ' '.join(f"{key}={value}" for key, value in variant.items() if value not in (None, '')) or 'base options'
+
+
+class Variant:
+    """One option combination in a race"""
+
+    PENDING, RUNNING, WON, FINISHED, FAILED, CANCELLED = 'pending', 'running', 'won', 'finished', 'failed', 'cancelled'
+
+    __slots__ = ('index', 'values', 'options', 'process', 'status', 'return_code', 'start_time', 'end_time',
+                 'finding')
+
+    def __init__(self, index: int, values: Dict[str, Any], options: Dict[str, Any]):
+        self.index = index
+        self.values = values
+        self.options = options
+        self.process: Optional[SqlmapProcess] = None
+        self.status = self.PENDING
+        self.return_code: Optional[int] = None
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.finding: Optional[str] = None  # Line that confirmed the injection
+
+    def __repr__(self) -> str:
+        return f"Variant({self.index}, {describe_variant(self.values)!r}, {self.status})"
+
+
+class OptionMatrixRace:
+    """Runs option variants in parallel until one finds an injection point
+
+    Every variant gets its own output directory so their sqlmap sessions do
+    not collide; the winner's directory holds the session to continue from.
+    Without a governor the variants share a DEFAULT_HOST_RPS budget.
+    """
+
+    def __init__(self, wrapper: SqlmapWrapper, base_options: Dict[str, Any], variants: List[Dict[str, Any]],
+                 parallel: int = 4, work_dir: Optional[str] = None, governor: Optional[RateGovernor] = None,
+                 registry: Optional[TargetRegistry] = None,
+                 process_factory: Callable[[List[str]], SqlmapProcess] = SqlmapProcess,
+                 output_callback: Optional[Callable[[Variant, str], None]] = None):
+        if not base_options.get('url'):
+            raise ValueError("Option matrix races need a single target URL")
+        self.wrapper = wrapper
+        self.base_options = dict(base_options)
+        self.parallel = max(1, parallel)
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix='sqlmap-gui-matrix-')
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.governor = governor if governor is not None else RateGovernor(host_rps=DEFAULT_HOST_RPS)
+        self.registry = registry
+        self.process_factory = process_factory
+        self.output_callback = output_callback
+        self.host = options_host(self.base_options)
+        self.variants = [Variant(index, values, apply_variant(self.base_options, values))
+                         for index, values in enumerate(variants)]
+        self.running: List[Variant] = []
+        self.winner: Optional[Variant] = None
+        self.stopped = False
+
+    def _job_id(self, variant: Variant) -> str:
+        return f"matrix-{id(self):x}-{variant.index}"
+
+    def _launch(self, variant: Variant) -> Optional[bool]:
+        """Start a variant; None (and still pending) when the rate governor has no free slot"""
+        options = dict(variant.options)
+        options['output_dir'] = os.path.join(self.work_dir, f"variant-{variant.index:03d}")
+        variant.options = options
+        if self.governor:
+            options = self.governor.acquire(self._job_id(variant), self.host, options)
+            if options is None:
+                return None
+        variant.start_time = time.time()
+        try:
+            variant.process = self.process_factory(self.wrapper.build_command(options, force_batch=True))
+            started = variant.process.start()
+        except Exception as e:
+            print(f"Error starting variant {variant.index}: {e}")
+            started = False
+        if not started:
+            self._retire(variant, Variant.FAILED)
+            return False
+        variant.status = Variant.RUNNING
+        self.running.append(variant)
+        return True
+
+    def _retire(self, variant: Variant, status: str):
+        variant.status = status
+        variant.end_time = time.time()
+        if variant in self.running:
+            self.running.remove(variant)
+        if self.governor:
+            self.governor.release(self._job_id(variant))
+
+    def _scan_output(self, variant: Variant) -> bool:
+        """Forward output; True once the variant confirms an injection point"""
+        for line in variant.process.get_output():
+            if self.output_callback:
+                self.output_callback(variant, line)
+            if variant.finding is None and reports_injection(line):
+                variant.finding = line
+        return variant.finding is not None
+
+    def step(self) -> bool:
+        """Poll running variants and start pending ones; False when the race is over"""
+        for variant in list(self.running):
+            if variant.status != Variant.RUNNING:
+                continue  # Cancelled by a winner earlier in this pass
+            found = self._scan_output(variant)
+            if found and self.winner is None:
+                self._declare_winner(variant)
+            return_code = variant.process.poll()
+            if return_code is not None:
+                variant.process.wait_output()  # The readers may still hold the confirming lines
+                if self._scan_output(variant) and self.winner is None:
+                    self._declare_winner(variant)
+                variant.return_code = return_code
+                if variant is self.winner:
+                    self._retire(variant, Variant.WON)
+                else:
+                    self._retire(variant, Variant.FINISHED if return_code == 0 else Variant.FAILED)
+
+        if not self.stopped:
+            for variant in self.variants:
+                if len(self.running) >= self.parallel:
+                    break
+                if variant.status == Variant.PENDING and self._launch(variant) is None:
+                    break
+        waiting = not self.stopped and any(variant.status == Variant.PENDING for variant in self.variants)
+        return bool(self.running) or waiting
+
+    def _declare_winner(self, variant: Variant):
+        """Cancel every other variant and record the winning configuration
+
+        The winner keeps running so it can finish what was asked of it
+        (enumeration, dumps) from the session it just built.
+        """
+        self.winner = variant
+        self.cancel(keep=variant)
+        if self.registry is not None:
+            try:
+                self.registry.record_options(variant.options, 'vulnerable')
+            except Exception as e:
+                print(f"Error recording matrix winner: {e}")
+        self.save_winner()
+
+    def cancel(self, keep: Optional[Variant] = None):
+        """Stop running variants (except `keep`) and drop pending ones"""
+        self.stopped = True
+        for variant in list(self.running):
+            if variant is keep:
+                continue
+            variant.process.stop()
+            self._retire(variant, Variant.CANCELLED)
+        for variant in self.variants:
+            if variant.status == Variant.PENDING:
+                variant.status = Variant.CANCELLED
+
+    def run(self, poll_interval: float = 0.2) -> Optional[Variant]:
+        """Race until a variant wins or all have finished; returns the winner"""
+        while self.step():
+            time.sleep(poll_interval)
+        return self.winner
+
+    def save_winner(self) -> Optional[str]:
+        """Write the winning configuration next to the variant outputs"""
+        if self.winner is None:
+            return None
+        path = os.path.join(self.work_dir, 'winner.json')
+        record = {
+            'target': self.base_options.get('url'),
+            'variant': self.winner.values,
+            'options': self.winner.options,
+            'finding': self.winner.finding,
+            'seconds_to_finding': round(time.time() - self.winner.start_time, 1),
+            'found_at': time.time(),
+        }
+        try:
+            atomic_write_json(path, record, indent=2, default=str)
+        except OSError as e:
+            print(f"Error saving matrix winner: {e}")
+            return None
+        return path
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for variant in self.variants:
+            counts[variant.status] = counts.get(variant.status, 0) + 1
+        return {
+            'target': self.base_options.get('url'),
+            'variants': len(self.variants),
+            'status': counts,
+            'winner': describe_variant(self.winner.values) if self.winner else None,
+            'work_dir': self.work_dir,
+        }
+
+
+def main():
+    """Race option variants against one URL"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Race option variants against one target")
+    parser.add_argument('url', help="target URL")
+    parser.add_argument('--technique', help="comma-separated --technique values, e.g. B,T,BEU")
+    parser.add_argument('--tamper', help="comma-separated tamper chains; use ';' inside a chain, '-' for none")
+    parser.add_argument('--level', help="comma-separated levels, e.g. 1,3,5")
+    parser.add_argument('--risk', help="comma-separated risks, e.g. 1,2")
+    parser.add_argument('--prefix', help="comma-separated injection prefixes")
+    parser.add_argument('--suffix', help="comma-separated injection suffixes")
+    parser.add_argument('-j', '--parallel', type=int, default=4, help="variants run at once (default: 4)")
+    parser.add_argument('--max-variants', type=int, default=None, help="cap on the number of variants")
+    parser.add_argument('--host-rps', type=float, default=DEFAULT_HOST_RPS,
+                        help=f"request budget for the target host, 0 for none (default: {DEFAULT_HOST_RPS:g})")
+    parser.add_argument('--sqlmap', default='sqlmap', help="sqlmap command (default: sqlmap)")
+    parser.add_argument('--work-dir', default=None, help="directory for variant outputs")
+    args = parser.parse_args()
+
+    variants = expand_matrix(parse_axes(vars(args)), args.max_variants)
+    print(f"{len(variants)} variants")
+
+    governor = RateGovernor(host_rps=args.host_rps if args.host_rps > 0 else None)
+    race = OptionMatrixRace(SqlmapWrapper(args.sqlmap), {'url': args.url, 'batch': True}, variants,
+                            parallel=args.parallel, work_dir=args.work_dir, governor=governor,
+                            output_callback=lambda variant, line: print(f"[variant {variant.index}] {line}"))
+    try:
+        winner = race.run()
+    except KeyboardInterrupt:
+        race.cancel()
+        winner = None
+    if winner:
+        print(f"Winner: {describe_variant(winner.values)} -> {os.path.join(race.work_dir, 'winner.json')}")
+    print(race.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Output Events - Classify sqlmap console lines into connection-health events
+Used by the auto-tuner and progress tracking to react to what a running scan prints
+"""
+
+import re
+import time
+from typing import Optional
+
+
+# "[12:34:56] [WARNING] message" (the timestamp is missing with some -v levels)
+_LOG_LINE = re.compile(r'^(?:\[\d{1,2}:\d{2}:\d{2}\]\s*)?\[(CRITICAL|ERROR|WARNING|INFO|DEBUG|PAYLOAD|TRAFFIC OUT|TRAFFIC IN)\]\s*(.*)$')
+# Status codes in "HTTP error code (503)", "(429 Too Many Requests)", "429 (Too Many Requests) - 5 times"
+_THROTTLE_CODE = re.compile(r'(?<!\d)(429|503)(?!\d)')
+_THROTTLE_TEXT = re.compile(r'too many requests|service unavailable|rate limit', re.I)
+
+# Event kinds
+TIMEOUT = 'timeout'
+CONNECTION_RESET = 'connection_reset'
+CONNECTION_REFUSED = 'connection_refused'
+THROTTLED = 'throttled'
+RETRY = 'retry'
+WAF = 'waf'
+ERROR = 'error'
+
+# Events that mean the target (or something in front of it) is being pushed too hard
+CONGESTION_EVENTS = frozenset({TIMEOUT, CONNECTION_RESET, CONNECTION_REFUSED, THROTTLED, RETRY})
+
+# Lines sqlmap prints once it has confirmed (or restored from its session) an injection point
+INJECTION_FOUND_MARKERS = ('identified the following injection point', 'resumed the following injection point')
+
+
+def reports_injection(line: str) -> bool:
+    """Whether a line of sqlmap output confirms an injection point"""
+    return any(marker in line for marker in INJECTION_FOUND_MARKERS)
+
+
+class OutputEvent:
+    """A classified line of sqlmap output"""
+
+    __slots__ = ('kind', 'level', 'message', 'timestamp')
+
+    def __init__(self, kind: str, level: str, message: str, timestamp: float):
+        self.kind = kind
+        self.level = level
+        self.message = message
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        return f"OutputEvent({self.kind!r}, {self.level!r}, {self.message[:40]!r})"
+
+
+def parse_log_line(line: str):
+    """Split a sqlmap log line into (level, message), or (None, line) for other output"""
+    match = _LOG_LINE.match(line.strip())
+    if match:
+        return match.group(1), match.group(2)
+    return None, line.strip()
+
+
+def classify_message(level: Optional[str], message: str) -> Optional[str]:
+    """Event kind of a log message, or None if it says nothing about connection health"""
+    lowered = message.lower()
+    if 'timed out' in lowered or ('timeout' in lowered and level in ('CRITICAL', 'WARNING', 'ERROR')):
+        return TIMEOUT
+    if 'connection reset' in lowered or 'reset by peer' in lowered:
+        return CONNECTION_RESET
+    if 'connection refused' in lowered or 'unable to connect' in lowered:
+        return CONNECTION_REFUSED
+    if (_THROTTLE_CODE.search(message) and ('http' in lowered or 'code' in lowered or 'times' in lowered)) \
+            or _THROTTLE_TEXT.search(message):
+        return THROTTLED
+    if 'retry the request' in lowered or 'retrying' in lowered:
+        return RETRY
+    if 'waf/ips' in lowered or ('dropping' in lowered and 'suspicious' in lowered):
+        return WAF
+    if level in ('CRITICAL', 'ERROR'):
+        return ERROR
+    return None
+
+
+def classify_line(line: str, timestamp: Optional[float] = None) -> Optional[OutputEvent]:
+    """Classify one line of sqlmap output"""
+    level, message = parse_log_line(line)
+    # Cheap exit for the bulk of output: plain INFO/payload lines and tables
+    if level in ('INFO', 'DEBUG', 'PAYLOAD', 'TRAFFIC OUT'):
+        return None
+    if level is None:
+        # Unprefixed output (tables, dumped data) only counts for the HTTP error code summary
+        kind = THROTTLED if _THROTTLE_TEXT.search(message) else None
+    else:
+        kind = classify_message(level, message)
+    if kind is None:
+        return None
+    return OutputEvent(kind, level or '', message, timestamp if timestamp is not None else time.time())
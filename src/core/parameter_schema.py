@@ -0,0 +1,473 @@
+"""
+Parameter Schema - Single compiled description of every SQLmap option
+Built once at import and shared by the wrapper, validator, exclusion manager and tabs
+"""
+
+from types import MappingProxyType
+from typing import Dict, List, Tuple, Optional, Any
+
+
+class ParameterSpec:
+    """Immutable record describing one SQLmap option"""
+
+    __slots__ = ('name', 'flag', 'kind', 'group', 'aliases', 'technique', 'verbatim',
+                 'value_range', 'risk', 'description', 'takes_value', 'flags')
+
+    def __init__(self, name: str, flag: str, kind: str, group: str,
+                 aliases: Tuple[str, ...] = (), technique: Optional[str] = None,
+                 verbatim: bool = False, value_range: Optional[Tuple[int, Optional[int]]] = None,
+                 risk: Optional[Tuple[str, str]] = None, description: Optional[str] = None):
+        setter = object.__setattr__
+        setter(self, 'name', name)
+        setter(self, 'flag', flag)
+        setter(self, 'kind', kind)                # 'flag', 'quoted_arg' or 'technique'
+        setter(self, 'group', group)
+        setter(self, 'aliases', tuple(aliases))
+        setter(self, 'technique', technique)      # Letter contributed to --technique
+        setter(self, 'verbatim', verbatim)        # Passed to sqlmap without shell quoting
+        setter(self, 'value_range', value_range)  # (min, max) for numeric values
+        setter(self, 'risk', risk)                # (risk_level, warning) for dangerous options
+        setter(self, 'description', description)
+        setter(self, 'takes_value', kind == 'quoted_arg')
+        setter(self, 'flags', (flag,) + tuple(aliases))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"ParameterSpec({self.name!r}, {self.flag!r}, {self.kind!r}, group={self.group!r})"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Legacy dictionary form used by SqlmapWrapper.all_params"""
+        info = {'flag': self.flag, 'type': self.kind}
+        if self.technique:
+            info['value'] = self.technique
+        if self.description:
+            info['description'] = self.description
+        return info
+
+
+def _flag(name, flag, group, **kwargs) -> ParameterSpec:
+    return ParameterSpec(name, flag, 'flag', group, **kwargs)
+
+
+def _arg(name, flag, group, **kwargs) -> ParameterSpec:
+    return ParameterSpec(name, flag, 'quoted_arg', group, **kwargs)
+
+
+def _technique(name, letter) -> ParameterSpec:
+    return ParameterSpec(name, '--technique', 'technique', 'techniques', technique=letter)
+
+
+# Declaration order matters: when several names share a flag, the first one
+# declared is the canonical record for that flag. Flags must match the
+# spellings printed by `sqlmap -hh` (see help_schema).
+PARAMETERS: Tuple[ParameterSpec, ...] = (
+    # TARGET
+    _arg('url', '-u', 'target', aliases=('--url',), verbatim=True, description='Target URL'),
+    _arg('direct', '-d', 'target', verbatim=True, description='Direct connection string'),
+    _arg('log_file', '-l', 'target', verbatim=True, description='Parse targets from Burp/ZAP proxy log'),
+    _arg('bulk_file', '-m', 'target', verbatim=True, description='Scan multiple targets from file'),
+    _arg('request_file', '-r', 'target', verbatim=True, description='Load HTTP request from file'),
+    _arg('google_dork', '-g', 'target', description='Process Google dork results'),
+
+    # REQUEST
+    _arg('method', '--method', 'request', aliases=('-X',)),
+    _arg('data', '--data', 'request', verbatim=True),
+    _arg('param_del', '--param-del', 'request'),
+    _arg('cookie', '--cookie', 'request', verbatim=True),
+    _arg('cookie_del', '--cookie-del', 'request'),
+    _arg('live_cookies', '--live-cookies', 'request'),
+    _arg('load_cookies', '--load-cookies', 'request'),
+    _flag('drop_set_cookie', '--drop-set-cookie', 'request'),
+    _flag('mobile', '--mobile', 'request'),
+    _flag('random_agent', '--random-agent', 'request'),
+    _arg('user_agent', '--user-agent', 'request'),
+    _arg('host', '--host', 'request'),
+    _arg('referer', '--referer', 'request'),
+    _arg('headers', '--headers', 'request', verbatim=True),
+    _arg('auth_type', '--auth-type', 'request'),
+    _arg('auth_cred', '--auth-cred', 'request'),
+    _arg('auth_file', '--auth-file', 'request'),
+    _arg('abort_code', '--abort-code', 'request'),
+    _arg('ignore_code', '--ignore-code', 'request'),
+    _flag('ignore_proxy', '--ignore-proxy', 'request'),
+    _flag('ignore_redirects', '--ignore-redirects', 'request'),
+    _flag('ignore_timeouts', '--ignore-timeouts', 'request'),
+    _arg('proxy', '--proxy', 'request', verbatim=True),
+    _arg('proxy_cred', '--proxy-cred', 'request'),
+    _arg('proxy_file', '--proxy-file', 'request'),
+    _arg('proxy_freq', '--proxy-freq', 'request', value_range=(1, 1000)),
+    _flag('tor', '--tor', 'request'),
+    _arg('tor_port', '--tor-port', 'request', value_range=(1, 65535)),
+    _arg('tor_type', '--tor-type', 'request'),
+    _flag('check_tor', '--check-tor', 'request'),
+    _arg('delay', '--delay', 'request', value_range=(0, 3600)),
+    _arg('timeout', '--timeout', 'request', value_range=(1, 3600)),
+    _arg('retries', '--retries', 'request', value_range=(0, 50)),
+    _arg('retry_on', '--retry-on', 'request'),
+    _arg('randomize', '--randomize', 'request'),
+    _arg('safe_url', '--safe-url', 'request'),
+    _arg('safe_post', '--safe-post', 'request'),
+    _arg('safe_req', '--safe-req', 'request'),
+    _arg('safe_freq', '--safe-freq', 'request', value_range=(1, 1000)),
+    _flag('skip_urlencode', '--skip-urlencode', 'request'),
+    _arg('csrf_token', '--csrf-token', 'request'),
+    _arg('csrf_url', '--csrf-url', 'request'),
+    _arg('csrf_method', '--csrf-method', 'request'),
+    _arg('csrf_data', '--csrf-data', 'request'),
+    _arg('csrf_retries', '--csrf-retries', 'request', value_range=(0, 10)),
+    _flag('force_ssl', '--force-ssl', 'request'),
+    _flag('chunked', '--chunked', 'request'),
+    _flag('hpp', '--hpp', 'request'),
+    _arg('eval', '--eval', 'request'),
+
+    # OPTIMIZATION
+    _flag('optimize', '-o', 'optimization'),
+    _flag('predict_output', '--predict-output', 'optimization'),
+    _flag('keep_alive', '--keep-alive', 'optimization'),
+    _flag('null_connection', '--null-connection', 'optimization'),
+    _arg('threads', '--threads', 'optimization', value_range=(1, 100)),
+
+    # INJECTION
+    _arg('testable_parameter', '-p', 'injection'),
+    _arg('skip', '--skip', 'injection'),
+    _flag('skip_static', '--skip-static', 'injection'),
+    _arg('param_exclude', '--param-exclude', 'injection'),
+    _arg('param_filter', '--param-filter', 'injection'),
+    _arg('dbms', '--dbms', 'injection'),
+    _arg('dbms_cred', '--dbms-cred', 'injection'),
+    _arg('os', '--os', 'injection'),
+    _flag('invalid_bignum', '--invalid-bignum', 'injection'),
+    _flag('invalid_logical', '--invalid-logical', 'injection'),
+    _flag('invalid_string', '--invalid-string', 'injection'),
+    _flag('no_cast', '--no-cast', 'injection'),
+    _flag('no_escape', '--no-escape', 'injection'),
+    _arg('prefix', '--prefix', 'injection', verbatim=True),
+    _arg('suffix', '--suffix', 'injection', verbatim=True),
+    _arg('tamper', '--tamper', 'injection', verbatim=True),
+
+    # DETECTION
+    _arg('level', '--level', 'detection', value_range=(1, 5)),
+    _arg('risk', '--risk', 'detection', value_range=(1, 3)),
+    _arg('string', '--string', 'detection', verbatim=True),
+    _arg('not_string', '--not-string', 'detection', verbatim=True),
+    _arg('regexp', '--regexp', 'detection', verbatim=True),
+    _arg('code', '--code', 'detection', verbatim=True),
+    _flag('smart', '--smart', 'detection'),
+    _flag('text_only', '--text-only', 'detection'),
+    _flag('titles', '--titles', 'detection'),
+
+    # TECHNIQUES
+    _arg('technique', '--technique', 'techniques'),
+    _arg('time_sec', '--time-sec', 'techniques', value_range=(1, 3600)),
+    _arg('union_cols', '--union-cols', 'techniques'),
+    _arg('union_char', '--union-char', 'techniques'),
+    _arg('union_from', '--union-from', 'techniques'),
+    _arg('union_values', '--union-values', 'techniques'),
+    _arg('dns_domain', '--dns-domain', 'techniques'),
+    _arg('second_url', '--second-url', 'techniques', verbatim=True),
+    _arg('second_req', '--second-req', 'techniques'),
+    _technique('boolean_blind', 'B'),
+    _technique('error_based', 'E'),
+    _technique('union_based', 'U'),
+    _technique('stacked_queries', 'S'),
+    _technique('time_based', 'T'),
+    _technique('inline_queries', 'Q'),
+
+    # FINGERPRINT
+    _flag('fingerprint', '--fingerprint', 'fingerprint'),
+
+    # ENUMERATION
+    _flag('all', '--all', 'enumeration'),
+    _flag('banner', '--banner', 'enumeration'),
+    _flag('current_user', '--current-user', 'enumeration'),
+    _flag('current_db', '--current-db', 'enumeration'),
+    _flag('hostname', '--hostname', 'enumeration'),
+    _flag('is_dba', '--is-dba', 'enumeration'),
+    _flag('users', '--users', 'enumeration'),
+    _flag('passwords', '--passwords', 'enumeration'),
+    _flag('privileges', '--privileges', 'enumeration'),
+    _flag('roles', '--roles', 'enumeration'),
+    _flag('dbs', '--dbs', 'enumeration'),
+    _flag('tables', '--tables', 'enumeration'),
+    _flag('columns', '--columns', 'enumeration'),
+    _flag('schema', '--schema', 'enumeration'),
+    _flag('count', '--count', 'enumeration'),
+    _flag('dump', '--dump', 'enumeration'),
+    _flag('dump_all', '--dump-all', 'enumeration',
+          risk=('MEDIUM RISK', 'Dumping all data can expose sensitive information')),
+    _flag('search', '--search', 'enumeration'),
+    _flag('comments', '--comments', 'enumeration'),
+    _flag('statements', '--statements', 'enumeration'),
+    _arg('db', '-D', 'enumeration'),
+    _arg('tbl', '-T', 'enumeration'),
+    _arg('col', '-C', 'enumeration'),
+    _arg('exclude', '--exclude', 'enumeration'),
+    _arg('user', '-U', 'enumeration'),
+    _flag('exclude_sysdbs', '--exclude-sysdbs', 'enumeration'),
+    _arg('pivot_column', '--pivot-column', 'enumeration'),
+    _arg('where', '--where', 'enumeration', verbatim=True),
+    _arg('start', '--start', 'enumeration', value_range=(1, None)),
+    _arg('stop', '--stop', 'enumeration', value_range=(1, None)),
+    _arg('first', '--first', 'enumeration', value_range=(1, None)),
+    _arg('last', '--last', 'enumeration', value_range=(1, None)),
+    _arg('sql_query', '--sql-query', 'enumeration', verbatim=True),
+    _flag('sql_shell', '--sql-shell', 'enumeration',
+          risk=('MEDIUM RISK', 'SQL shell access allows arbitrary database queries')),
+    _arg('sql_file', '--sql-file', 'enumeration', verbatim=True),
+
+    # BRUTE FORCE
+    _flag('common_tables', '--common-tables', 'brute_force'),
+    _flag('common_columns', '--common-columns', 'brute_force'),
+    _flag('common_files', '--common-files', 'brute_force'),
+
+    # UDF INJECTION
+    _flag('udf_inject', '--udf-inject', 'udf'),
+    _arg('shared_lib', '--shared-lib', 'udf', verbatim=True),
+
+    # FILE SYSTEM ACCESS
+    _arg('file_read', '--file-read', 'file_system', verbatim=True,
+         risk=('MEDIUM RISK', 'Reads files from target system')),
+    _arg('file_write', '--file-write', 'file_system', verbatim=True,
+         risk=('MEDIUM RISK', 'File writing can modify target system files')),
+    _arg('file_dest', '--file-dest', 'file_system', verbatim=True),
+
+    # OS ACCESS
+    _arg('os_cmd', '--os-cmd', 'os_access', verbatim=True,
+         risk=('HIGH RISK', 'OS command execution can compromise the target system')),
+    _flag('os_shell', '--os-shell', 'os_access',
+          risk=('HIGH RISK', 'OS shell access can compromise the target system')),
+    _flag('os_pwn', '--os-pwn', 'os_access',
+          risk=('HIGH RISK', 'OS takeover can completely compromise the target system')),
+    _flag('os_smbrelay', '--os-smbrelay', 'os_access',
+          risk=('HIGH RISK', 'One-click shell/Meterpreter access')),
+    _flag('os_bof', '--os-bof', 'os_access',
+          risk=('HIGH RISK', 'Buffer overflow exploitation')),
+    _flag('priv_esc', '--priv-esc', 'os_access',
+          risk=('HIGH RISK', 'Privilege escalation can lead to full system compromise')),
+    _arg('msf_path', '--msf-path', 'os_access'),
+    _arg('tmp_path', '--tmp-path', 'os_access'),
+
+    # WINDOWS REGISTRY
+    _flag('reg_read', '--reg-read', 'registry'),
+    _flag('reg_add', '--reg-add', 'registry',
+          risk=('MEDIUM RISK', 'Modifies Windows registry')),
+    _flag('reg_del', '--reg-del', 'registry',
+          risk=('MEDIUM RISK', 'Deletes Windows registry entries')),
+    _arg('reg_key', '--reg-key', 'registry'),
+    _arg('reg_value', '--reg-value', 'registry'),
+    _arg('reg_data', '--reg-data', 'registry'),
+    _arg('reg_type', '--reg-type', 'registry'),
+
+    # GENERAL
+    # The INI file may itself define the target, so it is not a target option
+    _arg('config_file', '-c', 'general', description='Load options from a configuration INI file'),
+    _arg('session_file', '-s', 'general'),
+    _arg('traffic_file', '-t', 'general', verbatim=True),
+    _arg('answers', '--answers', 'general'),
+    _arg('base64', '--base64', 'general'),
+    _flag('base64_safe', '--base64-safe', 'general'),
+    _flag('batch', '--batch', 'general'),
+    _arg('binary_fields', '--binary-fields', 'general'),
+    _flag('check_internet', '--check-internet', 'general'),
+    _flag('cleanup', '--cleanup', 'general'),
+    _arg('crawl', '--crawl', 'general', value_range=(0, 10)),
+    _arg('crawl_exclude', '--crawl-exclude', 'general'),
+    _arg('csv_del', '--csv-del', 'general'),
+    _arg('charset', '--charset', 'general'),
+    _arg('dump_file', '--dump-file', 'general'),
+    _arg('dump_format', '--dump-format', 'general'),
+    _arg('encoding', '--encoding', 'general'),
+    _flag('eta', '--eta', 'general'),
+    _flag('flush_session', '--flush-session', 'general'),
+    _flag('forms', '--forms', 'general'),
+    _flag('fresh_queries', '--fresh-queries', 'general'),
+    _arg('gpage', '--gpage', 'general', value_range=(1, None)),
+    _arg('har', '--har', 'general'),
+    _flag('hex', '--hex', 'general'),
+    _arg('output_dir', '--output-dir', 'general'),
+    _flag('parse_errors', '--parse-errors', 'general'),
+    _arg('preprocess', '--preprocess', 'general'),
+    _arg('postprocess', '--postprocess', 'general'),
+    _flag('repair', '--repair', 'general'),
+    _arg('save', '--save', 'general'),
+    _arg('scope', '--scope', 'general'),
+    _flag('skip_heuristics', '--skip-heuristics', 'general'),
+    _flag('skip_waf', '--skip-waf', 'general'),
+    _arg('table_prefix', '--table-prefix', 'general'),
+    _arg('test_filter', '--test-filter', 'general'),
+    _arg('test_skip', '--test-skip', 'general'),
+    _arg('time_limit', '--time-limit', 'general'),
+    _arg('web_root', '--web-root', 'general'),
+    _flag('abort_on_empty', '--abort-on-empty', 'general'),
+    _arg('verbose', '-v', 'general', value_range=(0, 6)),
+
+    # MISCELLANEOUS
+    _arg('alert', '--alert', 'miscellaneous'),
+    _flag('beep', '--beep', 'miscellaneous'),
+    _flag('dependencies', '--dependencies', 'miscellaneous'),
+    _flag('disable_coloring', '--disable-coloring', 'miscellaneous'),
+    _flag('disable_hashing', '--disable-hashing', 'miscellaneous'),
+    _flag('list_tampers', '--list-tampers', 'miscellaneous'),
+    _flag('no_logging', '--no-logging', 'miscellaneous'),
+    _flag('no_truncate', '--no-truncate', 'miscellaneous'),
+    _flag('offline', '--offline', 'miscellaneous'),
+    _flag('purge', '--purge', 'miscellaneous'),
+    _arg('results_file', '--results-file', 'miscellaneous'),
+    _flag('shell', '--shell', 'miscellaneous'),
+    _arg('tmp_dir', '--tmp-dir', 'miscellaneous'),
+    _flag('unstable', '--unstable', 'miscellaneous'),
+    _flag('update', '--update', 'miscellaneous'),
+    _flag('wizard', '--wizard', 'miscellaneous'),
+
+    # GUI-specific options that map onto real flags
+    _flag('auto_batch', '--batch', 'gui'),
+    _arg('tamper_custom', '--tamper', 'gui'),
+    _flag('list_tampers_btn', '--list-tampers', 'gui'),
+)
+
+# Mutual exclusion groups (at most one member may be set)
+MUTUAL_EXCLUSIONS: Dict[str, Tuple[str, ...]] = MappingProxyType({
+    'target_input': ('url', 'direct', 'log_file', 'bulk_file', 'request_file', 'google_dork'),
+    'user_agent_type': ('user_agent', 'random_agent', 'mobile'),
+    'proxy_type': ('proxy', 'tor'),
+    'shell_access': ('sql_shell', 'os_shell', 'os_cmd'),
+    'data_output': ('dump_all', 'sql_query', 'dump'),
+    'crawl_vs_threads': ('crawl', 'threads'),
+    'batch_vs_wizard': ('batch', 'wizard'),
+})
+
+# Groups the GUI enforces but sqlmap itself accepts together (kept out of command validation);
+# target_input is checked separately by the validator
+GUI_ONLY_EXCLUSIONS = frozenset({'target_input', 'crawl_vs_threads'})
+
+# Pairwise conflicts that are not expressed as an exclusion group
+_EXTRA_CONFLICTS = {
+    'offline': ('crawl', 'forms', 'check_internet'),
+}
+
+# Option -> options of which at least one must also be set
+DEPENDENCIES: Dict[str, Tuple[str, ...]] = MappingProxyType({
+    'csrf_token': ('url', 'forms'),
+    'csrf_url': ('forms',),
+    'data': ('url', 'request_file', 'log_file', 'bulk_file'),
+    'cookie': ('url', 'request_file', 'log_file', 'bulk_file', 'google_dork'),
+    'proxy_cred': ('proxy',),
+    'proxy_freq': ('proxy_file',),
+    'tor_port': ('tor',),
+    'tor_type': ('tor',),
+    'check_tor': ('tor',),
+    'safe_post': ('safe_url',),
+    'safe_req': ('safe_url',),
+    'safe_freq': ('safe_url', 'safe_post', 'safe_req'),
+    'dbms_cred': ('dbms',),
+    'second_req': ('request_file',),
+    'second_url': ('request_file',),
+    'db': ('dbs', 'tables', 'columns', 'dump', 'count', 'schema', 'search', 'common_tables', 'common_columns'),
+    'tbl': ('tables', 'columns', 'dump', 'count', 'search', 'common_columns'),
+    'col': ('columns', 'dump', 'search'),
+    'pivot_column': ('dump',),
+    'where': ('dump',),
+    'start': ('dump',),
+    'stop': ('dump',),
+    'first': ('dump',),
+    'last': ('dump',),
+    'reg_key': ('reg_read', 'reg_add', 'reg_del'),
+    'reg_value': ('reg_key',),
+    'reg_data': ('reg_add',),
+    'reg_type': ('reg_add',),
+    'shared_lib': ('udf_inject',),
+    'file_dest': ('file_write',),
+    'msf_path': ('os_pwn', 'os_smbrelay'),
+})
+
+# Dependencies the command validator reports as errors; the others are only advisory,
+# because sqlmap accepts those options on their own or with other targets (-r, -l, -m)
+REQUIRED_DEPENDENCIES = frozenset({
+    'proxy_freq', 'safe_freq', 'dbms_cred', 'second_req', 'second_url', 'csrf_token',
+    'reg_key', 'file_dest', 'pivot_column', 'where', 'start', 'stop', 'first', 'last',
+})
+
+# Spin-box options whose minimum value means "not set" in the GUI
+UNSET_AT_MINIMUM = frozenset({'start', 'stop', 'first', 'last', 'safe_freq', 'proxy_freq'})
+
+
+def _build_indexes():
+    by_name = {}
+    by_flag = {}
+    groups = {}
+    for spec in PARAMETERS:
+        by_name[spec.name] = spec
+        for flag in spec.flags:
+            by_flag.setdefault(flag, spec)
+        groups.setdefault(spec.group, []).append(spec.name)
+
+    option_groups = {}
+    conflicts = {}
+    for group_name, members in MUTUAL_EXCLUSIONS.items():
+        for member in members:
+            option_groups.setdefault(member, []).append(group_name)
+            conflicts.setdefault(member, []).extend(m for m in members if m != member)
+    for option, others in _EXTRA_CONFLICTS.items():
+        conflicts.setdefault(option, []).extend(others)
+        for other in others:
+            conflicts.setdefault(other, []).append(option)
+
+    return (by_name, by_flag, {g: tuple(m) for g, m in groups.items()},
+            {o: tuple(g) for o, g in option_groups.items()},
+            {o: tuple(dict.fromkeys(c)) for o, c in conflicts.items()})
+
+
+_by_name, _by_flag, _groups, _option_groups, _conflicts = _build_indexes()
+
+BY_NAME: Dict[str, ParameterSpec] = MappingProxyType(_by_name)
+BY_FLAG: Dict[str, ParameterSpec] = MappingProxyType(_by_flag)
+GROUPS: Dict[str, Tuple[str, ...]] = MappingProxyType(_groups)
+OPTION_EXCLUSION_GROUPS: Dict[str, Tuple[str, ...]] = MappingProxyType(_option_groups)
+CONFLICTS: Dict[str, Tuple[str, ...]] = MappingProxyType(_conflicts)
+
+TARGET_PARAMS: Tuple[str, ...] = GROUPS['target']
+TECHNIQUE_PARAMS: Tuple[ParameterSpec, ...] = tuple(s for s in PARAMETERS if s.kind == 'technique')
+VALID_TECHNIQUES = frozenset(s.technique for s in TECHNIQUE_PARAMS)
+HIGH_RISK: Dict[str, ParameterSpec] = MappingProxyType({s.name: s for s in PARAMETERS if s.risk})
+
+# Legacy dictionary views kept for callers that expect plain dicts
+ALL_PARAMS: Dict[str, Dict[str, Any]] = MappingProxyType(
+    {s.name: s.as_dict() for s in PARAMETERS})
+
+# Flag-level indexes for command-line validation (aliases included)
+TARGET_FLAGS = frozenset(f for name in TARGET_PARAMS for f in _by_name[name].flags)
+BOOLEAN_FLAGS = frozenset(f for f, s in _by_flag.items() if s.kind == 'flag')
+VALUE_FLAGS = frozenset(f for f, s in _by_flag.items() if s.kind != 'flag')
+NUMERIC_RANGES: Dict[str, Tuple[int, Optional[int]]] = MappingProxyType(
+    {f: s.value_range for f, s in _by_flag.items() if s.value_range})
+EXCLUSIVE_FLAG_GROUPS: Tuple[frozenset, ...] = tuple(
+    frozenset(f for name in members for f in _by_name[name].flags)
+    for group_name, members in MUTUAL_EXCLUSIONS.items() if group_name not in GUI_ONLY_EXCLUSIONS)
+FLAG_DEPENDENCIES: Dict[str, Tuple[str, ...]] = MappingProxyType({
+    flag: tuple(f for dep in deps for f in _by_name[dep].flags)
+    for name, deps in DEPENDENCIES.items() if name in REQUIRED_DEPENDENCIES for flag in _by_name[name].flags})
+ADVISORY_FLAG_DEPENDENCIES: Dict[str, Tuple[str, ...]] = MappingProxyType({
+    flag: tuple(f for dep in deps for f in _by_name[dep].flags)
+    for name, deps in DEPENDENCIES.items() if name not in REQUIRED_DEPENDENCIES for flag in _by_name[name].flags})
+HIGH_RISK_FLAGS: Dict[str, str] = MappingProxyType(
+    {s.flag: s.risk[1] for s in HIGH_RISK.values()})
+
+
+def options_from_flags(flags: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """GUI options for flags lexed from a sqlmap command line, and the flags no option knows"""
+    options: Dict[str, Any] = {}
+    unknown: List[str] = []
+    for flag, value in flags.items():
+        spec = _by_flag.get(flag)
+        if spec is None:
+            unknown.append(flag)
+        elif spec.kind == 'flag':
+            options[spec.name] = True
+        else:
+            options[spec.name] = value
+    return options, unknown
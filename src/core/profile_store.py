@@ -0,0 +1,262 @@
+"""
+Profile Store - Saved option profiles in one transactional SQLite database
+Saving or deleting a profile touches only that profile's row, so the cost does
+not grow with the number of profiles, and a crash mid-write leaves the previous
+version intact. Names, tags and creation times are indexed for lookups.
+
+Profiles kept in the older formats (profiles.json holding every profile, and
+one JSON file per profile under profiles/) are imported once.
+"""
+
+import datetime
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def default_store_path() -> Path:
+    return Path.home() / '.sqlmap-gui' / 'profiles.db'
+
+
+def _parse_timestamp(value: Any, default: float) -> float:
+    """Epoch seconds from an epoch number or an ISO 8601 string"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+class ProfileStore:
+    """Named option profiles with tags"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            name TEXT PRIMARY KEY,
+            options TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS profiles_by_created ON profiles (created_at);
+        CREATE TABLE IF NOT EXISTS profile_tags (
+            tag TEXT NOT NULL,
+            name TEXT NOT NULL REFERENCES profiles (name) ON DELETE CASCADE ON UPDATE CASCADE,
+            PRIMARY KEY (tag, name)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS profile_tags_by_name ON profile_tags (name);
+        CREATE TABLE IF NOT EXISTS store_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        ) WITHOUT ROWID;
+    """
+
+    # Keeps created_at of an existing profile
+    UPSERT = """
+        INSERT INTO profiles (name, options, created_at, updated_at) VALUES (?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET options = excluded.options, updated_at = excluded.updated_at
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else default_store_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> 'ProfileStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Updates
+
+    def save(self, name: str, options: Dict[str, Any], tags: Optional[Iterable[str]] = None,
+             created_at: Optional[float] = None) -> bool:
+        """Insert or replace one profile; tags are replaced only when given"""
+        now = time.time()
+        data = json.dumps(options, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            with self.conn:
+                self.conn.execute(self.UPSERT, (name, data, created_at or now, now))
+                if tags is not None:
+                    self._set_tags(name, tags)
+        return True
+
+    def _set_tags(self, name: str, tags: Iterable[str]):
+        self.conn.execute("DELETE FROM profile_tags WHERE name = ?", (name,))
+        self.conn.executemany("INSERT OR IGNORE INTO profile_tags (tag, name) VALUES (?, ?)",
+                              [(tag.strip(), name) for tag in tags if tag and tag.strip()])
+
+    def set_tags(self, name: str, tags: Iterable[str]) -> bool:
+        with self._lock:
+            with self.conn:
+                if not self.exists(name):
+                    return False
+                self._set_tags(name, tags)
+        return True
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            with self.conn:
+                cursor = self.conn.execute("DELETE FROM profiles WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def rename(self, old: str, new: str) -> bool:
+        with self._lock:
+            try:
+                with self.conn:
+                    cursor = self.conn.execute("UPDATE profiles SET name = ?, updated_at = ? WHERE name = ?",
+                                               (new, time.time(), old))
+            except sqlite3.IntegrityError:
+                return False  # A profile called `new` already exists
+        return cursor.rowcount > 0
+
+    # Lookups
+
+    def exists(self, name: str) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM profiles WHERE name = ?", (name,)).fetchone() is not None
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """Options of a profile, or None if there is no such profile"""
+        with self._lock:
+            row = self.conn.execute("SELECT options FROM profiles WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def info(self, name: str) -> Optional[Dict[str, Any]]:
+        """Options, tags and timestamps of a profile"""
+        with self._lock:
+            row = self.conn.execute("SELECT options, created_at, updated_at FROM profiles WHERE name = ?",
+                                    (name,)).fetchone()
+            if not row:
+                return None
+            tags = [tag for tag, in self.conn.execute(
+                "SELECT tag FROM profile_tags WHERE name = ? ORDER BY tag", (name,))]
+        return {'name': name, 'options': json.loads(row[0]), 'tags': tags,
+                'created_at': row[1], 'updated_at': row[2]}
+
+    def names(self, prefix: str = '', limit: int = -1, offset: int = 0) -> List[str]:
+        """Profile names in order, optionally only those starting with `prefix`"""
+        with self._lock:
+            if prefix:
+                # A range on the primary key, so the prefix search stays indexed
+                rows = self.conn.execute(
+                    "SELECT name FROM profiles WHERE name >= ? AND name < ? ORDER BY name LIMIT ? OFFSET ?",
+                    (prefix, prefix + '\U0010ffff', limit, offset))
+            else:
+                rows = self.conn.execute("SELECT name FROM profiles ORDER BY name LIMIT ? OFFSET ?",
+                                         (limit, offset))
+            return [name for name, in rows]
+
+    def with_tag(self, tag: str) -> List[str]:
+        with self._lock:
+            return [name for name, in self.conn.execute(
+                "SELECT name FROM profile_tags WHERE tag = ? ORDER BY name", (tag,))]
+
+    def tags(self) -> Dict[str, int]:
+        """Profile count per tag"""
+        with self._lock:
+            return dict(self.conn.execute("SELECT tag, COUNT(*) FROM profile_tags GROUP BY tag ORDER BY tag"))
+
+    def created_between(self, start: float = 0.0, end: Optional[float] = None, limit: int = -1) -> List[str]:
+        """Names of profiles created in [start, end), newest first"""
+        with self._lock:
+            return [name for name, in self.conn.execute(
+                "SELECT name FROM profiles WHERE created_at >= ? AND created_at < ? "
+                "ORDER BY created_at DESC LIMIT ?", (start, end if end is not None else float('inf'), limit))]
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Every profile with its options and timestamps (reads the whole store)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT name, options, created_at, updated_at FROM profiles ORDER BY name").fetchall()
+        return [{'name': name, 'options': json.loads(options), 'created_at': created, 'updated_at': updated}
+                for name, options, created, updated in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    # Migration
+
+    def _migrated(self, source: Path) -> bool:
+        row = self.conn.execute("SELECT 1 FROM store_meta WHERE key = ?", (f"migrated:{source}",)).fetchone()
+        return row is not None
+
+    def _mark_migrated(self, source: Path, count: int):
+        self.conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                          (f"migrated:{source}", json.dumps({'profiles': count, 'at': time.time()})))
+
+    def migrate_legacy(self, profiles_json: Optional[Path] = None, profiles_dir: Optional[Path] = None) -> int:
+        """Import profiles from the older JSON formats once; profiles already in the store win
+
+        The old files are left where they are. Returns the number of profiles imported.
+        """
+        imported = 0
+        with self._lock:
+            if profiles_json and Path(profiles_json).is_file() and not self._migrated(Path(profiles_json)):
+                try:
+                    with open(profiles_json, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if not isinstance(data, dict):
+                        raise ValueError("not a JSON object")
+                    with self.conn:
+                        for name, entry in data.items():
+                            if not isinstance(entry, dict):
+                                continue
+                            options = entry.get('options', {})
+                            created = _parse_timestamp(entry.get('created_at'), time.time())
+                            imported += self._import(str(entry.get('name') or name), options, created)
+                        self._mark_migrated(Path(profiles_json), len(data))
+                except (OSError, ValueError) as e:
+                    print(f"Error migrating profiles from {profiles_json}: {e}")
+
+            if profiles_dir and Path(profiles_dir).is_dir() and not self._migrated(Path(profiles_dir)):
+                files = sorted(Path(profiles_dir).glob('*.json'))
+                with self.conn:
+                    for profile_file in files:
+                        try:
+                            with open(profile_file, 'r', encoding='utf-8') as f:
+                                options = json.load(f)
+                        except (OSError, ValueError) as e:
+                            print(f"Skipping unreadable profile {profile_file}: {e}")
+                            continue
+                        imported += self._import(profile_file.stem, options, profile_file.stat().st_mtime)
+                    self._mark_migrated(Path(profiles_dir), len(files))
+        return imported
+
+    def _import(self, name: str, options: Any, created_at: float) -> int:
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO profiles (name, options, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (name, json.dumps(options, ensure_ascii=False, separators=(',', ':')), created_at, created_at))
+        return cursor.rowcount
+
+
+_default_store: Optional[ProfileStore] = None
+_default_lock = threading.Lock()
+
+
+def get_default_store() -> ProfileStore:
+    """The store under ~/.sqlmap-gui, with the older profile files imported on first use"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            store = ProfileStore()
+            config_dir = default_store_path().parent
+            store.migrate_legacy(config_dir / 'profiles.json', config_dir / 'profiles')
+            _default_store = store
+        return _default_store
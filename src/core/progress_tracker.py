@@ -0,0 +1,322 @@
+"""
+Progress Tracker - Phase-aware percentage and ETA from sqlmap output
+sqlmap has no overall progress indicator, so the tracker maps the phase
+markers it does print (connection checks, heuristic tests, "testing '...'"
+lines, enumeration steps, entry counts and --eta bars) onto bands of one
+0-100 scale, and estimates the time left from how fast the scan moves through it
+"""
+
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .output_events import parse_log_line
+
+
+# Phases in scan order, with the band of the overall percentage each one covers
+STARTING = 'starting'
+CONNECTION = 'connection'
+HEURISTICS = 'heuristics'
+DETECTION = 'detection'
+ENUMERATION = 'enumeration'
+FINISHED = 'finished'
+
+PHASE_BANDS = {
+    STARTING: (0.0, 2.0),
+    CONNECTION: (2.0, 5.0),
+    HEURISTICS: (5.0, 10.0),
+    DETECTION: (10.0, 60.0),
+    ENUMERATION: (60.0, 100.0),
+    FINISHED: (100.0, 100.0),
+}
+PHASE_ORDER = tuple(PHASE_BANDS)
+# Detection runs to the end of the scale when nothing is enumerated afterwards
+DETECTION_ONLY_BAND = (10.0, 97.0)
+
+# Test payloads sqlmap runs per parameter with all techniques, by [level][risk]
+# (counted from sqlmap's data/xml/payloads); techniques scale it down
+EXPECTED_TESTS = {
+    1: (21, 21, 28),
+    2: (57, 64, 83),
+    3: (115, 130, 169),
+    4: (163, 199, 256),
+    5: (217, 282, 365),
+}
+TECHNIQUE_LETTERS = 'BEUSTQ'
+
+# Options that make sqlmap go on retrieving data after detection
+ENUMERATION_OPTIONS = ('all', 'banner', 'current_user', 'current_db', 'hostname', 'is_dba', 'users', 'passwords',
+                       'privileges', 'roles', 'dbs', 'tables', 'columns', 'schema', 'count', 'dump', 'dump_all',
+                       'search', 'comments', 'statements', 'sql_query', 'file_read', 'os_cmd')
+
+# Share of the enumeration band each "fetching ..." step takes from what is left
+ENUMERATION_STEP = 0.25
+
+# Seconds of history before a rate-based ETA is trusted
+MIN_ETA_ELAPSED = 5.0
+
+# "45% [=====>      ] 12/30 (ETA 00:12)", several per line once \r is stripped
+_ETA_BAR = re.compile(r'(\d{1,3})%\s*\[[=> ]*\]\s*(\d+)/(\d+)\s*(?:\(ETA (\?\?:\?\?|\d+:\d{2})\))?')
+_RETRIEVED_COUNT = re.compile(r'^retrieved: (\d+)(?:/(\d+))?$')
+_TESTING_TECHNIQUE = re.compile(r"^testing '")
+_PARAMETER_DONE = ('does not seem to be injectable', 'is not injectable')
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """mm:ss (or h:mm:ss) for a number of seconds, '--:--' if unknown"""
+    if seconds is None:
+        return '--:--'
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def _parse_clock(text: str) -> Optional[int]:
+    if not text or '?' in text:
+        return None
+    minutes, seconds = text.split(':')
+    return int(minutes) * 60 + int(seconds)
+
+
+class ScanProgress:
+    """Progress of one sqlmap run, fed line by line"""
+
+    def __init__(self, parameters: int = 1, level: int = 1, risk: int = 1, techniques: int = 6,
+                 enumerates: bool = False, clock=time.time):
+        self.parameters = max(1, parameters)
+        level = min(max(int(level), 1), 5)
+        risk = min(max(int(risk), 1), 3)
+        self.tests_per_parameter = max(1, EXPECTED_TESTS[level][risk - 1] * max(1, techniques) // 6)
+        self.enumerates = enumerates
+        self.clock = clock
+        self.started = clock()
+
+        self.phase = STARTING
+        self.percent = 0.0
+        self.eta: Optional[float] = None
+        self.changed = False  # Set whenever percent, phase or ETA moves; cleared by the reader
+
+        self.parameters_done = 0
+        self.tests = 0  # "testing '...'" lines for the current parameter
+        self.enumeration_steps = 0
+        self.expected_entries = 0  # From "retrieved: N" after "fetching number of ..."
+        self.entries = 0
+        self.awaiting_count = False
+        self.bar_eta: Optional[int] = None
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any], **kwargs) -> 'ScanProgress':
+        """Size the detection phase from the scan's target and level/risk/technique options"""
+        names = set()
+        url = options.get('url') or ''
+        if url:
+            names.update(name for name, _ in parse_qsl(urlsplit(url).query, keep_blank_values=True))
+        if options.get('data'):
+            names.update(name for name, _ in parse_qsl(str(options['data']), keep_blank_values=True))
+        testable = options.get('testable_parameter')
+        if testable:
+            names = {name.strip() for name in str(testable).split(',') if name.strip()}
+        technique = str(options.get('technique') or '').upper()
+        if technique:
+            techniques = len(set(technique) & set(TECHNIQUE_LETTERS))
+        else:
+            switches = ('boolean_blind', 'error_based', 'union_based', 'stacked_queries', 'time_based',
+                        'inline_queries')
+            techniques = sum(1 for name in switches if options.get(name)) or 6
+        try:
+            level, risk = int(options.get('level') or 1), int(options.get('risk') or 1)
+        except (TypeError, ValueError):
+            level, risk = 1, 1
+        return cls(parameters=len(names) or 1, level=level, risk=risk, techniques=techniques,
+                   enumerates=any(options.get(name) for name in ENUMERATION_OPTIONS), **kwargs)
+
+    # Feeding
+
+    def feed_line(self, line: str):
+        """Account for one raw line of sqlmap output"""
+        level, message = parse_log_line(line)
+        self.feed(level, message)
+
+    def feed(self, level: Optional[str], message: str):
+        """Account for one already parsed line; only INFO lines and --eta bars move progress"""
+        if level is None:
+            if '%' in message and '[' in message:
+                self._eta_bar(message)
+            elif message.startswith('sqlmap identified the following') or \
+                    message.startswith('sqlmap resumed the following'):
+                self._enter(DETECTION, 1.0)
+            elif 'is vulnerable. Do you want to keep testing' in message:
+                self._parameter_done()
+            return
+        if level == 'WARNING':
+            if any(marker in message for marker in _PARAMETER_DONE):
+                self._parameter_done()
+                self._update_eta()
+            return
+        if level != 'INFO':
+            return
+
+        if _TESTING_TECHNIQUE.match(message):
+            self.tests += 1
+            self._detection()
+        elif message.startswith('retrieved: '):
+            self._retrieved(message)
+        elif message.startswith('fetching '):
+            self._fetching(message)
+        elif message.startswith('testing for SQL injection on'):
+            self.tests = 0
+            self._detection()
+        elif message.startswith('testing connection to the target'):
+            self._enter(CONNECTION, 0.0)
+        elif message.startswith('checking if the target is protected') or \
+                message.startswith('testing if the target URL content is stable'):
+            self._enter(HEURISTICS, 0.2)
+        elif message.startswith('testing if ') and message.endswith('is dynamic'):
+            self._enter(HEURISTICS, 0.5)
+        elif message.startswith('heuristic (basic) test'):
+            self._enter(HEURISTICS, 0.9)
+        elif message.startswith('the back-end DBMS is'):
+            self._enter(ENUMERATION if self.enumerates else DETECTION, 0.0 if self.enumerates else 1.0)
+        elif message.startswith('fetched data logged to text files') or message.startswith('ending @'):
+            self.finish()
+        self._update_eta()
+
+    def finish(self):
+        self._enter(FINISHED, 1.0)
+        self.eta = 0.0
+
+    # Phases
+
+    def _band(self, phase: str) -> Tuple[float, float]:
+        if phase == DETECTION and not self.enumerates:
+            return DETECTION_ONLY_BAND
+        return PHASE_BANDS[phase]
+
+    def _enter(self, phase: str, fraction: float):
+        """Move to `fraction` of a phase's band; progress never goes backwards"""
+        start, end = self._band(phase)
+        percent = start + (end - start) * min(max(fraction, 0.0), 1.0)
+        if percent > self.percent:
+            self.percent = percent
+            self.changed = True
+        if PHASE_ORDER.index(phase) > PHASE_ORDER.index(self.phase):
+            self.phase = phase
+            self.changed = True
+
+    def _detection(self):
+        within = min(self.tests / self.tests_per_parameter, 0.95)
+        done = min(self.parameters_done + within, self.parameters)
+        self._enter(DETECTION, done / self.parameters)
+
+    def _parameter_done(self):
+        self.parameters_done += 1
+        self.tests = 0
+        self._detection()
+
+    def _fetching(self, message: str):
+        if self.phase != ENUMERATION:
+            self._enter(ENUMERATION, 0.0)
+        self.enumeration_steps += 1
+        self.awaiting_count = message.startswith('fetching number of')
+        self.expected_entries = self.entries = 0
+        self.bar_eta = None
+        self._enumeration()
+
+    def _retrieved(self, message: str):
+        match = _RETRIEVED_COUNT.match(message)
+        if match and match.group(2):
+            # An explicit "retrieved: x/y" counter
+            self.entries, self.expected_entries = int(match.group(1)), int(match.group(2))
+        elif match and self.awaiting_count:
+            self.expected_entries = int(match.group(1))
+            self.entries = 0
+        else:
+            self.entries += 1
+        self.awaiting_count = False
+        self.bar_eta = None  # The bar belonged to the value just retrieved
+        if self.phase == ENUMERATION:
+            self._enumeration()
+
+    def _enumeration(self, step_fraction: Optional[float] = None):
+        """Each step takes a share of what is left, so the band is approached but never overrun"""
+        if step_fraction is None and self.expected_entries:
+            step_fraction = min(self.entries / self.expected_entries, 1.0)
+        done = 1.0 - (1.0 - ENUMERATION_STEP) ** max(self.enumeration_steps - 1, 0)
+        step = (1.0 - done) * ENUMERATION_STEP * (step_fraction or 0.0)
+        self._enter(ENUMERATION, done + step)
+
+    def _eta_bar(self, message: str):
+        matches = _ETA_BAR.findall(message)
+        if not matches:
+            return
+        percent, _, _, eta = matches[-1]  # The bar is redrawn in place; the last one is current
+        self.bar_eta = _parse_clock(eta)
+        if self.phase == ENUMERATION:
+            self._enumeration(min(int(percent), 100) / 100.0)
+        self._update_eta()
+
+    # Estimates
+
+    def _update_eta(self):
+        if self.phase == FINISHED:
+            return
+        elapsed = self.clock() - self.started
+        eta = None
+        if self.bar_eta is not None:
+            eta = float(self.bar_eta)  # sqlmap's own estimate for the retrieval under way
+        elif self.percent >= 1.0 and elapsed >= MIN_ETA_ELAPSED:
+            eta = elapsed * (100.0 - self.percent) / self.percent
+        if eta is None and self.eta is None:
+            return
+        if eta is None or self.eta is None or abs(eta - self.eta) >= 1.0:
+            self.eta = eta
+            self.changed = True
+
+    def take_changed(self) -> bool:
+        changed, self.changed = self.changed, False
+        return changed
+
+    def snapshot(self) -> Tuple[int, Optional[int], str]:
+        """(percent, seconds left or None, phase)"""
+        return int(self.percent), (int(self.eta) if self.eta is not None else None), self.phase
+
+    def describe(self) -> str:
+        percent, eta, phase = self.snapshot()
+        return f"{phase} {percent}% (ETA {format_eta(eta)})"
+
+
+class ProgressAggregator:
+    """Combined progress of concurrent scans, for one status display"""
+
+    def __init__(self):
+        self.scans: Dict[str, Tuple[int, Optional[int], str]] = {}
+
+    def update(self, scan_id: str, percent: int, eta: Optional[int], phase: str):
+        self.scans[scan_id] = (percent, eta, phase)
+
+    def remove(self, scan_id: str):
+        self.scans.pop(scan_id, None)
+
+    def clear(self):
+        self.scans.clear()
+
+    def __len__(self) -> int:
+        return len(self.scans)
+
+    def combined(self) -> Tuple[int, Optional[int]]:
+        """Mean percentage, and the longest ETA since all scans have to finish"""
+        if not self.scans:
+            return 0, None
+        percent = sum(scan[0] for scan in self.scans.values()) // len(self.scans)
+        etas = [scan[1] for scan in self.scans.values()]
+        eta = None if any(value is None for value in etas) else max(etas)
+        return percent, eta
+
+    def describe(self) -> str:
+        percent, eta = self.combined()
+        if len(self.scans) == 1:
+            phase = next(iter(self.scans.values()))[2]
+            return f"Scanning ({phase}): {percent}% - ETA {format_eta(eta)}"
+        return f"{len(self.scans)} scans: {percent}% - ETA {format_eta(eta)}"
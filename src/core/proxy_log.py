@@ -0,0 +1,357 @@
+"""
+Proxy Log - Streaming Burp/ZAP proxy log preprocessor for sqlmap -l
+Collapses requests that hit the same injection points (method, path template,
+parameter names, content type) into one representative, reading the log line
+by line so multi-GB logs are handled in constant memory
+
+Run with: python -m src.core.proxy_log proxy.log -o deduplicated.log
+"""
+
+import json
+import os
+import re
+import time
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+
+# Burp frames every item with a line of '=' characters; ZAP exports use "==== 12 =========="
+_SEPARATOR = re.compile(r'^={3,}\s*(?:\d+\s*=+)?\s*$')
+# Burp item header: "10:52:56  http://example.com:80  [1.2.3.4]"
+_BURP_HEADER = re.compile(r'^\S*\s+(https?://[^\s\[]+)(?:\s+\[[^\]]*\])?\s*$', re.I)
+_REQUEST_LINE = re.compile(r'^([A-Z]{3,})\s+(\S+)\s+HTTP/\d(?:\.\d)?\s*$')
+_MULTIPART_NAME = re.compile(r'\bname="([^"]*)"', re.I)
+
+# Path segments that vary per object rather than per endpoint
+_NUMERIC = re.compile(r'^\d+$')
+_HEX_ID = re.compile(r'^(?=.*\d)[0-9a-f]{16,}$', re.I)
+_UUID = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
+
+# Bodies beyond this size are truncated for parameter extraction only
+MAX_BODY_PARSE = 1024 * 1024
+
+
+class ProxyRequest:
+    """One HTTP request taken from a proxy log"""
+
+    __slots__ = ('method', 'target', 'base_url', 'headers', 'body', 'raw')
+
+    def __init__(self, method: str, target: str, base_url: Optional[str],
+                 headers: List[Tuple[str, str]], body: str, raw: str):
+        self.method = method
+        self.target = target      # Request-line target (path or absolute URL)
+        self.base_url = base_url  # scheme://host:port from the log item header
+        self.headers = headers
+        self.body = body
+        self.raw = raw            # Request exactly as logged
+
+    def __repr__(self) -> str:
+        return f"ProxyRequest({self.method} {self.url})"
+
+    def header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    @property
+    def url(self) -> str:
+        """Absolute URL of the request"""
+        if '://' in self.target:
+            return self.target
+        if self.base_url:
+            return self.base_url.rstrip('/') + self.target
+        host = self.header('Host') or ''
+        return f"http://{host}{self.target}"
+
+    @property
+    def content_type(self) -> str:
+        """Media type without parameters, e.g. 'application/json'"""
+        value = self.header('Content-Type') or ''
+        return value.split(';', 1)[0].strip().lower()
+
+
+def _parse_block(lines: List[str], base_url: Optional[str]) -> Optional[ProxyRequest]:
+    """Parse the lines of one log item into a request, or None if it is not one"""
+    start = 0
+    while start < len(lines) and not lines[start].strip():
+        start += 1
+    if start == len(lines):
+        return None
+    match = _REQUEST_LINE.match(lines[start].rstrip('\r\n'))
+    if not match:
+        return None
+
+    headers = []
+    i = start + 1
+    while i < len(lines):
+        line = lines[i].rstrip('\r\n')
+        i += 1
+        if not line:
+            break
+        name, sep, value = line.partition(':')
+        if sep:
+            headers.append((name.strip(), value.strip()))
+
+    body = ''.join(lines[i:]).rstrip('\r\n')
+    raw = ''.join(lines[start:]).rstrip('\r\n')
+    return ProxyRequest(match.group(1), match.group(2), base_url, headers, body, raw)
+
+
+def iter_log_requests(stream: IO[str]) -> Iterator[Optional[ProxyRequest]]:
+    """Stream requests from a Burp or ZAP log
+
+    Yields a ProxyRequest per logged request and None for items that are not
+    requests (responses, malformed items), so callers can count them.
+    """
+    block: List[str] = []
+    pending_base = None
+
+    for line in stream:
+        if _SEPARATOR.match(line):
+            if block:
+                header = _BURP_HEADER.match(block[0].strip()) if len(block) <= 2 else None
+                if header and not any(_REQUEST_LINE.match(item.strip()) for item in block):
+                    # Burp item header; the request follows the next separator
+                    pending_base = header.group(1)
+                else:
+                    yield _parse_block(block, pending_base)
+                    pending_base = None
+                block = []
+            continue
+        if block or line.strip():
+            block.append(line)
+
+    if block:
+        yield _parse_block(block, pending_base)
+
+
+def template_path(path: str) -> str:
+    """Replace per-object path segments (ids, hashes, UUIDs) with placeholders"""
+    segments = path.split('/')
+    for i, segment in enumerate(segments):
+        if not segment:
+            continue
+        if _NUMERIC.match(segment):
+            segments[i] = '{n}'
+        elif _UUID.match(segment):
+            segments[i] = '{uuid}'
+        elif _HEX_ID.match(segment):
+            segments[i] = '{hex}'
+    return '/'.join(segments)
+
+
+def _json_keys(value: Any, prefix: str = '') -> Iterator[str]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            name = f"{prefix}.{key}" if prefix else str(key)
+            yield name
+            yield from _json_keys(item, name)
+    elif isinstance(value, list) and value:
+        # Arrays are treated as homogeneous: their first element stands for all
+        yield from _json_keys(value[0], prefix + '[]')
+
+
+def body_parameter_names(request: ProxyRequest) -> Tuple[str, ...]:
+    """Names of the parameters carried in the request body"""
+    body = request.body[:MAX_BODY_PARSE]
+    if not body:
+        return ()
+    content_type = request.content_type
+    if 'json' in content_type or (not content_type and body.lstrip()[:1] in ('{', '[')):
+        try:
+            return tuple(_json_keys(json.loads(body)))
+        except ValueError:
+            return ()
+    if content_type.startswith('multipart/'):
+        return tuple(_MULTIPART_NAME.findall(body))
+    if not content_type or content_type == 'application/x-www-form-urlencoded':
+        return tuple(name for name, _ in parse_qsl(body, keep_blank_values=True))
+    return ()
+
+
+def request_signature(request: ProxyRequest, include_cookies: bool = False) -> Tuple:
+    """Signature of the injection points a request exposes"""
+    parts = urlsplit(request.url)
+    query_names = frozenset(name for name, _ in parse_qsl(parts.query, keep_blank_values=True))
+    body_names = frozenset(body_parameter_names(request))
+    cookie_names = frozenset()
+    if include_cookies:
+        cookie = request.header('Cookie') or ''
+        cookie_names = frozenset(item.split('=', 1)[0].strip() for item in cookie.split(';') if '=' in item)
+    return (request.method, parts.scheme.lower(), parts.netloc.lower(), template_path(parts.path),
+            query_names, body_names, request.content_type, cookie_names)
+
+
+def target_signature(url: str, method: str = 'GET', body_names: Iterable[str] = ()) -> str:
+    """Stable text form of an endpoint: method, scheme/host, path template, parameter names"""
+    if '://' not in url:
+        url = 'http://' + url
+    parts = urlsplit(url)
+    netloc = parts.netloc.lower()
+    # Proxy logs spell out the port; URLs typed into a scan usually do not
+    default_port = {'http': ':80', 'https': ':443'}.get(parts.scheme.lower())
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+    query_names = sorted({name for name, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    return (f"{method.upper()} {parts.scheme.lower()}://{netloc}{template_path(parts.path)}"
+            f"?{'&'.join(query_names)}|{'&'.join(sorted(set(body_names)))}")
+
+
+def _log_item(request: ProxyRequest) -> str:
+    """Format a request as a Burp log item that sqlmap -l can read"""
+    parts = urlsplit(request.url)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    base = f"{parts.scheme}://{parts.hostname}:{port}"
+    separator = '=' * 54
+    return (f"{separator}\n{time.strftime('%H:%M:%S')}  {base}  [{parts.hostname}]\n{separator}\n"
+            f"{request.raw}\n{separator}\n\n\n\n")
+
+
+class DeduplicationStats:
+    """Counters of one preprocessing run"""
+
+    def __init__(self):
+        self.items = 0        # Log items read
+        self.requests = 0     # Items that were HTTP requests
+        self.unique = 0       # Representatives written
+        self.collapsed = 0    # Requests dropped as duplicates of a representative
+        self.skipped = 0      # Items that were not requests
+        self.no_params = 0    # Requests without any parameter to test (dropped)
+        self.already_tested = 0  # Injection points covered by earlier scans (dropped)
+        self.bytes_read = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+    def summary(self) -> str:
+        ratio = (self.collapsed / self.requests * 100) if self.requests else 0.0
+        return (f"{self.requests} requests -> {self.unique} unique injection points "
+                f"({self.collapsed} collapsed, {ratio:.1f}%; {self.no_params} without parameters, "
+                f"{self.already_tested} already tested, {self.skipped} non-request items)")
+
+
+class ProxyLogDeduplicator:
+    """Keeps the first request of every signature and counts the rest
+
+    Memory grows with the number of distinct signatures, not with log size.
+    """
+
+    def __init__(self, include_cookies: bool = False, keep_parameterless: bool = False):
+        self.include_cookies = include_cookies
+        self.keep_parameterless = keep_parameterless
+        self.seen: Dict[Tuple, int] = {}  # Signature -> number of requests collapsed into it
+        self.stats = DeduplicationStats()
+
+    def feed(self, request: Optional[ProxyRequest]) -> Optional[Tuple]:
+        """Account for one log item; returns its signature if it is a new representative"""
+        stats = self.stats
+        stats.items += 1
+        if request is None:
+            stats.skipped += 1
+            return None
+        stats.requests += 1
+
+        signature = request_signature(request, self.include_cookies)
+        if not self.keep_parameterless and not (signature[4] or signature[5] or signature[7]):
+            stats.no_params += 1
+            return None
+        if signature in self.seen:
+            self.seen[signature] += 1
+            stats.collapsed += 1
+            return None
+        self.seen[signature] = 0
+        stats.unique += 1
+        return signature
+
+    def top_collapsed(self, count: int = 10) -> List[Tuple[Tuple, int]]:
+        """Signatures that absorbed the most duplicates"""
+        return sorted(self.seen.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def preprocess_log(log_path: str, output_log: Optional[str] = None, request_dir: Optional[str] = None,
+                   include_cookies: bool = False, keep_parameterless: bool = False,
+                   registry=None, coverage: Optional[str] = None) -> DeduplicationStats:
+    """Deduplicate a proxy log into a compact log and/or one request file per injection point
+
+    With a TargetRegistry and the coverage fingerprint of the scan options,
+    injection points already covered by earlier scans are dropped as well.
+    """
+    if not output_log and not request_dir:
+        raise ValueError("Need an output log or a request file directory")
+
+    dedup = ProxyLogDeduplicator(include_cookies, keep_parameterless)
+    dedup.stats.bytes_read = os.path.getsize(log_path)
+    if request_dir:
+        os.makedirs(request_dir, exist_ok=True)
+
+    out = open(output_log, 'w', encoding='utf-8') if output_log else None
+    try:
+        with open(log_path, 'r', encoding='utf-8', errors='replace', newline='') as stream:
+            for request in iter_log_requests(stream):
+                if dedup.feed(request) is None:
+                    continue
+                if registry is not None and coverage is not None:
+                    target = target_signature(request.url, request.method, body_parameter_names(request))
+                    if registry.is_covered(target, coverage):
+                        dedup.stats.unique -= 1
+                        dedup.stats.already_tested += 1
+                        continue
+                if out:
+                    out.write(_log_item(request))
+                if request_dir:
+                    path = os.path.join(request_dir, f"request-{dedup.stats.unique:06d}.txt")
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(request.raw)
+                        f.write('\n')
+    finally:
+        if out:
+            out.close()
+    return dedup.stats
+
+
+def default_output_path(log_path: str) -> str:
+    """"scan.log" -> "scan.dedup.log" next to the original"""
+    root, ext = os.path.splitext(log_path)
+    return f"{root}.dedup{ext or '.log'}"
+
+
+def main():
+    """Deduplicate a Burp/ZAP proxy log for sqlmap -l"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Collapse duplicate injection points in a proxy log")
+    parser.add_argument('log', help="Burp or ZAP proxy log")
+    parser.add_argument('-o', '--output', default=None, help="deduplicated log (default: <log>.dedup.log)")
+    parser.add_argument('--request-dir', default=None, help="also write one request file per injection point")
+    parser.add_argument('--cookies', action='store_true', help="treat cookie names as injection points")
+    parser.add_argument('--keep-parameterless', action='store_true', help="keep requests without parameters")
+    parser.add_argument('--skip-tested', metavar='PROFILE', default=None,
+                        help="also drop injection points the tested-target registry says scans with this "
+                             "GUI profile (file or saved name) already covered")
+    args = parser.parse_args()
+
+    registry, coverage = None, None
+    if args.skip_tested:
+        from ..cli import load_profile_options
+        from .target_registry import TargetRegistry, coverage_fingerprint
+        try:
+            coverage = coverage_fingerprint(load_profile_options(args.skip_tested))
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot load profile: {e}")
+        registry = TargetRegistry()
+
+    output = args.output or default_output_path(args.log)
+    try:
+        stats = preprocess_log(args.log, output, args.request_dir, args.cookies, args.keep_parameterless,
+                               registry, coverage)
+    finally:
+        if registry is not None:
+            registry.close()
+    print(stats.summary())
+    print(f"Deduplicated log: {output}")
+
+
+if __name__ == "__main__":
+    main()
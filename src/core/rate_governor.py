@@ -0,0 +1,270 @@
+"""
+Rate Governor - Host-aware request budgets shared by concurrently running scans
+Splits a per-host requests-per-second and concurrency budget (and an optional
+global outbound budget) across the jobs hitting each host by rewriting their
+--threads and --delay at launch
+"""
+
+import math
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+def target_host(target: str) -> str:
+    """Host (and explicit port) a target URL points at"""
+    if '://' not in target:
+        target = 'http://' + target
+    try:
+        parts = urlsplit(target)
+        host = (parts.hostname or '').lower()
+        port = parts.port
+    except ValueError:
+        return ''
+    return f"{host}:{port}" if port else host
+
+
+def options_host(options: Dict[str, Any]) -> str:
+    """Host an option set scans, or '' when it is not known up front"""
+    url = options.get('url')
+    return target_host(str(url).strip()) if url else ''
+
+
+class HostBudget:
+    """Requests-per-second and concurrent-request limits for one host"""
+
+    __slots__ = ('rps', 'concurrency')
+
+    def __init__(self, rps: Optional[float] = None, concurrency: Optional[int] = None):
+        self.rps = rps                  # None = no rate limit
+        self.concurrency = concurrency  # None = no concurrency limit
+
+    def __repr__(self) -> str:
+        return f"HostBudget(rps={self.rps}, concurrency={self.concurrency})"
+
+
+class JobAllocation:
+    """What a job asked for and the share of its host budget it was given"""
+
+    __slots__ = ('job_id', 'host', 'requested_threads', 'requested_delay', 'threads', 'delay', 'launched')
+
+    def __init__(self, job_id: str, host: str, requested_threads: int, requested_delay: float):
+        self.job_id = job_id
+        self.host = host
+        self.requested_threads = requested_threads
+        self.requested_delay = requested_delay
+        self.threads = requested_threads
+        self.delay = requested_delay
+        self.launched = 0  # threads the job was started with, held until release
+
+    def __repr__(self) -> str:
+        return f"JobAllocation({self.job_id!r}, {self.host!r}, threads={self.threads}, delay={self.delay})"
+
+    @property
+    def rps(self) -> Optional[float]:
+        """Approximate request rate of the job (threads / delay)"""
+        return self.threads / self.delay if self.delay else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id, 'host': self.host,
+            'requested_threads': self.requested_threads, 'requested_delay': self.requested_delay,
+            'threads': self.threads, 'delay': self.delay, 'launched': self.launched,
+        }
+
+
+def _as_number(value: Any, cast, default):
+    try:
+        return cast(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        return default
+
+
+class RateGovernor:
+    """Shares per-host and global request budgets across running jobs
+
+    Each job's rate is taken as threads / delay (sqlmap sleeps --delay seconds
+    before every request in every thread). Jobs never get more threads or a
+    shorter delay than they asked for. sqlmap cannot be re-tuned mid-run, so
+    rebalancing on start/finish affects the jobs launched afterwards; the
+    returned allocations say what running jobs would now be entitled to.
+    Threads a job launched with stay held until it is released, and a job
+    that would push a host (or the global budget) past its concurrency limit
+    is refused so the caller can wait for a slot.
+    """
+
+    def __init__(self, host_rps: Optional[float] = None, host_concurrency: Optional[int] = 10,
+                 global_rps: Optional[float] = None, global_concurrency: Optional[int] = None):
+        self.default_budget = HostBudget(host_rps, host_concurrency)
+        self.host_budgets: Dict[str, HostBudget] = {}
+        self.global_rps = global_rps
+        self.global_concurrency = global_concurrency
+        self.jobs: Dict[str, JobAllocation] = {}
+        self._rps_shares: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RateGovernor':
+        """Build a governor from the 'rate_limits' config section (0 means unlimited)"""
+        def limit(key, cast):
+            value = _as_number(config.get(key), cast, None)
+            return value if value and value > 0 else None
+
+        governor = cls(limit('host_rps', float), limit('host_concurrency', int),
+                       limit('global_rps', float), limit('global_concurrency', int))
+        for host, budget in (config.get('hosts') or {}).items():
+            if isinstance(budget, dict):
+                governor.set_host_budget(host, _as_number(budget.get('rps'), float, None),
+                                         _as_number(budget.get('concurrency'), int, None))
+        return governor
+
+    def set_host_budget(self, host: str, rps: Optional[float] = None, concurrency: Optional[int] = None):
+        """Override the budget of one host"""
+        with self._lock:
+            self.host_budgets[host.lower()] = HostBudget(rps, concurrency)
+            self._rebalance()
+
+    def budget_for(self, host: str) -> HostBudget:
+        return self.host_budgets.get(host, self.default_budget)
+
+    def acquire(self, job_id: str, host: str, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Register a job about to launch; returns its options with threads/delay rewritten
+
+        Returns None when the host or global concurrency budget has no free
+        slot; the job is not registered and should be retried after a release.
+        """
+        threads = max(1, _as_number(options.get('threads'), int, 1))
+        delay = max(0.0, _as_number(options.get('delay'), float, 0.0))
+        # Jobs with an unknown host are budgeted on their own
+        host = host.lower() if host else f"job:{job_id}"
+
+        with self._lock:
+            allocation = JobAllocation(job_id, host, threads, delay)
+            self.jobs[job_id] = allocation
+            self._rebalance()
+
+            # Running jobs keep the threads they started with, so only the slots they leave are free
+            others = [job for job in self.jobs.values() if job is not allocation]
+            free = [max(allocation.threads, 1)]
+            concurrency = self.budget_for(host).concurrency
+            if concurrency:
+                free.append(concurrency - sum(job.launched for job in others if job.host == host))
+            if self.global_concurrency:
+                free.append(self.global_concurrency - sum(job.launched for job in others))
+            if min(free) < 1:
+                del self.jobs[job_id]
+                self._rebalance()
+                return None
+            if min(free) != allocation.threads:
+                allocation.threads = min(free)
+                allocation.delay = self._delay_for(allocation)
+            allocation.launched = allocation.threads
+
+        governed = dict(options)
+        if allocation.threads != threads:
+            governed['threads'] = allocation.threads
+        if allocation.delay != delay:
+            governed['delay'] = allocation.delay
+        return governed
+
+    def release(self, job_id: str) -> List[JobAllocation]:
+        """Forget a finished job; returns the remaining jobs' new allocations"""
+        with self._lock:
+            if self.jobs.pop(job_id, None) is not None:
+                self._rebalance()
+            return list(self.jobs.values())
+
+    def allocation(self, job_id: str) -> Optional[JobAllocation]:
+        return self.jobs.get(job_id)
+
+    def _rebalance(self):
+        """Recompute every job's threads and delay from the budgets"""
+        by_host: Dict[str, List[JobAllocation]] = {}
+        for job in self.jobs.values():
+            by_host.setdefault(job.host, []).append(job)
+
+        # Per-host shares
+        rps_share: Dict[str, Optional[float]] = {}
+        for host, jobs in by_host.items():
+            budget = self.budget_for(host)
+            count = len(jobs)
+            if budget.concurrency:
+                # Hand out the host's slots in launch order; jobs past the budget get none
+                base, extra = divmod(budget.concurrency, count)
+            for index, job in enumerate(jobs):
+                threads = job.requested_threads
+                if budget.concurrency:
+                    threads = min(threads, base + (1 if index < extra else 0))
+                job.threads = threads
+                rps_share[job.job_id] = budget.rps / count if budget.rps else None
+
+        # Global outbound budget
+        if self.global_concurrency:
+            total_threads = sum(job.threads for job in self.jobs.values())
+            if total_threads > self.global_concurrency:
+                scale = self.global_concurrency / total_threads
+                for job in self.jobs.values():
+                    job.threads = int(job.threads * scale)
+
+        if self.global_rps and self.jobs:
+            # Jobs without a host rate limit get an even share, then all shares are scaled to fit
+            even_share = self.global_rps / len(self.jobs)
+            for job_id, share in rps_share.items():
+                if not share:
+                    rps_share[job_id] = even_share
+            total = sum(rps_share.values())
+            if total > self.global_rps:
+                scale = self.global_rps / total
+                for job_id in rps_share:
+                    rps_share[job_id] *= scale
+
+        self._rps_shares = rps_share
+        for job in self.jobs.values():
+            job.delay = self._delay_for(job)
+
+    def _delay_for(self, job: JobAllocation) -> float:
+        """Shortest delay that keeps the job's threads within its rate share"""
+        share = self._rps_shares.get(job.job_id)
+        delay = job.requested_delay
+        if share and job.threads:
+            # Round up to 10 ms so the rate never exceeds the share
+            delay = max(delay, math.ceil(job.threads / share * 100) / 100)
+        return delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current jobs and allocations, grouped by host"""
+        with self._lock:
+            hosts: Dict[str, Any] = {}
+            for job in self.jobs.values():
+                budget = self.budget_for(job.host)
+                info = hosts.setdefault(job.host, {'rps': budget.rps, 'concurrency': budget.concurrency,
+                                                   'jobs': []})
+                info['jobs'].append(job.as_dict())
+            return {'global_rps': self.global_rps, 'global_concurrency': self.global_concurrency,
+                    'hosts': hosts}
+
+
+_default_governor: Optional[RateGovernor] = None
+_default_lock = threading.Lock()
+
+
+def get_default_governor() -> RateGovernor:
+    """Process-wide governor shared by every scan window"""
+    global _default_governor
+    with _default_lock:
+        if _default_governor is None:
+            _default_governor = RateGovernor()
+        return _default_governor
+
+
+def configure_default_governor(config: Dict[str, Any]) -> RateGovernor:
+    """Replace the shared governor's budgets from config, keeping registered jobs"""
+    governor = get_default_governor()
+    configured = RateGovernor.from_config(config)
+    with governor._lock:
+        governor.default_budget = configured.default_budget
+        governor.host_budgets = configured.host_budgets
+        governor.global_rps = configured.global_rps
+        governor.global_concurrency = configured.global_concurrency
+        governor._rebalance()
+    return governor
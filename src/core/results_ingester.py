@@ -0,0 +1,844 @@
+"""
+Results Ingester - Incremental import of sqlmap output directories
+Watches output directories (inotify on Linux, mtime polling elsewhere), tails
+each host's log, target.txt and dump/<db>/<table>.csv from the last offset
+and stores injection points, DBMS, databases, tables and dumped rows in SQLite
+"""
+
+import csv
+import ctypes
+import ctypes.util
+import hashlib
+import io
+import json
+import os
+import re
+import select
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+
+def default_results_path() -> Path:
+    return Path.home() / '.sqlmap-gui' / 'results.db'
+
+
+# Files sqlmap writes into each per-host directory
+LOG_FILE = 'log'
+TARGET_FILE = 'target.txt'
+DUMP_DIR = 'dump'
+
+# Largest chunk read from one file per pass; the rest is picked up next pass
+READ_CHUNK = 4 * 1024 * 1024
+
+# Leading bytes of a dump file fingerprinted to notice sqlmap rewriting it in place
+HEAD_BYTES = 1024
+
+
+class ResultsStore:
+    """SQLite store of everything parsed out of sqlmap output directories"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            inode INTEGER NOT NULL,
+            offset INTEGER NOT NULL,
+            mtime REAL NOT NULL DEFAULT 0,
+            header TEXT,
+            head TEXT
+        );
+        CREATE TABLE IF NOT EXISTS targets (
+            host TEXT PRIMARY KEY,
+            url TEXT,
+            method TEXT,
+            data TEXT,
+            dbms TEXT,
+            output_dir TEXT,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS facts (
+            host TEXT NOT NULL,
+            name TEXT NOT NULL,
+            value TEXT,
+            PRIMARY KEY (host, name)
+        );
+        CREATE TABLE IF NOT EXISTS injection_points (
+            host TEXT NOT NULL,
+            path TEXT NOT NULL,
+            parameter TEXT NOT NULL,
+            place TEXT NOT NULL,
+            technique TEXT NOT NULL,
+            title TEXT,
+            payload TEXT,
+            first_seen REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            PRIMARY KEY (host, path, parameter, place, technique)
+        );
+        CREATE TABLE IF NOT EXISTS databases (
+            host TEXT NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (host, name)
+        );
+        CREATE TABLE IF NOT EXISTS tables (
+            host TEXT NOT NULL,
+            db TEXT NOT NULL,
+            name TEXT NOT NULL,
+            columns TEXT,
+            rows INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (host, db, name)
+        );
+        CREATE TABLE IF NOT EXISTS dump_rows (
+            host TEXT NOT NULL,
+            db TEXT NOT NULL,
+            tbl TEXT NOT NULL,
+            row TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS dump_rows_table ON dump_rows (host, db, tbl);
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else default_results_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(files)")]
+        if 'head' not in columns:
+            self.conn.execute("ALTER TABLE files ADD COLUMN head TEXT")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def commit(self):
+        with self._lock:
+            self.conn.commit()
+
+    # File offsets
+
+    def file_state(self, path: str) -> Optional[Tuple[int, int, float, Optional[str], Optional[str]]]:
+        """(inode, offset, mtime, header, head) recorded for a file"""
+        with self._lock:
+            return self.conn.execute("SELECT inode, offset, mtime, header, head FROM files WHERE path = ?",
+                                     (path,)).fetchone()
+
+    def set_file_state(self, path: str, inode: int, offset: int, mtime: float = 0, header: Optional[str] = None,
+                       head: Optional[str] = None):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO files (path, inode, offset, mtime, header, head) "
+                              "VALUES (?, ?, ?, ?, ?, ?)", (path, inode, offset, mtime, header, head))
+
+    # Findings
+
+    def set_target(self, host: str, url: str, method: str, data: Optional[str], output_dir: str):
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO targets (host, url, method, data, output_dir, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(host) DO UPDATE SET url = excluded.url, method = excluded.method, "
+                "data = excluded.data, output_dir = excluded.output_dir, updated_at = excluded.updated_at",
+                (host, url, method, data, output_dir, time.time()))
+
+    def target_path(self, host: str) -> str:
+        """URL path of the host's last target, used to key its injection points"""
+        with self._lock:
+            row = self.conn.execute("SELECT url FROM targets WHERE host = ?", (host,)).fetchone()
+        if not row or not row[0]:
+            return ''
+        try:
+            return urlsplit(row[0]).path or '/'
+        except ValueError:
+            return ''
+
+    def set_fact(self, host: str, name: str, value: str):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO facts (host, name, value) VALUES (?, ?, ?)", (host, name, value))
+            if name == 'dbms':
+                self.conn.execute(
+                    "INSERT INTO targets (host, dbms, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(host) DO UPDATE SET dbms = excluded.dbms, updated_at = excluded.updated_at",
+                    (host, value, time.time()))
+
+    def add_injection_point(self, host: str, parameter: str, place: str, technique: str,
+                            title: Optional[str], payload: Optional[str]) -> bool:
+        """Record an injection point; True if it was not known before"""
+        now = time.time()
+        key = (host, self.target_path(host), parameter, place, technique)
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO injection_points "
+                "(host, path, parameter, place, technique, title, payload, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", key + (title, payload, now, now))
+            if cursor.rowcount:
+                return True
+            self.conn.execute(
+                "UPDATE injection_points SET title = ?, payload = ?, last_seen = ? "
+                "WHERE host = ? AND path = ? AND parameter = ? AND place = ? AND technique = ?",
+                (title, payload, now) + key)
+        return False
+
+    def add_databases(self, host: str, names: Iterable[str]) -> int:
+        with self._lock:
+            cursor = self.conn.executemany("INSERT OR IGNORE INTO databases (host, name) VALUES (?, ?)",
+                                           [(host, name) for name in names])
+        return max(cursor.rowcount, 0)
+
+    def add_tables(self, host: str, db: str, names: Iterable[str]) -> int:
+        with self._lock:
+            self.conn.execute("INSERT OR IGNORE INTO databases (host, name) VALUES (?, ?)", (host, db))
+            cursor = self.conn.executemany("INSERT OR IGNORE INTO tables (host, db, name) VALUES (?, ?, ?)",
+                                           [(host, db, name) for name in names])
+        return max(cursor.rowcount, 0)
+
+    def set_table_columns(self, host: str, db: str, table: str, columns: List[str]):
+        with self._lock:
+            self.add_tables(host, db, [table])
+            self.conn.execute("UPDATE tables SET columns = ? WHERE host = ? AND db = ? AND name = ?",
+                              (json.dumps(columns), host, db, table))
+
+    def add_dump_rows(self, host: str, db: str, table: str, rows: List[Dict[str, str]]) -> int:
+        if not rows:
+            return 0
+        with self._lock:
+            self.conn.executemany("INSERT INTO dump_rows (host, db, tbl, row) VALUES (?, ?, ?, ?)",
+                                  [(host, db, table, json.dumps(row, ensure_ascii=False)) for row in rows])
+            self.conn.execute("UPDATE tables SET rows = rows + ? WHERE host = ? AND db = ? AND name = ?",
+                              (len(rows), host, db, table))
+        return len(rows)
+
+    def clear_dump(self, host: str, db: str, table: str):
+        """Forget rows of a dump file that sqlmap rewrote from scratch"""
+        with self._lock:
+            self.conn.execute("DELETE FROM dump_rows WHERE host = ? AND db = ? AND tbl = ?", (host, db, table))
+            self.conn.execute("UPDATE tables SET rows = 0 WHERE host = ? AND db = ? AND name = ?", (host, db, table))
+
+    # Queries
+
+    def injection_points(self, host: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = ("SELECT host, path, parameter, place, technique, title, payload, first_seen, last_seen "
+                 "FROM injection_points")
+        params: Tuple = ()
+        if host:
+            query += " WHERE host = ?"
+            params = (host,)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY host, path, parameter, technique", params).fetchall()
+        names = ('host', 'path', 'parameter', 'place', 'technique', 'title', 'payload', 'first_seen', 'last_seen')
+        return [dict(zip(names, row)) for row in rows]
+
+    def dump_rows(self, host: str, db: str, table: str, limit: int = 100, offset: int = 0) -> List[Dict[str, str]]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT row FROM dump_rows WHERE host = ? AND db = ? AND tbl = ? ORDER BY rowid LIMIT ? OFFSET ?",
+                (host, db, table, limit, offset)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def summary(self, host: Optional[str] = None) -> Dict[str, Any]:
+        """Counts per host (or for one host)"""
+        where, params = (" WHERE host = ?", (host,)) if host else ("", ())
+        with self._lock:
+            summary = {
+                'hosts': self.conn.execute(f"SELECT COUNT(*) FROM targets{where}", params).fetchone()[0],
+                'injection_points': self.conn.execute(f"SELECT COUNT(*) FROM injection_points{where}",
+                                                      params).fetchone()[0],
+                'databases': self.conn.execute(f"SELECT COUNT(*) FROM databases{where}", params).fetchone()[0],
+                'tables': self.conn.execute(f"SELECT COUNT(*) FROM tables{where}", params).fetchone()[0],
+                'dumped_rows': self.conn.execute(f"SELECT COUNT(*) FROM dump_rows{where}", params).fetchone()[0],
+            }
+            summary['dbms'] = dict(self.conn.execute(f"SELECT host, dbms FROM targets{where}", params).fetchall())
+        return summary
+
+
+# Log parsing
+
+_PARAMETER_RE = re.compile(r'^Parameter: (.+) \((.+)\)$')
+_LIST_HEADER_RE = re.compile(r'^available databases \[\d+\]:$')
+_FACT_RE = re.compile(r'^(back-end DBMS|web server operating system|web application technology|banner|'
+                      r'current user|current database|hostname|current user is DBA): (.+)$')
+_FACT_NAMES = {
+    'back-end DBMS': 'dbms',
+    'web server operating system': 'os',
+    'web application technology': 'technology',
+    'current user is DBA': 'is_dba',
+}
+
+
+class LogParser:
+    """Line state machine over the text sqlmap appends to a host's `log` file
+
+    Multi-line blocks (injection points, database and table listings) are only
+    stored once complete; `block_start` tells the caller where the open block
+    began so a restart can re-read just that block.
+    """
+
+    def __init__(self, store: ResultsStore, host: str):
+        self.store = store
+        self.host = host
+        self.state: Optional[str] = None
+        self.block_start: Optional[int] = None
+        self.items: List[str] = []
+        self.database: Optional[str] = None
+        self.parameter: Optional[Tuple[str, str]] = None
+        self.technique: Optional[Dict[str, str]] = None
+        self.new_points = 0
+        self.reported: List[tuple] = []  # Injection points for the findings database
+        self.dbms: Optional[str] = None
+
+    def _open(self, state: str, offset: int):
+        self.state = state
+        self.block_start = offset
+        self.items = []
+
+    def _close(self):
+        self.state = None
+        self.block_start = None
+        self.items = []
+        self.parameter = None
+        self.technique = None
+
+    def _flush_technique(self):
+        if self.parameter and self.technique and self.technique.get('type'):
+            parameter, place = self.parameter
+            title, payload = self.technique.get('title'), self.technique.get('payload')
+            if self.store.add_injection_point(self.host, parameter, place, self.technique['type'], title, payload):
+                self.new_points += 1
+            self.reported.append((self.host, self.store.target_path(self.host), parameter, place,
+                                  self.technique['type'], self.dbms or '', title, payload, 'log'))
+        self.technique = None
+
+    def feed(self, line: str, offset: int):
+        """Parse one line; `offset` is where the line starts in the file"""
+        text = line.strip()
+        state = self.state
+
+        if state == 'injection':
+            if text == '---':
+                self._flush_technique()
+                self._close()
+                return
+            match = _PARAMETER_RE.match(text)
+            if match:
+                self._flush_technique()
+                self.parameter = (match.group(1), match.group(2))
+            elif text.startswith('Type: '):
+                self._flush_technique()
+                self.technique = {'type': text[6:]}
+            elif self.technique is not None and text.startswith('Title: '):
+                self.technique['title'] = text[7:]
+            elif self.technique is not None and text.startswith('Payload: '):
+                self.technique['payload'] = text[9:]
+            return
+
+        if state == 'databases':
+            if text.startswith('[*] '):
+                self.items.append(text[4:].strip())
+                return
+            self.store.add_databases(self.host, self.items)
+            self._close()
+        elif state == 'tables':
+            if text.startswith('| ') and text.endswith(' |'):
+                self.items.append(text[2:-2].strip())
+                return
+            if text.startswith('+') and not self.items:
+                return  # Top border
+            self.store.add_tables(self.host, self.database, self.items)
+            self._close()
+            return
+        elif state == 'database':
+            # "Database: x" is followed by a table list or by "Table: y" (dump/columns)
+            if re.match(r'^\[\d+ tables?\]$', text):
+                self.state = 'tables'
+                return
+            if text.startswith('Table: '):
+                self.store.add_tables(self.host, self.database, [text[7:].strip()])
+            self._close()
+            return
+
+        if text == '---':
+            self._open('injection', offset)
+        elif text.startswith('Database: ') or text == '<current>':
+            # Table listings of the current database are headed by a bare "<current>"
+            self._open('database', offset)
+            self.database = text[10:].strip() if text != '<current>' else text
+        elif _LIST_HEADER_RE.match(text):
+            self._open('databases', offset)
+        else:
+            match = _FACT_RE.match(text)
+            if match:
+                value = match.group(2).strip()
+                if len(value) > 1 and value[0] == value[-1] == "'":
+                    value = value[1:-1]
+                name = _FACT_NAMES.get(match.group(1), match.group(1).replace(' ', '_'))
+                self.store.set_fact(self.host, name, value)
+                if name == 'dbms':
+                    self.dbms = value
+
+
+def complete_records(data: bytes) -> int:
+    """Length of the leading part of CSV bytes that holds only whole records
+
+    A record ends at a newline outside double quotes, so quoted values with
+    embedded newlines are never split between two reads.
+    """
+    end = 0
+    quotes = 0
+    start = 0
+    while True:
+        newline = data.find(b'\n', start)
+        if newline < 0:
+            return end
+        quotes += data.count(b'"', start, newline)
+        start = newline + 1
+        if quotes % 2 == 0:
+            end = start
+            quotes = 0
+
+
+class _LogTail:
+    """In-memory tail position of one log file"""
+
+    __slots__ = ('inode', 'offset', 'parser')
+
+    def __init__(self, inode: int, offset: int, parser: LogParser):
+        self.inode = inode
+        self.offset = offset
+        self.parser = parser
+
+
+def _file_id(stat: os.stat_result) -> int:
+    return stat.st_ino or int(stat.st_ctime)
+
+
+def _head_hash(path: str, length: int) -> str:
+    """Fingerprint of the first `length` bytes (at most HEAD_BYTES) of a file"""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+
+def csv_delimiter(value: Optional[str]) -> str:
+    """The single character sqlmap writes for --csv-del (escapes such as \\t allowed)"""
+    if not value:
+        return ','
+    try:
+        value = value.encode('latin-1', errors='backslashreplace').decode('unicode_escape')
+    except (UnicodeError, ValueError):
+        pass
+    return value[0] if len(value) == 1 else ','
+
+
+class ResultsIngester:
+    """Tails sqlmap output directories into a ResultsStore
+
+    Injection points are also merged into a FindingsDB when one is given.
+    """
+
+    def __init__(self, store: ResultsStore, findings=None):
+        self.store = store
+        self.findings = findings
+        self.roots: Set[str] = set()
+        self.delimiters: Dict[str, str] = {}  # Root -> --csv-del of the scan writing into it
+        self._logs: Dict[str, _LogTail] = {}
+        self._lock = threading.RLock()
+        self.bytes_read = 0
+        self.new_points = 0
+        self.new_rows = 0
+
+    def watch(self, path: str, delimiter: str = ','):
+        with self._lock:
+            path = os.path.abspath(path)
+            self.roots.add(path)
+            self.delimiters[path] = delimiter
+
+    def unwatch(self, path: str):
+        with self._lock:
+            path = os.path.abspath(path)
+            self.roots.discard(path)
+            self.delimiters.pop(path, None)
+
+    def delimiter_for(self, host_dir: str) -> str:
+        host_dir = os.path.abspath(host_dir)
+        for root, delimiter in self.delimiters.items():
+            if host_dir == root or host_dir.startswith(root + os.sep):
+                return delimiter
+        return ','
+
+    @staticmethod
+    def host_dirs(root: str) -> List[str]:
+        """Per-host directories below an output directory (or the root itself)"""
+        if os.path.exists(os.path.join(root, TARGET_FILE)) or os.path.exists(os.path.join(root, LOG_FILE)):
+            return [root]
+        try:
+            entries = os.scandir(root)
+        except OSError:
+            return []
+        with entries:
+            return sorted(entry.path for entry in entries if entry.is_dir() and not entry.name.startswith('.'))
+
+    def host_dir_for(self, path: str) -> Optional[str]:
+        """The host directory a changed path belongs to"""
+        path = os.path.abspath(path)
+        for root in self.roots:
+            if path == root or path.startswith(root + os.sep):
+                if os.path.exists(os.path.join(root, TARGET_FILE)) or os.path.exists(os.path.join(root, LOG_FILE)):
+                    return root
+                relative = os.path.relpath(path, root)
+                if relative == '.':
+                    return None
+                return os.path.join(root, relative.split(os.sep, 1)[0])
+        return None
+
+    def ingest(self, paths: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Read whatever is new in the given host directories (default: all watched)"""
+        with self._lock:
+            before = (self.bytes_read, self.new_points, self.new_rows)
+            if paths is None:
+                host_dirs = [host_dir for root in sorted(self.roots) for host_dir in self.host_dirs(root)]
+            else:
+                host_dirs = sorted({host_dir for path in paths for host_dir in self.host_dirs(path)})
+            for host_dir in host_dirs:
+                try:
+                    self.ingest_host(host_dir)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Error ingesting {host_dir}: {e}")
+            self.store.commit()
+            return {
+                'hosts': len(host_dirs),
+                'bytes': self.bytes_read - before[0],
+                'injection_points': self.new_points - before[1],
+                'rows': self.new_rows - before[2],
+            }
+
+    def ingest_host(self, host_dir: str):
+        host = os.path.basename(host_dir.rstrip(os.sep))
+        self._ingest_target(host, host_dir)
+        self._ingest_log(host, os.path.join(host_dir, LOG_FILE))
+        dump_dir = os.path.join(host_dir, DUMP_DIR)
+        if os.path.isdir(dump_dir):
+            delimiter = self.delimiter_for(host_dir)
+            for db_entry in os.scandir(dump_dir):
+                if not db_entry.is_dir():
+                    continue
+                for entry in os.scandir(db_entry.path):
+                    if entry.name.endswith('.csv') and entry.is_file():
+                        self._ingest_csv(host, db_entry.name, entry.name[:-4], entry.path, delimiter)
+
+    def _ingest_target(self, host: str, host_dir: str):
+        """target.txt is a single line that sqlmap rewrites per run; re-read it only when it changes"""
+        path = os.path.join(host_dir, TARGET_FILE)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        state = self.store.file_state(path)
+        if state and state[0] == _file_id(stat) and state[1] == stat.st_size and state[2] == stat.st_mtime:
+            return
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read(64 * 1024)
+        self.bytes_read += len(text)
+        first, _, rest = text.partition('\n')
+        match = re.match(r'^(.*?) \((\w+)\)(?:\s+#.*)?$', first.strip())
+        if match:
+            self.store.set_target(host, match.group(1), match.group(2), rest.strip() or None, host_dir)
+        self.store.set_file_state(path, _file_id(stat), stat.st_size, stat.st_mtime)
+
+    def _read_new(self, path: str, offset: int, size: int) -> bytes:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return f.read(min(size - offset, READ_CHUNK))
+
+    def _ingest_log(self, host: str, path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        inode = _file_id(stat)
+        tail = self._logs.get(path)
+        if tail is None:
+            state = self.store.file_state(path)
+            offset = state[1] if state and state[0] == inode else 0
+            tail = self._logs[path] = _LogTail(inode, offset, LogParser(self.store, host))
+        if tail.inode != inode or stat.st_size < tail.offset:
+            # Rotated, or truncated by --flush-session
+            tail = self._logs[path] = _LogTail(inode, 0, LogParser(self.store, host))
+        if stat.st_size == tail.offset:
+            return
+
+        data = self._read_new(path, tail.offset, stat.st_size)
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return  # No complete line yet
+        self.bytes_read += end
+        position = tail.offset
+        for raw in data[:end].splitlines(keepends=True):
+            tail.parser.feed(raw.decode('utf-8', errors='replace'), position)
+            position += len(raw)
+        tail.offset = position
+        self.new_points += tail.parser.new_points
+        tail.parser.new_points = 0
+        if self.findings is not None:
+            reported, tail.parser.reported = tail.parser.reported, []
+            try:
+                self.findings.record_many(reported)
+                if tail.parser.dbms:
+                    self.findings.set_dbms(host, tail.parser.dbms)
+            except sqlite3.Error as e:
+                print(f"Error recording findings for {host}: {e}")
+        # An open block is re-read after a restart, so persist its start
+        safe = tail.parser.block_start if tail.parser.block_start is not None else tail.offset
+        self.store.set_file_state(path, inode, safe, stat.st_mtime)
+
+    def _ingest_csv(self, host: str, db: str, table: str, path: str, delimiter: str = ','):
+        stat = os.stat(path)
+        inode = _file_id(stat)
+        state = self.store.file_state(path)
+        offset, header = 0, None
+        if state:
+            # Re-dumping truncates the file in place, so the inode alone does not tell
+            if (state[0] == inode and stat.st_size >= state[1] and stat.st_mtime >= state[2]
+                    and (state[4] is None or state[4] == _head_hash(path, state[1]))):
+                offset, header = state[1], state[3]
+            else:
+                self.store.clear_dump(host, db, table)  # sqlmap rewrote the dump
+                self.store.set_file_state(path, inode, 0)
+        if stat.st_size == offset:
+            return
+
+        data = self._read_new(path, offset, stat.st_size)
+        end = complete_records(data)
+        if not end:
+            return
+        self.bytes_read += end
+        records = list(csv.reader(io.StringIO(data[:end].decode('utf-8', errors='replace'), newline=''),
+                                  delimiter=delimiter))
+        if header is None:
+            if not records:
+                return
+            columns = records.pop(0)
+            header = json.dumps(columns)
+            self.store.set_table_columns(host, db, table, columns)
+        else:
+            self.store.add_tables(host, db, [table])
+        columns = json.loads(header)
+        rows = [dict(zip(columns, record)) for record in records if record]
+        self.new_rows += self.store.add_dump_rows(host, db, table, rows)
+        self.store.set_file_state(path, inode, offset + end, stat.st_mtime, header, _head_hash(path, offset + end))
+
+
+# Watching
+
+class PollingWatcher:
+    """Reports every watched root as changed once per interval
+
+    Each pass only stats files and compares sizes with the stored offsets.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self.roots: Set[str] = set()
+
+    def add(self, path: str):
+        self.roots.add(os.path.abspath(path))
+
+    def remove(self, path: str):
+        self.roots.discard(os.path.abspath(path))
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        return set(self.roots)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through libc, watching directories recursively"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | getattr(os, 'O_CLOEXEC', 0))
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, str] = {}
+        self.roots: Set[str] = set()
+        self.missing: Set[str] = set()  # Roots sqlmap has not created yet
+
+    def _add_dir(self, path: str):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            print(f"Cannot watch {path}: {os.strerror(ctypes.get_errno())}")
+            return
+        self.watches[wd] = path
+
+    def add(self, path: str):
+        path = os.path.abspath(path)
+        self.roots.add(path)
+        if not os.path.isdir(path):
+            self.missing.add(path)
+            return
+        for directory, _, _ in os.walk(path):
+            self._add_dir(directory)
+
+    def remove(self, path: str):
+        path = os.path.abspath(path)
+        self.roots.discard(path)
+        self.missing.discard(path)
+        for wd, directory in list(self.watches.items()):
+            if directory == path or directory.startswith(path + os.sep):
+                if not any(directory == root or directory.startswith(root + os.sep) for root in self.roots):
+                    self.libc.inotify_rm_watch(self.fd, wd)
+                    del self.watches[wd]
+
+    def _attach_missing(self) -> Set[str]:
+        """Start watching roots that have appeared since they were added"""
+        created = {path for path in self.missing if os.path.isdir(path)}
+        for path in created:
+            self.missing.discard(path)
+            for directory, _, _ in os.walk(path):
+                self._add_dir(directory)
+        return created
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Directories with changes (empty on timeout)"""
+        if self.missing:
+            timeout = 1.0 if timeout is None else min(timeout, 1.0)
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        changed = self._attach_missing()
+        if not readable:
+            return changed
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        position = 0
+        while position + self._EVENT.size <= len(buffer):
+            wd, mask, _, length = self._EVENT.unpack_from(buffer, position)
+            name = buffer[position + self._EVENT.size:position + self._EVENT.size + length].rstrip(b'\0')
+            position += self._EVENT.size + length
+            if mask & self.IN_Q_OVERFLOW:
+                return set(self.roots)  # Events were lost; rescan everything
+            if mask & self.IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                # New host or dump directory; files may already be inside it
+                for new_dir, _, _ in os.walk(os.path.join(directory, os.fsdecode(name))):
+                    self._add_dir(new_dir)
+            changed.add(os.path.join(directory, os.fsdecode(name)) if name else directory)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(poll_interval: float = 2.0):
+    """inotify where available, mtime polling otherwise"""
+    try:
+        return InotifyWatcher()
+    except (OSError, AttributeError) as e:
+        print(f"inotify unavailable ({e}), polling output directories every {poll_interval}s")
+        return PollingWatcher(poll_interval)
+
+
+class IngestWorker:
+    """Background thread feeding watcher events into an ingester"""
+
+    def __init__(self, ingester: ResultsIngester, poll_interval: float = 2.0, use_inotify: bool = True):
+        self.ingester = ingester
+        self.watcher = create_watcher(poll_interval) if use_inotify else PollingWatcher(poll_interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Set[str] = set()
+        self._retiring: Set[str] = set()
+        self._watchers: Dict[str, int] = {}  # Scans currently writing into each directory
+        self._pending_lock = threading.Lock()
+
+    def watch(self, path: str, delimiter: str = ','):
+        """Watch an output directory; what it already holds is ingested in the background"""
+        path = os.path.abspath(path)
+        with self._pending_lock:
+            self._watchers[path] = self._watchers.get(path, 0) + 1
+            self._retiring.discard(path)
+        self.ingester.watch(path, delimiter)
+        try:
+            self.watcher.add(path)
+        except OSError as e:
+            print(f"Error watching {path}: {e}")
+        self.request(path)
+
+    def unwatch(self, path: str):
+        """Stop watching once the scan writing into a directory is done; it is ingested one last time first"""
+        path = os.path.abspath(path)
+        with self._pending_lock:
+            count = self._watchers.get(path, 0) - 1
+            if count > 0:
+                self._watchers[path] = count
+            else:
+                self._watchers.pop(path, None)
+                self._retiring.add(path)
+            self._pending.add(path)
+
+    def request(self, path: str):
+        """Ingest a directory on the next pass, e.g. once its scan has finished"""
+        with self._pending_lock:
+            self._pending.add(os.path.abspath(path))
+
+    def _take_pending(self) -> Set[str]:
+        with self._pending_lock:
+            pending, self._pending = self._pending, set()
+        return pending
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='results-ingester', daemon=True)
+            self._thread.start()
+
+    def _retire(self):
+        """Drop directories whose final pass has run"""
+        with self._pending_lock:
+            retiring = self._retiring - self._pending
+            self._retiring -= retiring
+        for path in retiring:
+            self.ingester.unwatch(path)
+            self.watcher.remove(path)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                changed = self._take_pending() or self.watcher.wait(1.0) | self._take_pending()
+                if changed:
+                    host_dirs = {self.ingester.host_dir_for(path) or path for path in changed}
+                    self.ingester.ingest(host_dirs)
+                self._retire()
+            except Exception as e:
+                print(f"Results ingester error: {e}")
+                time.sleep(1.0)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        self.watcher.close()
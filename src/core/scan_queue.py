@@ -0,0 +1,374 @@
+"""
+Scan Queue - Crash-safe persistent queue of sqlmap jobs
+Jobs, their states and their output directories live in a write-ahead-logged
+SQLite database; after a crash or reboot interrupted jobs are requeued and
+relaunched on their existing output directory and session file, so sqlmap
+resumes from its session instead of repeating the detection phase
+
+Queued jobs without an output directory get their own under
+~/.sqlmap-gui/jobs, so parallel jobs never share a session. Those
+directories are kept after the job finishes (the results ingester and
+resumed runs read them) until the job is cleared with remove_job_dirs.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .sqlmap_wrapper import SqlmapProcess, SqlmapWrapper
+
+
+# Job states
+QUEUED, RUNNING, DONE, FAILED, STOPPED = 'queued', 'running', 'done', 'failed', 'stopped'
+FINISHED_STATES = frozenset({DONE, FAILED, STOPPED})
+
+# Options that would throw away what an interrupted run already stored
+_RESUME_DROPPED = ('flush_session', 'fresh_queries')
+
+
+def default_queue_path() -> Path:
+    return Path.home() / '.sqlmap-gui' / 'scan_queue.db'
+
+
+def default_jobs_dir() -> Path:
+    return Path.home() / '.sqlmap-gui' / 'jobs'
+
+
+def _process_start_time(pid: int) -> Optional[float]:
+    try:
+        import psutil
+        return psutil.Process(pid).create_time()
+    except ImportError:
+        return None
+    except Exception:
+        return -1.0  # No such process
+
+
+def owner_token() -> str:
+    """Identifies this process, also across pid reuse when psutil is available"""
+    pid = os.getpid()
+    started = _process_start_time(pid)
+    return f"{pid}:{started if started else ''}"
+
+
+def owner_alive(token: Optional[str]) -> bool:
+    """Whether the process that claimed a job is still running"""
+    if not token:
+        return False
+    pid_text, _, started = token.partition(':')
+    try:
+        pid = int(pid_text)
+    except ValueError:
+        return False
+    if pid == os.getpid():
+        return token == owner_token()
+
+    current = _process_start_time(pid)
+    if current is not None:
+        return current >= 0 and (not started or abs(current - float(started)) < 1.0)
+    if sys.platform == 'win32':
+        return False  # os.kill cannot probe a process there
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class ScanJob:
+    """One queued scan"""
+
+    __slots__ = ('job_id', 'label', 'options', 'state', 'output_dir', 'created_at', 'started_at',
+                 'finished_at', 'exit_code', 'attempts', 'owner')
+
+    def __init__(self, job_id: int, label: str, options: Dict[str, Any], state: str, output_dir: str,
+                 created_at: float, started_at: Optional[float] = None, finished_at: Optional[float] = None,
+                 exit_code: Optional[int] = None, attempts: int = 0, owner: Optional[str] = None):
+        self.job_id = job_id
+        self.label = label
+        self.options = options
+        self.state = state
+        self.output_dir = output_dir
+        self.created_at = created_at
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.exit_code = exit_code
+        self.attempts = attempts  # Launches so far; more than one means it was resumed
+        self.owner = owner
+
+    def __repr__(self) -> str:
+        return f"ScanJob({self.job_id}, {self.label!r}, {self.state}, attempts={self.attempts})"
+
+    @property
+    def resumed(self) -> bool:
+        return self.attempts > 1
+
+
+def resume_options(job: ScanJob) -> Dict[str, Any]:
+    """Options for (re)launching a job on its own output directory and session"""
+    options = dict(job.options)
+    if job.output_dir:
+        options['output_dir'] = job.output_dir
+    if job.resumed:
+        for key in _RESUME_DROPPED:
+            options.pop(key, None)
+    return options
+
+
+class ScanQueueStore:
+    """Persistent job queue in SQLite (WAL mode, synchronous writes)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            label TEXT NOT NULL DEFAULT '',
+            options TEXT NOT NULL,
+            state TEXT NOT NULL,
+            output_dir TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            exit_code INTEGER,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            owner TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+    """
+    COLUMNS = "id, label, options, state, output_dir, created_at, started_at, finished_at, exit_code, attempts, owner"
+
+    def __init__(self, path: Optional[str] = None, jobs_dir: Optional[str] = None):
+        self.path = Path(path) if path else default_queue_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.jobs_dir = Path(jobs_dir) if jobs_dir else default_jobs_dir()
+        self.owner = owner_token()
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # A job marked running must survive a power cut, so sync every commit
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> 'ScanQueueStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @classmethod
+    def _job(cls, row) -> ScanJob:
+        job_id, label, options, state, output_dir, created_at, started_at, finished_at, exit_code, attempts, owner = row
+        try:
+            options = json.loads(options)
+        except ValueError:
+            options = {}
+        return ScanJob(job_id, label, options, state, output_dir, created_at, started_at, finished_at,
+                       exit_code, attempts, owner)
+
+    def enqueue(self, options: Dict[str, Any], label: str = '', claim: bool = False,
+                job_dir: bool = True) -> ScanJob:
+        """Add a job (already running for this process if claimed); with job_dir, jobs
+        without an output directory get their own under the jobs dir, otherwise they
+        use sqlmap's default output directory"""
+        options = {key: value for key, value in options.items() if value not in (None, '', False)}
+        label = label or str(options.get('url') or options.get('bulk_file') or options.get('request_file') or '')
+        now = time.time()
+        state, started_at, attempts, owner = (RUNNING, now, 1, self.owner) if claim else (QUEUED, None, 0, None)
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (label, options, state, created_at, started_at, attempts, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (label, json.dumps(options, sort_keys=True, default=str), state, now, started_at, attempts, owner))
+            job_id = cursor.lastrowid
+            output_dir = options.get('output_dir') or (str(self.jobs_dir / f"job-{job_id:06d}") if job_dir else '')
+            self.conn.execute("UPDATE jobs SET output_dir = ? WHERE id = ?", (output_dir, job_id))
+            self.conn.commit()
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        return ScanJob(job_id, label, options, state, output_dir, now, started_at, attempts=attempts, owner=owner)
+
+    def get(self, job_id: int) -> Optional[ScanJob]:
+        with self._lock:
+            row = self.conn.execute(f"SELECT {self.COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def jobs(self, states: Optional[List[str]] = None) -> List[ScanJob]:
+        """Jobs in queue order, optionally only those in the given states"""
+        query = f"SELECT {self.COLUMNS} FROM jobs"
+        params: List[Any] = []
+        if states:
+            query += f" WHERE state IN ({', '.join('?' * len(states))})"
+            params = list(states)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY id", params).fetchall()
+        return [self._job(row) for row in rows]
+
+    def claim_next(self) -> Optional[ScanJob]:
+        """Atomically move the oldest queued job to running for this process"""
+        with self._lock:
+            row = self.conn.execute("SELECT id FROM jobs WHERE state = ? ORDER BY id LIMIT 1", (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            return self.mark_running(row[0])
+
+    def mark_running(self, job_id: int) -> Optional[ScanJob]:
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, started_at = ?, finished_at = NULL, exit_code = NULL, "
+                "attempts = attempts + 1, owner = ? WHERE id = ?",
+                (RUNNING, time.time(), self.owner, job_id))
+            self.conn.commit()
+        return self.get(job_id)
+
+    def mark_finished(self, job_id: int, state: str, exit_code: Optional[int] = None):
+        if state not in FINISHED_STATES:
+            raise ValueError(f"Not a finished state: {state}")
+        with self._lock:
+            self.conn.execute("UPDATE jobs SET state = ?, finished_at = ?, exit_code = ?, owner = NULL WHERE id = ?",
+                              (state, time.time(), exit_code, job_id))
+            self.conn.commit()
+
+    def requeue(self, job_id: int):
+        """Put a stopped or failed job back in the queue; it resumes on its session"""
+        with self._lock:
+            self.conn.execute("UPDATE jobs SET state = ?, owner = NULL WHERE id = ?", (QUEUED, job_id))
+            self.conn.commit()
+
+    def recover_interrupted(self) -> List[ScanJob]:
+        """Requeue running jobs whose owning process is gone; returns them"""
+        recovered = []
+        with self._lock:
+            for job in self.jobs([RUNNING]):
+                if owner_alive(job.owner):
+                    continue  # Still running in another window or process
+                self.conn.execute("UPDATE jobs SET state = ?, owner = NULL WHERE id = ? AND state = ?",
+                                  (QUEUED, job.job_id, RUNNING))
+                job.state = QUEUED
+                recovered.append(job)
+            self.conn.commit()
+        return recovered
+
+    def _remove_job_dir(self, output_dir: str):
+        """Delete a directory the queue created; output directories the user chose are never touched"""
+        if not output_dir:
+            return
+        path = Path(output_dir).resolve()
+        if path.parent != self.jobs_dir.resolve() or not path.name.startswith('job-'):
+            return
+        try:
+            shutil.rmtree(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing job directory {path}: {e}")
+
+    def remove(self, job_id: int, remove_job_dir: bool = False):
+        job = self.get(job_id) if remove_job_dir else None
+        with self._lock:
+            self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self.conn.commit()
+        if job is not None:
+            self._remove_job_dir(job.output_dir)
+
+    def clear_finished(self, remove_job_dirs: bool = False) -> int:
+        """Forget finished jobs; their output directories are kept unless remove_job_dirs
+        is set, and then only those the queue created under the jobs dir are deleted"""
+        with self._lock:
+            finished = self.jobs(sorted(FINISHED_STATES))
+            cursor = self.conn.execute(
+                f"DELETE FROM jobs WHERE state IN ({', '.join('?' * len(FINISHED_STATES))})",
+                sorted(FINISHED_STATES))
+            self.conn.commit()
+        if remove_job_dirs:
+            # A directory still in use by a remaining job (shared output dir) is kept
+            in_use = {job.output_dir for job in self.jobs()}
+            for job in finished:
+                if job.output_dir not in in_use:
+                    self._remove_job_dir(job.output_dir)
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"))
+
+
+class ScanQueueRunner:
+    """Runs queued jobs with up to `concurrency` sqlmap processes"""
+
+    def __init__(self, store: ScanQueueStore, wrapper: SqlmapWrapper, concurrency: int = 1,
+                 process_factory: Callable[[List[str]], SqlmapProcess] = SqlmapProcess,
+                 output_callback: Optional[Callable[[ScanJob, str], None]] = None):
+        self.store = store
+        self.wrapper = wrapper
+        self.concurrency = max(1, concurrency)
+        self.process_factory = process_factory
+        self.output_callback = output_callback
+        self.running: Dict[int, Any] = {}  # Job id -> (job, process)
+        self.stopped = False
+
+    def _launch(self, job: ScanJob) -> bool:
+        try:
+            command = self.wrapper.build_command(resume_options(job), force_batch=True)
+            process = self.process_factory(command)
+            started = process.start()
+        except Exception as e:
+            print(f"Error starting job {job.job_id}: {e}")
+            started = False
+        if not started:
+            self.store.mark_finished(job.job_id, FAILED)
+            return False
+        self.running[job.job_id] = (job, process)
+        return True
+
+    def _collect_output(self, job: ScanJob, process):
+        for line in process.get_output():
+            if self.output_callback:
+                self.output_callback(job, line)
+
+    def step(self) -> bool:
+        """Retire finished jobs and start queued ones; returns False when idle"""
+        for job_id, (job, process) in list(self.running.items()):
+            self._collect_output(job, process)
+            return_code = process.poll()
+            if return_code is None:
+                continue
+            process.wait_output()
+            self._collect_output(job, process)
+            del self.running[job_id]
+            self.store.mark_finished(job_id, DONE if return_code == 0 else FAILED, return_code)
+
+        while not self.stopped and len(self.running) < self.concurrency:
+            job = self.store.claim_next()
+            if job is None:
+                break
+            self._launch(job)
+        return bool(self.running)
+
+    def run(self, poll_interval: float = 0.5):
+        """Work through the queue until it is empty"""
+        while self.step():
+            time.sleep(poll_interval)
+
+    def stop(self, requeue: bool = True):
+        """Stop running jobs; requeued jobs resume on their session next time"""
+        self.stopped = True
+        for job_id, (job, process) in list(self.running.items()):
+            process.stop()
+            if requeue:
+                self.store.requeue(job_id)
+            else:
+                self.store.mark_finished(job_id, STOPPED, process.poll())
+        self.running.clear()
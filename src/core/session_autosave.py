@@ -0,0 +1,282 @@
+"""
+Session Autosave - Journaled, debounced persistence of the GUI option state
+The state is {tab: {option: value}}, the same layout as exported profiles.
+Changes are appended to a journal as compact diff records by a background
+writer; the journal is periodically compacted into a snapshot. Loading reads
+the snapshot and replays the journal, tolerating a record cut short by a crash.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .atomic_io import atomic_write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+SNAPSHOT_FORMAT = 1
+
+# Compact once the journal holds this many records or bytes
+COMPACT_RECORDS = 200
+COMPACT_BYTES = 256 * 1024
+
+# Seconds the writer waits after the last change before writing
+DEFAULT_DEBOUNCE = 0.5
+
+State = Dict[str, Dict[str, Any]]
+
+
+def default_autosave_dir() -> Path:
+    return Path.home() / '.sqlmap-gui' / 'autosave'
+
+
+def diff_state(old: State, new: State) -> Optional[Dict[str, Any]]:
+    """Compact change record turning `old` into `new`, or None if they are equal
+
+    {"c": {tab: {option: value}}, "d": {tab: [option, ...]}}; a tab missing from
+    `new` has all of its options deleted.
+    """
+    changed: Dict[str, Dict[str, Any]] = {}
+    deleted: Dict[str, list] = {}
+    for tab in set(old) | set(new):
+        before, after = old.get(tab, {}), new.get(tab, {})
+        values = {key: value for key, value in after.items() if key not in before or before[key] != value}
+        removed = [key for key in before if key not in after]
+        if values:
+            changed[tab] = values
+        if removed:
+            deleted[tab] = removed
+    if not changed and not deleted:
+        return None
+    record: Dict[str, Any] = {}
+    if changed:
+        record['c'] = changed
+    if deleted:
+        record['d'] = deleted
+    return record
+
+
+def _valid_record(record: Any) -> bool:
+    """Whether a parsed journal line has the shape append() writes"""
+    if not isinstance(record, dict) or not isinstance(record.get('q'), int):
+        return False
+    changed, deleted = record.get('c', {}), record.get('d', {})
+    return (isinstance(changed, dict) and all(isinstance(values, dict) for values in changed.values())
+            and isinstance(deleted, dict) and all(isinstance(keys, list) for keys in deleted.values()))
+
+
+def apply_record(state: State, record: Dict[str, Any]):
+    """Apply a change record to `state` in place"""
+    for tab, values in record.get('c', {}).items():
+        state.setdefault(tab, {}).update(values)
+    for tab, keys in record.get('d', {}).items():
+        options = state.get(tab)
+        if options is None:
+            continue
+        for key in keys:
+            options.pop(key, None)
+        if not options:
+            del state[tab]
+
+
+class SessionJournal:
+    """Snapshot plus append-only journal of change records in one directory"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory) if directory else default_autosave_dir()
+        self.snapshot_path = self.directory / 'snapshot.json'
+        self.journal_path = self.directory / 'journal.jsonl'
+        self.lock_path = self.directory / 'autosave.lock'
+        self.seq = 0
+        self.records = 0  # Records in the journal since the last compaction
+        self._valid_bytes = 0  # Journal length up to the end of its last complete record
+        self.state: State = {}  # State as persisted
+        self._journal = None
+        self._lock_file = None
+
+    def acquire(self) -> bool:
+        """Take the autosave over for this window; False if another window already has it"""
+        if self._lock_file is not None:
+            return True
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        lock_file = open(self.lock_path, 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+        self._lock_file = lock_file
+        return True
+
+    def load(self) -> State:
+        """Read the snapshot and replay the journal; returns a copy of the restored state"""
+        state: State = {}
+        seq = 0
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('format') == SNAPSHOT_FORMAT and isinstance(snapshot.get('state'), dict):
+                state = snapshot['state']
+                seq = int(snapshot.get('seq') or 0)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Ignoring unreadable autosave snapshot: {e}")
+
+        records = 0
+        valid_bytes = 0
+        try:
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # The last record was cut short; everything before it is good
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if not _valid_record(record):
+                        break  # Corrupt; keep what came before it
+                    valid_bytes += len(line)
+                    if record.get('q', 0) <= seq:
+                        continue  # Already in the snapshot (compaction stopped before truncating)
+                    apply_record(state, record)
+                    seq = record['q']
+                    records += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error reading autosave journal: {e}")
+
+        self.state, self.seq, self.records, self._valid_bytes = state, seq, records, valid_bytes
+        return copy.deepcopy(state)
+
+    def append(self, state: State) -> bool:
+        """Journal the difference between the persisted state and `state`; False if nothing changed"""
+        record = diff_state(self.state, state)
+        if record is None:
+            return False
+        record['q'] = self.seq + 1
+        if self._journal is None:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # Options include credentials and cookies, so only the user may read the journal
+            handle = os.open(str(self.journal_path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            if hasattr(os, 'fchmod'):
+                os.fchmod(handle, 0o600)  # A journal created with wider permissions before
+            self._journal = os.fdopen(handle, 'a', encoding='utf-8')
+            # Drop a record torn by a crash so new records start on a line of their own
+            self._journal.truncate(self._valid_bytes)
+        self._journal.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self.seq += 1
+        self.records += 1
+        apply_record(self.state, record)
+        return True
+
+    def needs_compaction(self) -> bool:
+        if self.records >= COMPACT_RECORDS:
+            return True
+        return self._journal is not None and self._journal.tell() >= COMPACT_BYTES
+
+    def compact(self):
+        """Write the persisted state as the snapshot and empty the journal"""
+        atomic_write_json(self.snapshot_path, {'format': SNAPSHOT_FORMAT, 'seq': self.seq,
+                                               'saved_at': time.time(), 'state': self.state},
+                          separators=(',', ':'), default=str)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self.records = 0
+        self._valid_bytes = 0
+
+    def clear(self):
+        self.close()
+        for path in (self.snapshot_path, self.journal_path):
+            if path.exists():
+                path.unlink()
+        self.state, self.seq, self.records, self._valid_bytes = {}, 0, 0, 0
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._lock_file is not None:
+            self._lock_file.close()  # Releases the lock
+            self._lock_file = None
+
+
+class AutosaveWriter:
+    """Background thread journaling the latest submitted state once changes settle"""
+
+    def __init__(self, journal: SessionJournal, debounce: float = DEFAULT_DEBOUNCE):
+        self.journal = journal
+        self.debounce = debounce
+        self._condition = threading.Condition()
+        self._pending: Optional[State] = None
+        self._due = 0.0
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.writes = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='session-autosave', daemon=True)
+            self._thread.start()
+
+    def submit(self, state: State):
+        """Hand over the current state; cheap enough to call from the GUI thread"""
+        with self._condition:
+            self._pending = state
+            self._due = time.monotonic() + self.debounce
+            self._condition.notify()
+
+    def _take(self) -> Tuple[Optional[State], bool]:
+        """Wait for a state whose debounce period has passed"""
+        with self._condition:
+            while True:
+                if self._stopping:
+                    state, self._pending = self._pending, None
+                    return state, True
+                if self._pending is not None:
+                    wait = self._due - time.monotonic()
+                    if wait <= 0:
+                        state, self._pending = self._pending, None
+                        return state, False
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+
+    def _run(self):
+        while True:
+            state, stopping = self._take()
+            try:
+                if state is not None and self.journal.append(state):
+                    self.writes += 1
+                if stopping or self.journal.needs_compaction():
+                    if self.journal.records:
+                        self.journal.compact()
+            except Exception as e:
+                print(f"Error autosaving session: {e}")
+            if stopping:
+                self.journal.close()
+                return
+
+    def stop(self, timeout: float = 5.0):
+        """Write whatever is pending, compact and stop"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
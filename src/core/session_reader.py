@@ -0,0 +1,369 @@
+"""
+Session Reader - Read-only access to sqlmap's per-host session.sqlite
+Reads injection points, DBMS/OS fingerprint and cached query results straight
+from the session database, live while a scan runs or later for past scans
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import quote, urlsplit
+
+
+SESSION_FILE = 'session.sqlite'
+
+# sqlmap appends this to every session key (lib/core/settings.py)
+HASHDB_MILESTONE_VALUE = "CvHUbaSNZL"
+
+# Session keys read by name (lib/core/enums.py HASHDB_KEYS)
+KEY_INJECTIONS = 'KB_INJECTIONS'
+KEY_DBMS = 'DBMS'
+KEY_DBMS_FORK = 'DBMS_FORK'
+KEY_OS = 'OS'
+KEY_CHARS = 'KB_CHARS'
+KEY_WAF = 'CHECK_WAF_RESULT'
+KEY_ABS_FILE_PATHS = 'KB_ABS_FILE_PATHS'
+KEY_BRUTE_TABLES = 'KB_BRUTE_TABLES'
+KEY_BRUTE_COLUMNS = 'KB_BRUTE_COLUMNS'
+KNOWN_KEYS = (KEY_INJECTIONS, KEY_DBMS, KEY_DBMS_FORK, KEY_OS, KEY_CHARS, KEY_WAF, KEY_ABS_FILE_PATHS,
+              KEY_BRUTE_TABLES, KEY_BRUTE_COLUMNS, 'KB_DYNAMIC_MARKINGS', 'KB_ERROR_CHUNK_LENGTH',
+              'KB_XP_CMDSHELL_AVAILABLE', 'CHECK_NULL_CONNECTION_RESULT', 'CHECK_WAF_BYPASS', 'CONF_TMP_PATH',
+              'MYSQL_UTF8MB4')
+
+# Technique numbers used in injection data (lib/core/enums.py PAYLOAD.SQLINJECTION)
+TECHNIQUE_NAMES = {
+    1: 'boolean-based blind',
+    2: 'error-based',
+    3: 'inline query',
+    4: 'stacked queries',
+    5: 'time-based blind',
+    6: 'UNION query',
+}
+
+# Rows fetched per query when reading new entries
+FETCH_BATCH = 500
+
+
+def hash_key(key: str) -> int:
+    """Row id sqlmap stores a session key under (HashDB.hashKey)"""
+    data = key.encode('utf-8', errors='xmlcharrefreplace')
+    return struct.unpack('<Q', hashlib.md5(data).digest()[:8])[0] & 0x7fffffffffffffff
+
+
+def key_prefix(url: str) -> str:
+    """Per-target part of session keys: hostname and URL path without slashes"""
+    if '://' not in url:
+        url = f"http://{url}"
+    parts = urlsplit(url)
+    hostname = (parts.hostname or '').strip('[]')
+    return f"{hostname}|{parts.path.strip().strip('/')}"
+
+
+def session_key_id(prefix: str, key: str) -> int:
+    return hash_key(f"{prefix}|{key}|{HASHDB_MILESTONE_VALUE}")
+
+
+def _decode(struct_: Any) -> Any:
+    """Rebuild a value from sqlmap's tagged JSON serialization; objects become dicts"""
+    if isinstance(struct_, list):
+        return [_decode(item) for item in struct_]
+    if not isinstance(struct_, dict):
+        return struct_
+    tag = struct_.get('$T')
+    value = struct_.get('v')
+    if tag in ('t', 'f', 's', 'ba'):
+        return [_decode(item) for item in value or []]
+    if tag == 'm':
+        return {_hashable(_decode(k)): _decode(v) for k, v in value or []}
+    if tag == 'o':
+        return {_hashable(_decode(k)): _decode(v) for k, v in struct_.get('d') or []}
+    if tag == 'b':
+        return f"<{len(value or '') * 3 // 4} bytes>"
+    if tag in ('dec', 'dt', 'date', 'time', 'td'):
+        return str(value)
+    return {_hashable(_decode(k)): _decode(v) for k, v in struct_.items()}
+
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def decode_value(text: Optional[str]) -> Any:
+    """A session value as plain Python data
+
+    Values written as plain text (most query results) come back unchanged;
+    sessions from old sqlmap versions that pickled values are never unpickled.
+    """
+    if text is None:
+        return None
+    stripped = text.strip()
+    if stripped[:1] in ('{', '[') or stripped in ('true', 'false', 'null'):
+        try:
+            return _decode(json.loads(stripped))
+        except ValueError:
+            pass
+    return text
+
+
+class InjectionPoint:
+    """One injectable parameter and the techniques that work on it"""
+
+    __slots__ = ('place', 'parameter', 'ptype', 'prefix', 'suffix', 'dbms', 'os', 'techniques')
+
+    def __init__(self, data: Dict[Any, Any]):
+        self.place = data.get('place')
+        self.parameter = data.get('parameter')
+        self.ptype = data.get('ptype')
+        self.prefix = data.get('prefix')
+        self.suffix = data.get('suffix')
+        self.dbms = data.get('dbms')
+        self.os = data.get('os')
+        self.techniques: List[Dict[str, Any]] = []
+        for technique, details in sorted((data.get('data') or {}).items(), key=lambda item: str(item[0])):
+            details = details if isinstance(details, dict) else {}
+            try:
+                name = TECHNIQUE_NAMES.get(int(technique), str(technique))
+            except (TypeError, ValueError):
+                name = str(technique)
+            self.techniques.append({'technique': name, 'title': details.get('title'),
+                                    'payload': details.get('payload'), 'vector': details.get('vector')})
+
+    @property
+    def key(self) -> tuple:
+        return self.place, self.parameter, tuple(item['technique'] for item in self.techniques)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        names = ', '.join(item['technique'] for item in self.techniques)
+        return f"InjectionPoint({self.parameter!r} ({self.place}), {names})"
+
+
+def split_result(value: str, chars: Optional[Dict[str, str]]) -> Any:
+    """Cached inference output as rows of fields, using the session's marker strings"""
+    if not chars or not isinstance(value, str):
+        return value
+    start, stop, delimiter = chars.get('start'), chars.get('stop'), chars.get('delimiter')
+    if not start or not stop or start not in value:
+        return value
+    rows = []
+    for chunk in value.split(start)[1:]:
+        chunk = chunk.split(stop, 1)[0]
+        fields = chunk.split(delimiter) if delimiter else [chunk]
+        rows.append([field.replace(chars.get('space') or '\0', ' ') for field in fields])
+    if len(rows) == 1 and len(rows[0]) == 1:
+        return rows[0][0]
+    return rows
+
+
+class SessionUpdate:
+    """What changed in a session since the previous poll"""
+
+    __slots__ = ('injection_points', 'dbms', 'os', 'results', 'facts')
+
+    def __init__(self):
+        self.injection_points: List[InjectionPoint] = []
+        self.dbms: Optional[str] = None
+        self.os: Optional[str] = None
+        self.results: List[Any] = []  # Newly cached query results
+        self.facts: Dict[str, Any] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.injection_points or self.dbms or self.os or self.results or self.facts)
+
+
+class SessionReader:
+    """Incremental, read-only reader of one session.sqlite
+
+    Session rows are keyed by a hash of the key, so entries cannot be listed
+    by name: known keys are looked up by their computed id, and everything
+    else is found by remembering which ids were already read. Each poll first
+    checks PRAGMA data_version and does nothing if sqlmap committed nothing.
+    """
+
+    def __init__(self, path: str, urls: Optional[Iterable[str]] = None):
+        if os.path.isdir(path):
+            path = os.path.join(path, SESSION_FILE)
+        self.path = path
+        self.urls = list(urls or []) or self._target_urls()
+        self.prefixes = sorted({key_prefix(url) for url in self.urls}) if self.urls else []
+        self._known_ids = {session_key_id(prefix, key): (prefix, key) for prefix in self.prefixes
+                           for key in KNOWN_KEYS}
+        self.conn: Optional[sqlite3.Connection] = None
+        self.inode: Optional[int] = None
+        self._reset()
+
+    def _reset(self):
+        self.data_version: Optional[int] = None
+        self.seen_ids: Set[int] = set()
+        self.values: Dict[str, Any] = {}  # Latest value of each known key
+        self.injection_points: Dict[tuple, InjectionPoint] = {}
+        self.results: List[Any] = []
+
+    def _target_urls(self) -> List[str]:
+        """Target URL of the last scan, from target.txt next to the session"""
+        target_file = os.path.join(os.path.dirname(self.path), 'target.txt')
+        try:
+            with open(target_file, 'r', encoding='utf-8', errors='replace') as f:
+                first = f.readline()
+        except OSError:
+            return []
+        url = first.split(' (', 1)[0].strip()
+        return [url] if url else []
+
+    def open(self) -> bool:
+        try:
+            inode = os.stat(self.path).st_ino
+        except OSError:
+            self.close()
+            return False
+        if self.conn is not None:
+            if inode == self.inode:
+                return True
+            # --flush-session replaced the file; start over
+            self.close()
+            self._reset()
+        self.inode = inode
+        try:
+            self.conn = sqlite3.connect(f"file:{quote(os.path.abspath(self.path))}?mode=ro", uri=True,
+                                        timeout=1.0, check_same_thread=False)
+        except sqlite3.Error as e:
+            print(f"Cannot open session {self.path}: {e}")
+            return False
+        return True
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self) -> 'SessionReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _changed(self) -> bool:
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        changed = version != self.data_version
+        self.data_version = version
+        return changed
+
+    def _fetch(self, ids: List[int]) -> Dict[int, str]:
+        values: Dict[int, str] = {}
+        for i in range(0, len(ids), FETCH_BATCH):
+            batch = ids[i:i + FETCH_BATCH]
+            marks = ','.join('?' * len(batch))
+            values.update(self.conn.execute(f"SELECT id, value FROM storage WHERE id IN ({marks})", batch))
+        return values
+
+    def poll(self) -> SessionUpdate:
+        """Read what sqlmap committed since the last poll"""
+        update = SessionUpdate()
+        if not self.open():
+            return update
+        try:
+            if not self._changed():
+                return update
+            ids = [row[0] for row in self.conn.execute("SELECT id FROM storage")]
+            new_ids = [row_id for row_id in ids if row_id not in self.seen_ids]
+            # Known keys are re-read every time; sqlmap updates them in place
+            values = self._fetch(sorted(set(new_ids) | set(self._known_ids)))
+        except sqlite3.OperationalError as e:
+            # Busy while sqlmap writes; the next poll picks it up
+            if 'locked' not in str(e) and 'busy' not in str(e):
+                print(f"Error reading session {self.path}: {e}")
+            self.data_version = None
+            return update
+        except sqlite3.DatabaseError as e:
+            print(f"Error reading session {self.path}: {e}")
+            self.data_version = None
+            return update
+        self.seen_ids.update(new_ids)
+
+        for row_id, (prefix, key) in self._known_ids.items():
+            if row_id not in values:
+                continue
+            value = decode_value(values[row_id])
+            previous = self.values.get(key)
+            if value == previous:
+                continue
+            self.values[key] = value
+            if key == KEY_INJECTIONS:
+                for data in value if isinstance(value, list) else []:
+                    if isinstance(data, dict):
+                        point = InjectionPoint(data)
+                        if point.key not in self.injection_points:
+                            self.injection_points[point.key] = point
+                            update.injection_points.append(point)
+            elif key == KEY_DBMS:
+                update.dbms = value
+            elif key == KEY_OS:
+                update.os = value
+            elif key != KEY_CHARS and value not in (None, [], {}):
+                update.facts[key] = value
+
+        chars = self.values.get(KEY_CHARS)
+        for row_id in new_ids:
+            if row_id in self._known_ids or row_id not in values:
+                continue
+            value = decode_value(values[row_id])
+            if isinstance(value, str) and value:
+                result = split_result(value, chars if isinstance(chars, dict) else None)
+                self.results.append(result)
+                update.results.append(result)
+        return update
+
+    def follow(self, interval: float = 1.0, stop=None):
+        """Yield updates as sqlmap writes them until `stop()` returns True"""
+        while not (stop and stop()):
+            update = self.poll()
+            if update:
+                yield update
+            time.sleep(interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything read so far"""
+        self.poll()
+        return {
+            'session': self.path,
+            'targets': self.urls,
+            'dbms': self.values.get(KEY_DBMS),
+            'os': self.values.get(KEY_OS),
+            'waf': self.values.get(KEY_WAF),
+            'injection_points': [point.to_dict() for point in self.injection_points.values()],
+            'cached_results': len(self.results),
+        }
+
+
+def default_output_dir() -> str:
+    """Where sqlmap writes when no --output-dir is given"""
+    return os.path.join(os.path.expanduser('~'), '.local', 'share', 'sqlmap', 'output')
+
+
+def find_sessions(output_dir: str) -> List[str]:
+    """session.sqlite files below a sqlmap output directory, newest first"""
+    sessions = []
+    if os.path.isfile(os.path.join(output_dir, SESSION_FILE)):
+        sessions.append(os.path.join(output_dir, SESSION_FILE))
+    try:
+        entries = list(os.scandir(output_dir))
+    except OSError:
+        entries = []
+    for entry in entries:
+        candidate = os.path.join(entry.path, SESSION_FILE)
+        if entry.is_dir() and os.path.isfile(candidate):
+            sessions.append(candidate)
+    return sorted(sessions, key=lambda path: os.path.getmtime(path), reverse=True)
+
+
+def session_path(output_dir: str, url: str) -> str:
+    """Where sqlmap keeps the session of a target below an output directory"""
+    if '://' not in url:
+        url = f"http://{url}"
+    return os.path.join(output_dir, (urlsplit(url).hostname or '').strip('[]'), SESSION_FILE)
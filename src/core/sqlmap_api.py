@@ -0,0 +1,454 @@
+"""
+SQLmap API Backend - Run scans as tasks of one long-lived local sqlmapapi server
+Options are mapped from the parameter schema onto sqlmap's internal option
+names; task status, log and data are polled incrementally by offset and
+exposed through the same interface as SqlmapProcess
+"""
+
+import atexit
+import base64
+import importlib.util
+import json
+import os
+import secrets
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import AbstractSet, Any, Dict, List, Optional, Tuple
+
+from . import parameter_schema
+from .sqlmap_wrapper import SqlmapWrapper
+
+
+# GUI option names whose sqlmap option name is not the camelCase of the name
+API_OPTION_NAMES = {
+    'user_agent': 'agent', 'randomize': 'rParam', 'safe_req': 'safeReqFile', 'skip_urlencode': 'skipUrlEncode',
+    'force_ssl': 'forceSSL', 'eval': 'evalCode', 'testable_parameter': 'testParameter',
+    'union_cols': 'uCols', 'union_char': 'uChar', 'union_from': 'uFrom', 'union_values': 'uValues',
+    'fingerprint': 'extensiveFp', 'all': 'getAll', 'banner': 'getBanner', 'current_user': 'getCurrentUser',
+    'current_db': 'getCurrentDb', 'hostname': 'getHostname', 'users': 'getUsers',
+    'passwords': 'getPasswordHashes', 'privileges': 'getPrivileges', 'roles': 'getRoles', 'dbs': 'getDbs',
+    'tables': 'getTables', 'columns': 'getColumns', 'schema': 'getSchema', 'count': 'getCount',
+    'dump': 'dumpTable', 'comments': 'getComments', 'statements': 'getStatements',
+    'exclude_sysdbs': 'excludeSysDbs', 'where': 'dumpWhere', 'start': 'limitStart', 'stop': 'limitStop',
+    'first': 'firstChar', 'last': 'lastChar', 'shared_lib': 'shLib', 'os_smbrelay': 'osSmb',
+    'reg_value': 'regVal', 'base64': 'base64Parameter', 'crawl': 'crawlDepth', 'gpage': 'googlePage',
+    'har': 'harFile', 'hex': 'hexConvert', 'save': 'saveConfig', 'update': 'updateAll',
+    'auto_batch': 'batch',
+}
+
+# Options whose comma-separated values are joined into one sqlmap option
+API_JOINED_OPTIONS = {'tamper': ('tamper', 'tamper_custom')}
+
+# Highest row id the ranged log endpoint can be asked for
+_LAST_LOG_ROW = 2 ** 63 - 1
+
+# Seen log entries after which a task moves its log start past them
+LOG_WINDOW = 500
+
+# Options a server task cannot use (interactive, or refused by sqlmapapi)
+API_UNSUPPORTED = frozenset({'sql_shell', 'os_shell', 'os_pwn', 'wizard', 'eval', 'alert', 'update',
+                             'shell', 'predict_output'})
+
+
+def api_option_name(name: str) -> str:
+    """sqlmap's internal option name for a GUI option name"""
+    mapped = API_OPTION_NAMES.get(name)
+    if mapped:
+        return mapped
+    first, *rest = name.split('_')
+    return first + ''.join(part[:1].upper() + part[1:] for part in rest)
+
+
+def to_api_options(options: Dict[str, Any],
+                   known: Optional[AbstractSet[str]] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """Translate GUI options into sqlmapapi task options; returns (options, skipped names)
+
+    With `known` (the server's option names), options the server would reject
+    as unknown are skipped too.
+    """
+    api_options: Dict[str, Any] = {}
+    techniques = []
+    skipped = []
+    joined = {name for names in API_JOINED_OPTIONS.values() for name in names}
+    for name, value in options.items():
+        if value in (None, '', False) or name in joined:
+            continue
+        spec = parameter_schema.BY_NAME.get(name)
+        if spec is None or spec.group == 'gui':
+            continue  # GUI-only keys, ignored like build_command does
+        if name in API_UNSUPPORTED:
+            skipped.append(name)
+            continue
+        if spec.kind == 'technique':
+            techniques.append(spec.technique)
+            continue
+        api_name = api_option_name(name)
+        if known is not None and api_name not in known:
+            skipped.append(name)
+            continue
+        api_options[api_name] = True if spec.kind == 'flag' else value
+    if techniques and 'technique' not in api_options:
+        api_options['technique'] = ''.join(techniques)
+    for api_name, names in API_JOINED_OPTIONS.items():
+        values = [str(options[name]).strip() for name in names if options.get(name)]
+        if not values:
+            continue
+        if known is not None and api_name not in known:
+            skipped.extend(name for name in names if options.get(name))
+            continue
+        api_options[api_name] = ','.join(values)
+    api_options['batch'] = True  # Nobody can answer prompts on a server task
+    return api_options, skipped
+
+
+def find_sqlmapapi(wrapper: SqlmapWrapper) -> Optional[List[str]]:
+    """Command prefix that runs sqlmapapi.py next to the sqlmap the wrapper uses"""
+    python = getattr(wrapper, 'python_cmd', None) or sys.executable
+    path = wrapper.sqlmap_path
+    if isinstance(path, list):
+        python, path = path[0], path[-1]
+    else:
+        path = shutil.which(path) or path
+
+    candidates = []
+    if path:
+        candidates.append(os.path.join(os.path.dirname(os.path.realpath(path)), 'sqlmapapi.py'))
+    # pip installs only a "sqlmap" entry point; the package still ships sqlmapapi.py
+    spec = importlib.util.find_spec('sqlmap')
+    if spec and spec.origin:
+        candidates.append(os.path.join(os.path.dirname(spec.origin), 'sqlmapapi.py'))
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return [python, candidate]
+    return None
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class ApiError(Exception):
+    """The sqlmapapi server refused a request or could not be reached"""
+
+
+class SqlmapApiServer:
+    """A local sqlmapapi server shared by many scan tasks"""
+
+    def __init__(self, wrapper: SqlmapWrapper, host: str = '127.0.0.1', port: Optional[int] = None,
+                 database: Optional[str] = None):
+        self.wrapper = wrapper
+        self.host = host
+        self.port = port
+        self.database = database
+        # Basic auth is mandatory for the server; credentials never leave this process
+        self.username = 'sqlmap-gui'
+        self.password = secrets.token_urlsafe(24)
+        self.process: Optional[subprocess.Popen] = None
+        self._option_names: Optional[frozenset] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, timeout: float = 20.0) -> bool:
+        """Start the server and wait until it answers"""
+        with self._lock:
+            if self.running:
+                return True
+            command = find_sqlmapapi(self.wrapper)
+            if command is None:
+                print("sqlmapapi.py not found next to the sqlmap installation")
+                return False
+            self.port = self.port or _free_port(self.host)
+            command += ['-s', '-H', self.host, '-p', str(self.port),
+                        '--username', self.username, '--password', self.password]
+            if self.database:
+                command += ['--database', self.database]
+            try:
+                # Tasks launch sqlmap.py relative to the server's working directory
+                self.process = subprocess.Popen(command, cwd=os.path.dirname(command[1]),
+                                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except OSError as e:
+                print(f"Error starting sqlmapapi server: {e}")
+                return False
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if not self.running:
+                print("sqlmapapi server exited during start-up")
+                return False
+            try:
+                self.request('GET', '/version')
+                return True
+            except ApiError:
+                time.sleep(0.2)
+        print("sqlmapapi server did not answer in time")
+        self.stop()
+        return False
+
+    def stop(self):
+        with self._lock:
+            if self.running:
+                self.process.terminate()
+                try:
+                    self.process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+            self.process = None
+
+    def __enter__(self) -> 'SqlmapApiServer':
+        if not self.start():
+            raise ApiError("sqlmapapi server could not be started")
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """JSON request to the server; raises ApiError unless it reports success"""
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        credentials = base64.b64encode(f"{self.username}:{self.password}".encode('utf-8')).decode('ascii')
+        request = urllib.request.Request(self.url + path, data=data, method=method, headers={
+            'Authorization': f"Basic {credentials}", 'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                reply = json.loads(response.read().decode('utf-8'))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise ApiError(f"{method} {path}: {e}")
+        if not reply.get('success', False):
+            raise ApiError(f"{method} {path}: {reply.get('message', 'request failed')}")
+        return reply
+
+    def option_names(self, task_id: str) -> frozenset:
+        """Option names the server accepts (sqlmap's optDict), read once from a task's option list"""
+        if self._option_names is None:
+            self._option_names = frozenset(self.request('GET', f"/option/{task_id}/list").get('options', {}))
+        return self._option_names
+
+    def new_task(self, options: Dict[str, Any]) -> 'ApiTask':
+        return ApiTask(self, options)
+
+
+class ApiTask:
+    """One scan as a server task; log and data are fetched from where the last poll stopped"""
+
+    def __init__(self, server: SqlmapApiServer, options: Dict[str, Any]):
+        self.server = server
+        self.gui_options = options
+        self.options, self.skipped = to_api_options(options)
+        self.task_id: Optional[str] = None
+        self.log_start = 1  # Server-wide log row id the next poll starts from
+        self.log_seen = 0   # Entries at or after log_start already returned
+        self.data_offset = 0
+        self.status = 'not running'
+        self.returncode: Optional[int] = None
+
+    def start(self):
+        self.task_id = self.server.request('GET', '/task/new')['taskid']
+        # The server refuses the whole scan over one unknown option, so drop those first
+        self.options, self.skipped = to_api_options(self.gui_options, self.server.option_names(self.task_id))
+        self.server.request('POST', f"/scan/{self.task_id}/start", self.options)
+        self.status = 'running'
+
+    def poll_status(self) -> str:
+        reply = self.server.request('GET', f"/scan/{self.task_id}/status")
+        self.status = reply.get('status', self.status)
+        self.returncode = reply.get('returncode')
+        return self.status
+
+    def _log_range(self, start: int, end: int = _LAST_LOG_ROW) -> List[Dict[str, Any]]:
+        return self.server.request('GET', f"/scan/{self.task_id}/log/{start}/{end}").get('log', [])
+
+    def new_log(self) -> List[Dict[str, Any]]:
+        """Log entries ({'time', 'level', 'message'}) added since the last call
+
+        Only entries from log_start on are fetched. The ranged endpoint
+        takes row ids of the server's shared log table and does not return
+        them, so once LOG_WINDOW entries have been seen the id of the last
+        one is found by bisection and log_start moves past it.
+        """
+        entries = self._log_range(self.log_start)
+        new = entries[self.log_seen:]
+        self.log_seen = len(entries)
+        if self.log_seen >= LOG_WINDOW:
+            self._advance_log_start()
+        return new
+
+    def _advance_log_start(self):
+        """Move log_start just past the last entry already seen"""
+        # Rows are appended in id order, so the last seen entry has the smallest
+        # id whose range from log_start holds every seen entry
+        low, high = self.log_start, self.log_start + self.log_seen
+        while len(self._log_range(self.log_start, high)) < self.log_seen:
+            low, high = high + 1, self.log_start + (high - self.log_start) * 2
+        while low < high:
+            middle = (low + high) // 2
+            if len(self._log_range(self.log_start, middle)) < self.log_seen:
+                low = middle + 1
+            else:
+                high = middle
+        self.log_start, self.log_seen = high + 1, 0
+
+    def new_data(self) -> List[Dict[str, Any]]:
+        """Structured results ({'status', 'type', 'value'}) added since the last call
+
+        The data endpoint has no ranged form, so callers should only ask
+        when the log shows the scan moved on.
+        """
+        reply = self.server.request('GET', f"/scan/{self.task_id}/data")
+        data = reply.get('data', [])
+        new = data[self.data_offset:]
+        self.data_offset = len(data)
+        return new
+
+    def errors(self) -> List[str]:
+        return self.server.request('GET', f"/scan/{self.task_id}/data").get('error', [])
+
+    def stop(self):
+        if self.task_id and self.status == 'running':
+            try:
+                self.server.request('GET', f"/scan/{self.task_id}/kill")
+            except ApiError as e:
+                print(f"Error stopping API task {self.task_id}: {e}")
+
+    def delete(self):
+        if self.task_id:
+            try:
+                self.server.request('GET', f"/task/{self.task_id}/delete")
+            except ApiError as e:
+                print(f"Error deleting API task {self.task_id}: {e}")
+            self.task_id = None
+
+
+class SqlmapApiProcess:
+    """SqlmapProcess look-alike backed by an API task
+
+    Log entries are rendered as sqlmap console lines so the log view and the
+    output classifiers work unchanged; structured results collect in `data`.
+    """
+
+    def __init__(self, server: SqlmapApiServer, options: Dict[str, Any], poll_interval: float = 1.0):
+        self.server = server
+        self.task = ApiTask(server, options)
+        self.poll_interval = poll_interval
+        self.is_running = False
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.data: List[Dict[str, Any]] = []
+        self._output: List[str] = []
+        self._errors: List[str] = []
+        self._last_poll = 0.0
+
+    def start(self) -> bool:
+        try:
+            if not self.server.running and not self.server.start():
+                return False
+            self.task.start()
+        except ApiError as e:
+            print(f"Error starting API task: {e}")
+            return False
+        if self.task.skipped:
+            self._errors.append(f"Options not available through sqlmapapi: {', '.join(self.task.skipped)}")
+        self.start_time = time.time()
+        self.is_running = True
+        return True
+
+    def _refresh(self, force: bool = False):
+        """Fetch new log/data at most every poll_interval seconds"""
+        now = time.time()
+        if not self.is_running or (not force and now - self._last_poll < self.poll_interval):
+            return
+        self._last_poll = now
+        try:
+            status = self.task.poll_status()
+            entries = self.task.new_log()
+            for entry in entries:
+                self._output.append(f"[{entry.get('time', '')}] [{entry.get('level', 'INFO')}] {entry.get('message', '')}")
+            # Results only appear alongside log output, and once more at the end
+            if entries or status == 'terminated':
+                self.data.extend(self.task.new_data())
+        except ApiError as e:
+            self._errors.append(str(e))
+            status = 'terminated' if not self.server.running else self.task.status
+        if status == 'terminated':
+            if self.server.running:
+                try:
+                    self._errors.extend(self.task.errors())
+                except ApiError as e:
+                    self._errors.append(str(e))
+            self.is_running = False
+            self.end_time = now
+
+    def get_output(self) -> List[str]:
+        self._refresh()
+        lines, self._output = self._output, []
+        return lines
+
+    def get_errors(self) -> List[str]:
+        lines, self._errors = self._errors, []
+        return lines
+
+    def read_output(self) -> Optional[str]:
+        self._refresh()
+        return self._output.pop(0) if self._output else None
+
+    def read_error(self) -> Optional[str]:
+        return self._errors.pop(0) if self._errors else None
+
+    def poll(self) -> Optional[int]:
+        self._refresh()
+        if self.is_running:
+            return None
+        return self.get_exit_code()
+
+    def wait_output(self, timeout: float = 5.0):
+        """The refresh that noticed the task ended already fetched the rest of its log"""
+
+    def get_exit_code(self) -> Optional[int]:
+        if self.task.returncode is None and not self.is_running and self.end_time:
+            return 1  # Killed or lost with the server
+        return self.task.returncode
+
+    def stop(self) -> bool:
+        if not self.is_running:
+            return False
+        self.task.stop()
+        self._refresh(force=True)
+        self.is_running = False
+        self.end_time = time.time()
+        return True
+
+
+_default_server: Optional[SqlmapApiServer] = None
+_default_lock = threading.Lock()
+
+
+def get_default_server(wrapper: SqlmapWrapper) -> SqlmapApiServer:
+    """Server shared by every scan of this process, started on first use"""
+    global _default_server
+    with _default_lock:
+        if _default_server is None:
+            _default_server = SqlmapApiServer(wrapper)
+            # Other windows may still use it, so it lives until the process exits
+            atexit.register(shutdown_default_server)
+        return _default_server
+
+
+def shutdown_default_server():
+    with _default_lock:
+        if _default_server is not None:
+            _default_server.stop()
@@ -3,7 +3,6 @@
 SQLmap Command Validator - Comprehensive validation system for SQLmap commands
 """
 
-import shlex
 import re
 import os
 import json
@@ -11,6 +10,27 @@ from typing import Dict, List, Tuple, Optional, Any, Set
 from dataclasses import dataclass
 from enum import Enum
 
+from . import parameter_schema
+from .command_lexer import CommandLexer
+
+
+# Precompiled patterns and flag sets used on every validation
+_URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
+    r'localhost|'  # localhost
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # IP
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+_URL_FLAGS = frozenset({'-u', '--url'})
+
+_FILE_FLAGS = frozenset({
+    '--tamper', '--auth-file', '-r', '-l', '-m', '--sql-file', '--load-cookies', '--live-cookies'
+})
+
+_DIR_FLAGS = frozenset({'--output-dir', '--tmp-dir'})
+
 
 class ValidationLevel(Enum):
     """Validation severity levels"""
@@ -49,155 +69,32 @@ class SqlmapValidator:
     def initialize_validation_data(self):
         """Initialize validation rules and data"""
         
+        # Flag knowledge comes from the shared parameter schema
+        
         # Target specification flags (at least one required)
-        self.target_flags = {
-            '-u', '--url',           # Target URL
-            '-d', '--direct',        # Direct database connection
-            '-l', '--logfile',       # Burp/WebScarab log file
-            '-m', '--bulkfile',      # Multiple targets file
-            '-r', '--requestfile',   # HTTP request file
-            '-g', '--googledork',    # Google dork
-            '-c', '--configfile'     # Configuration file
-        }
+        self.target_flags = parameter_schema.TARGET_FLAGS
         
         # Boolean flags (no values expected)
-        self.boolean_flags = {
-            '--batch', '--mobile', '--random-agent', '--force-ssl', '--chunked',
-            '--hpp', '--forms', '--fresh-queries', '--hex', '--parse-errors',
-            '--repair', '--skip-urlencode', '--skip-static', '--skip-heuristics',
-            '--skip-waf', '--smart', '--text-only', '--titles', '--no-cast',
-            '--no-escape', '--invalid-bignum', '--invalid-logical', '--invalid-string',
-            '--optimize', '--predict-output', '--keep-alive', '--null-connection',
-            '--all', '--banner', '--current-user', '--current-db', '--hostname',
-            '--is-dba', '--users', '--passwords', '--privileges', '--roles',
-            '--dbs', '--tables', '--columns', '--schema', '--count', '--dump',
-            '--dump-all', '--search', '--comments', '--statements', '--common-tables',
-            '--common-columns', '--common-files', '--udf-inject', '--os-shell',
-            '--os-pwn', '--os-smbrelay', '--os-bof', '--priv-esc', '--sql-shell',
-            '--reg-read', '--reg-add', '--reg-del', '--flush-session', '--cleanup',
-            '--crawl-exclude', '--base64-safe', '--check-internet', '--eta',
-            '--offline', '--purge', '--shell', '--unstable', '--update', '--wizard',
-            '--beep', '--dependencies', '--disable-coloring', '--disable-hashing',
-            '--list-tampers', '--no-logging', '--no-truncate', '--fingerprint',
-            '--exclude-sysdbs', '--check-tor', '--ignore-proxy', '--ignore-redirects',
-            '--ignore-timeouts', '--drop-set-cookie', '--tor'
-        }
+        self.boolean_flags = parameter_schema.BOOLEAN_FLAGS
         
         # Flags that require values
-        self.value_flags = {
-            # Target and request
-            '-u', '--url', '-d', '--direct', '-l', '--logfile', '-m', '--bulkfile',
-            '-r', '--requestfile', '-g', '--googledork', '-c', '--configfile',
-            '--method', '--data', '--param-del', '--cookie', '--cookie-del',
-            '--live-cookies', '--load-cookies', '--host', '--referer', '--headers',
-            '--auth-type', '--auth-cred', '--auth-file', '--abort-code', '--ignore-code',
-            '--proxy', '--proxy-cred', '--proxy-file', '--proxy-freq', '--tor-port',
-            '--tor-type', '--delay', '--timeout', '--retries', '--retry-on',
-            '--randomize', '--safe-url', '--safe-post', '--safe-req', '--safe-freq',
-            '--csrf-token', '--csrf-url', '--csrf-method', '--csrf-data', '--csrf-retries',
-            '--eval', '--user-agent', '--encoding',
-            
-            # Injection
-            '-p', '--skip', '--param-exclude', '--param-filter', '--dbms', '--dbms-cred',
-            '--os', '--prefix', '--suffix', '--tamper',
-            
-            # Detection and techniques
-            '--level', '--risk', '--string', '--not-string', '--regexp', '--code',
-            '--technique', '--time-sec', '--union-cols', '--union-char', '--union-from',
-            '--union-values', '--dns-domain', '--second-url', '--second-req',
-            
-            # Enumeration
-            '-D', '--db', '-T', '--tbl', '-C', '--col', '-X', '--exclude',
-            '-U', '--user', '--pivot-column', '--where', '--start', '--stop',
-            '--first', '--last', '--sql-query', '--sql-file',
-            
-            # File system and OS
-            '--file-read', '--file-write', '--file-dest', '--os-cmd', '--msf-path',
-            '--tmp-path', '--shared-lib',
-            
-            # Registry
-            '--reg-key', '--reg-value', '--reg-data', '--reg-type',
-            
-            # General
-            '-s', '--sessionfile', '-t', '--trafficfile', '--answers', '--base64',
-            '--binary-fields', '--charset', '--csv-del', '--dump-file', '--dump-format',
-            '--output-dir', '--preprocess', '--postprocess', '--save', '--scope',
-            '--test-filter', '--test-skip', '--time-limit', '--table-prefix',
-            '--web-root', '--alert', '--results-file', '--tmp-dir', '--har',
-            
-            # Numeric flags
-            '-v', '--verbose', '--threads', '--crawl', '--gpage'
-        }
+        self.value_flags = parameter_schema.VALUE_FLAGS
         
         # Numeric ranges for specific flags
-        self.numeric_ranges = {
-            '--level': (1, 5),
-            '--risk': (1, 3),
-            '-v': (0, 6),
-            '--verbose': (0, 6),
-            '--threads': (1, 100),
-            '--timeout': (1, 3600),
-            '--retries': (0, 50),
-            '--delay': (0, 3600),
-            '--time-sec': (1, 3600),
-            '--safe-freq': (1, 1000),
-            '--proxy-freq': (1, 1000),
-            '--tor-port': (1, 65535),
-            '--crawl': (0, 10),
-            '--csrf-retries': (0, 10),
-            '--start': (1, None),
-            '--stop': (1, None),
-            '--first': (1, None),
-            '--last': (1, None),
-            '--gpage': (1, None)
-        }
+        self.numeric_ranges = parameter_schema.NUMERIC_RANGES
         
         # Mutually exclusive flags
-        self.mutually_exclusive = [
-            {'--os-shell', '--sql-shell', '--os-cmd'},
-            {'--dump', '--dump-all', '--sql-query'},
-            {'--tor', '--proxy'},
-            {'--batch', '--wizard'},
-            {'--mobile', '--random-agent', '--user-agent'}
-        ]
-        
-        # Dependent flags (flag -> required flags)
-        self.dependencies = {
-            '--proxy-freq': ['--proxy-file'],
-            '--safe-freq': ['--safe-url', '--safe-post', '--safe-req'],
-            '--dbms-cred': ['--dbms'],
-            '--second-req': ['-r', '--requestfile'],
-            '--second-url': ['-r', '--requestfile'],
-            '--csrf-token': ['-u', '--url'],
-            '--data': ['-u', '--url'],
-            '--cookie': ['-u', '--url'],
-            '--reg-key': ['--reg-read', '--reg-add', '--reg-del'],
-            '--file-dest': ['--file-write'],
-            '--pivot-column': ['--dump'],
-            '--where': ['--dump'],
-            '--start': ['--dump'],
-            '--stop': ['--dump'],
-            '--first': ['--dump'],
-            '--last': ['--dump']
-        }
+        self.mutually_exclusive = parameter_schema.EXCLUSIVE_FLAG_GROUPS
+        
+        # Dependent flags (flag -> flags of which at least one is required)
+        self.dependencies = parameter_schema.FLAG_DEPENDENCIES
+        self.advisory_dependencies = parameter_schema.ADVISORY_FLAG_DEPENDENCIES
         
         # High-risk flags requiring warnings
-        self.high_risk_flags = {
-            '--os-cmd': "Executes OS commands on target server",
-            '--os-shell': "Provides interactive OS shell access",
-            '--os-pwn': "Attempts to get Meterpreter/VNC access",
-            '--os-smbrelay': "One-click shell/Meterpreter access",
-            '--os-bof': "Buffer overflow exploitation",
-            '--priv-esc': "Privilege escalation attempts",
-            '--file-write': "Writes files to target system",
-            '--file-read': "Reads files from target system",
-            '--reg-add': "Modifies Windows registry",
-            '--reg-del': "Deletes Windows registry entries",
-            '--sql-shell': "Provides interactive SQL shell"
-        }
+        self.high_risk_flags = parameter_schema.HIGH_RISK_FLAGS
         
         # Valid techniques
-        self.valid_techniques = set('BEUSTQ')
+        self.valid_techniques = parameter_schema.VALID_TECHNIQUES
         
         # Valid dump formats
         self.valid_dump_formats = {'CSV', 'HTML', 'SQLITE'}
@@ -222,6 +119,13 @@ class SqlmapValidator:
         self.valid_auth_types = {
             'Basic', 'Digest', 'NTLM', 'PKI', 'Bearer'
         }
+        
+        # Flags taking part in any exclusion group, for a fast no-conflict path
+        self.exclusive_flags = frozenset(flag for group in self.mutually_exclusive for flag in group)
+        
+        # Every known flag, and the lexer resolving flags and prefixes against them
+        self.all_flags = self.boolean_flags | self.value_flags | self.target_flags
+        self.lexer = CommandLexer(self.boolean_flags, self.value_flags | self.target_flags)
     
     def validate_command(self, command: str) -> CommandValidation:
         """Main validation method"""
@@ -233,13 +137,21 @@ class SqlmapValidator:
             if not self._validate_base_command(command, results):
                 return self._create_validation_result(results)
             
-            # 2. Parse command into tokens
-            tokens = self._parse_command(command, results)
-            if not tokens:
-                return self._create_validation_result(results)
+            # 2. Lex the command into resolved flags and values in a single pass
+            lexed = self.lexer.lex(command)
+            if lexed.parsed and not lexed.recognized:
+                results.append(ValidationResult(
+                    ValidationLevel.WARNING,
+                    "Command should start with 'sqlmap' or 'python sqlmap'",
+                    suggestion="Ensure you're calling SQLmap correctly"
+                ))
+            for level, message, flag, suggestion in lexed.issues:
+                results.append(ValidationResult(ValidationLevel(level), message, flag=flag, suggestion=suggestion))
             
-            # 3. Extract flags and values
-            flags_dict = self._extract_flags_and_values(tokens, results)
+            # 3. Nothing to check without arguments
+            flags_dict = lexed.flags
+            if not lexed.parsed or (not flags_dict and not lexed.issues):
+                return self._create_validation_result(results)
             
             # 4. Validate target specification
             self._validate_target_specification(flags_dict, results)
@@ -282,90 +194,8 @@ class SqlmapValidator:
             ))
             return False
         
-        command = command.strip()
-        
-        # Check if it starts with sqlmap
-        if not (command.startswith('sqlmap') or command.startswith('python sqlmap')):
-            results.append(ValidationResult(
-                ValidationLevel.WARNING,
-                "Command should start with 'sqlmap' or 'python sqlmap'",
-                suggestion="Ensure you're calling SQLmap correctly"
-            ))
-        
         return True
     
-    def _parse_command(self, command: str, results: List[ValidationResult]) -> List[str]:
-        """Parse command into tokens using shell-style parsing"""
-        try:
-            # Remove 'sqlmap' or 'python sqlmap.py' from the beginning
-            if command.startswith('python sqlmap'):
-                command = command[len('python sqlmap'):].lstrip()
-            elif command.startswith('sqlmap'):
-                command = command[len('sqlmap'):].lstrip()
-            
-            # Use shlex for proper shell-style parsing
-            tokens = shlex.split(command)
-            return tokens
-            
-        except ValueError as e:
-            results.append(ValidationResult(
-                ValidationLevel.ERROR,
-                f"Failed to parse command: {str(e)}",
-                suggestion="Check for unmatched quotes or invalid shell syntax"
-            ))
-            return []
-    
-    def _extract_flags_and_values(self, tokens: List[str], results: List[ValidationResult]) -> Dict[str, Any]:
-        """Extract flags and their values from tokens"""
-        flags_dict = {}
-        i = 0
-        
-        while i < len(tokens):
-            token = tokens[i]
-            
-            if token.startswith('-'):
-                # Handle combined short flags like -uhttp://example.com
-                if token.startswith('-') and not token.startswith('--') and len(token) > 2 and '=' not in token:
-                    flag = token[:2]
-                    value = token[2:]
-                    flags_dict[flag] = value
-                # Handle --flag=value format
-                elif '=' in token:
-                    flag, value = token.split('=', 1)
-                    flags_dict[flag] = value
-                # Handle --flag value format
-                else:
-                    flag = token
-                    
-                    # Check if this flag expects a value
-                    if flag in self.boolean_flags:
-                        flags_dict[flag] = True
-                    elif flag in self.value_flags:
-                        # Look for next token as value
-                        if i + 1 < len(tokens) and not tokens[i + 1].startswith('-'):
-                            i += 1
-                            flags_dict[flag] = tokens[i]
-                        else:
-                            results.append(ValidationResult(
-                                ValidationLevel.ERROR,
-                                f"Flag '{flag}' requires a value but none provided",
-                                flag=flag
-                            ))
-                            flags_dict[flag] = None
-                    else:
-                        # Unknown flag - will be caught in flag validation
-                        flags_dict[flag] = True
-            else:
-                results.append(ValidationResult(
-                    ValidationLevel.WARNING,
-                    f"Unexpected token '{token}' - not a flag or value",
-                    suggestion="Check command syntax"
-                ))
-            
-            i += 1
-        
-        return flags_dict
-    
     def _validate_target_specification(self, flags_dict: Dict[str, Any], results: List[ValidationResult]):
         """Validate that at least one target is specified"""
         found_targets = []
@@ -374,7 +204,8 @@ class SqlmapValidator:
             if flag in self.target_flags:
                 found_targets.append(flag)
         
-        if not found_targets:
+        # A -c configuration file may define the target itself
+        if not found_targets and '-c' not in flags_dict:
             results.append(ValidationResult(
                 ValidationLevel.ERROR,
                 "No target specification found",
@@ -389,7 +220,7 @@ class SqlmapValidator:
     
     def _validate_flags_existence(self, flags_dict: Dict[str, Any], results: List[ValidationResult]):
         """Validate that all flags are supported by SQLmap"""
-        all_valid_flags = self.boolean_flags | self.value_flags | self.target_flags
+        all_valid_flags = self.all_flags
         
         for flag in flags_dict.keys():
             if flag not in all_valid_flags:
@@ -448,7 +279,7 @@ class SqlmapValidator:
                 ))
         
         # URL validation
-        elif flag in ['-u', '--url']:
+        elif flag in _URL_FLAGS:
             if not self._validate_url(value):
                 results.append(ValidationResult(
                     ValidationLevel.ERROR,
@@ -509,8 +340,7 @@ class SqlmapValidator:
                 ))
         
         # File path validation
-        elif flag in ['--tamper', '--auth-file', '-r', '--requestfile', '-l', '--logfile', 
-                      '-m', '--bulkfile', '--sql-file', '--load-cookies', '--live-cookies']:
+        elif flag in _FILE_FLAGS:
             if not os.path.isfile(value):
                 results.append(ValidationResult(
                     ValidationLevel.WARNING,
@@ -520,7 +350,7 @@ class SqlmapValidator:
                 ))
         
         # Directory path validation
-        elif flag in ['--output-dir', '--tmp-dir']:
+        elif flag in _DIR_FLAGS:
             if not os.path.isdir(value):
                 results.append(ValidationResult(
                     ValidationLevel.WARNING,
@@ -531,6 +361,10 @@ class SqlmapValidator:
     
     def _validate_logical_compatibility(self, flags_dict: Dict[str, Any], results: List[ValidationResult]):
         """Check for mutually exclusive flags"""
+        exclusive_flags = self.exclusive_flags
+        if sum(1 for flag in flags_dict if flag in exclusive_flags) < 2:
+            return
+        
         for exclusive_group in self.mutually_exclusive:
             found_flags = [flag for flag in exclusive_group if flag in flags_dict]
             
@@ -543,53 +377,29 @@ class SqlmapValidator:
     
     def _validate_dependencies(self, flags_dict: Dict[str, Any], results: List[ValidationResult]):
         """Check flag dependencies"""
-        # Create mapping of short to long flags for dependency checking
-        flag_mapping = {
-            '-u': '--url',
-            '-d': '--direct',
-            '-r': '--requestfile',
-            '-l': '--logfile',
-            '-m': '--bulkfile',
-            '-g': '--googledork',
-            '-c': '--configfile',
-            '-s': '--sessionfile',
-            '-t': '--trafficfile',
-            '-v': '--verbose',
-            '-D': '--db',
-            '-T': '--tbl',
-            '-C': '--col',
-            '-U': '--user',
-            '-X': '--exclude'
-        }
-        
-        # Create reverse mapping and add both forms to check set
-        all_flags = set(flags_dict.keys())
-        for short, long_flag in flag_mapping.items():
-            if short in flags_dict:
-                all_flags.add(long_flag)
-            if long_flag in flags_dict:
-                all_flags.add(short)
-        
-        for flag, required_flags in self.dependencies.items():
-            if flag in flags_dict:
-                missing_deps = []
-                for req_flag in required_flags:
-                    # Check if any of the required flags (if it's a list) is present
-                    if isinstance(req_flag, list):
-                        if not any(rf in all_flags for rf in req_flag):
-                            missing_deps.extend(req_flag)
-                    elif req_flag not in all_flags:
-                        missing_deps.append(req_flag)
-                
-                if missing_deps:
-                    results.append(ValidationResult(
-                        ValidationLevel.ERROR,
-                        f"Flag '{flag}' requires one of: {', '.join(missing_deps)}",
-                        flag=flag
-                    ))
+        # Dependency lists already contain every short/long form of the required flags
+        for flag in flags_dict:
+            required_flags = self.dependencies.get(flag)
+            if required_flags and not any(req_flag in flags_dict for req_flag in required_flags):
+                results.append(ValidationResult(
+                    ValidationLevel.ERROR,
+                    f"Flag '{flag}' requires one of: {', '.join(required_flags)}",
+                    flag=flag
+                ))
+                continue
+            related_flags = self.advisory_dependencies.get(flag)
+            if related_flags and not any(rel_flag in flags_dict for rel_flag in related_flags):
+                results.append(ValidationResult(
+                    ValidationLevel.WARNING,
+                    f"Flag '{flag}' usually goes with one of: {', '.join(related_flags)}",
+                    flag=flag
+                ))
     
     def _validate_security_risks(self, flags_dict: Dict[str, Any], results: List[ValidationResult]):
         """Identify high-risk operations"""
+        if self.high_risk_flags.keys().isdisjoint(flags_dict):
+            return
+        
         for flag, description in self.high_risk_flags.items():
             if flag in flags_dict:
                 results.append(ValidationResult(
@@ -635,15 +445,7 @@ class SqlmapValidator:
     
     def _validate_url(self, url: str) -> bool:
         """Validate URL format"""
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
-            r'localhost|'  # localhost
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # IP
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        
-        return url_pattern.match(url) is not None
+        return _URL_PATTERN.match(url) is not None
     
     def _generate_suggestions(self, original_command: str, flags_dict: Dict[str, Any], 
                             results: List[ValidationResult]) -> Optional[str]:
@@ -0,0 +1,279 @@
+"""
+Target Registry - Persistent record of which targets were tested with which options
+SQLite holds the (target signature, option fingerprint, outcome) records; a
+Bloom filter in front of it answers "never tested" without touching the disk
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from . import parameter_schema
+from .proxy_log import target_signature
+from .validation_cache import options_digest
+
+
+# Options that change how fast or how verbosely a scan runs, or where it writes,
+# but not what it covers; they are left out of the option fingerprint
+COVERAGE_NEUTRAL = frozenset({
+    'threads', 'delay', 'timeout', 'retries', 'verbose', 'batch', 'auto_batch', 'flush_session',
+    'fresh_queries', 'output_dir', 'results_file', 'traffic_file', 'session_file', 'eta', 'proxy',
+    'proxy_file', 'proxy_cred', 'tor', 'tor_port', 'tor_type', 'check_tor', 'keep_alive',
+    'null_connection', 'disable_coloring', 'answers', 'list_tampers_btn', 'auto_tune', '_metadata',
+}) | frozenset(parameter_schema.TARGET_PARAMS)
+
+
+def coverage_fingerprint(options: Dict[str, Any]) -> str:
+    """Fingerprint of the options that decide what a scan tests"""
+    relevant = {key: value for key, value in options.items()
+                if key not in COVERAGE_NEUTRAL and value not in (None, '', False)}
+    return options_digest(relevant)
+
+
+def options_target_signature(options: Dict[str, Any]) -> Optional[str]:
+    """Target signature of a single-URL option set, or None for other target kinds"""
+    url = options.get('url')
+    if not url:
+        return None
+    data = options.get('data') or ''
+    method = options.get('method') or ('POST' if data else 'GET')
+    body_names = [name for name, _ in parse_qsl(str(data), keep_blank_values=True)]
+    return target_signature(str(url).strip(), method, body_names)
+
+
+# Outcomes that mean the target/options pair was fully covered
+COMPLETED_OUTCOMES = frozenset({'vulnerable', 'not_vulnerable', 'completed'})
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a BLAKE2b digest"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        for i in range(self.hashes):
+            yield (first + i * second) % size
+
+    def add(self, key: str):
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+    def to_bytes(self) -> bytes:
+        header = f"{self.capacity}:{self.error_rate}:{self.count}:".encode('ascii')
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        capacity, error_rate, count, bits = data.split(b':', 3)
+        bloom = cls(int(capacity), float(error_rate))
+        if len(bits) != len(bloom.bits):
+            raise ValueError("Bloom filter size mismatch")
+        bloom.bits = bytearray(bits)
+        bloom.count = int(count)
+        return bloom
+
+
+class TestRecord:
+    """One registry entry"""
+
+    __slots__ = ('target', 'options', 'outcome', 'tested_at', 'runs')
+
+    def __init__(self, target: str, options: str, outcome: str, tested_at: float, runs: int):
+        self.target = target
+        self.options = options
+        self.outcome = outcome
+        self.tested_at = tested_at
+        self.runs = runs
+
+    def __repr__(self) -> str:
+        return f"TestRecord({self.target!r}, {self.outcome!r}, runs={self.runs})"
+
+
+def default_registry_path() -> Path:
+    return Path.home() / '.sqlmap-gui' / 'target_registry.db'
+
+
+class TargetRegistry:
+    """Persistent (target signature, option fingerprint) -> outcome records"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tested (
+            target TEXT NOT NULL,
+            options TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            tested_at REAL NOT NULL,
+            runs INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (target, options)
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value BLOB
+        );
+    """
+
+    def __init__(self, path: Optional[str] = None, error_rate: float = 0.01):
+        self.path = Path(path) if path else default_registry_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.error_rate = error_rate
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(self.SCHEMA)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.bloom = self._load_bloom()
+        self.bloom_negatives = 0  # Lookups answered by the filter alone
+        self.lookups = 0
+
+    @staticmethod
+    def _key(target: str, options: str) -> str:
+        return f"{target}\0{options}"
+
+    def _max_rowid(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM tested").fetchone()[0]
+
+    def _load_bloom(self) -> BloomFilter:
+        """Load the saved filter if it matches the table, otherwise rebuild it"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'bloom'").fetchone()
+        stamp = self.conn.execute("SELECT value FROM meta WHERE key = 'bloom_rowid'").fetchone()
+        if row and stamp and int(stamp[0]) == self._max_rowid():
+            try:
+                return BloomFilter.from_bytes(row[0])
+            except ValueError as e:
+                print(f"Rebuilding target registry index: {e}")
+        return self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> BloomFilter:
+        count = self.conn.execute("SELECT COUNT(*) FROM tested").fetchone()[0]
+        bloom = BloomFilter(max(100000, count * 2), self.error_rate)
+        for target, options in self.conn.execute("SELECT target, options FROM tested"):
+            bloom.add(self._key(target, options))
+        return bloom
+
+    def save_index(self):
+        """Persist the Bloom filter so the next open skips the rebuild"""
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('bloom', ?)", (self.bloom.to_bytes(),))
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('bloom_rowid', ?)", (self._max_rowid(),))
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.save_index()
+            self.conn.close()
+
+    def __enter__(self) -> 'TargetRegistry':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def might_contain(self, target: str, options: str) -> bool:
+        """Fast check; False means definitely never tested"""
+        self.lookups += 1
+        if self._key(target, options) in self.bloom:
+            return True
+        self.bloom_negatives += 1
+        return False
+
+    def lookup(self, target: str, options: str) -> Optional[TestRecord]:
+        """The record for a target/options pair, if it was tested before"""
+        if not self.might_contain(target, options):
+            return None
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT target, options, outcome, tested_at, runs FROM tested WHERE target = ? AND options = ?",
+                (target, options)).fetchone()
+        return TestRecord(*row) if row else None
+
+    def record(self, target: str, options: str, outcome: str, tested_at: Optional[float] = None):
+        self.record_many([(target, options, outcome)], tested_at)
+
+    def record_many(self, entries: Iterable[Tuple[str, str, str]], tested_at: Optional[float] = None):
+        """Record (target, options, outcome) results in one transaction"""
+        tested_at = tested_at or time.time()
+        rows = [(target, options, outcome, tested_at) for target, options, outcome in entries]
+        with self._lock:
+            self.conn.executemany(
+                "INSERT INTO tested (target, options, outcome, tested_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(target, options) DO UPDATE SET outcome = excluded.outcome, "
+                "tested_at = excluded.tested_at, runs = runs + 1", rows)
+            self.conn.commit()
+            for target, options, _, _ in rows:
+                self.bloom.add(self._key(target, options))
+            if self.bloom.saturated:
+                self.bloom = self._rebuild_bloom()
+
+    def is_covered(self, target: str, options: str) -> bool:
+        """Whether a scan of this target with these options already completed"""
+        record = self.lookup(target, options)
+        return record is not None and record.outcome in COMPLETED_OUTCOMES
+
+    def filter_untested(self, items: Iterable[Tuple[str, str, Any]]) -> Iterator[Any]:
+        """Yield the payload of (target, options, payload) items not covered before"""
+        for target, options, payload in items:
+            if not self.is_covered(target, options):
+                yield payload
+
+    def check_options(self, options: Dict[str, Any]) -> Optional[TestRecord]:
+        """Previous result of a single-URL scan with equivalent options"""
+        target = options_target_signature(options)
+        if target is None:
+            return None
+        return self.lookup(target, coverage_fingerprint(options))
+
+    def record_options(self, options: Dict[str, Any], outcome: str):
+        target = options_target_signature(options)
+        if target is not None:
+            self.record(target, coverage_fingerprint(options), outcome)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            records = self.conn.execute("SELECT COUNT(*) FROM tested").fetchone()[0]
+            outcomes = dict(self.conn.execute("SELECT outcome, COUNT(*) FROM tested GROUP BY outcome"))
+        return {
+            'records': records,
+            'outcomes': outcomes,
+            'bloom_bits': self.bloom.size,
+            'bloom_hashes': self.bloom.hashes,
+            'lookups': self.lookups,
+            'bloom_negatives': self.bloom_negatives,
+        }
+
+
+_default_registry: Optional[TargetRegistry] = None
+
+
+def get_default_registry() -> TargetRegistry:
+    """Registry shared by everything in this process"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = TargetRegistry()
+    return _default_registry
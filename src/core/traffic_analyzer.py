@@ -0,0 +1,442 @@
+"""
+Traffic Analyzer - Live request rate, status mix and latency from a sqlmap traffic file
+Follows the file written by -t incrementally and keeps the most recent
+exchanges in fixed-size array windows, so metrics stay cheap however long
+the scan runs
+
+sqlmap writes an exchange once its response is complete and logs no
+timings, so while following a live scan each exchange is timestamped when
+it is read (spread evenly over the poll interval) and latency is only an
+estimate: the spacing of completions times the number of scan threads.
+Real per-request timings come from the HAR file (--har), which sqlmap
+writes when the scan exits; once it is loaded it replaces the estimate.
+"""
+
+import datetime
+import json
+import os
+import re
+import threading
+import time
+from array import array
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+# Written after every exchange: os.linesep, 76 '#', os.linesep, os.linesep
+SEPARATOR = b'#' * 76
+
+_REQUEST_HEAD = re.compile(rb'^HTTP request \[#(\d+)\]:\r?\n(\S+) (\S+)', re.M)
+_RESPONSE_HEAD = re.compile(rb'^HTTP (?:response|redirect) \[#(\d+)\] \((\d{3})?[^\n]*?\):\r?$', re.M)
+_DATE_HEADER = re.compile(rb'^Date: ([^\r\n]+)', re.M | re.I)
+
+# Status codes that mean the target is pushing back
+THROTTLE_CODES = (429, 503)
+# Share of throttled or failed responses in a window of at least MIN_THROTTLE_SAMPLES that is worth a warning
+THROTTLE_WARNING = 0.2
+MIN_THROTTLE_SAMPLES = 20
+
+# Exchanges kept per window and seconds of per-second request counts kept for charts
+DEFAULT_WINDOW = 512
+HISTORY_SECONDS = 300
+
+# Seconds the request rate is averaged over
+RATE_SPAN = 10
+
+
+class Exchange:
+    """One request/response pair from the traffic file"""
+
+    __slots__ = ('number', 'method', 'path', 'status', 'size', 'timestamp', 'latency')
+
+    def __init__(self, number: int, method: str, path: str, status: int, size: int, timestamp: float,
+                 latency: Optional[float] = None):
+        self.number = number
+        self.method = method
+        self.path = path
+        self.status = status  # 0 when the request failed without a response
+        self.size = size      # Response body bytes as logged (sqlmap truncates huge pages)
+        self.timestamp = timestamp
+        self.latency = latency
+
+    def __repr__(self) -> str:
+        return f"Exchange(#{self.number} {self.method} {self.path[:40]} -> {self.status}, {self.size} bytes)"
+
+
+def parse_exchange(record: bytes, timestamp: Optional[float] = None) -> Optional[Exchange]:
+    """Parse one record of the traffic file; without a timestamp the response Date header is used"""
+    request = _REQUEST_HEAD.search(record)
+    if not request:
+        return None
+    response = _RESPONSE_HEAD.search(record, request.end())
+    status, size = 0, 0
+    if response:
+        status = int(response.group(2) or 0)
+        body = record.find(b'\r\n\r\n', response.end())
+        if body >= 0:
+            size = len(record[body + 4:].rstrip(b'\r\n'))
+    if timestamp is None:
+        date = _DATE_HEADER.search(record, response.end() if response else request.end())
+        timestamp = time.time()
+        if date:
+            try:
+                timestamp = parsedate_to_datetime(date.group(1).decode('ascii', 'replace')).timestamp()
+            except (TypeError, ValueError):
+                pass
+    return Exchange(int(request.group(1)), request.group(2).decode('ascii', 'replace'),
+                    request.group(3).decode('utf-8', 'replace'), status, size, timestamp)
+
+
+def _har_time(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds of a HAR startedDateTime; sqlmap writes e.g. 2024-01-02T03:04:05.678901+0100"""
+    if not value:
+        return None
+    for layout in ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return datetime.datetime.strptime(value.replace('Z', '+0000'), layout).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_har(path: str) -> List[Exchange]:
+    """Exchanges of a HAR file with their measured latency (entry startedDateTime and time)"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        har = json.load(f)
+    exchanges = []
+    entries = har.get('log', {}).get('entries', []) if isinstance(har, dict) else []
+    for number, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            continue
+        request, response = entry.get('request') or {}, entry.get('response') or {}
+        elapsed = entry.get('time')
+        latency = elapsed / 1000.0 if isinstance(elapsed, (int, float)) and elapsed >= 0 else None
+        started = _har_time(entry.get('startedDateTime'))
+        if started is None:
+            started = exchanges[-1].timestamp if exchanges else time.time()
+        content = response.get('content') or {}
+        size = content.get('size') if isinstance(content.get('size'), int) else len(content.get('text') or '')
+        exchanges.append(Exchange(number, str(request.get('method') or ''), str(request.get('url') or ''),
+                                  int(response.get('status') or 0), max(size, 0),
+                                  started + (latency or 0), latency))
+    return exchanges
+
+
+class RollingWindow:
+    """The last `size` values of one measurement in a preallocated array"""
+
+    def __init__(self, size: int = DEFAULT_WINDOW, typecode: str = 'd'):
+        self.values = array(typecode, [0] * size)
+        self.size = size
+        self.count = 0
+        self.next = 0
+
+    def add(self, value):
+        self.values[self.next] = value
+        self.next = (self.next + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def samples(self) -> List:
+        """Values oldest first"""
+        if self.count < self.size:
+            return self.values[:self.count].tolist()
+        return self.values[self.next:].tolist() + self.values[:self.next].tolist()
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.count:
+            return None
+        ordered = sorted(self.values[:self.count])
+        return ordered[min(int(fraction * self.count), self.count - 1)]
+
+    def mean(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return sum(self.values[:self.count]) / self.count
+
+
+class TrafficMetrics:
+    """Rolling metrics over the most recent exchanges"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, history: int = HISTORY_SECONDS):
+        self.statuses = RollingWindow(window, 'H')
+        self.sizes = RollingWindow(window, 'Q')
+        self.latencies = RollingWindow(window, 'd')
+        # Requests per wall-clock second, as a ring ending at `history_second`
+        self.history = array('I', [0] * history)
+        self.history_second = 0
+        self.requests = 0
+        self.bytes = 0
+        self.status_totals: Dict[int, int] = {}
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self.latency_estimated = True  # False once the latencies come from a HAR file
+
+    def add(self, exchange: Exchange):
+        self.requests += 1
+        self.bytes += exchange.size
+        self.status_totals[exchange.status] = self.status_totals.get(exchange.status, 0) + 1
+        self.statuses.add(exchange.status)
+        self.sizes.add(exchange.size)
+        if exchange.latency is not None:
+            self.latencies.add(exchange.latency)
+        second = int(exchange.timestamp)
+        self._advance(second)
+        if second > self.history_second - len(self.history):
+            self.history[second % len(self.history)] += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = exchange.timestamp
+        self.last_timestamp = exchange.timestamp
+
+    def _advance(self, second: int):
+        """Move the history ring forward to `second`, zeroing the seconds skipped"""
+        if second <= self.history_second:
+            return
+        span = len(self.history)
+        if second - self.history_second >= span:
+            for index in range(span):
+                self.history[index] = 0
+        else:
+            for skipped in range(self.history_second + 1, second + 1):
+                self.history[skipped % span] = 0
+        self.history_second = second
+
+    def rate_series(self, seconds: int = 60, now: Optional[float] = None) -> List[int]:
+        """Requests in each of the last `seconds` seconds, oldest first"""
+        if now is not None:
+            self._advance(int(now))
+        seconds = min(seconds, len(self.history))
+        end = self.history_second
+        return [self.history[second % len(self.history)] for second in range(end - seconds + 1, end + 1)]
+
+    def requests_per_second(self, now: Optional[float] = None, span: int = RATE_SPAN) -> float:
+        return sum(self.rate_series(span, now)) / float(span)
+
+    def average_rps(self) -> float:
+        """Requests per second over everything seen"""
+        if self.first_timestamp is None:
+            return 0.0
+        return self.requests / max(self.last_timestamp - self.first_timestamp, 1.0)
+
+    def status_mix(self) -> Dict[int, int]:
+        """Status code counts over the window"""
+        mix: Dict[int, int] = {}
+        for status in self.statuses.values[:self.statuses.count]:
+            mix[status] = mix.get(status, 0) + 1
+        return mix
+
+    def throttled_share(self) -> float:
+        """Share of the window answered with a throttling status (or no response at all)"""
+        if not self.statuses.count:
+            return 0.0
+        mix = self.status_mix()
+        pushed_back = sum(mix.get(code, 0) for code in THROTTLE_CODES + (0,))
+        return pushed_back / float(self.statuses.count)
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, object]:
+        return {
+            'requests': self.requests,
+            'bytes': self.bytes,
+            'rps': round(self.requests_per_second(now), 2),
+            'average_rps': round(self.average_rps(), 2),
+            'status_mix': self.status_mix(),
+            'throttled': round(self.throttled_share(), 3),
+            'size_mean': self.sizes.mean(),
+            'size_p95': self.sizes.percentile(0.95),
+            'latency_p50': self.latencies.percentile(0.5),
+            'latency_p90': self.latencies.percentile(0.9),
+            'latency_p99': self.latencies.percentile(0.99),
+            'latency_estimated': self.latency_estimated,
+        }
+
+
+class TrafficTailer:
+    """Follows a traffic file, feeding completed exchanges into TrafficMetrics"""
+
+    READ_LIMIT = 8 * 1024 * 1024  # Bytes read per poll, so a huge backlog is consumed in steps
+
+    def __init__(self, path: Optional[str], threads: int = 1, window: int = DEFAULT_WINDOW, clock=time.time,
+                 har_path: Optional[str] = None):
+        self.path = path  # None when there is only a HAR file
+        self.har_path = har_path
+        self.threads = max(1, int(threads or 1))
+        self.window = window
+        self.clock = clock
+        self.metrics = TrafficMetrics(window)
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.pending = b''
+        self.caught_up = False  # Whether the backlog present when following started has been read
+        self.last_poll: Optional[float] = None
+        self.last_live: Optional[float] = None  # Timestamp of the last exchange seen completing
+        self.lock = threading.Lock()  # poll() runs on a worker thread while the GUI reads the metrics
+        self.on_exchange = None  # Called with each live exchange as it is read
+
+    def reset(self):
+        self.metrics = TrafficMetrics(self.window)
+        self.offset = 0
+        self.pending = b''
+        self.caught_up = False
+        self.last_poll = None
+        self.last_live = None
+
+    def poll(self) -> int:
+        """Read what was appended since the last poll; returns the number of new exchanges"""
+        with self.lock:
+            return self._poll()
+
+    def _poll(self) -> int:
+        if self.path is None:
+            return 0
+        now = self.clock()
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self.caught_up = True  # Not written yet, so everything that appears is live
+            self.last_poll = now
+            return 0
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # A new scan recreates (sqlmap opens it with "w+") or truncates the file
+            if self.inode is not None:
+                self.reset()
+            self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            self.caught_up = True
+            self.last_poll = now
+            return 0
+        try:
+            with open(self.path, 'rb') as handle:
+                handle.seek(self.offset)
+                data = handle.read(self.READ_LIMIT)
+        except OSError as e:
+            print(f"Error reading traffic file {self.path}: {e}")
+            return 0
+        self.offset += len(data)
+
+        data = self.pending + data
+        cut = data.rfind(SEPARATOR)
+        if cut < 0:
+            self.pending = data
+            return 0
+        self.pending = data[cut + len(SEPARATOR):]
+        records = [record for record in data[:cut].split(SEPARATOR) if record.strip()]
+
+        # The backlog keeps its Date header times and has no latency; later records
+        # completed since the previous poll, so they are spread evenly across it
+        backlog = not self.caught_up
+        started = self.last_poll if self.last_poll is not None else now
+        count = 0
+        for position, record in enumerate(records, 1):
+            timestamp = None if backlog else started + (now - started) * position / len(records)
+            exchange = parse_exchange(record, timestamp)
+            if exchange is None:
+                continue
+            if not backlog:
+                if self.last_live is not None:
+                    exchange.latency = (exchange.timestamp - self.last_live) * self.threads
+                self.last_live = exchange.timestamp
+                if self.on_exchange is not None:
+                    self.on_exchange(exchange)
+            self.metrics.add(exchange)
+            count += 1
+        self.last_poll = now
+        if self.offset >= stat.st_size:
+            self.caught_up = True
+        return count
+
+    def load_har(self) -> int:
+        """Replace the estimated latencies with the measured ones of the HAR file
+
+        Without a traffic file the HAR exchanges feed every metric. Returns
+        the number of exchanges read, 0 when the HAR file is not there (yet).
+        """
+        if not self.har_path or not os.path.isfile(self.har_path):
+            return 0
+        try:
+            exchanges = parse_har(self.har_path)
+        except (OSError, ValueError) as e:
+            print(f"Error reading HAR file {self.har_path}: {e}")
+            return 0
+        with self.lock:
+            if self.metrics.requests:
+                self.metrics.latencies = RollingWindow(self.window, 'd')
+                for exchange in exchanges:
+                    if exchange.latency is not None:
+                        self.metrics.latencies.add(exchange.latency)
+            else:
+                for exchange in exchanges:
+                    self.metrics.add(exchange)
+            self.metrics.latency_estimated = False
+        return len(exchanges)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self.lock:
+            return self.metrics.snapshot(self.clock())
+
+    def view(self, chart_seconds: int = 60) -> Dict[str, Any]:
+        """Snapshot plus the series charts need, read consistently while polling goes on"""
+        with self.lock:
+            view: Dict[str, Any] = dict(self.metrics.snapshot(self.clock()))
+            view['window'] = len(self.metrics.statuses)
+            view['rate_series'] = self.metrics.rate_series(chart_seconds)
+            view['latencies'] = self.metrics.latencies.samples()
+            return view
+
+
+class TrafficPoller:
+    """Background thread polling a TrafficTailer, so reading the file stays off the GUI thread"""
+
+    def __init__(self, tailer: TrafficTailer, interval: float = 1.0):
+        self.tailer = tailer
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='traffic-poller', daemon=True)
+            self._thread.start()
+
+    def _drain(self):
+        try:
+            while self.tailer.poll() and not self._stop.is_set():
+                pass
+        except Exception as e:
+            print(f"Error reading traffic file: {e}")
+
+    def _run(self):
+        if self.tailer.path is None:
+            self.tailer.load_har()  # Nothing to follow
+            return
+        while True:
+            self._drain()
+            if self._stop.wait(self.interval):
+                return
+
+    def finish(self):
+        """Stop following once the scan is done: read what is left, then the HAR file sqlmap wrote on exit"""
+        self._stop.set()
+        thread = threading.Thread(target=self._finish, name='traffic-finish', daemon=True)
+        thread.start()
+
+    def _finish(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            while self.tailer.poll():
+                pass
+            self.tailer.load_har()
+        except Exception as e:
+            print(f"Error reading traffic file: {e}")
+
+    def stop(self):
+        self._stop.set()
+
+
+def format_status_mix(mix: Dict[int, int]) -> str:
+    total = sum(mix.values()) or 1
+    return ', '.join(f"{code or 'no response'}: {count * 100 // total}%"
+                     for code, count in sorted(mix.items(), key=lambda item: -item[1]))
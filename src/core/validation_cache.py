@@ -0,0 +1,172 @@
+"""
+Validation Cache - Memoization for option validation and command building
+Option sets are keyed by a canonical, order-independent fingerprint; cached
+results that depend on files are invalidated when those files change on disk
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+def _canonical_value(value: Any) -> Hashable:
+    """Hashable stand-in for an unhashable option value (lists, dicts)"""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ('json', json.dumps(value, sort_keys=True, default=repr))
+
+
+def options_fingerprint(options: Dict[str, Any]) -> frozenset:
+    """Canonical, order-independent key of an options dict
+
+    Two dicts get equal fingerprints exactly when they hold the same keys with
+    the same values of the same types (so 1, True and '1' differ), whatever
+    their insertion order.
+    """
+    values = options.values()
+    try:
+        return frozenset(zip(options, map(type, values), values))
+    except TypeError:
+        # Rare unhashable values (e.g. _metadata dicts) take the slow path
+        return frozenset((key, type(value), _canonical_value(value)) for key, value in options.items())
+
+
+def options_digest(options: Dict[str, Any]) -> str:
+    """Stable hex digest of an options dict, for logs and persisted keys"""
+    canonical = json.dumps(options, sort_keys=True, separators=(',', ':'), default=repr)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """(mtime_ns, size, inode) of a path, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class LRUCache:
+    """Bounded least-recently-used mapping with hit/miss counters
+
+    Safe to share between threads: the GUI thread, scan workers and the help
+    schema loader (which invalidates caches) all use the wrapper's caches.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a key, counting the hit or miss and marking it recently used"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            data = self._data
+            data[key] = value
+            data.move_to_end(key)
+            if len(data) > self.maxsize:
+                data.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: Hashable, stale: bool = False):
+        """Drop a key; with stale=True the lookup that just found it counts as a miss"""
+        with self._lock:
+            self._data.pop(key, None)
+            if stale:
+                self.hits -= 1
+                self.misses += 1
+
+    def clear(self):
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ValidationCache:
+    """LRU of validation results keyed by option fingerprint
+
+    Each entry remembers the stat signature of the files its result depended
+    on; a lookup re-stats them (a few microseconds) and treats any change as
+    a miss, so creating or editing a request file is picked up immediately.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.entries = LRUCache(maxsize)
+        self.stale = 0  # Hits discarded because a referenced file changed
+
+    def get(self, key: Hashable) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        signatures, value = entry
+        for path, signature in signatures:
+            if file_signature(path) != signature:
+                self.entries.discard(key, stale=True)
+                self.stale += 1
+                return None
+        return value
+
+    def put(self, key: Hashable, value: Any, paths: Iterable[str] = ()):
+        signatures = tuple((path, file_signature(path)) for path in paths)
+        self.entries.put(key, (signatures, value))
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.entries.stats()
+        stats['stale'] = self.stale
+        return stats
+
+
+def format_cache_stats(stats: Dict[str, Dict[str, Any]]) -> str:
+    """Format named cache statistics as plain text for debug views"""
+    lines = []
+    for name, info in stats.items():
+        lines.append(f"{name}:")
+        lines.append(f"  Entries: {info['size']}/{info['maxsize']}")
+        lines.append(f"  Hits: {info['hits']}  Misses: {info['misses']}  "
+                     f"Hit rate: {info['hit_rate'] * 100:.1f}%")
+        extra = [f"{key.capitalize()}: {info[key]}" for key in ('evictions', 'stale') if key in info]
+        lines.append("  " + "  ".join(extra))
+    return "\n".join(lines)
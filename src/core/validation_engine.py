@@ -0,0 +1,167 @@
+"""
+Validation Engine - Incremental, dependency-indexed option validation
+Rules declare the option keys they read; only rules whose inputs changed are re-run
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class ValidationRule:
+    """A validation check and the option keys it depends on"""
+
+    __slots__ = ('name', 'inputs', 'check', 'needs_input')
+
+    def __init__(self, name: str, inputs: Iterable[str], check: Callable[[Dict[str, Any]], List[Any]],
+                 needs_input: bool = True):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.check = check              # check(options) -> list of ValidationIssue
+        self.needs_input = needs_input  # Rule can only report when one of its inputs is set
+
+    def __repr__(self) -> str:
+        return f"ValidationRule({self.name!r}, inputs={self.inputs!r})"
+
+
+class ValidationRuleSet:
+    """Rules plus the key -> rule index, compiled once and shared by validators"""
+
+    def __init__(self, rules: Iterable[ValidationRule]):
+        self.rules: Tuple[ValidationRule, ...] = tuple(rules)
+
+        # Option key -> indexes of the rules reading it
+        index: Dict[str, List[int]] = {}
+        for i, rule in enumerate(self.rules):
+            for key in rule.inputs:
+                index.setdefault(key, []).append(i)
+        self.rules_by_key: Dict[str, Tuple[int, ...]] = {key: tuple(ids) for key, ids in index.items()}
+
+        # Rules that must run even when none of their inputs are set
+        self.always: Tuple[int, ...] = tuple(i for i, rule in enumerate(self.rules) if not rule.needs_input)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def affected(self, keys: Iterable[str]) -> List[int]:
+        """Indexes of the rules reading any of the given keys, in declaration order"""
+        rules_by_key = self.rules_by_key
+        affected: Set[int] = set()
+        for key in keys:
+            ids = rules_by_key.get(key)
+            if ids:
+                affected.update(ids)
+        return sorted(affected)
+
+
+_MISSING = object()
+
+
+class IncrementalValidator:
+    """Keeps a standing validation result and re-evaluates only affected rules
+
+    Issues are expected to carry a ``level`` enum whose value is 'error',
+    'warning' or 'info' (see sqlmap_wrapper.ValidationIssue).
+    """
+
+    def __init__(self, rule_set: ValidationRuleSet, options: Optional[Dict[str, Any]] = None):
+        self.rule_set = rule_set
+        self.rules = rule_set.rules
+        self.rules_by_key = rule_set.rules_by_key
+        self.options: Dict[str, Any] = dict(options) if options else {}
+
+        # Rule index -> issues it currently reports (only non-empty entries)
+        self._issues: Dict[int, List[Any]] = {}
+        self._aggregate: Optional[Tuple[List[Any], List[Any], List[Any]]] = None
+        self.evaluations = 0
+
+        self.revalidate_all()
+
+    def _run(self, rule_ids: Iterable[int]):
+        """Evaluate the given rules against the current options"""
+        options = self.options
+        issues = self._issues
+        for i in rule_ids:
+            try:
+                found = self.rules[i].check(options)
+            except Exception as e:
+                print(f"Error in validation rule {self.rules[i].name}: {e}")
+                found = None
+            self.evaluations += 1
+            if found:
+                issues[i] = found
+            elif i in issues:
+                del issues[i]
+        self._aggregate = None
+
+    def revalidate_all(self):
+        """Re-run every applicable rule (e.g. after the filesystem or sqlmap changed)"""
+        self._issues.clear()
+        ids = set(self.rule_set.always)
+        ids.update(self.rule_set.affected(self.options))
+        self._run(sorted(ids))
+
+    def invalidate_keys(self, keys: Iterable[str]):
+        """Re-run the rules that read any of the given keys"""
+        self._run(self.rule_set.affected(keys))
+
+    def set_option(self, key: str, value: Any) -> int:
+        """Apply a single option change; returns the number of rules re-run"""
+        if self.options.get(key, _MISSING) == value:
+            return 0
+        if value is None:
+            self.options.pop(key, None)
+        else:
+            self.options[key] = value
+
+        ids = self.rules_by_key.get(key)
+        if not ids:
+            return 0
+        self._run(ids)
+        return len(ids)
+
+    def update(self, options: Dict[str, Any]) -> Set[str]:
+        """Replace the option set, re-running only rules whose inputs changed
+
+        Returns the set of option keys that changed.
+        """
+        current = self.options
+        changed = {key for key, value in options.items() if current.get(key, _MISSING) != value}
+        changed.update(key for key in current if key not in options)
+        if not changed:
+            return changed
+
+        self.options = dict(options)
+        self._run(self.rule_set.affected(changed))
+        return changed
+
+    def _levels(self) -> Tuple[List[Any], List[Any], List[Any]]:
+        if self._aggregate is None:
+            errors, warnings, infos = [], [], []
+            buckets = {'error': errors, 'warning': warnings, 'info': infos}
+            for i in sorted(self._issues):
+                for issue in self._issues[i]:
+                    buckets.get(issue.level.value, infos).append(issue)
+            self._aggregate = (errors, warnings, infos)
+        return self._aggregate
+
+    @property
+    def errors(self) -> List[Any]:
+        return self._levels()[0]
+
+    @property
+    def warnings(self) -> List[Any]:
+        return self._levels()[1]
+
+    @property
+    def infos(self) -> List[Any]:
+        return self._levels()[2]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self._levels()[0]
+
+    def issues_for(self, rule_name: str) -> List[Any]:
+        """Issues currently reported by the named rule"""
+        for i, rule in enumerate(self.rules):
+            if rule.name == rule_name:
+                return list(self._issues.get(i, ()))
+        return []
@@ -0,0 +1,618 @@
+"""
+Worker Agent - Run sqlmap jobs on other hosts over a small framed TCP protocol
+An agent accepts scan options (never raw commands), builds the command with
+its own SqlmapWrapper, runs it locally and streams output, status and the
+results CSV back. AgentPool dispatches jobs across agents by free capacity.
+
+Frames are a 4-byte big-endian length followed by a UTF-8 JSON object.
+File options (request files, bulk files, ...) must exist on the agent host;
+options that write files or run code on the agent host are not accepted.
+
+The shared token and all scan options (cookies, credentials) travel in the
+clear unless the agent is given a certificate (--cert/--key) and clients
+connect with --tls. Without TLS, keep agents bound to localhost or reach
+them through an SSH tunnel.
+
+Run with: python -m src.core.worker_agent serve [--port 8765] [--capacity 2] [--cert FILE --key FILE]
+          python -m src.core.worker_agent dispatch --agent host:port [--tls [--cafile FILE]] [URL ...]
+"""
+
+import glob
+import hmac
+import json
+import os
+import select
+import shutil
+import socket
+import socketserver
+import ssl
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .sqlmap_wrapper import SqlmapProcess, SqlmapWrapper
+
+
+DEFAULT_PORT = 8765
+MAX_FRAME = 16 * 1024 * 1024
+MAX_RESULTS = 4 * 1024 * 1024  # Results CSV bytes sent back per job
+TOKEN_ENV = 'SQLMAP_GUI_AGENT_TOKEN'
+_HEADER = struct.Struct('>I')
+
+# Options an agent accepts from clients. Anything that writes files chosen by
+# the client (output, traffic, HAR, dumps, temp dirs), runs code on the agent
+# host (--eval, pre/postprocess scripts, Metasploit) or needs a terminal is left out.
+_AGENT_OPTIONS = frozenset((
+    # Target
+    'url', 'direct', 'log_file', 'bulk_file', 'request_file', 'google_dork',
+    # Request
+    'method', 'data', 'param_del', 'cookie', 'cookie_del', 'live_cookies', 'load_cookies',
+    'drop_set_cookie', 'mobile', 'random_agent', 'user_agent', 'host', 'referer', 'headers',
+    'auth_type', 'auth_cred', 'auth_file', 'abort_code', 'ignore_code', 'ignore_proxy',
+    'ignore_redirects', 'ignore_timeouts', 'proxy', 'proxy_cred', 'proxy_file', 'proxy_freq',
+    'tor', 'tor_port', 'tor_type', 'check_tor', 'delay', 'timeout', 'retries', 'retry_on',
+    'randomize', 'safe_url', 'safe_post', 'safe_req', 'safe_freq', 'skip_urlencode',
+    'csrf_token', 'csrf_url', 'csrf_method', 'csrf_data', 'csrf_retries', 'force_ssl',
+    'chunked', 'hpp',
+    # Optimization
+    'optimize', 'predict_output', 'keep_alive', 'null_connection', 'threads',
+    # Injection and detection
+    'testable_parameter', 'skip', 'skip_static', 'param_exclude', 'param_filter', 'dbms',
+    'dbms_cred', 'os', 'invalid_bignum', 'invalid_logical', 'invalid_string', 'no_cast',
+    'no_escape', 'prefix', 'suffix', 'tamper', 'tamper_custom',
+    'level', 'risk', 'string', 'not_string', 'regexp', 'code', 'smart', 'text_only', 'titles',
+    # Techniques
+    'technique', 'time_sec', 'union_cols', 'union_char', 'union_from', 'union_values',
+    'dns_domain', 'second_url', 'second_req', 'boolean_blind', 'error_based', 'union_based',
+    'stacked_queries', 'time_based', 'inline_queries',
+    # Fingerprint, enumeration and brute force
+    'fingerprint', 'all', 'banner', 'current_user', 'current_db', 'hostname', 'is_dba', 'users',
+    'passwords', 'privileges', 'roles', 'dbs', 'tables', 'columns', 'schema', 'count', 'dump',
+    'dump_all', 'search', 'comments', 'statements', 'db', 'tbl', 'col', 'exclude', 'user',
+    'exclude_sysdbs', 'pivot_column', 'where', 'start', 'stop', 'first', 'last', 'sql_query',
+    'sql_file', 'common_tables', 'common_columns', 'common_files',
+    # Access to the target's file system, OS and registry
+    'udf_inject', 'file_read', 'file_dest', 'os_cmd', 'priv_esc', 'tmp_path',
+    'reg_read', 'reg_add', 'reg_del', 'reg_key', 'reg_value', 'reg_data', 'reg_type',
+    # General and miscellaneous
+    'answers', 'base64', 'base64_safe', 'batch', 'auto_batch', 'binary_fields', 'check_internet',
+    'crawl', 'crawl_exclude', 'csv_del', 'charset', 'dump_format', 'encoding', 'eta',
+    'flush_session', 'forms', 'fresh_queries', 'gpage', 'hex', 'parse_errors', 'repair', 'scope',
+    'skip_heuristics', 'skip_waf', 'table_prefix', 'test_filter', 'test_skip', 'time_limit',
+    'web_root', 'abort_on_empty', 'verbose', 'disable_coloring', 'disable_hashing', 'no_logging',
+    'no_truncate', 'offline', 'unstable',
+))
+
+
+class ProtocolError(Exception):
+    """Malformed or unexpected frame"""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_frame(sock: socket.socket, message: Dict[str, Any]):
+    payload = json.dumps(message, separators=(',', ':'), default=str).encode('utf-8')
+    if len(payload) > MAX_FRAME:
+        raise ProtocolError(f"Frame too large ({len(payload)} bytes)")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket, max_size: int = MAX_FRAME) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    if size > max_size:
+        raise ProtocolError(f"Frame too large ({size} bytes)")
+    try:
+        message = json.loads(_recv_exact(sock, size).decode('utf-8'))
+    except ValueError as e:
+        raise ProtocolError(f"Invalid frame: {e}")
+    if not isinstance(message, dict) or 'type' not in message:
+        raise ProtocolError("Frame is not a message")
+    return message
+
+
+def readable(sock: socket.socket, timeout: float) -> bool:
+    if isinstance(sock, ssl.SSLSocket) and sock.pending():
+        return True  # Already decrypted; select() can't see it
+    return bool(select.select([sock], [], [], timeout)[0])
+
+
+def agent_options(options: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Options an agent accepts, and the names of the ones it drops"""
+    accepted = {key: value for key, value in options.items() if key in _AGENT_OPTIONS}
+    return accepted, sorted(key for key in options if key not in _AGENT_OPTIONS)
+
+
+def server_ssl_context(certfile: str, keyfile: Optional[str] = None) -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+def client_ssl_context(cafile: Optional[str] = None) -> ssl.SSLContext:
+    """Verifying context; `cafile` trusts an agent's self-signed certificate"""
+    return ssl.create_default_context(cafile=cafile)
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """'host:port' or 'host' -> (host, port)"""
+    host, _, port = address.rpartition(':')
+    if not host:
+        return address, DEFAULT_PORT
+    return host.strip('[]'), int(port)
+
+
+class AgentJob:
+    """A job running on this agent"""
+
+    __slots__ = ('owner', 'job_id', 'process', 'work_dir', 'results_file')
+
+    def __init__(self, owner: str, job_id: str, process: SqlmapProcess, work_dir: str, results_file: str):
+        self.owner = owner  # Connection that submitted the job; job ids are only unique per connection
+        self.job_id = job_id
+        self.process = process
+        self.work_dir = work_dir
+        self.results_file = results_file
+
+    def results(self) -> str:
+        """Results CSV text (older sqlmap writes results-*.csv into the output dir)"""
+        files = [self.results_file] if os.path.exists(self.results_file) else []
+        files.extend(sorted(glob.glob(os.path.join(self.work_dir, 'output', 'results-*.csv'))))
+        text = ''
+        for path in files:
+            try:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    text += f.read(MAX_RESULTS - len(text))
+            except OSError as e:
+                print(f"Error reading results of job {self.job_id}: {e}")
+        return text
+
+
+class WorkerAgent(socketserver.ThreadingTCPServer):
+    """TCP server running sqlmap jobs for authenticated clients"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, token: str = '',
+                 capacity: int = 2, wrapper: Optional[SqlmapWrapper] = None, work_dir: Optional[str] = None,
+                 process_factory: Callable[[List[str]], SqlmapProcess] = SqlmapProcess,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        if not token:
+            raise ValueError(f"Worker agents need a shared token (--token or ${TOKEN_ENV})")
+        self.token = token
+        self.capacity = max(1, capacity)
+        self.wrapper = wrapper or SqlmapWrapper()
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix='sqlmap-gui-agent-')
+        self.process_factory = process_factory
+        self.ssl_context = ssl_context
+        self.name = socket.gethostname()
+        self.jobs: Dict[Tuple[str, str], AgentJob] = {}  # Keyed by (connection, job id)
+        self.jobs_lock = threading.Lock()
+        super().__init__((host, port), AgentHandler)
+
+    def get_request(self):
+        sock, address = super().get_request()
+        if self.ssl_context is not None:
+            # The handshake happens on the handler thread, not in the accept loop
+            sock = self.ssl_context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False)
+        return sock, address
+
+    @property
+    def running(self) -> int:
+        return len(self.jobs)
+
+    def status(self) -> Dict[str, Any]:
+        return {'type': 'status', 'agent': self.name, 'capacity': self.capacity, 'running': self.running}
+
+    def start_job(self, owner: str, job_id: str, options: Dict[str, Any]) -> Tuple[Optional[AgentJob], str]:
+        """Launch a job for a connection if there is capacity; returns (job, reason on failure)"""
+        key = (owner, job_id)
+        safe_name = ''.join(c for c in f"{owner}-{job_id}" if c.isalnum() or c in '-_')
+        job_dir = os.path.join(self.work_dir, f"job-{safe_name}")
+        with self.jobs_lock:
+            if key in self.jobs:
+                return None, f"job id {job_id!r} is already running for this connection"
+            if len(self.jobs) >= self.capacity:
+                return None, 'busy'
+            self.jobs[key] = None  # Reserve the slot while starting
+
+        try:
+            options, dropped = agent_options(options)
+            if dropped:
+                print(f"Job {job_id}: ignoring options not accepted by agents: {', '.join(dropped)}")
+            os.makedirs(job_dir, exist_ok=True)
+            options['output_dir'] = os.path.join(job_dir, 'output')
+            results_file = os.path.join(job_dir, 'results.csv')
+            options['results_file'] = results_file
+            command = self.wrapper.build_command(options, force_batch=True)
+            process = self.process_factory(command)
+            if not process.start():
+                raise RuntimeError("sqlmap did not start")
+        except Exception as e:
+            with self.jobs_lock:
+                self.jobs.pop(key, None)
+            return None, str(e)
+
+        job = AgentJob(owner, job_id, process, job_dir, results_file)
+        with self.jobs_lock:
+            self.jobs[key] = job
+        return job, ''
+
+    def finish_job(self, job: AgentJob):
+        with self.jobs_lock:
+            self.jobs.pop((job.owner, job.job_id), None)
+        shutil.rmtree(job.work_dir, ignore_errors=True)
+
+
+class AgentHandler(socketserver.BaseRequestHandler):
+    """One client connection: handles its requests and streams its jobs' output"""
+
+    def setup(self):
+        self.owner = f"{self.client_address[0]}-{self.client_address[1]}"
+        self.jobs: Dict[str, AgentJob] = {}
+
+    def handle(self):
+        sock = self.request
+        try:
+            if isinstance(sock, ssl.SSLSocket):
+                sock.settimeout(10.0)
+                sock.do_handshake()
+                sock.settimeout(None)
+            hello = recv_frame(sock, max_size=4096)  # Unauthenticated peers get no big buffers
+            if hello.get('type') != 'hello' or not hmac.compare_digest(str(hello.get('token', '')), self.server.token):
+                send_frame(sock, {'type': 'error', 'reason': 'authentication failed'})
+                return
+            send_frame(sock, dict(self.server.status(), type='welcome'))
+
+            while True:
+                if readable(sock, 0.2):
+                    self.dispatch(recv_frame(sock))
+                self.pump()
+        except (ConnectionError, ProtocolError, OSError) as e:  # ssl.SSLError is an OSError
+            print(f"Agent connection from {self.client_address[0]} closed: {e}")
+        finally:
+            # Jobs belong to the client; its scheduler requeues them
+            for job in list(self.jobs.values()):
+                job.process.stop()
+                self.server.finish_job(job)
+
+    def dispatch(self, message: Dict[str, Any]):
+        sock = self.request
+        kind = message['type']
+        if kind == 'submit':
+            job_id = str(message.get('job_id', ''))
+            job, reason = self.server.start_job(self.owner, job_id, message.get('options') or {})
+            if job is None:
+                send_frame(sock, {'type': 'rejected', 'job_id': job_id, 'reason': reason})
+            else:
+                self.jobs[job_id] = job
+                send_frame(sock, {'type': 'accepted', 'job_id': job_id})
+        elif kind == 'stop':
+            job = self.jobs.get(str(message.get('job_id', '')))
+            if job:
+                job.process.stop()
+        elif kind == 'status':
+            send_frame(sock, self.server.status())
+        else:
+            raise ProtocolError(f"Unknown message type: {kind}")
+
+    def pump(self):
+        """Send new output of this connection's jobs and report finished ones"""
+        sock = self.request
+        for job_id, job in list(self.jobs.items()):
+            output = job.process.get_output()
+            errors = job.process.get_errors()
+            if output or errors:
+                send_frame(sock, {'type': 'output', 'job_id': job_id, 'lines': output, 'errors': errors})
+                continue
+            exit_code = job.process.poll()
+            if exit_code is None and job.process.is_running:
+                continue
+            # The readers may still hold the last lines; send them before the job is gone
+            job.process.wait_output()
+            output = job.process.get_output()
+            errors = job.process.get_errors()
+            if output or errors:
+                send_frame(sock, {'type': 'output', 'job_id': job_id, 'lines': output, 'errors': errors})
+            send_frame(sock, {'type': 'finished', 'job_id': job_id, 'exit_code': exit_code,
+                              'results': job.results()})
+            del self.jobs[job_id]
+            self.server.finish_job(job)
+
+
+class AgentClient:
+    """Connection to one worker agent"""
+
+    def __init__(self, address: str, token: str, timeout: float = 10.0,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.address = address
+        host, port = parse_address(address)
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        if ssl_context is not None:
+            try:
+                self.sock = ssl_context.wrap_socket(self.sock, server_hostname=host)
+            except OSError:
+                self.sock.close()
+                raise
+        send_frame(self.sock, {'type': 'hello', 'token': token})
+        welcome = recv_frame(self.sock)
+        if welcome.get('type') != 'welcome':
+            self.sock.close()
+            raise ConnectionError(f"{address}: {welcome.get('reason', 'unexpected reply')}")
+        self.sock.settimeout(None)
+        self.name = welcome.get('agent', address)
+        self.capacity = int(welcome.get('capacity', 1))
+        self.running = int(welcome.get('running', 0))
+        self.jobs: Dict[str, Any] = {}  # Job id -> caller's job object
+        self.alive = True
+
+    def __repr__(self) -> str:
+        return f"AgentClient({self.address!r}, {self.running}/{self.capacity})"
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.running if self.alive else 0
+
+    def submit(self, job_id: str, options: Dict[str, Any], job: Any = None):
+        if job_id in self.jobs:
+            raise ValueError(f"Job id {job_id!r} is already running on {self.address}")
+        send_frame(self.sock, {'type': 'submit', 'job_id': job_id, 'options': options})
+        self.jobs[job_id] = job
+        self.running += 1  # Counted until accepted/rejected says otherwise
+
+    def stop(self, job_id: str):
+        send_frame(self.sock, {'type': 'stop', 'job_id': job_id})
+
+    def request_status(self):
+        send_frame(self.sock, {'type': 'status'})
+
+    def poll(self, timeout: float = 0.0) -> List[Dict[str, Any]]:
+        """Messages that have arrived, waiting up to `timeout` for the first"""
+        messages = []
+        try:
+            while self.alive and readable(self.sock, timeout):
+                messages.append(recv_frame(self.sock))
+                timeout = 0.0
+        except (ConnectionError, ProtocolError, OSError) as e:
+            print(f"Lost worker agent {self.address}: {e}")
+            self.alive = False
+        for message in messages:
+            if message['type'] in ('rejected', 'finished'):
+                self.running = max(0, self.running - 1)
+        return messages
+
+    def close(self):
+        self.alive = False
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class AgentPool:
+    """Dispatches jobs across worker agents by free capacity and collects their output
+
+    Callbacks get the caller's job object: output_callback(job, line, is_error)
+    and finished_callback(job, exit_code, results_csv). Jobs of an agent that
+    is lost or rejects them go to lost_callback(job, reason).
+    """
+
+    def __init__(self, addresses: List[str], token: str,
+                 output_callback: Optional[Callable[[Any, str, bool], None]] = None,
+                 finished_callback: Optional[Callable[[Any, Optional[int], str], None]] = None,
+                 lost_callback: Optional[Callable[[Any, str], None]] = None,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.agents: List[AgentClient] = []
+        for address in addresses:
+            try:
+                self.agents.append(AgentClient(address, token, ssl_context=ssl_context))
+            except (OSError, ConnectionError, ProtocolError) as e:
+                print(f"Worker agent {address} unavailable: {e}")
+        self.output_callback = output_callback
+        self.finished_callback = finished_callback
+        self.lost_callback = lost_callback
+
+    @property
+    def free(self) -> int:
+        return sum(agent.free for agent in self.agents)
+
+    @property
+    def running(self) -> int:
+        return sum(len(agent.jobs) for agent in self.agents if agent.alive)
+
+    def submit(self, job_id: str, options: Dict[str, Any], job: Any = None) -> Optional[AgentClient]:
+        """Send a job to the agent with the most free slots; None when all are full"""
+        candidates = [agent for agent in self.agents if agent.free > 0]
+        if not candidates:
+            return None
+        agent = max(candidates, key=lambda candidate: candidate.free)
+        try:
+            agent.submit(job_id, options, job)
+        except OSError as e:
+            print(f"Error submitting to worker agent {agent.address}: {e}")
+            agent.alive = False
+            agent.jobs.pop(job_id, None)
+            return None
+        return agent
+
+    def poll(self, timeout: float = 0.2):
+        """Handle messages from every agent"""
+        per_agent = timeout / max(1, len(self.agents))
+        for agent in self.agents:
+            for message in agent.poll(per_agent):
+                self._handle(agent, message)
+            if not agent.alive and agent.jobs:
+                for job in agent.jobs.values():
+                    if self.lost_callback:
+                        self.lost_callback(job, f"agent {agent.address} lost")
+                agent.jobs.clear()
+
+    def _handle(self, agent: AgentClient, message: Dict[str, Any]):
+        job_id = str(message.get('job_id', ''))
+        job = agent.jobs.get(job_id)
+        kind = message['type']
+        if kind == 'output' and self.output_callback:
+            for line in message.get('lines') or []:
+                self.output_callback(job, line, False)
+            for line in message.get('errors') or []:
+                self.output_callback(job, line, True)
+        elif kind == 'rejected':
+            agent.jobs.pop(job_id, None)
+            if message.get('reason') == 'busy':
+                # Other clients share the agent; ask how many slots are really in use
+                try:
+                    agent.request_status()
+                except OSError:
+                    agent.alive = False
+            if self.lost_callback:
+                self.lost_callback(job, f"rejected by {agent.address}: {message.get('reason')}")
+        elif kind == 'status':
+            agent.capacity = int(message.get('capacity', agent.capacity))
+            agent.running = max(int(message.get('running', 0)), len(agent.jobs))
+        elif kind == 'finished':
+            agent.jobs.pop(job_id, None)
+            if self.finished_callback:
+                self.finished_callback(job, message.get('exit_code'), message.get('results') or '')
+
+    def stop(self):
+        for agent in self.agents:
+            if agent.alive:
+                for job_id in list(agent.jobs):
+                    try:
+                        agent.stop(job_id)
+                    except OSError:
+                        pass
+
+    def close(self):
+        for agent in self.agents:
+            agent.close()
+
+
+def run_queue_on_agents(store, pool: AgentPool, poll_interval: float = 0.2,
+                        output_callback: Optional[Callable[[Any, str, bool], None]] = None) -> Dict[str, int]:
+    """Work through a ScanQueueStore on worker agents, as if the jobs ran locally
+
+    Each job's results CSV is written to its output directory; jobs whose
+    agent is lost are put back in the queue.
+    """
+    from .scan_queue import DONE, FAILED, resume_options
+
+    def finished(job, exit_code, results):
+        if results:
+            try:
+                os.makedirs(job.output_dir, exist_ok=True)
+                with open(os.path.join(job.output_dir, 'results.csv'), 'w', encoding='utf-8') as f:
+                    f.write(results)
+            except OSError as e:
+                print(f"Error writing results of job {job.job_id}: {e}")
+        store.mark_finished(job.job_id, DONE if exit_code == 0 else FAILED, exit_code)
+
+    def lost(job, reason):
+        print(f"Job {job.job_id} requeued: {reason}")
+        store.requeue(job.job_id)
+
+    pool.output_callback = output_callback
+    pool.finished_callback = finished
+    pool.lost_callback = lost
+
+    while True:
+        while pool.free > 0:
+            job = store.claim_next()
+            if job is None:
+                break
+            options = resume_options(job)
+            options.pop('output_dir', None)  # The agent picks its own; results come back here
+            if pool.submit(str(job.job_id), options, job) is None:
+                store.requeue(job.job_id)
+                break
+        if not pool.running and (not pool.free or not store.counts().get('queued')):
+            break
+        pool.poll(poll_interval)
+    return store.counts()
+
+
+def main():
+    """Serve jobs as a worker agent, or dispatch URLs across agents"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="sqlmap worker agents")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve', help="run a worker agent")
+    serve.add_argument('--bind', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    serve.add_argument('--capacity', type=int, default=2, help="concurrent sqlmap processes (default: 2)")
+    serve.add_argument('--sqlmap', default='sqlmap', help="sqlmap command (default: sqlmap)")
+    serve.add_argument('--work-dir', default=None, help="directory for job output")
+    serve.add_argument('--cert', default=None, help="TLS certificate (PEM); clients must use --tls")
+    serve.add_argument('--key', default=None, help="TLS private key, if not in the certificate file")
+
+    dispatch = sub.add_parser('dispatch', help="run URLs or the scan queue on agents")
+    dispatch.add_argument('--agent', action='append', required=True, help="agent host:port (repeatable)")
+    dispatch.add_argument('--queue', action='store_true', help="run the persistent scan queue")
+    dispatch.add_argument('--tls', action='store_true', help="connect to agents over TLS")
+    dispatch.add_argument('--cafile', default=None, help="CA or self-signed agent certificate to trust (implies --tls)")
+    dispatch.add_argument('urls', nargs='*', help="target URLs to add to the queue first")
+
+    for command in (serve, dispatch):
+        command.add_argument('--token', default=os.environ.get(TOKEN_ENV, ''),
+                             help=f"shared secret (default: ${TOKEN_ENV})")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        try:
+            context = server_ssl_context(args.cert, args.key) if args.cert else None
+        except (OSError, ssl.SSLError) as e:
+            parser.error(f"cannot load certificate: {e}")
+        agent = WorkerAgent(args.bind, args.port, args.token, args.capacity, SqlmapWrapper(args.sqlmap),
+                            args.work_dir, ssl_context=context)
+        print(f"Worker agent listening on {args.bind}:{args.port} (capacity {agent.capacity}"
+              f"{', TLS' if context else ''})")
+        if context is None and args.bind not in ('127.0.0.1', '::1', 'localhost'):
+            print("Warning: without --cert the token and scan options are sent unencrypted")
+        try:
+            agent.serve_forever()
+        except KeyboardInterrupt:
+            agent.shutdown()
+        return
+
+    from .scan_queue import ScanQueueStore
+
+    with ScanQueueStore() as store:
+        for url in args.urls:
+            store.enqueue({'url': url, 'batch': True})
+        if args.urls or args.queue:
+            store.recover_interrupted()
+        try:
+            context = client_ssl_context(args.cafile) if args.tls or args.cafile else None
+        except (OSError, ssl.SSLError) as e:
+            parser.error(f"cannot load CA file: {e}")
+        pool = AgentPool(args.agent, args.token, ssl_context=context)
+        if not pool.agents:
+            print("No worker agents available")
+            return
+        started = time.time()
+        try:
+            counts = run_queue_on_agents(store, pool, output_callback=lambda job, line, is_error: print(
+                f"[job {job.job_id if job else '?'}]{' ERROR' if is_error else ''} {line}"))
+        except KeyboardInterrupt:
+            pool.stop()
+            counts = store.counts()
+        finally:
+            pool.close()
+        print(f"Finished in {time.time() - started:.1f}s: {counts}")
+
+
+if __name__ == "__main__":
+    main()
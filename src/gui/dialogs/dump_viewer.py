@@ -0,0 +1,266 @@
+"""
+Dump Viewer Dialog - Browse huge sqlmap CSV dumps without loading them
+The file is memory-mapped and indexed in a background thread; the table model
+parses only the rows the view asks for, and sort/filter run in a worker thread
+"""
+
+from collections import OrderedDict
+from typing import List, Optional
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                            QPushButton, QComboBox, QTableView, QHeaderView, QProgressBar)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
+import sys
+import os
+
+# Add the parent directory to the path to import from core
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.core.dump_index import DumpFile
+
+
+class DumpIndexThread(QThread):
+    """Builds the record index of a dump"""
+
+    progress = pyqtSignal(int, int)  # bytes indexed, rows indexed
+
+    def __init__(self, dump: DumpFile):
+        super().__init__()
+        self.dump = dump
+        self.should_stop = False
+
+    def run(self):
+        try:
+            self.dump.build_index(lambda indexed, rows: self.progress.emit(indexed, rows),
+                                  lambda: self.should_stop)
+        except Exception as e:
+            print(f"Error indexing dump: {e}")
+
+    def stop(self):
+        self.should_stop = True
+
+
+class DumpQueryThread(QThread):
+    """Filters and sorts the indexed records"""
+
+    result_ready = pyqtSignal(object)  # array of record indexes, or None for all records
+
+    def __init__(self, dump: DumpFile, filter_text: str = '', filter_column: int = -1,
+                 sort_column: int = -1, descending: bool = False):
+        super().__init__()
+        self.dump = dump
+        self.filter_text = filter_text
+        self.filter_column = filter_column
+        self.sort_column = sort_column
+        self.descending = descending
+        self.should_stop = False
+
+    def run(self):
+        cancelled = lambda: self.should_stop
+        try:
+            view = None
+            if self.filter_text:
+                view = self.dump.filter_rows(self.filter_text, self.filter_column, cancelled=cancelled)
+                if view is None:
+                    return
+            if self.sort_column >= 0:
+                view = self.dump.sort_rows(self.sort_column, self.descending, view, cancelled=cancelled)
+                if view is None:
+                    return
+            if not self.should_stop:
+                self.result_ready.emit(view)
+        except Exception as e:
+            print(f"Error querying dump: {e}")
+
+    def stop(self):
+        self.should_stop = True
+
+
+class DumpTableModel(QAbstractTableModel):
+    """Table model reading rows from a DumpFile on demand"""
+
+    CACHE_SIZE = 4096
+
+    def __init__(self, dump: DumpFile, parent=None):
+        super().__init__(parent)
+        self.dump = dump
+        self.view = None  # Record indexes shown, or None for all indexed records
+        self.visible_rows = 0
+        self._cache: 'OrderedDict[int, List[str]]' = OrderedDict()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.view) if self.view is not None else self.visible_rows
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.dump.header)
+
+    def record(self, row: int) -> int:
+        return self.view[row] if self.view is not None else row
+
+    def _row(self, record: int) -> List[str]:
+        values = self._cache.get(record)
+        if values is None:
+            values = self.dump.row(record)
+            self._cache[record] = values
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(record)
+        return values
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        values = self._row(self.record(index.row()))
+        return values[index.column()] if index.column() < len(values) else ''
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.dump.header[section] if section < len(self.dump.header) else None
+        return str(self.record(section) + 1)
+
+    def grow(self, rows: int):
+        """Show records indexed since the last call"""
+        if self.view is not None or rows <= self.visible_rows:
+            return
+        self.beginInsertRows(QModelIndex(), self.visible_rows, rows - 1)
+        self.visible_rows = rows
+        self.endInsertRows()
+
+    def set_view(self, view):
+        self.beginResetModel()
+        self.view = view
+        self.visible_rows = self.dump.row_count
+        self.endResetModel()
+
+
+class DumpViewerDialog(QDialog):
+    """Dialog showing one CSV dump"""
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.dump = DumpFile(path)
+        self.model = DumpTableModel(self.dump, self)
+        self.index_thread: Optional[DumpIndexThread] = None
+        self.query_thread: Optional[DumpQueryThread] = None
+        self.sort_column = -1
+        self.descending = False
+        self.init_ui()
+        self.start_indexing()
+
+    def init_ui(self):
+        self.setWindowTitle(f"Dump Viewer - {os.path.basename(self.path)}")
+        self.resize(900, 600)
+        layout = QVBoxLayout(self)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filter:"))
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Text to search for")
+        self.filter_edit.returnPressed.connect(self.run_query)
+        filter_layout.addWidget(self.filter_edit)
+        self.column_combo = QComboBox()
+        self.column_combo.addItem("All columns")
+        self.column_combo.addItems(self.dump.header)
+        filter_layout.addWidget(self.column_combo)
+        self.apply_button = QPushButton("Apply")
+        self.apply_button.clicked.connect(self.run_query)
+        filter_layout.addWidget(self.apply_button)
+        layout.addLayout(filter_layout)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setAlternatingRowColors(True)
+        # Fixed row heights keep Qt from measuring rows it does not show
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table.horizontalHeader().setDefaultSectionSize(150)
+        self.table.horizontalHeader().setSortIndicatorShown(True)
+        self.table.horizontalHeader().sectionClicked.connect(self.sort_by)
+        layout.addWidget(self.table)
+
+        status_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        status_layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setMaximumWidth(200)
+        status_layout.addWidget(self.progress_bar)
+        status_layout.addStretch()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        status_layout.addWidget(close_button)
+        layout.addLayout(status_layout)
+
+    def start_indexing(self):
+        self.set_query_enabled(False)
+        self.index_thread = DumpIndexThread(self.dump)
+        self.index_thread.progress.connect(self.on_index_progress)
+        self.index_thread.finished.connect(self.on_index_finished)
+        self.index_thread.start()
+
+    def set_query_enabled(self, enabled: bool):
+        self.filter_edit.setEnabled(enabled)
+        self.column_combo.setEnabled(enabled)
+        self.apply_button.setEnabled(enabled)
+        self.table.horizontalHeader().setSectionsClickable(enabled)
+
+    def on_index_progress(self, indexed: int, rows: int):
+        self.model.grow(rows)
+        if self.dump.size:
+            self.progress_bar.setValue(int(indexed * 1000 / self.dump.size))
+        self.status_label.setText(f"Indexing... {rows:,} rows")
+
+    def on_index_finished(self):
+        self.model.grow(self.dump.row_count)
+        self.progress_bar.setVisible(False)
+        self.set_query_enabled(True)
+        self.update_status()
+
+    def update_status(self):
+        total = self.dump.row_count
+        shown = self.model.rowCount()
+        text = f"{total:,} rows" if shown == total else f"{shown:,} of {total:,} rows"
+        self.status_label.setText(f"{text}, {len(self.dump.header)} columns, {self.dump.size:,} bytes")
+
+    def sort_by(self, column: int):
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column, self.descending = column, False
+        order = Qt.SortOrder.DescendingOrder if self.descending else Qt.SortOrder.AscendingOrder
+        self.table.horizontalHeader().setSortIndicator(column, order)
+        self.run_query()
+
+    def run_query(self):
+        """Filter and sort in the background; the current view stays usable meanwhile"""
+        if self.query_thread and self.query_thread.isRunning():
+            self.query_thread.stop()
+            self.query_thread.wait()
+        filter_text = self.filter_edit.text().strip()
+        if not filter_text and self.sort_column < 0:
+            self.model.set_view(None)
+            self.update_status()
+            return
+        self.query_thread = DumpQueryThread(self.dump, filter_text, self.column_combo.currentIndex() - 1,
+                                            self.sort_column, self.descending)
+        self.query_thread.result_ready.connect(self.on_query_result)
+        self.status_label.setText("Filtering..." if filter_text else "Sorting...")
+        self.query_thread.start()
+
+    def on_query_result(self, view):
+        self.model.set_view(view)
+        self.update_status()
+
+    def done(self, result: int):
+        for thread in (self.index_thread, self.query_thread):
+            if thread and thread.isRunning():
+                thread.stop()
+                thread.wait()
+        self.dump.close()
+        super().done(result)
@@ -0,0 +1,185 @@
+"""
+Findings Dialog - Browse injectable parameters found across all scans
+Groups come straight from the findings database indexes; the table below
+lists the findings of the selected group a page at a time
+"""
+
+from typing import Any, Dict, Optional
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+                            QComboBox, QSplitter, QTreeWidget, QTreeWidgetItem, QTableWidget,
+                            QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, QTimer
+import datetime
+import sys
+import os
+
+# Add the parent directory to the path to import from core
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.core.findings_db import FindingsDB
+
+
+class FindingsDialog(QDialog):
+    """Findings grouped by DBMS, technique or host"""
+
+    GROUPINGS = [
+        ("DBMS / Technique", ('dbms', 'technique')),
+        ("Technique / DBMS", ('technique', 'dbms')),
+        ("Host", ('host',)),
+    ]
+    TABLE_COLUMNS = [('host', "Host"), ('path', "Path"), ('parameter', "Parameter"), ('place', "Place"),
+                     ('technique', "Technique"), ('dbms', "DBMS"), ('payload', "Payload"), ('last_seen', "Last Seen")]
+    PAGE_SIZE = 1000
+
+    def __init__(self, findings: FindingsDB, parent=None):
+        super().__init__(parent)
+        self.findings = findings
+        self.filters: Dict[str, Any] = {}
+        self.loaded = 0
+        self.seen_version = -1
+        self.init_ui()
+        self.refresh()
+
+        # Scans keep reporting while the dialog is open
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_if_changed)
+        self.refresh_timer.start(3000)
+
+    def init_ui(self):
+        self.setWindowTitle("Findings")
+        self.resize(1000, 600)
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Group by:"))
+        self.grouping_combo = QComboBox()
+        for label, _ in self.GROUPINGS:
+            self.grouping_combo.addItem(label)
+        self.grouping_combo.currentIndexChanged.connect(self.refresh)
+        controls.addWidget(self.grouping_combo)
+        controls.addWidget(QLabel("Host:"))
+        self.host_edit = QLineEdit()
+        self.host_edit.setPlaceholderText("Exact host name (optional)")
+        self.host_edit.returnPressed.connect(self.refresh)
+        controls.addWidget(self.host_edit)
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        controls.addWidget(refresh_button)
+        layout.addLayout(controls)
+
+        self.stats_label = QLabel()
+        layout.addWidget(self.stats_label)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.group_tree = QTreeWidget()
+        self.group_tree.setHeaderLabels(["Group", "Findings", "Hosts"])
+        self.group_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.group_tree.currentItemChanged.connect(self.on_group_selected)
+        splitter.addWidget(self.group_tree)
+
+        self.table = QTableWidget(0, len(self.TABLE_COLUMNS))
+        self.table.setHorizontalHeaderLabels([label for _, label in self.TABLE_COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table.verticalHeader().setVisible(False)
+        splitter.addWidget(self.table)
+        splitter.setSizes([300, 700])
+        layout.addWidget(splitter)
+
+        buttons = QHBoxLayout()
+        self.more_button = QPushButton("Load More")
+        self.more_button.clicked.connect(self.load_more)
+        buttons.addWidget(self.more_button)
+        buttons.addStretch()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def base_filters(self) -> Dict[str, Any]:
+        host = self.host_edit.text().strip()
+        return {'host': host} if host else {}
+
+    def refresh_if_changed(self):
+        if self.findings.version != self.seen_version:
+            self.refresh()
+
+    def refresh(self):
+        """Rebuild the group tree, keeping the selected group if it still exists"""
+        self.seen_version = self.findings.version
+        selected = dict(self.filters)
+        columns = self.GROUPINGS[self.grouping_combo.currentIndex()][1]
+        base = self.base_filters()
+        try:
+            stats = self.findings.stats()
+            groups = self.findings.groups(columns, **base)
+        except Exception as e:
+            self.stats_label.setText(f"Findings database error: {e}")
+            return
+        self.stats_label.setText(f"{stats['findings']:,} findings, {stats['parameters']:,} vulnerable parameters "
+                                 f"on {stats['hosts']:,} hosts")
+
+        self.group_tree.blockSignals(True)
+        self.group_tree.clear()
+        parents: Dict[Any, QTreeWidgetItem] = {}
+        current: Optional[QTreeWidgetItem] = None
+        for group in groups:
+            first = group[columns[0]]
+            if len(columns) == 1:
+                item = QTreeWidgetItem([first or "(unknown)", str(group['findings']), str(group['hosts'])])
+                item.setData(0, Qt.ItemDataRole.UserRole, dict(base, **{columns[0]: first}))
+                self.group_tree.addTopLevelItem(item)
+            else:
+                parent = parents.get(first)
+                if parent is None:
+                    parent = QTreeWidgetItem([first or "(unknown)", "0", ""])
+                    parent.setData(0, Qt.ItemDataRole.UserRole, dict(base, **{columns[0]: first}))
+                    self.group_tree.addTopLevelItem(parent)
+                    parents[first] = parent
+                    if parent.data(0, Qt.ItemDataRole.UserRole) == selected:
+                        current = parent
+                parent.setText(1, str(int(parent.text(1)) + group['findings']))
+                second = group[columns[1]]
+                item = QTreeWidgetItem([second or "(unknown)", str(group['findings']), str(group['hosts'])])
+                item.setData(0, Qt.ItemDataRole.UserRole, dict(base, **{columns[0]: first, columns[1]: second}))
+                parent.addChild(item)
+            if item.data(0, Qt.ItemDataRole.UserRole) == selected:
+                current = item
+        self.group_tree.expandAll()
+        if current is not None:
+            self.group_tree.setCurrentItem(current)
+        else:
+            self.filters = base
+        self.group_tree.blockSignals(False)
+        self.load_findings()
+
+    def on_group_selected(self, item: Optional[QTreeWidgetItem], _previous=None):
+        self.filters = item.data(0, Qt.ItemDataRole.UserRole) if item else self.base_filters()
+        self.load_findings()
+
+    def load_findings(self):
+        self.table.setRowCount(0)
+        self.loaded = 0
+        self.load_more()
+
+    def load_more(self):
+        try:
+            rows = self.findings.findings(self.PAGE_SIZE, self.loaded, **self.filters)
+        except Exception as e:
+            self.stats_label.setText(f"Findings database error: {e}")
+            return
+        start = self.table.rowCount()
+        self.table.setRowCount(start + len(rows))
+        for offset, finding in enumerate(rows):
+            for column, (key, _) in enumerate(self.TABLE_COLUMNS):
+                value = finding[key]
+                if key == 'last_seen':
+                    value = datetime.datetime.fromtimestamp(value).strftime('%Y-%m-%d %H:%M')
+                self.table.setItem(start + offset, column, QTableWidgetItem(str(value or '')))
+        self.loaded += len(rows)
+        self.more_button.setEnabled(len(rows) == self.PAGE_SIZE)
+
+    def done(self, result: int):
+        self.refresh_timer.stop()
+        super().done(result)
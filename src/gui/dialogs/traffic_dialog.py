@@ -0,0 +1,107 @@
+"""
+Traffic Dialog - Live request rate, latency and status mix of a scan
+Shows the metrics a TrafficTailer keeps for the scan's traffic file (-t);
+the running scan's tailer is polled by the main window, a file opened on
+its own by a poller the dialog starts. Files are only ever read on those
+background threads; the dialog just redraws from the tailer.
+"""
+
+from typing import Optional
+
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGridLayout
+from PyQt6.QtCore import QTimer
+import sys
+import os
+
+# Add the parent directory to the path to import from core
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.core.traffic_analyzer import TrafficPoller, TrafficTailer, format_status_mix
+from src.gui.widgets.custom_widgets import Sparkline
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value * 1000:.0f} ms" if value is not None else "n/a"
+
+
+class TrafficDialog(QDialog):
+    """Live metrics of one traffic file"""
+
+    CHART_SECONDS = 120
+
+    def __init__(self, tailer: TrafficTailer, poll: bool = False, parent=None):
+        super().__init__(parent)
+        self.tailer = tailer
+        self.poller = None
+        if poll:
+            # A file opened on its own; the dialog follows it
+            self.poller = TrafficPoller(tailer)
+            self.poller.start()
+        self.init_ui()
+        self.refresh()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+
+    def init_ui(self):
+        self.setWindowTitle(f"Traffic - {os.path.basename(self.tailer.path or self.tailer.har_path)}")
+        self.resize(700, 480)
+        layout = QVBoxLayout(self)
+
+        grid = QGridLayout()
+        self.labels = {}
+        fields = [('requests', "Requests"), ('rps', "Requests/s (last 10 s)"), ('average_rps', "Requests/s overall"),
+                  ('latency', "Estimated latency p50 / p90 / p99"), ('size', "Response size mean / p95"),
+                  ('throttled', "Throttled or failed"), ('status_mix', "Status codes")]
+        self.titles = {}
+        for row, (key, title) in enumerate(fields):
+            self.titles[key] = QLabel(f"{title}:")
+            grid.addWidget(self.titles[key], row, 0)
+            self.labels[key] = QLabel()
+            grid.addWidget(self.labels[key], row, 1)
+        layout.addLayout(grid)
+
+        self.rate_chart = Sparkline("Requests per second")
+        layout.addWidget(self.rate_chart)
+        self.latency_chart = Sparkline("Estimated latency (ms)", "#d9822b")
+        layout.addWidget(self.latency_chart)
+
+        self.note = QLabel()
+        self.note.setWordWrap(True)
+        layout.addWidget(self.note)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def refresh(self):
+        snapshot = self.tailer.view(self.CHART_SECONDS)
+        if snapshot['latency_estimated']:
+            self.titles['latency'].setText("Estimated latency p50 / p90 / p99:")
+            self.latency_chart.title = "Estimated latency (ms)"
+            self.note.setText("sqlmap logs no timings in the traffic file; latency is estimated from how quickly "
+                              "exchanges complete. Scans run with --har get measured latency once they finish.")
+        else:
+            self.titles['latency'].setText("Latency p50 / p90 / p99:")
+            self.latency_chart.title = "Latency (ms)"
+            self.note.setText("Latency measured by sqlmap, from the HAR file.")
+        self.labels['requests'].setText(f"{snapshot['requests']:,} ({snapshot['bytes']:,} response bytes)")
+        self.labels['rps'].setText(f"{snapshot['rps']:.1f}")
+        self.labels['average_rps'].setText(f"{snapshot['average_rps']:.1f}")
+        self.labels['latency'].setText(f"{_ms(snapshot['latency_p50'])} / {_ms(snapshot['latency_p90'])} / "
+                                       f"{_ms(snapshot['latency_p99'])}")
+        self.labels['size'].setText(f"{int(snapshot['size_mean'] or 0):,} / {int(snapshot['size_p95'] or 0):,} bytes")
+        self.labels['throttled'].setText(f"{snapshot['throttled'] * 100:.0f}% of the last {snapshot['window']}")
+        self.labels['status_mix'].setText(format_status_mix(snapshot['status_mix']) or "none yet")
+        self.rate_chart.set_values(snapshot['rate_series'], f"last {self.CHART_SECONDS} s")
+        latencies = [value * 1000 for value in snapshot['latencies']]
+        self.latency_chart.set_values(latencies, f"last {len(latencies)} exchanges")
+
+    def done(self, result: int):
+        self.refresh_timer.stop()
+        if self.poller:
+            self.poller.stop()
+        super().done(result)
@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QVBoxLayout, QHBoxLayout,
                             QWidget, QPushButton, QSplitter, QMenuBar, QMenu, 
                             QStatusBar, QMessageBox, QDialog, QTextEdit, QLabel,
                             QGroupBox, QScrollArea, QFrame, QToolBar, QApplication,
-                            QInputDialog, QLineEdit)
+                            QInputDialog, QLineEdit, QFormLayout, QSpinBox, QDialogButtonBox)
 from PyQt6.QtCore import Qt, pyqtSignal, QThread, QTimer
 from PyQt6.QtGui import QIcon, QKeySequence, QFont, QAction
 
@@ -16,13 +16,28 @@ import sys
 import datetime
 import time
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add parent directories to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.core.sqlmap_wrapper import SqlmapWrapper
 from src.core.mutual_exclusion_manager import MutualExclusionManager
+from src.core.validation_cache import format_cache_stats
+from src.core.rate_governor import configure_default_governor, options_host
+from src.core.target_registry import COMPLETED_OUTCOMES, coverage_fingerprint, get_default_registry
+from src.core.auto_tuner import AutoTuner, TunedScan
+from src.core.bulk_sharding import ShardedBulkScan
+from src.core.option_matrix import MATRIX_AXES, OptionMatrixRace, describe_variant, expand_matrix, parse_axes
+from src.core.scan_queue import DONE, FAILED, STOPPED, ScanQueueStore, resume_options
+from src.core.sqlmap_api import SqlmapApiProcess, get_default_server
+from src.core.results_ingester import IngestWorker, ResultsIngester, ResultsStore, csv_delimiter
+from src.core.session_reader import SessionReader, default_output_dir, find_sessions, key_prefix, session_path
+from src.core.findings_db import FindingsDB
+from src.core.atomic_io import atomic_write_json
+from src.core.progress_tracker import STARTING, ProgressAggregator, ScanProgress
+from src.core.traffic_analyzer import MIN_THROTTLE_SAMPLES, THROTTLE_WARNING, TrafficPoller, TrafficTailer
+from src.core.session_autosave import AutosaveWriter, SessionJournal
 from src.utils.config import ConfigManager
 from src.gui.widgets.custom_widgets import StatusBar, LogWidget, CollapsibleWidget
 from src.gui.tabs.target_tab import TargetTab
@@ -57,9 +72,83 @@ class SqlmapMainWindow(QMainWindow):
         # Initialize core components
         self.config_manager = ConfigManager()
         self.sqlmap_wrapper = SqlmapWrapper()  # Fast initialization now
+        self.live_validation = self.sqlmap_wrapper.create_validation_engine()
         self.mutual_exclusion_manager = MutualExclusionManager()
         self.current_scan_thread = None
         
+        # Request budgets are shared with scans running in other windows
+        self.rate_governor = configure_default_governor(self.config_manager.get('rate_limits', {}))
+        self.scan_job_id = f"window-{id(self):x}"
+        self.scan_progress = ProgressAggregator()
+        self.current_scan_options = None
+        
+        # Record of targets already covered by earlier scans
+        try:
+            self.target_registry = get_default_registry()
+        except Exception as e:
+            print(f"Target registry unavailable: {e}")
+            self.target_registry = None
+        
+        # Persistent job queue, so interrupted scans can be resumed after a crash
+        try:
+            self.scan_queue = ScanQueueStore()
+        except Exception as e:
+            print(f"Scan queue unavailable: {e}")
+            self.scan_queue = None
+        self.current_job = None
+        self.queue_autorun = False
+        
+        # Injection points found by any scan, deduplicated across scans
+        try:
+            self.findings_db = FindingsDB()
+        except Exception as e:
+            print(f"Findings database unavailable: {e}")
+            self.findings_db = None
+        
+        # Findings parsed out of scan output directories as sqlmap writes them
+        try:
+            self.results_store = ResultsStore()
+            self.results_worker = IngestWorker(ResultsIngester(self.results_store, findings=self.findings_db))
+            self.results_worker.start()
+        except Exception as e:
+            print(f"Results store unavailable: {e}")
+            self.results_store = None
+            self.results_worker = None
+        self.watched_output_dir = None
+        self.bulk_thread = None  # Parallel bulk file scan (Tools > Run Bulk File in Parallel)
+        self.matrix_thread = None  # Option variant race (Tools > Race Option Variants)
+        
+        # Live view of the running scan's session.sqlite
+        self.session_reader = None
+        self.session_target = None
+        self.session_timer = QTimer(self)
+        self.session_timer.setInterval(2000)
+        self.session_timer.timeout.connect(self.poll_scan_session)
+        
+        # Request rate and latency of the running scan, from its traffic file (-t) and HAR file (--har)
+        self.traffic_tailer = None
+        self.traffic_poller = None  # Reads the traffic file off the GUI thread
+        self.traffic_throttled = False
+        self.traffic_timer = QTimer(self)
+        self.traffic_timer.setInterval(1000)
+        self.traffic_timer.timeout.connect(self.poll_scan_traffic)
+        
+        # A scan waiting for the rate governor to free a slot on its host
+        self.pending_launch = None
+        self.launch_retry_timer = QTimer(self)
+        self.launch_retry_timer.setSingleShot(True)
+        self.launch_retry_timer.setInterval(2000)
+        self.launch_retry_timer.timeout.connect(self.retry_pending_launch)
+        
+        # Option state is journaled by a background writer and restored on the next start
+        self.session_journal = None
+        self.session_writer = None
+        self.session_restore_thread = None
+        self.session_autosave_timer = QTimer(self)
+        self.session_autosave_timer.setSingleShot(True)
+        self.session_autosave_timer.setInterval(1000)
+        self.session_autosave_timer.timeout.connect(self.autosave_session)
+        
         # Initialize UI
         self.setup_ui()
         self.setup_menu_bar()
@@ -143,6 +232,7 @@ class SqlmapMainWindow(QMainWindow):
         
         # Target options
         self.tabs['target'] = TargetTab(mutual_exclusion_manager=self.mutual_exclusion_manager)
+        self.tabs['target'].coverage_source = self.dedup_coverage
         self.tab_widget.addTab(self.tabs['target'], "Target")
         
         # Request options
@@ -506,6 +596,48 @@ class SqlmapMainWindow(QMainWindow):
         reset_action.triggered.connect(self.reset_options)
         tools_menu.addAction(reset_action)
         
+        tools_menu.addSeparator()
+        
+        queue_action = QAction("Add Scan to Queue", self)
+        queue_action.triggered.connect(self.queue_current_scan)
+        tools_menu.addAction(queue_action)
+        
+        run_queue_action = QAction("Run Scan Queue", self)
+        run_queue_action.triggered.connect(self.run_scan_queue)
+        tools_menu.addAction(run_queue_action)
+        
+        show_queue_action = QAction("Show Scan Queue", self)
+        show_queue_action.triggered.connect(self.show_scan_queue)
+        tools_menu.addAction(show_queue_action)
+        
+        bulk_action = QAction("Run Bulk File in Parallel...", self)
+        bulk_action.triggered.connect(self.run_sharded_bulk)
+        tools_menu.addAction(bulk_action)
+        
+        matrix_action = QAction("Race Option Variants...", self)
+        matrix_action.triggered.connect(self.run_option_matrix)
+        tools_menu.addAction(matrix_action)
+        
+        show_results_action = QAction("Show Scan Results", self)
+        show_results_action.triggered.connect(self.show_scan_results)
+        tools_menu.addAction(show_results_action)
+        
+        findings_action = QAction("Findings...", self)
+        findings_action.triggered.connect(self.show_findings)
+        tools_menu.addAction(findings_action)
+        
+        session_action = QAction("Browse Scan Session...", self)
+        session_action.triggered.connect(self.browse_scan_session)
+        tools_menu.addAction(session_action)
+        
+        traffic_action = QAction("Traffic Analytics...", self)
+        traffic_action.triggered.connect(self.show_traffic)
+        tools_menu.addAction(traffic_action)
+        
+        dump_viewer_action = QAction("Open Dump Viewer...", self)
+        dump_viewer_action.triggered.connect(self.open_dump_viewer)
+        tools_menu.addAction(dump_viewer_action)
+        
         # Help menu
         help_menu = menubar.addMenu("Help")
         
@@ -523,6 +655,10 @@ class SqlmapMainWindow(QMainWindow):
         cpu_debug_action.triggered.connect(self.debug_cpu_monitoring)
         help_menu.addAction(cpu_debug_action)
         
+        cache_debug_action = QAction("Debug Validation Cache", self)
+        cache_debug_action.triggered.connect(self.debug_validation_cache)
+        help_menu.addAction(cache_debug_action)
+        
         # Add performance control actions
         help_menu.addSeparator()
         
@@ -601,6 +737,7 @@ class SqlmapMainWindow(QMainWindow):
         for tab in self.tabs.values():
             if hasattr(tab, 'options_changed'):
                 tab.options_changed.connect(self.schedule_command_preview_update)
+                tab.options_changed.connect(self.schedule_session_autosave)
         
         # Initialize command preview update timer with longer interval
         self.command_timer = QTimer()
@@ -647,6 +784,10 @@ class SqlmapMainWindow(QMainWindow):
                         print(f"Error getting options from {tab_name}: {e}")
                         continue
             
+            # Re-check only the rules whose options changed
+            self.live_validation.update(all_options)
+            self.update_validation_indicator()
+            
             # Build command using wrapper - respect user's batch preference
             command = self.sqlmap_wrapper.build_command(all_options, force_batch=False)
             
@@ -667,6 +808,24 @@ class SqlmapMainWindow(QMainWindow):
             if not current_text.startswith("Error"):
                 self.command_preview.setPlainText(error_msg)
     
+    def update_validation_indicator(self):
+        """Show the live validation result on the validate button"""
+        errors = self.live_validation.errors
+        warnings = self.live_validation.warnings
+        
+        if errors:
+            text = f"🔍 Validate Command ({len(errors)} error{'s' if len(errors) != 1 else ''})"
+        elif warnings:
+            text = f"🔍 Validate Command ({len(warnings)} warning{'s' if len(warnings) != 1 else ''})"
+        else:
+            text = "🔍 Validate Command"
+        
+        tooltip = "\n".join(issue.message for issue in (errors + warnings)[:10])
+        if self.validate_button.text() != text:
+            self.validate_button.setText(text)
+        if self.validate_button.toolTip() != tooltip:
+            self.validate_button.setToolTip(tooltip)
+    
     def start_scan(self, use_sudo: bool = False):
         """Start SQLmap scan"""
         try:
@@ -704,6 +863,18 @@ class SqlmapMainWindow(QMainWindow):
                 
                 return
             
+            # Ask before repeating a scan that already completed with equivalent options
+            if self.target_registry:
+                previous = self.target_registry.check_options(all_options)
+                if previous and previous.outcome in COMPLETED_OUTCOMES:
+                    reply = QMessageBox.question(self, "Already Tested",
+                                               f"This target was already scanned with equivalent options on "
+                                               f"{time.ctime(previous.tested_at)} (outcome: {previous.outcome}).\n\n"
+                                               f"Scan it again?",
+                                               QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+                    if reply != QMessageBox.StandardButton.Yes:
+                        return
+            
             # If there's already a scan running, stop it first
             if hasattr(self, 'current_scan_thread') and self.current_scan_thread and self.current_scan_thread.isRunning():
                 self.current_scan_thread.stop() 
@@ -737,48 +908,212 @@ class SqlmapMainWindow(QMainWindow):
                     use_sudo = False
                     self.log_widget.append_log("Sudo cancelled by user - running without sudo", "info")
             
-            # Create and start the scan thread
-            self.current_scan_thread = SqlmapScanThread(
-                self.sqlmap_wrapper,
-                all_options,
-                use_sudo,
-                sudo_password
-            )
+            # Persist the job first so a crash mid-scan can be resumed
+            job = None
+            if self.scan_queue:
+                try:
+                    # Without an output dir the scan writes where sqlmap always does, and resumes from there
+                    job = self.scan_queue.enqueue(all_options, claim=True, job_dir=False)
+                except Exception as e:
+                    print(f"Error recording scan job: {e}")
             
-            # Connect thread signals
-            self.current_scan_thread.log_message.connect(self.log_widget.append_log)
-            self.current_scan_thread.scan_finished.connect(self.on_scan_finished)
+            self.launch_scan(all_options, use_sudo, sudo_password, job)
             
-            # Update UI state for scan start
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to start scan: {str(e)}")
+            self.log_widget.append_log(f"Failed to start scan: {str(e)}", "error")
+            self.on_scan_finished(False)
+    
+    def launch_scan(self, all_options: Dict[str, Any], use_sudo: bool = False, sudo_password: str = None,
+                    job=None):
+        """Start the scan thread for validated options"""
+        self.current_scan_options = all_options
+        self.current_job = job
+        retrying, self.pending_launch = self.pending_launch is not None, None
+        # Queued jobs are tracked (and budgeted) under their own id
+        self.scan_job_id = f"window-{id(self):x}" + (f"-job-{job.job_id}" if job else "")
+        
+        # Fit threads/delay into the target host's budget
+        tuning_limits = None
+        host = options_host(all_options)
+        if all_options.get('auto_tune'):
+            # The tuner may ramp up to the host's whole allocation, so ask for the maximum
+            ceiling = self.rate_governor.acquire(self.scan_job_id, host, dict(all_options, threads=10, delay=0))
+        else:
+            ceiling = self.rate_governor.acquire(self.scan_job_id, host, all_options)
+        if ceiling is None:
+            # Other scans hold every slot of the host's budget; try again shortly
+            self.pending_launch = (all_options, use_sudo, sudo_password, job)
+            self.launch_retry_timer.start()
             self.start_button.setEnabled(False)
             self.start_sudo_button.setEnabled(False)
             self.stop_button.setEnabled(True)
-            self.status_bar.set_status("Starting scan...")
-            
-            # Start the thread
-            self.current_scan_thread.start()
-            
-            sudo_text = " with sudo" if use_sudo else ""
-            self.log_widget.append_log(f"SQLmap scan thread starting{sudo_text} (command validated)", "success")
-            
+            if not retrying:
+                self.status_bar.set_status(f"Waiting for a free slot on {host or 'the target'}...")
+                self.log_widget.append_log(
+                    f"Rate governor: waiting for other scans of {host or 'the target'} to free a slot", "info")
+            return
+        
+        output_dir = all_options.get('output_dir') or default_output_dir()
+        if self.results_worker:
+            self.results_worker.watch(output_dir, csv_delimiter(all_options.get('csv_del')))
+            self.watched_output_dir = output_dir
+        
+        self.session_reader = None
+        self.session_target = None
+        if all_options.get('url'):
+            self.session_target = (output_dir, all_options['url'])
+            self.session_timer.start()
+        
+        if all_options.get('auto_tune'):
+            tuning_limits = {'max_threads': ceiling['threads'], 'min_delay': ceiling['delay']}
+            governed_options = dict(all_options)
+            # Only a value the budget actually changes is written, so defaults stay off the command line
+            threads, delay = int(all_options.get('threads') or 1), float(all_options.get('delay') or 0)
+            if ceiling['threads'] < threads:
+                governed_options['threads'] = ceiling['threads']
+            if ceiling['delay'] > delay:
+                governed_options['delay'] = ceiling['delay']
+        else:
+            governed_options = ceiling
+        for key in ('threads', 'delay'):
+            if governed_options.get(key) != all_options.get(key):
+                self.log_widget.append_log(
+                    f"Rate governor: {key} set to {governed_options[key]} (other scans share this host)", "info")
+        all_options = governed_options
+        
+        if all_options.get('traffic_file') or all_options.get('har'):
+            self.traffic_tailer = TrafficTailer(all_options.get('traffic_file'), all_options.get('threads') or 1,
+                                                har_path=all_options.get('har'))
+            self.traffic_poller = TrafficPoller(self.traffic_tailer)
+            self.traffic_poller.start()
+            self.traffic_throttled = False
+            self.traffic_timer.start()
+        
+        # Create and start the scan thread
+        self.current_scan_thread = SqlmapScanThread(
+            self.sqlmap_wrapper,
+            all_options,
+            use_sudo,
+            sudo_password,
+            tuning_limits
+        )
+        
+        self.current_scan_thread.backend = self.config_manager.get('sqlmap.backend', 'process')
+        
+        # Connect thread signals
+        self.current_scan_thread.log_message.connect(self.log_widget.append_log)
+        self.current_scan_thread.scan_finished.connect(self.on_scan_finished)
+        self.current_scan_thread.progress_updated.connect(self.on_scan_progress)
+        
+        # Update UI state for scan start
+        self.start_button.setEnabled(False)
+        self.start_sudo_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.status_bar.set_status("Starting scan...")
+        self.scan_progress.update(self.scan_job_id, 0, None, STARTING)
+        self.status_bar.set_progress(self.scan_progress.combined()[0])
+        self.status_bar.show_progress(True)
+        
+        # Start the thread
+        self.current_scan_thread.start()
+        
+        sudo_text = " with sudo" if use_sudo else ""
+        self.log_widget.append_log(f"SQLmap scan thread starting{sudo_text} (command validated)", "success")
+    
+    def retry_pending_launch(self):
+        """Try again to start the scan that was waiting for a rate governor slot"""
+        if self.pending_launch is None:
+            return
+        try:
+            self.launch_scan(*self.pending_launch)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to start scan: {str(e)}")
+            self.pending_launch = None
             self.log_widget.append_log(f"Failed to start scan: {str(e)}", "error")
             self.on_scan_finished(False)
     
     def stop_scan(self):
         """Stop current scan"""
+        if self.pending_launch is not None:
+            # Never started, so there is nothing to stop but the wait
+            self.launch_retry_timer.stop()
+            self.pending_launch = None
+            self.queue_autorun = False
+            if self.current_job and self.scan_queue:
+                try:
+                    self.scan_queue.mark_finished(self.current_job.job_id, STOPPED)
+                except Exception as e:
+                    print(f"Error updating scan job: {e}")
+            self.current_job = None
+            self.log_widget.append_log("Stopped waiting for a free slot", "warning")
+            self.on_scan_finished(False)
+            return
         if self.current_scan_thread and self.current_scan_thread.isRunning():
             self.current_scan_thread.stop()
             self.log_widget.append_log("Stopping scan...", "warning")
     
+    def on_scan_progress(self, percent: int, eta: int, phase: str):
+        """Show the scan's estimated progress, combined with any other running scans"""
+        self.on_job_progress(self.scan_job_id, percent, eta, phase)
+    
+    def on_job_progress(self, job_id: str, percent: int, eta: int, phase: str):
+        """Fold one job's estimated progress (the scan, a bulk shard or a variant) into the status bar"""
+        self.scan_progress.update(job_id, percent, eta if eta >= 0 else None, phase)
+        self.status_bar.set_progress(self.scan_progress.combined()[0])
+        self.status_bar.set_status(self.scan_progress.describe())
+        self.status_bar.show_progress(True)
+    
+    def on_job_finished(self, job_id: str):
+        """Drop a finished bulk shard or variant from the combined progress"""
+        self.scan_progress.remove(job_id)
+        self.status_bar.set_progress(self.scan_progress.combined()[0])
+        self.status_bar.show_progress(len(self.scan_progress) > 0)
+    
     def on_scan_finished(self, success: bool):
         """Handle scan completion"""
+        self.rate_governor.release(self.scan_job_id)
+        self.scan_progress.remove(self.scan_job_id)
+        
+        if success and self.target_registry and self.current_scan_options:
+            try:
+                self.target_registry.record_options(self.current_scan_options, 'completed')
+            except Exception as e:
+                print(f"Error recording scan in target registry: {e}")
+        if self.results_worker and self.watched_output_dir:
+            # Picks up whatever sqlmap flushed on exit, then stops watching
+            self.results_worker.unwatch(self.watched_output_dir)
+            self.watched_output_dir = None
+        self.current_scan_options = None
+        
+        if self.session_target:
+            self.poll_scan_session()
+            self.session_timer.stop()
+            if self.session_reader:
+                self.session_reader.close()
+            self.session_reader = None
+            self.session_target = None
+        
+        if self.traffic_timer.isActive():
+            # The tailer stays around so the finished scan's traffic can still be viewed;
+            # the poller reads the rest of the file and the HAR file in the background
+            self.traffic_timer.stop()
+            self.traffic_poller.finish()
+            self.traffic_poller = None
+        
+        stopped = bool(self.current_scan_thread and self.current_scan_thread.should_stop)
+        if self.current_job and self.scan_queue:
+            try:
+                state = DONE if success else (STOPPED if stopped else FAILED)
+                self.scan_queue.mark_finished(self.current_job.job_id, state)
+            except Exception as e:
+                print(f"Error updating scan job: {e}")
+        self.current_job = None
+        
         # Update UI state
         self.start_button.setEnabled(True)
         self.start_sudo_button.setEnabled(True)
         self.stop_button.setEnabled(False)
-        self.status_bar.show_progress(False)
+        self.status_bar.show_progress(len(self.scan_progress) > 0)
         
         if success:
             self.status_bar.set_status("Scan completed successfully")
@@ -786,6 +1121,451 @@ class SqlmapMainWindow(QMainWindow):
         else:
             self.status_bar.set_status("Scan failed or was stopped")
             self.log_widget.append_log("Scan failed or was stopped", "error")
+        
+        # Carry on with the queue unless the user stopped the scan
+        if self.queue_autorun and not stopped:
+            QTimer.singleShot(0, self.run_next_queued_job)
+        else:
+            self.queue_autorun = False
+    
+    def queue_current_scan(self):
+        """Add the current options to the persistent scan queue"""
+        if not self.scan_queue:
+            QMessageBox.warning(self, "Scan Queue", "The scan queue database is not available.")
+            return
+        
+        all_options = {}
+        for tab in self.tabs.values():
+            if hasattr(tab, 'get_options'):
+                all_options.update(tab.get_options())
+        
+        validation_result = self.sqlmap_wrapper.validate_options(all_options)
+        if not validation_result.is_valid:
+            QMessageBox.warning(self, "Scan Queue",
+                              f"The command has {len(validation_result.errors)} error(s); fix them before queueing.")
+            return
+        
+        try:
+            job = self.scan_queue.enqueue(all_options)
+            self.log_widget.append_log(f"Queued job {job.job_id} ({job.label or 'no target'}) -> {job.output_dir}", "info")
+        except Exception as e:
+            self.log_widget.append_log(f"Failed to queue scan: {str(e)}", "error")
+    
+    def run_scan_queue(self):
+        """Work through queued jobs one after another"""
+        if not self.scan_queue:
+            return
+        if self.current_scan_thread and self.current_scan_thread.isRunning():
+            self.queue_autorun = True
+            self.log_widget.append_log("Queued jobs will start when the current scan finishes", "info")
+            return
+        self.queue_autorun = True
+        self.run_next_queued_job()
+    
+    def run_next_queued_job(self):
+        """Launch the oldest queued job, resuming on its session if it ran before"""
+        if not self.scan_queue or not self.sqlmap_wrapper.sqlmap_available:
+            self.queue_autorun = False
+            return
+        if self.current_scan_thread and self.current_scan_thread.isRunning():
+            return
+        
+        try:
+            job = self.scan_queue.claim_next()
+        except Exception as e:
+            self.log_widget.append_log(f"Error reading scan queue: {str(e)}", "error")
+            job = None
+        if job is None:
+            if self.queue_autorun:
+                self.log_widget.append_log("Scan queue is empty", "info")
+            self.queue_autorun = False
+            return
+        
+        resumed = " (resuming from its session)" if job.resumed else ""
+        self.log_widget.append_log(f"Starting queued job {job.job_id}: {job.label}{resumed}", "info")
+        try:
+            self.launch_scan(resume_options(job), job=job)
+        except Exception as e:
+            self.log_widget.append_log(f"Failed to start queued job {job.job_id}: {str(e)}", "error")
+            self.on_scan_finished(False)
+    
+    def resume_interrupted_jobs(self):
+        """Requeue jobs a crash or reboot interrupted and offer to resume them"""
+        if not self.scan_queue:
+            return
+        try:
+            interrupted = self.scan_queue.recover_interrupted()
+        except Exception as e:
+            print(f"Error recovering scan queue: {e}")
+            return
+        if not interrupted:
+            return
+        
+        labels = "\n".join(f"• {job.label or job.output_dir}" for job in interrupted[:10])
+        more = f"\n… and {len(interrupted) - 10} more" if len(interrupted) > 10 else ""
+        reply = QMessageBox.question(self, "Resume Interrupted Scans",
+                                   f"{len(interrupted)} scan(s) were interrupted when SQLmap GUI last exited:\n\n"
+                                   f"{labels}{more}\n\n"
+                                   f"Resume them now? They continue from their sqlmap sessions.",
+                                   QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.run_scan_queue()
+        else:
+            self.log_widget.append_log(f"{len(interrupted)} interrupted scan(s) left in the queue "
+                                       f"(Tools > Run Scan Queue)", "info")
+    
+    def run_sharded_bulk(self):
+        """Scan the bulk file (-m) with several sqlmap workers, sharded by host"""
+        if self.bulk_thread and self.bulk_thread.isRunning():
+            reply = QMessageBox.question(self, "Bulk Scan", "A parallel bulk scan is running. Stop it?",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.Yes:
+                self.bulk_thread.stop()
+            return
+        if not self.sqlmap_wrapper.sqlmap_available:
+            QMessageBox.warning(self, "Bulk Scan", "SQLmap is not available.")
+            return
+        
+        all_options = {}
+        for tab in self.tabs.values():
+            if hasattr(tab, 'get_options'):
+                all_options.update(tab.get_options())
+        if not all_options.get('bulk_file'):
+            QMessageBox.warning(self, "Bulk Scan", "Select a bulk file (-m) on the Target tab first.")
+            return
+        validation_result = self.sqlmap_wrapper.validate_options(all_options)
+        if not validation_result.is_valid:
+            QMessageBox.warning(self, "Bulk Scan",
+                              f"The command has {len(validation_result.errors)} error(s); fix them first.")
+            return
+        
+        workers, ok = QInputDialog.getInt(self, "Bulk Scan", "Parallel sqlmap workers:", 4, 1, 32)
+        if not ok:
+            return
+        try:
+            # Targets tested before with the same options run last
+            scan = ShardedBulkScan(self.sqlmap_wrapper, all_options, workers=workers, governor=self.rate_governor,
+                                   registry=self.target_registry, registry_policy='defer')
+        except Exception as e:
+            self.log_widget.append_log(f"Failed to start bulk scan: {str(e)}", "error")
+            return
+        self.bulk_thread = BulkScanThread(scan)
+        self.bulk_thread.log_message.connect(self.log_widget.append_log)
+        self.bulk_thread.job_progress.connect(self.on_job_progress)
+        self.bulk_thread.job_finished.connect(self.on_job_finished)
+        self.bulk_thread.start()
+    
+    def run_option_matrix(self):
+        """Race technique/tamper/level/risk/prefix/suffix variants of the current options against the URL"""
+        if self.matrix_thread and self.matrix_thread.isRunning():
+            reply = QMessageBox.question(self, "Option Variants", "An option variant race is running. Stop it?",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.Yes:
+                self.matrix_thread.stop()
+            return
+        if not self.sqlmap_wrapper.sqlmap_available:
+            QMessageBox.warning(self, "Option Variants", "SQLmap is not available.")
+            return
+        
+        all_options = {}
+        for tab in self.tabs.values():
+            if hasattr(tab, 'get_options'):
+                all_options.update(tab.get_options())
+        if not all_options.get('url'):
+            QMessageBox.warning(self, "Option Variants", "Enter a target URL (-u) on the Target tab first.")
+            return
+        validation_result = self.sqlmap_wrapper.validate_options(all_options)
+        if not validation_result.is_valid:
+            QMessageBox.warning(self, "Option Variants",
+                              f"The command has {len(validation_result.errors)} error(s); fix them first.")
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Race Option Variants")
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel("Comma-separated values per option; every combination runs until one finds an "
+                                "injection point.\nTamper chains use ';' between scripts and '-' for none."))
+        form = QFormLayout()
+        fields = {}
+        hints = {'technique': "B,T,BEU", 'tamper': "-,space2comment,between;randomcase", 'level': "1,3,5",
+                 'risk': "1,2", 'prefix': "', \"", 'suffix': "-- -"}
+        for name in MATRIX_AXES:
+            field = QLineEdit()
+            field.setPlaceholderText(hints.get(name, ''))
+            form.addRow(f"{name.capitalize()}:", field)
+            fields[name] = field
+        parallel = QSpinBox()
+        parallel.setRange(1, 16)
+        parallel.setValue(4)
+        form.addRow("Parallel variants:", parallel)
+        layout.addLayout(form)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        variants = expand_matrix(parse_axes({name: field.text() for name, field in fields.items()}))
+        if len(variants) < 2:
+            QMessageBox.warning(self, "Option Variants", "Give at least two values for one of the options.")
+            return
+        try:
+            race = OptionMatrixRace(self.sqlmap_wrapper, all_options, variants, parallel=parallel.value(),
+                                    governor=self.rate_governor, registry=self.target_registry)
+        except Exception as e:
+            self.log_widget.append_log(f"Failed to start option variant race: {str(e)}", "error")
+            return
+        self.matrix_thread = MatrixRaceThread(race)
+        self.matrix_thread.log_message.connect(self.log_widget.append_log)
+        self.matrix_thread.job_progress.connect(self.on_job_progress)
+        self.matrix_thread.job_finished.connect(self.on_job_finished)
+        self.matrix_thread.start()
+    
+    def show_scan_queue(self):
+        """Show the persistent scan queue"""
+        if not self.scan_queue:
+            QMessageBox.warning(self, "Scan Queue", "The scan queue database is not available.")
+            return
+        
+        lines = []
+        for job in self.scan_queue.jobs():
+            lines.append(f"{job.job_id:>5}  {job.state:<8} attempts={job.attempts}  {job.label}")
+            lines.append(f"       {job.output_dir or '(sqlmap default output directory)'}")
+        counts = ", ".join(f"{state}: {count}" for state, count in sorted(self.scan_queue.counts().items()))
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Scan Queue")
+        dialog.resize(700, 450)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(counts or "The queue is empty"))
+        text = QTextEdit()
+        text.setReadOnly(True)
+        text.setFont(QFont("Courier", 9))
+        text.setPlainText("\n".join(lines))
+        layout.addWidget(text)
+        
+        buttons = QHBoxLayout()
+        clear_button = QPushButton("Clear Finished")
+        clear_button.clicked.connect(lambda: (self.clear_finished_jobs(), dialog.accept()))
+        buttons.addWidget(clear_button)
+        buttons.addStretch()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(dialog.accept)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+        dialog.exec()
+    
+    def clear_finished_jobs(self):
+        """Forget finished queue jobs, optionally deleting the directories the queue made for them"""
+        reply = QMessageBox.question(
+            self, "Scan Queue",
+            f"Also delete the finished jobs' output directories under {self.scan_queue.jobs_dir}?\n"
+            "Directories you chose yourself are always kept.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel)
+        if reply == QMessageBox.StandardButton.Cancel:
+            return
+        cleared = self.scan_queue.clear_finished(remove_job_dirs=reply == QMessageBox.StandardButton.Yes)
+        self.log_widget.append_log(f"Cleared {cleared} finished job(s) from the scan queue", "info")
+    
+    def show_scan_results(self):
+        """Show findings ingested from scan output directories"""
+        if not self.results_store:
+            QMessageBox.warning(self, "Scan Results", "The results database is not available.")
+            return
+        
+        summary = self.results_store.summary()
+        lines = []
+        for point in self.results_store.injection_points():
+            lines.append(f"{point['host']}{point['path']}  {point['parameter']} ({point['place']})  {point['technique']}")
+            if point['payload']:
+                lines.append(f"    {point['payload']}")
+        for host, dbms in sorted(summary['dbms'].items()):
+            if dbms:
+                lines.append(f"{host}: {dbms}")
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Scan Results")
+        dialog.resize(700, 450)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f"{summary['hosts']} hosts, {summary['injection_points']} injection points, "
+                                f"{summary['databases']} databases, {summary['tables']} tables, "
+                                f"{summary['dumped_rows']} dumped rows"))
+        text = QTextEdit()
+        text.setReadOnly(True)
+        text.setFont(QFont("Courier", 9))
+        text.setPlainText("\n".join(lines) or "Nothing ingested yet")
+        layout.addWidget(text)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button)
+        dialog.exec()
+    
+    def show_findings(self):
+        """Browse vulnerable parameters across all scans"""
+        if not self.findings_db:
+            QMessageBox.warning(self, "Findings", "The findings database is not available.")
+            return
+        from src.gui.dialogs.findings_dialog import FindingsDialog
+        
+        if getattr(self, 'findings_dialog', None) is None:
+            self.findings_dialog = FindingsDialog(self.findings_db, self)
+        self.findings_dialog.show()
+        self.findings_dialog.raise_()
+        self.findings_dialog.refresh()
+    
+    def poll_scan_session(self):
+        """Report what the running scan committed to its session database"""
+        if not self.session_target:
+            return
+        if self.session_reader is None:
+            output_dir, url = self.session_target
+            path = session_path(output_dir, url)
+            if not os.path.exists(path):
+                return
+            self.session_reader = SessionReader(path, [url])
+        
+        update = self.session_reader.poll()
+        if update.dbms:
+            self.log_widget.append_log(f"Session: back-end DBMS is {update.dbms}", "info")
+        if update.os:
+            self.log_widget.append_log(f"Session: operating system is {update.os}", "info")
+        for point in update.injection_points:
+            techniques = ", ".join(item['technique'] for item in point.techniques)
+            self.log_widget.append_log(
+                f"Session: injection point {point.parameter} ({point.place}) - {techniques}", "success")
+        if update.injection_points and self.findings_db:
+            host, path = key_prefix(self.session_target[1]).split('|', 1)
+            dbms = self.session_reader.values.get('DBMS') or ''
+            try:
+                self.findings_db.record_many(
+                    (host, path, point.parameter, point.place, item['technique'], dbms,
+                     item['title'], item['payload'], 'session')
+                    for point in update.injection_points for item in point.techniques)
+            except Exception as e:
+                print(f"Error recording findings: {e}")
+        if update.results:
+            self.status_bar.set_status(f"{len(self.session_reader.results)} results cached in session")
+    
+    def poll_scan_traffic(self):
+        """Warn when the target starts pushing back, from what the traffic poller has read"""
+        if not self.traffic_tailer:
+            return
+        snapshot = self.traffic_tailer.view()
+        if snapshot['window'] < MIN_THROTTLE_SAMPLES:
+            return
+        share = snapshot['throttled']
+        if share >= THROTTLE_WARNING and not self.traffic_throttled:
+            self.traffic_throttled = True
+            self.log_widget.append_log(
+                f"Traffic: {share * 100:.0f}% of the last {snapshot['window']} responses were 429/503 "
+                f"or failed - the target may be throttling", "warning")
+        elif share < THROTTLE_WARNING / 2 and self.traffic_throttled:
+            self.traffic_throttled = False
+            self.log_widget.append_log("Traffic: throttling responses have subsided", "info")
+    
+    def dedup_coverage(self) -> Tuple[Any, Optional[str]]:
+        """Registry and coverage fingerprint of the current options, for dropping already tested log entries"""
+        if not self.target_registry:
+            return None, None
+        all_options = {}
+        for tab in self.tabs.values():
+            if hasattr(tab, 'get_options'):
+                all_options.update(tab.get_options())
+        return self.target_registry, coverage_fingerprint(all_options)
+    
+    def show_traffic(self):
+        """Live request rate, latency and status codes of the current scan or a traffic file"""
+        from PyQt6.QtWidgets import QFileDialog
+        from src.gui.dialogs.traffic_dialog import TrafficDialog
+        
+        if self.traffic_tailer:
+            # The main window keeps polling the scan's tailer
+            dialog = TrafficDialog(self.traffic_tailer, poll=False, parent=self)
+        else:
+            file_path, _ = QFileDialog.getOpenFileName(self, "Open Traffic File", "",
+                                                       "Traffic Files (*.txt *.log);;HAR Files (*.har);;All Files (*)")
+            if not file_path:
+                return
+            if file_path.lower().endswith('.har'):
+                tailer = TrafficTailer(None, har_path=file_path)
+            else:
+                tailer = TrafficTailer(file_path)
+            dialog = TrafficDialog(tailer, poll=True, parent=self)
+        dialog.show()
+    
+    def browse_scan_session(self):
+        """Show what a past scan's session.sqlite holds without re-running sqlmap"""
+        from PyQt6.QtWidgets import QFileDialog
+        
+        output_dir = self.tabs['general'].get_options().get('output_dir') or default_output_dir()
+        sessions = find_sessions(output_dir) if os.path.isdir(output_dir) else []
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open Scan Session",
+            sessions[0] if sessions else "",
+            "sqlmap Sessions (session.sqlite);;All Files (*)"
+        )
+        if not file_path:
+            return
+        
+        with SessionReader(file_path) as reader:
+            snapshot = reader.snapshot()
+            results = list(reader.results)
+        
+        lines = [f"Target: {', '.join(snapshot['targets']) or 'unknown (no target.txt)'}",
+                 f"Back-end DBMS: {snapshot['dbms'] or 'unknown'}",
+                 f"Operating system: {snapshot['os'] or 'unknown'}", ""]
+        for point in snapshot['injection_points']:
+            lines.append(f"Parameter: {point['parameter']} ({point['place']})")
+            for technique in point['techniques']:
+                lines.append(f"    Type: {technique['technique']}")
+                lines.append(f"    Title: {technique['title']}")
+                lines.append(f"    Payload: {technique['payload']}")
+            lines.append("")
+        if results:
+            lines.append(f"Cached results ({len(results)}):")
+            for result in results[:500]:
+                if isinstance(result, list):
+                    lines.extend("    " + " | ".join(row) for row in result)
+                else:
+                    lines.append(f"    {result}")
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Scan Session - {os.path.basename(os.path.dirname(file_path))}")
+        dialog.resize(700, 450)
+        layout = QVBoxLayout(dialog)
+        text = QTextEdit()
+        text.setReadOnly(True)
+        text.setFont(QFont("Courier", 9))
+        text.setPlainText("\n".join(lines))
+        layout.addWidget(text)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button)
+        dialog.exec()
+    
+    def open_dump_viewer(self):
+        """Browse a CSV dump written by --dump/--dump-all"""
+        from PyQt6.QtWidgets import QFileDialog
+        from src.gui.dialogs.dump_viewer import DumpViewerDialog
+        
+        start_dir = self.tabs['general'].get_options().get('output_dir') or default_output_dir()
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open Dump",
+            start_dir if os.path.isdir(start_dir) else "",
+            "CSV Dumps (*.csv);;All Files (*)"
+        )
+        if not file_path:
+            return
+        
+        try:
+            dialog = DumpViewerDialog(file_path, self)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Dump Viewer", f"Cannot open dump: {str(e)}")
+            return
+        dialog.exec()
     
     def validate_options(self) -> bool:
         """Validate current options"""
@@ -840,8 +1620,11 @@ class SqlmapMainWindow(QMainWindow):
                     tab_options = tab.get_options()
                     all_options.update(tab_options)
             
-            # Get validation results from wrapper
-            validation = self.sqlmap_wrapper.validate_options(all_options)
+            # Refresh the live result; files may have appeared or vanished since the last edit
+            self.live_validation.update(all_options)
+            self.live_validation.revalidate_all()
+            self.update_validation_indicator()
+            validation = self.sqlmap_wrapper.validation_from_engine(self.live_validation)
             
             # Get current command for display
             command_list = self.sqlmap_wrapper.build_command(all_options, force_batch=False)
@@ -866,6 +1649,46 @@ class SqlmapMainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to apply fixes: {str(e)}")
     
+    def apply_tab_options(self, options: Optional[Dict[str, Dict[str, Any]]],
+                          only_given: bool = False) -> Tuple[int, List[str], float]:
+        """Set the options of every tab ({tab: options}), or reset them all when `options` is None
+        
+        Tab signals are blocked and mutual exclusions are evaluated once over the final
+        state, so the preview and autosave are notified once instead of once per widget.
+        With `only_given`, tabs missing from `options` are left alone instead of reset.
+        Returns the number of tabs applied, per-tab errors and the time taken in ms.
+        """
+        started = time.perf_counter()
+        applied = 0
+        error_tabs = []
+        
+        with self.mutual_exclusion_manager.bulk_update():
+            for tab_name, tab in self.tabs.items():
+                if options is not None and only_given and tab_name not in options:
+                    continue
+                blocked = tab.blockSignals(True)
+                try:
+                    if options is None:
+                        if hasattr(tab, 'reset_options'):
+                            tab.reset_options()
+                            applied += 1
+                    elif hasattr(tab, 'set_options'):
+                        tab.set_options(options.get(tab_name, {}))
+                        applied += 1
+                except Exception as e:
+                    error_tabs.append(f"{tab_name}: {str(e)}")
+                    print(f"Error applying options to {tab_name}: {e}")
+                finally:
+                    tab.blockSignals(blocked)
+            if options is None:
+                # Defaults are not choices; start the exclusion state afresh
+                self.mutual_exclusion_manager.reset_all()
+        
+        # The one notification for the whole batch
+        self.update_command_preview()
+        self.schedule_session_autosave()
+        return applied, error_tabs, (time.perf_counter() - started) * 1000
+    
     def reset_options(self):
         """Reset all options to defaults"""
         reply = QMessageBox.question(self, "Reset Options",
@@ -876,30 +1699,11 @@ class SqlmapMainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                reset_count = 0
-                error_tabs = []
-
-                # Reset each tab individually with error handling
-                for tab_name, tab in self.tabs.items():
-                    try:
-                        if hasattr(tab, 'reset_options'):
-                            tab.reset_options()
-                            reset_count += 1
-                    except Exception as e:
-                        error_tabs.append(f"{tab_name}: {str(e)}")
-                        print(f"Error resetting {tab_name}: {e}")
-
-                # Reset mutual exclusion manager
-                self.mutual_exclusion_manager.reset_all()
-                
-                # Clear command preview
-                self.command_preview.clear()
+                # Reset every tab and the mutual exclusion state in one pass
+                reset_count, error_tabs, elapsed_ms = self.apply_tab_options(None)
                 
                 # Clear execution log
                 self.log_widget.clear_log()
-                
-                # Update command preview with reset values
-                self.update_command_preview()
 
                 # Report results
                 if error_tabs:
@@ -910,7 +1714,8 @@ class SqlmapMainWindow(QMainWindow):
                     QMessageBox.information(self, "Reset Complete",
                                           f"Successfully reset all {reset_count} tabs to default values and cleared execution log.")
 
-                self.log_widget.append_log(f"Reset {reset_count} tabs to defaults and cleared execution log", "success")
+                self.log_widget.append_log(f"Reset {reset_count} tabs to defaults in {elapsed_ms:.0f} ms "
+                                           f"and cleared execution log", "success")
                 if error_tabs:
                     self.log_widget.append_log(f"Errors in {len(error_tabs)} tabs during reset", "warning")
 
@@ -985,21 +1790,7 @@ class SqlmapMainWindow(QMainWindow):
                     return
 
             # Load options into tabs with error handling
-            loaded_tabs = 0
-            error_tabs = []
-
-            for tab_name, tab in self.tabs.items():
-                try:
-                    if hasattr(tab, 'set_options'):
-                        tab_options = profile_data.get(tab_name, {})
-                        tab.set_options(tab_options)
-                        loaded_tabs += 1
-                except Exception as e:
-                    error_tabs.append(f"{tab_name}: {str(e)}")
-                    print(f"Error loading {tab_name}: {e}")
-
-            # Update command preview
-            self.update_command_preview()
+            loaded_tabs, error_tabs, elapsed_ms = self.apply_tab_options(profile_data)
 
             # Restore execution log if available
             execution_log = metadata.get('execution_log')
@@ -1030,7 +1821,8 @@ class SqlmapMainWindow(QMainWindow):
                                       f"Created: {created}\n"
                                       f"Loaded options for all {loaded_tabs} tabs{log_message}.")
 
-            self.log_widget.append_log(f"Profile loaded from {file_path} ({loaded_tabs} tabs{log_message})", "success")
+            self.log_widget.append_log(f"Profile loaded from {file_path} ({loaded_tabs} tabs{log_message}, "
+                                       f"applied in {elapsed_ms:.0f} ms)", "success")
             if error_tabs:
                 self.log_widget.append_log(f"Errors in {len(error_tabs)} tabs during load", "warning")
 
@@ -1067,7 +1859,6 @@ class SqlmapMainWindow(QMainWindow):
     def save_profile_to_file(self, file_path: str):
         """Save current profile to specified file"""
         try:
-            import json
             import datetime
 
             # Collect all options from tabs with error handling
@@ -1098,9 +1889,8 @@ class SqlmapMainWindow(QMainWindow):
                 'execution_log': self.log_widget.toPlainText() if hasattr(self, 'log_widget') else None
             }
 
-            # Save to file with pretty formatting
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(profile_data, f, indent=2, ensure_ascii=False)
+            # Save to file with pretty formatting; a crash never leaves half a profile behind
+            atomic_write_json(file_path, profile_data, indent=2, ensure_ascii=False)
 
             # Report results
             has_execution_log = bool(self.log_widget.toPlainText() if hasattr(self, 'log_widget') else False)
@@ -1280,6 +2070,15 @@ Problem Tabs: {results['total_tabs'] - results['working_tabs']}
         except Exception as e:
             self.log_widget.append_log(f"Performance optimization failed: {str(e)}", "warning")
     
+    def debug_validation_cache(self):
+        """Show hit/miss counters of the validation and command caches"""
+        try:
+            debug_info = format_cache_stats(self.sqlmap_wrapper.get_cache_stats())
+            debug_info += f"\n\nLive validation rule evaluations: {self.live_validation.evaluations}"
+            QMessageBox.information(self, "Validation Cache Debug", debug_info)
+        except Exception as e:
+            QMessageBox.critical(self, "Debug Error", f"Failed to read validation cache stats: {str(e)}")
+    
     def debug_cpu_monitoring(self):
         """Debug CPU monitoring functionality"""
         try:
@@ -1324,21 +2123,74 @@ Problem Tabs: {results['total_tabs'] - results['working_tabs']}
     def load_settings(self):
         """Load application settings"""
         try:
-            settings = self.config_manager.load_config()
-            # TODO: Apply settings to UI
+            # The configuration was read by the config manager; the last session's options
+            # are read off the GUI thread and applied once they arrive
+            if self.config_manager.get('ui.restore_session', True):
+                self.session_journal = SessionJournal()
+                self.session_restore_thread = SessionRestoreThread(self.session_journal)
+                self.session_restore_thread.restored.connect(self.on_session_restored)
+                self.session_restore_thread.start()
         except Exception as e:
             self.log_widget.append_log(f"Failed to load settings: {str(e)}", "warning")
     
+    def on_session_restored(self, state, elapsed_ms: float):
+        """Apply the options restored from the last session and start autosaving"""
+        if state is None:
+            if elapsed_ms < 0:
+                self.log_widget.append_log("Could not read the last session; autosave is off for this window",
+                                           "warning")
+            else:
+                self.log_widget.append_log("Session autosave is in use by another window", "info")
+            self.session_journal = None
+            return
+        
+        if state:
+            restored = sum(len(options) for tab_name, options in state.items() if tab_name in self.tabs)
+            self.apply_tab_options(state, only_given=True)
+            self.log_widget.append_log(f"Restored {restored} options from the last session "
+                                       f"(read in {elapsed_ms:.0f} ms)", "info")
+        
+        self.session_writer = AutosaveWriter(self.session_journal)
+        self.session_writer.start()
+    
+    def collect_session_state(self) -> Dict[str, Dict[str, Any]]:
+        """Current options of every tab"""
+        state = {}
+        for tab_name, tab in self.tabs.items():
+            if hasattr(tab, 'get_options'):
+                try:
+                    state[tab_name] = tab.get_options()
+                except Exception as e:
+                    print(f"Error reading {tab_name} options: {e}")
+        return state
+    
+    def schedule_session_autosave(self):
+        """Autosave once the options stop changing for a second"""
+        if self.session_writer:
+            self.session_autosave_timer.start()
+    
+    def autosave_session(self):
+        """Hand the current options to the background writer"""
+        if self.session_writer:
+            self.session_writer.submit(self.collect_session_state())
+    
     def save_settings(self):
         """Save application settings"""
         try:
-            # TODO: Collect settings from UI and save
-            pass
+            if self.session_writer:
+                # Write the final state and compact the journal into a snapshot
+                self.session_autosave_timer.stop()
+                self.session_writer.submit(self.collect_session_state())
+                self.session_writer.stop()
+                self.session_writer = None
+            elif self.session_restore_thread and self.session_restore_thread.isRunning():
+                self.session_restore_thread.wait(2000)
         except Exception as e:
             self.log_widget.append_log(f"Failed to save settings: {str(e)}", "warning")
     
     def closeEvent(self, event):
         """Handle application close"""
+        self.launch_retry_timer.stop()
         # Stop any running scan
         if self.current_scan_thread and self.current_scan_thread.isRunning():
             reply = QMessageBox.question(self, "Scan Running", 
@@ -1352,6 +2204,26 @@ Problem Tabs: {results['total_tabs'] - results['working_tabs']}
                 event.ignore()
                 return
         
+        if self.bulk_thread and self.bulk_thread.isRunning():
+            self.bulk_thread.stop()
+            self.bulk_thread.wait(5000)
+        
+        if self.matrix_thread and self.matrix_thread.isRunning():
+            self.matrix_thread.stop()
+            self.matrix_thread.wait(5000)
+        
+        if self.target_registry:
+            try:
+                self.target_registry.save_index()
+            except Exception as e:
+                print(f"Error saving target registry index: {e}")
+        
+        if self.results_worker:
+            self.results_worker.stop()
+        
+        if self.traffic_poller:
+            self.traffic_poller.stop()
+        
         # Stop all timers to prevent resource leaks
         try:
             if hasattr(self, 'command_timer') and self.command_timer:
@@ -1379,9 +2251,14 @@ Problem Tabs: {results['total_tabs'] - results['working_tabs']}
 
     def on_initialization_complete(self, sqlmap_available, python_available):
         """Handle successful initialization"""
+        # The installed sqlmap's flag schema may have changed the result
+        self.live_validation.revalidate_all()
+        self.update_validation_indicator()
+        
         if sqlmap_available and python_available:
             self.log_widget.append_log("✅ SQLmap and Python are available and ready", "success")
             self.log_widget.append_log("Ready to start SQL injection testing", "info")
+            self.resume_interrupted_jobs()
         elif sqlmap_available:
             self.log_widget.append_log("✅ SQLmap is available", "success")
             self.log_widget.append_log("⚠️ Python interpreter not found - some features may be limited", "warning")
@@ -1420,20 +2297,163 @@ class SqlmapInitializationThread(QThread):
             self.initialization_failed.emit(str(e))
 
 
+class JobProgressThread(QThread):
+    """Thread running several sqlmap jobs at once, reporting each job's estimated progress"""
+    
+    log_message = pyqtSignal(str, str)  # message, type
+    job_progress = pyqtSignal(str, int, int, str)  # job id, percent, seconds left (-1 if unknown), phase
+    job_finished = pyqtSignal(str)  # job id
+    
+    def __init__(self):
+        super().__init__()
+        self.job_progress_trackers: Dict[str, ScanProgress] = {}
+        self.should_stop = False
+    
+    def feed_job(self, job_id: str, options: Dict[str, Any], line: str):
+        """Account for one output line of a running job"""
+        tracker = self.job_progress_trackers.get(job_id)
+        if tracker is None:
+            tracker = self.job_progress_trackers[job_id] = ScanProgress.from_options(options)
+        tracker.feed_line(line)
+    
+    def report_jobs(self, running_ids):
+        """Emit progress of the running jobs that moved, and retire the ones that stopped"""
+        running_ids = set(running_ids)
+        for job_id, tracker in list(self.job_progress_trackers.items()):
+            if job_id not in running_ids:
+                del self.job_progress_trackers[job_id]
+                self.job_finished.emit(job_id)
+            elif tracker.take_changed():
+                percent, eta, phase = tracker.snapshot()
+                self.job_progress.emit(job_id, percent, eta if eta is not None else -1, phase)
+    
+    def stop(self):
+        self.should_stop = True
+
+
+class BulkScanThread(JobProgressThread):
+    """Runs a ShardedBulkScan, forwarding shard output to the log"""
+    
+    def __init__(self, scan: ShardedBulkScan):
+        super().__init__()
+        self.scan = scan
+        self.scan.output_callback = self.on_output
+    
+    def job_id(self, shard) -> str:
+        return f"shard-{shard.index}"
+    
+    def on_output(self, shard, line: str):
+        self.log_message.emit(f"[shard {shard.index}] {line}", "info")
+        self.feed_job(self.job_id(shard), self.scan.options, line)
+    
+    def run(self):
+        try:
+            total = self.scan.prepare()
+            self.log_message.emit(f"Bulk scan: {total} targets in {len(self.scan.shards)} shards, "
+                                  f"{self.scan.workers} workers ({self.scan.already_tested} tested before, "
+                                  f"run last) - {self.scan.work_dir}", "info")
+            while self.scan.step():
+                self.report_jobs(self.job_id(shard) for shard in self.scan.running)
+                if self.should_stop:
+                    self.scan.stop()
+                    self.log_message.emit("Bulk scan stopped by user", "warning")
+                    break
+                self.msleep(500)
+            path = self.scan.merge_results()
+            summary = self.scan.summary()
+            self.log_message.emit(f"Bulk scan finished: {summary['status']['done']} of {summary['shards']} shards "
+                                  f"done, {summary['results_rows']} results in {path}",
+                                  "success" if summary['results_rows'] else "info")
+        except Exception as e:
+            self.log_message.emit(f"Bulk scan error: {str(e)}", "error")
+        self.report_jobs(())
+
+
+class MatrixRaceThread(JobProgressThread):
+    """Runs an OptionMatrixRace, forwarding variant output to the log"""
+    
+    def __init__(self, race: OptionMatrixRace):
+        super().__init__()
+        self.race = race
+        self.race.output_callback = self.on_output
+    
+    def job_id(self, variant) -> str:
+        return f"variant-{variant.index}"
+    
+    def on_output(self, variant, line: str):
+        self.log_message.emit(f"[variant {variant.index}] {line}", "info")
+        self.feed_job(self.job_id(variant), variant.options, line)
+    
+    def run(self):
+        try:
+            self.log_message.emit(f"Racing {len(self.race.variants)} option variants, {self.race.parallel} at a "
+                                  f"time - {self.race.work_dir}", "info")
+            announced = False
+            while self.race.step():
+                self.report_jobs(self.job_id(variant) for variant in self.race.running)
+                if self.should_stop:
+                    self.race.cancel()
+                    self.log_message.emit("Option variant race stopped by user", "warning")
+                    break
+                if self.race.winner and not announced:
+                    announced = True
+                    self.log_message.emit(f"Injection found with {describe_variant(self.race.winner.values)}; "
+                                          f"other variants cancelled", "success")
+                self.msleep(200)
+            summary = self.race.summary()
+            if summary['winner']:
+                self.log_message.emit(f"Winning variant: {summary['winner']} "
+                                      f"(saved to {os.path.join(summary['work_dir'], 'winner.json')})", "success")
+            else:
+                self.log_message.emit(f"No variant found an injection point: {summary['status']}", "info")
+        except Exception as e:
+            self.log_message.emit(f"Option variant race error: {str(e)}", "error")
+        self.report_jobs(())
+
+
+class SessionRestoreThread(QThread):
+    """Thread reading the autosaved option state of the last session"""
+    
+    restored = pyqtSignal(object, float)  # {tab: options} or None, ms taken (-1 if the state was unreadable)
+    
+    def __init__(self, journal: SessionJournal):
+        super().__init__()
+        self.journal = journal
+    
+    def run(self):
+        started = time.perf_counter()
+        try:
+            if not self.journal.acquire():
+                self.restored.emit(None, 0.0)
+                return
+            state = self.journal.load()
+        except Exception as e:
+            # Autosaving on top of a state that was not read would overwrite it
+            print(f"Error restoring session: {e}")
+            self.journal.close()
+            self.restored.emit(None, -1.0)
+            return
+        self.restored.emit(state, (time.perf_counter() - started) * 1000)
+
+
 class SqlmapScanThread(QThread):
     """Thread for running SQLmap scans"""
     
     log_message = pyqtSignal(str, str)  # message, type
     scan_finished = pyqtSignal(bool)    # success
-    progress_updated = pyqtSignal(int)  # progress value
+    progress_updated = pyqtSignal(int, int, str)  # percent, seconds left (-1 if unknown), phase
     
-    def __init__(self, sqlmap_wrapper: SqlmapWrapper, options: Dict[str, Any], use_sudo: bool = False, sudo_password: str = None):
+    def __init__(self, sqlmap_wrapper: SqlmapWrapper, options: Dict[str, Any], use_sudo: bool = False,
+                 sudo_password: str = None, tuning_limits: Optional[Dict[str, Any]] = None):
         super().__init__()
         self.sqlmap_wrapper = sqlmap_wrapper
         self.options = options
         self.use_sudo = use_sudo
         self.sudo_password = sudo_password
+        self.tuning_limits = tuning_limits or {}
+        self.backend = 'process'  # Or 'api' for tasks of a shared sqlmapapi server
         self.should_stop = False
+        self.progress = ScanProgress.from_options(options)
     
     def clean_ansi_escape_sequences(self, text: str) -> str:
         """Remove ANSI escape sequences from text - comprehensive pattern"""
@@ -1444,11 +2464,89 @@ class SqlmapScanThread(QThread):
         cleaned = re.sub(r'[\x00-\x1F\x7F]', '', cleaned)
         return cleaned
     
+    def emit_lines(self, output: List[str], errors: List[str]):
+        """Forward process output and error lines to the log"""
+        for line in output:
+            cleaned_line = self.clean_ansi_escape_sequences(line.strip())
+            if cleaned_line:
+                self.progress.feed_line(cleaned_line)
+                self.log_message.emit(cleaned_line, "info")
+        for line in errors:
+            cleaned_line = self.clean_ansi_escape_sequences(line.strip())
+            if cleaned_line:
+                self.progress.feed_line(cleaned_line)
+                self.log_message.emit(f"Error: {cleaned_line}", "error")
+        self.report_progress()
+    
+    def report_progress(self):
+        """Emit the progress estimate if the last lines moved it"""
+        if self.progress.take_changed():
+            percent, eta, phase = self.progress.snapshot()
+            self.progress_updated.emit(percent, eta if eta is not None else -1, phase)
+    
+    def run_tuned(self):
+        """Run the scan under the auto-tuner, relaunching on the same session when settings change"""
+        try:
+            tuner = AutoTuner.from_options(self.options, **self.tuning_limits)
+            scan = TunedScan(self.sqlmap_wrapper, self.options, tuner, self.use_sudo, self.sudo_password)
+            if not scan.start():
+                self.log_message.emit("Failed to start SQLmap process - check SQLmap installation and PATH", "error")
+                self.scan_finished.emit(False)
+                return
+            
+            self.log_message.emit(f"SQLmap process started with auto-tuning "
+                                  f"(threads {tuner.threads}, delay {tuner.delay}s)", "info")
+            
+            while not self.should_stop:
+                exited = scan.poll() is not None
+                output, errors = scan.read()
+                self.emit_lines(output, errors)
+                if exited:
+                    self.emit_lines(*scan.finish())
+                    break
+                
+                decision = scan.retune()
+                if decision:
+                    if scan.poll() is None:
+                        self.log_message.emit(f"Auto-tune: {decision.describe()} - relaunching on the same session",
+                                              "warning")
+                    else:
+                        self.log_message.emit(f"Auto-tune: {decision.describe()} - failed to relaunch SQLmap",
+                                              "error")
+                self.msleep(100)
+            
+            if self.should_stop:
+                scan.stop()
+                self.log_message.emit("Scan stopped by user", "warning")
+                self.scan_finished.emit(False)
+                return
+            
+            exit_code = scan.poll()
+            if exit_code == 0:
+                self.log_message.emit(f"Scan completed successfully ({scan.relaunches} auto-tune relaunches)",
+                                      "success")
+                self.scan_finished.emit(True)
+            else:
+                self.log_message.emit(f"Scan failed with exit code {exit_code}", "error")
+                self.scan_finished.emit(False)
+        
+        except Exception as e:
+            self.log_message.emit(f"Scan error: {str(e)}", "error")
+            self.scan_finished.emit(False)
+    
     def run(self):
         """Run the scan"""
+        if self.options.get('auto_tune'):
+            self.run_tuned()
+            return
+        
         try:
-            # Create scan process
-            process = self.sqlmap_wrapper.create_process(self.options, self.use_sudo, self.sudo_password)
+            # Create scan process (sudo scans always run as a local process)
+            if self.backend == 'api' and not self.use_sudo:
+                process = SqlmapApiProcess(get_default_server(self.sqlmap_wrapper), self.options)
+                self.log_message.emit("Running scan as a sqlmapapi server task", "info")
+            else:
+                process = self.sqlmap_wrapper.create_process(self.options, self.use_sudo, self.sudo_password)
             
             if not process:
                 self.log_message.emit("Failed to create SQLmap process - check SQLmap installation and PATH", "error")
@@ -1473,6 +2571,7 @@ class SqlmapScanThread(QThread):
                 for line in initial_output:
                     cleaned_line = self.clean_ansi_escape_sequences(line)
                     if cleaned_line.strip():  # Only emit non-empty lines
+                        self.progress.feed_line(cleaned_line)
                         self.log_message.emit(cleaned_line, "info")
             
             initial_errors = process.get_errors()
@@ -1488,6 +2587,7 @@ class SqlmapScanThread(QThread):
                 if output:
                     cleaned_output = self.clean_ansi_escape_sequences(output.strip())
                     if cleaned_output:  # Only emit non-empty cleaned output
+                        self.progress.feed_line(cleaned_output)
                         self.log_message.emit(cleaned_output, "info")
                 
                 error = process.read_error()
@@ -1496,6 +2596,12 @@ class SqlmapScanThread(QThread):
                     if cleaned_error:
                         self.log_message.emit(f"Error: {cleaned_error}", "error")
                 
+                # Notice when sqlmap exits on its own once its output is drained
+                if not output and not error:
+                    process.poll()
+                
+                self.report_progress()
+                
                 self.msleep(100)  # Small delay to prevent excessive CPU usage
             
             # Stop process if requested
@@ -69,13 +69,13 @@ class GeneralTab(QWidget):
                 'type': 'file',
                 'label': 'Log All HTTP Traffic into File',
                 'filter': 'Text Files (*.txt);;All Files (*)',
-                'tooltip': 'Log all HTTP traffic into a textual file (--traffic-file=FILE)'
+                'tooltip': 'Log all HTTP traffic into a textual file (-t TRAFFICFILE)'
             },
             {
                 'name': 'output_dir',
                 'type': 'directory',
                 'label': 'Custom Output Directory Path',
-                'tooltip': 'Custom output directory path (-o DIR or --output-dir=DIR)'
+                'tooltip': 'Custom output directory path (--output-dir=OUTPUTDIR)'
             }
         ]
         
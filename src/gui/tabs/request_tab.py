@@ -89,6 +89,12 @@ class RequestTab(QWidget):
                 'max': 10,
                 'default': 1
             },
+            {
+                'name': 'auto_tune',
+                'type': 'checkbox',
+                'label': 'Auto-tune Threads/Delay from Target Responses',
+                'tooltip': 'Back off on timeouts, resets and 429/503 responses; with a traffic file (-t) slow responses count too'
+            },
             {
                 'name': 'tor',
                 'type': 'checkbox',
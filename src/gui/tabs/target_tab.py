@@ -6,11 +6,34 @@ Handles URL, request file, direct connection, and related options
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                             QCheckBox, QComboBox, QSpinBox, QTextEdit, QGroupBox,
                             QScrollArea, QPushButton, QFileDialog, QFrame)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QThread
 from typing import Dict, Any
 
 from ..widgets.custom_widgets import OptionGroup, ValidatedLineEdit
 from .base_tab import BaseTab
+from ...core import parameter_schema
+from ...core.proxy_log import default_output_path, preprocess_log
+
+
+class LogDeduplicationThread(QThread):
+    """Deduplicates a proxy log off the GUI thread"""
+    
+    finished_signal = pyqtSignal(str, str)  # output path, summary
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, log_path: str, output_path: str, parent=None, registry=None, coverage: str = None):
+        super().__init__(parent)
+        self.log_path = log_path
+        self.output_path = output_path
+        self.registry = registry  # With a coverage fingerprint, already scanned points are dropped too
+        self.coverage = coverage
+    
+    def run(self):
+        try:
+            stats = preprocess_log(self.log_path, self.output_path, registry=self.registry, coverage=self.coverage)
+            self.finished_signal.emit(self.output_path, stats.summary())
+        except Exception as e:
+            self.error_signal.emit(str(e))
 
 
 class TargetTab(BaseTab):
@@ -21,6 +44,8 @@ class TargetTab(BaseTab):
     def __init__(self, parent=None, mutual_exclusion_manager=None):
         super().__init__(parent)
         self.mutual_exclusion_manager = mutual_exclusion_manager
+        # Set by the main window: returns (target registry, coverage fingerprint of the scan options)
+        self.coverage_source = None
         self.setup_ui()
     
     def setup_ui(self):
@@ -75,6 +100,14 @@ class TargetTab(BaseTab):
                 'label': 'Parse Targets from Burp/WebScarab Log',
                 'filter': 'Log Files (*.log);;All Files (*)'
             },
+            {
+                'name': 'dedup_log_btn',
+                'type': 'button',
+                'label': 'Collapse Duplicate Injection Points in Log',
+                'button_text': 'Deduplicate Log',
+                'tooltip': 'Keep one request per method, path template, parameter names and content type',
+                'action': 'deduplicate_log_file'
+            },
             {
                 'name': 'bulk_file',
                 'type': 'file',
@@ -192,6 +225,32 @@ class TargetTab(BaseTab):
         
         return OptionGroup("Connection Options", connection_options, self.mutual_exclusion_manager)
     
+    def deduplicate_log_file(self):
+        """Replace the proxy log with a copy holding one request per injection point"""
+        from PyQt6.QtWidgets import QMessageBox
+        import os
+        
+        log_path = self.get_options().get('log_file')
+        if not log_path or not os.path.isfile(log_path):
+            QMessageBox.warning(self, "Deduplicate Log", "Select an existing Burp/ZAP log file first.")
+            return
+        if getattr(self, '_dedup_thread', None) and self._dedup_thread.isRunning():
+            return
+        
+        def on_finished(output_path, summary):
+            self.set_options({'log_file': output_path})
+            QMessageBox.information(self, "Deduplicate Log", f"{summary}\n\nUsing: {output_path}")
+        
+        def on_error(message):
+            QMessageBox.critical(self, "Deduplicate Log", f"Failed to process log: {message}")
+        
+        registry, coverage = self.coverage_source() if self.coverage_source else (None, None)
+        self._dedup_thread = LogDeduplicationThread(log_path, default_output_path(log_path), self,
+                                                    registry, coverage)
+        self._dedup_thread.finished_signal.connect(on_finished)
+        self._dedup_thread.error_signal.connect(on_error)
+        self._dedup_thread.start()
+    
     # Methods inherited from BaseTab: get_options, set_options, reset_options
     
     def validate_options(self) -> Dict[str, Any]:
@@ -200,14 +259,7 @@ class TargetTab(BaseTab):
         errors = []
         
         # Check if at least one target is specified
-        target_specified = any([
-            options.get('url'),
-            options.get('direct'),
-            options.get('log_file'),
-            options.get('bulk_file'),
-            options.get('request_file'),
-            options.get('google_dork')
-        ])
+        target_specified = any(options.get(name) for name in parameter_schema.TARGET_PARAMS)
         
         if not target_specified:
             errors.append("At least one target must be specified (URL, direct connection, log file, etc.)")
@@ -7,11 +7,13 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdi
                             QCheckBox, QComboBox, QSpinBox, QDoubleSpinBox, QTextEdit,
                             QGroupBox, QScrollArea, QPushButton, QFileDialog, QFrame,
                             QSlider, QProgressBar, QTabWidget, QSplitter)
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QRegularExpression
-from PyQt6.QtGui import QFont, QPalette, QValidator, QRegularExpressionValidator
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QRegularExpression, QPointF
+from PyQt6.QtGui import QFont, QPalette, QValidator, QRegularExpressionValidator, QPainter, QPen, QColor
 import re
 from typing import Any, Dict, List, Optional, Callable
 
+from ...core import parameter_schema
+
 class ValidatedLineEdit(QLineEdit):
     """Line edit with built-in validation and error styling"""
     
@@ -232,8 +234,38 @@ class OptionGroup(QGroupBox):
             self._containers[name] = container
             return container
         
+        elif option_type == 'button':
+            container = QWidget()
+            layout = QHBoxLayout()
+            layout.setContentsMargins(0, 0, 0, 0)
+            
+            label_widget = QLabel(label + ":")
+            button = QPushButton(option.get('button_text', label))
+            if option.get('tooltip'):
+                button.setToolTip(option['tooltip'])
+            button.clicked.connect(lambda checked=False, a=option.get('action'): self.trigger_action(a))
+            
+            layout.addWidget(label_widget)
+            layout.addStretch()
+            layout.addWidget(button)
+            
+            container.setLayout(layout)
+            return container
+        
         return None
     
+    def trigger_action(self, action: Optional[str]):
+        """Call a button's action method on the nearest parent that defines it"""
+        if not action:
+            return
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, action):
+                getattr(parent, action)()
+                return
+            parent = parent.parent()
+        print(f"No handler found for button action: {action}")
+    
     def option_changed(self, name: str, value: Any):
         """Handle option value change"""
         if name in self.enabled_changed:
@@ -242,6 +274,8 @@ class OptionGroup(QGroupBox):
         # Notify mutual exclusion manager
         if self.mutual_exclusion_manager:
             self.mutual_exclusion_manager.update_option_state(name, value)
+            if self.mutual_exclusion_manager.in_bulk_update:
+                return  # Whoever applies the options notifies once at the end
         
         # Emit signal to parent for real-time updates
         parent = self.parent()
@@ -267,7 +301,7 @@ class OptionGroup(QGroupBox):
                     # But include if there's an explicit default that was set
                     minimum = widget.minimum()
                     # Special handling for common parameters that shouldn't default to minimum
-                    if name in ['start', 'stop', 'first', 'last', 'safe_freq', 'proxy_freq'] and value == minimum:
+                    if name in parameter_schema.UNSET_AT_MINIMUM and value == minimum:
                         values[name] = None  # Don't include these unless explicitly set above minimum
                     else:
                         values[name] = value if value != 0 else None
@@ -727,3 +761,41 @@ class CollapsibleWidget(QWidget):
         self.is_expanded = expanded
         self.content_area.setVisible(expanded)
         self.toggle_button.setText("▼" if expanded else "▶")
+
+
+class Sparkline(QWidget):
+    """Small line chart of a series of values, scaled to the largest one"""
+    
+    def __init__(self, title: str = "", color: str = "#2a7ae2", parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.color = QColor(color)
+        self.values: List[float] = []
+        self.caption = ""
+        self.setMinimumHeight(80)
+    
+    def set_values(self, values: List[float], caption: str = ""):
+        """Replace the series and redraw"""
+        self.values = list(values)
+        self.caption = caption
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = self.rect().adjusted(4, 18, -4, -4)
+        painter.setPen(QPen(QColor("#cccccc")))
+        painter.drawRect(rect)
+        painter.setPen(QPen(QColor("#333333")))
+        peak = max(self.values) if self.values else 0
+        painter.drawText(4, 13, f"{self.title}  {self.caption}  (max {peak:g})")
+        if len(self.values) < 2 or rect.width() <= 0:
+            painter.end()
+            return
+        scale = rect.height() / peak if peak else 0
+        step = rect.width() / (len(self.values) - 1)
+        points = [QPointF(rect.left() + index * step, rect.bottom() - value * scale)
+                  for index, value in enumerate(self.values)]
+        painter.setPen(QPen(self.color, 1.5))
+        painter.drawPolyline(points)
+        painter.end()
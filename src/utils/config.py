@@ -9,6 +9,10 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from configparser import ConfigParser
 
+from ..core import parameter_schema
+from ..core.atomic_io import atomic_write_json
+from ..core.profile_store import get_default_store
+
 class ConfigManager:
     def __init__(self):
         self.config_dir = Path.home() / '.sqlmap-gui'
@@ -28,14 +32,26 @@ class ConfigManager:
                 'window_width': 1200,
                 'window_height': 800,
                 'show_tooltips': True,
-                'auto_save_profiles': True
+                'auto_save_profiles': True,
+                # Journal the option tabs in the background and restore them on the next start
+                'restore_session': True
             },
             'sqlmap': {
                 'path': 'sqlmap',
                 'default_threads': 1,
                 'default_timeout': 30,
                 'default_retries': 3,
-                'output_dir': str(Path.home() / 'sqlmap-gui-output')
+                'output_dir': str(Path.home() / 'sqlmap-gui-output'),
+                # 'process' runs sqlmap per scan; 'api' runs scans as tasks of one sqlmapapi server
+                'backend': 'process'
+            },
+            'rate_limits': {
+                # Shared by all scans in this process; 0 means unlimited
+                'host_rps': 0,
+                'host_concurrency': 10,
+                'global_rps': 0,
+                'global_concurrency': 0,
+                'hosts': {}
             },
             'advanced': {
                 'max_log_lines': 10000,
@@ -46,6 +62,9 @@ class ConfigManager:
         }
         
         self.config = self.load_config()
+        
+        # Profiles live in a SQLite store; files under profiles/ are imported into it once
+        self.profile_store = get_default_store()
     
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file or return defaults"""
@@ -64,8 +83,7 @@ class ConfigManager:
     def save_config(self) -> bool:
         """Save current configuration to file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            atomic_write_json(self.config_file, self.config, indent=4)
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
@@ -102,13 +120,10 @@ class ConfigManager:
             config = config[key]
         config[keys[-1]] = value
     
-    def save_profile(self, name: str, options: Dict[str, Any]) -> bool:
+    def save_profile(self, name: str, options: Dict[str, Any], tags: Optional[List[str]] = None) -> bool:
         """Save a configuration profile"""
         try:
-            profile_file = self.profiles_dir / f"{name}.json"
-            with open(profile_file, 'w') as f:
-                json.dump(options, f, indent=4)
-            return True
+            return self.profile_store.save(name, options, tags)
         except Exception as e:
             print(f"Error saving profile: {e}")
             return False
@@ -116,10 +131,7 @@ class ConfigManager:
     def load_profile(self, name: str) -> Optional[Dict[str, Any]]:
         """Load a configuration profile"""
         try:
-            profile_file = self.profiles_dir / f"{name}.json"
-            if profile_file.exists():
-                with open(profile_file, 'r') as f:
-                    return json.load(f)
+            return self.profile_store.load(name)
         except Exception as e:
             print(f"Error loading profile: {e}")
         return None
@@ -127,17 +139,14 @@ class ConfigManager:
     def list_profiles(self) -> List[str]:
         """List all available profiles"""
         try:
-            return [f.stem for f in self.profiles_dir.glob('*.json')]
+            return self.profile_store.names()
         except Exception:
             return []
     
     def delete_profile(self, name: str) -> bool:
         """Delete a profile"""
         try:
-            profile_file = self.profiles_dir / f"{name}.json"
-            if profile_file.exists():
-                profile_file.unlink()
-                return True
+            return self.profile_store.delete(name)
         except Exception as e:
             print(f"Error deleting profile: {e}")
         return False
@@ -148,8 +157,7 @@ class ConfigManager:
         warnings = []
         
         # Check for required target
-        target_options = ['url', 'direct', 'log_file', 'bulk_file', 'request_file', 'google_dork']
-        if not any(options.get(opt) for opt in target_options):
+        if not any(options.get(opt) for opt in parameter_schema.TARGET_PARAMS):
             errors.append("At least one target must be specified (URL, direct connection, log file, etc.)")
         
         # Check for conflicting options using SqlmapOptions
@@ -162,10 +170,8 @@ class ConfigManager:
         
         # Check dependencies
         for option, deps in sqlmap_opts.DEPENDENCIES.items():
-            if options.get(option):
-                for dep in deps:
-                    if not options.get(dep):
-                        warnings.append(f"Option '{option}' works best with '{dep}' option")
+            if options.get(option) and not any(options.get(dep) for dep in deps):
+                warnings.append(f"Option '{option}' works best with one of: {', '.join(deps)}")
         
         # Validate specific option values
         if options.get('level'):
@@ -201,114 +207,30 @@ class SqlmapOptions:
     Manages SQLmap options and their relationships/dependencies
     """
     
-    # Define option categories
-    CATEGORIES = {
-        'target': ['url', 'direct', 'logfile', 'bulkfile', 'requestfile', 'googledork', 'configfile'],
-        'request': ['user_agent', 'header', 'method', 'data', 'param_del', 'cookie', 'cookie_del',
-                   'live_cookies', 'load_cookies', 'drop_set_cookie', 'http1_0', 'http2',
-                   'mobile', 'random_agent', 'host', 'referer', 'headers', 'auth_type',
-                   'auth_cred', 'auth_file', 'abort_code', 'ignore_code', 'ignore_proxy',
-                   'ignore_redirects', 'ignore_timeouts', 'proxy', 'proxy_cred', 'proxy_file',
-                   'proxy_freq', 'tor', 'tor_port', 'tor_type', 'check_tor', 'delay',
-                   'timeout', 'retries', 'retry_on', 'randomize', 'safe_url', 'safe_post',
-                   'safe_req', 'safe_freq', 'skip_urlencode', 'csrf_token', 'csrf_url',
-                   'csrf_method', 'csrf_data', 'csrf_retries', 'force_ssl', 'chunked',
-                   'hpp', 'eval'],
-        'optimization': ['optimize', 'predict_output', 'keep_alive', 'null_connection', 'threads'],
-        'injection': ['testparameter', 'skip', 'skip_static', 'param_exclude', 'param_filter',
-                     'dbms', 'dbms_cred', 'os', 'invalid_bignum', 'invalid_logical',
-                     'invalid_string', 'no_cast', 'no_escape', 'prefix', 'suffix', 'tamper'],
-        'detection': ['level', 'risk', 'string', 'not_string', 'regexp', 'code', 'smart',
-                     'text_only', 'titles'],
-        'techniques': ['technique', 'time_sec', 'disable_stats', 'union_cols', 'union_char',
-                      'union_from', 'union_values', 'dns_domain', 'second_url', 'second_req'],
-        'fingerprint': ['fingerprint'],
-        'enumeration': ['all', 'banner', 'current_user', 'current_db', 'hostname', 'is_dba',
-                       'users', 'passwords', 'privileges', 'roles', 'dbs', 'tables', 'columns',
-                       'schema', 'count', 'dump', 'dump_all', 'search', 'comments', 'statements',
-                       'database', 'table', 'column', 'exclude', 'user', 'exclude_sysdbs',
-                       'pivot_column', 'where', 'start', 'stop', 'first', 'last', 'sql_query',
-                       'sql_shell', 'sql_file', 'abort_on_empty'],
-        'brute_force': ['common_tables', 'common_columns', 'common_files'],
-        'udf': ['udf_inject', 'shared_lib'],
-        'file_system': ['file_read', 'file_write', 'file_dest'],
-        'os_access': ['os_cmd', 'os_shell', 'os_pwn', 'os_smbrelay', 'os_bof', 'priv_esc',
-                     'msf_path', 'tmp_path'],
-        'registry': ['reg_read', 'reg_add', 'reg_del', 'reg_key', 'reg_value', 'reg_data',
-                    'reg_type'],
-        'general': ['sessionfile', 'trafficfile', 'answers', 'base64', 'base64_safe', 'batch',
-                   'binary_fields', 'check_internet', 'charset', 'cleanup', 'crawl',
-                   'crawl_exclude', 'csv_del', 'dump_file', 'dump_format', 'encoding', 'eta',
-                   'flush_session', 'forms', 'fresh_queries', 'gpage', 'har', 'hex',
-                   'output_dir', 'parse_errors', 'preprocess', 'postprocess', 'repair',
-                   'save', 'scope', 'skip_heuristics', 'skip_waf', 'table_prefix',
-                   'test_filter', 'test_skip', 'time_limit', 'unsafe_naming', 'web_root'],
-        'miscellaneous': ['mnemonics', 'alert', 'beep', 'dependencies', 'disable_coloring',
-                         'disable_hashing', 'list_tampers', 'no_logging', 'no_truncate',
-                         'offline', 'purge', 'results_file', 'shell', 'tmp_dir', 'unstable',
-                         'update', 'wizard']
-    }
+    # Option categories, conflicts and dependencies come from the shared parameter schema
+    CATEGORIES = parameter_schema.GROUPS
     
     # Define conflicting options
-    CONFLICTS = {
-        'url': ['direct', 'logfile', 'bulkfile', 'requestfile', 'googledork'],
-        'direct': ['url', 'logfile', 'bulkfile', 'requestfile', 'googledork'],
-        'logfile': ['url', 'direct', 'bulkfile', 'requestfile', 'googledork'],
-        'bulkfile': ['url', 'direct', 'logfile', 'requestfile', 'googledork'],
-        'requestfile': ['url', 'direct', 'logfile', 'bulkfile', 'googledork'],
-        'googledork': ['url', 'direct', 'logfile', 'bulkfile', 'requestfile'],
-        'tor': ['proxy'],
-        'proxy': ['tor'],
-        'batch': ['wizard'],
-        'wizard': ['batch'],
-        'offline': ['crawl', 'forms', 'check_internet']
-    }
+    CONFLICTS = parameter_schema.CONFLICTS
     
-    # Define dependencies (option requires other options)
-    DEPENDENCIES = {
-        'csrf_token': ['forms'],
-        'csrf_url': ['forms'],
-        'proxy_cred': ['proxy'],
-        'proxy_freq': ['proxy_file'],
-        'tor_port': ['tor'],
-        'tor_type': ['tor'],
-        'check_tor': ['tor'],
-        'safe_post': ['safe_url'],
-        'safe_req': ['safe_url'],
-        'safe_freq': ['safe_url'],
-        'database': ['dbs', 'tables', 'columns', 'dump', 'count', 'schema'],
-        'table': ['tables', 'columns', 'dump', 'count'],
-        'column': ['columns', 'dump'],
-        'where': ['dump'],
-        'start': ['dump'],
-        'stop': ['dump'],
-        'first': ['dump'],
-        'last': ['dump'],
-        'reg_value': ['reg_key'],
-        'reg_data': ['reg_add'],
-        'reg_type': ['reg_add'],
-        'shared_lib': ['udf_inject'],
-        'file_dest': ['file_write'],
-        'msf_path': ['os_pwn', 'os_smbrelay']
-    }
+    # Define dependencies (option requires at least one of the other options)
+    DEPENDENCIES = parameter_schema.DEPENDENCIES
     
     @classmethod
     def get_category(cls, option: str) -> Optional[str]:
         """Get the category of an option"""
-        for category, options in cls.CATEGORIES.items():
-            if option in options:
-                return category
-        return None
+        spec = parameter_schema.BY_NAME.get(option)
+        return spec.group if spec else None
     
     @classmethod
     def get_conflicts(cls, option: str) -> List[str]:
         """Get list of conflicting options"""
-        return cls.CONFLICTS.get(option, [])
+        return list(cls.CONFLICTS.get(option, ()))
     
     @classmethod
     def get_dependencies(cls, option: str) -> List[str]:
         """Get list of required options"""
-        return cls.DEPENDENCIES.get(option, [])
+        return list(cls.DEPENDENCIES.get(option, ()))
     
     @classmethod
     def validate_options(cls, options: Dict[str, Any]) -> List[str]:
@@ -327,13 +249,11 @@ class SqlmapOptions:
         for option, value in options.items():
             if value:  # Only check enabled options
                 dependencies = cls.get_dependencies(option)
-                for dep in dependencies:
-                    if not options.get(dep):
-                        errors.append(f"Option '{option}' requires '{dep}' to be enabled")
+                if dependencies and not any(options.get(dep) for dep in dependencies):
+                    errors.append(f"Option '{option}' requires one of '{', '.join(dependencies)}' to be enabled")
         
         # Check target requirements
-        target_options = ['url', 'direct', 'logfile', 'bulkfile', 'requestfile', 'googledork']
-        if not any(options.get(opt) for opt in target_options):
+        if not any(options.get(opt) for opt in parameter_schema.TARGET_PARAMS):
             errors.append("At least one target option must be specified")
         
         return errors